@@ -1,9 +1,136 @@
 """Base classes and protocols for vector database adapters."""
 
-from typing import Any, Dict, List, Optional, Protocol
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Union,
+    cast,
+    runtime_checkable,
+)
 
 import numpy as np
 
+# Vector storage types for `create_collection(..., dtype=...)`: full and half
+# precision floats, 8-bit scalar quantization and one bit per dimension.
+VECTOR_DTYPES = ("float32", "float16", "int8", "binary")
+
+
+def vector_dtype(kwargs: Dict[str, Any], supported: tuple[str, ...]) -> str:
+    """Returns the `dtype` requested in `create_collection` keyword arguments.
+
+    Args:
+        kwargs: The keyword arguments. The dtype defaults to "float32".
+        supported: The dtypes the adapter can store.
+
+    Raises:
+        ValueError: If the dtype is unknown or not supported.
+    """
+    dtype: str = kwargs.get("dtype", "float32")
+    if dtype not in supported:
+        raise ValueError(f"Unsupported dtype {dtype!r}; expected one of {supported}")
+    return dtype
+
+
+# Distance metrics for `create_collection(..., metric=...)`: squared
+# Euclidean distance, inner product and cosine similarity.
+METRICS = ("l2", "ip", "cosine")
+
+
+def vector_metric(
+    kwargs: Dict[str, Any], supported: tuple[str, ...], default: str = "l2"
+) -> str:
+    """Returns the `metric` requested in `create_collection` keyword arguments.
+
+    Args:
+        kwargs: The keyword arguments.
+        supported: The metrics the adapter can rank by.
+        default: The metric to use when none is requested.
+
+    Raises:
+        ValueError: If the metric is unknown or not supported.
+    """
+    metric: str = kwargs.get("metric") or default
+    if metric not in supported:
+        raise ValueError(f"Unsupported metric {metric!r}; expected one of {supported}")
+    return metric
+
+
+class QueryResult:
+    """Top-k results for a batch of queries, stored as parallel arrays.
+
+    Attributes:
+        ids: An object array of shape (num_queries, k) holding the document ids
+            of the hits, padded with None where a query has fewer than k hits.
+        distances: A float32 array of the same shape holding the distance or
+            score the backend reported for each hit (NaN for padding).
+
+    Metadata is not materialized with the hits. It is resolved on demand
+    through `metadata` or `field`, so callers that only need ids and distances
+    never pay for it.
+    """
+
+    __slots__ = ("ids", "distances", "_payload")
+
+    def __init__(
+        self,
+        ids: np.ndarray[Any, Any],
+        distances: np.ndarray[Any, Any],
+        payload: Callable[[int, int], Dict[str, Any]],
+    ) -> None:
+        self.ids = ids
+        self.distances = distances
+        self._payload = payload
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def valid(self) -> np.ndarray[Any, Any]:
+        """A boolean mask of the slots that hold a hit."""
+        return np.asarray(self.ids != None, dtype=bool)  # noqa: E711
+
+    def metadata(self, i: int, j: int) -> Dict[str, Any]:
+        """Returns the metadata of the j-th hit of the i-th query."""
+        return self._payload(i, j)
+
+    def field(self, key: str) -> np.ndarray[Any, Any]:
+        """Returns one metadata field for every hit.
+
+        Returns:
+            An object array shaped like `ids`, with None for padding and for
+            hits without the field.
+        """
+        values = np.full(self.ids.shape, None, dtype=object)
+        for i, j in zip(*np.nonzero(self.valid), strict=True):
+            values[i, j] = self._payload(int(i), int(j)).get(key)
+        return values
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Returns the legacy flat list of hit dictionaries.
+
+        Hits of all queries are concatenated in order, each as a dictionary
+        with "id", "distance" and "metadata" keys.
+        """
+        results = []
+        for i in range(self.ids.shape[0]):
+            for j in range(self.ids.shape[1]):
+                doc_id = self.ids[i, j]
+                if doc_id is None:
+                    continue
+                results.append(
+                    {
+                        "id": doc_id,
+                        "distance": float(self.distances[i, j]),
+                        "metadata": self._payload(i, j),
+                    }
+                )
+        return results
+
 
 class VectorDB(Protocol):
     """A protocol for vector database operations."""
@@ -19,7 +146,13 @@ class VectorDB(Protocol):
         ...
 
     def create_collection(self, name: str, dim: int, **kwargs: Any) -> None:
-        """Create a collection."""
+        """Create a collection.
+
+        Adapters that can store vectors in reduced precision accept a `dtype`
+        from `VECTOR_DTYPES`, and every adapter accepts a `metric` from
+        `METRICS`; each raises ValueError for a dtype or metric it does not
+        support.
+        """
         ...
 
     def upsert(
@@ -28,8 +161,18 @@ class VectorDB(Protocol):
         ids: List[str],
         vectors: np.ndarray[Any, Any],
         meta: List[Dict[str, Any]],
+        wait: bool = True,
     ) -> None:
-        """Upsert data into a collection."""
+        """Upsert data into a collection.
+
+        Args:
+            name: The collection name.
+            ids: The document ids.
+            vectors: The vectors, one row per id.
+            meta: The metadata, one dictionary per id.
+            wait: Whether to block until the points are searchable. If False,
+                a remote backend may acknowledge the write before applying it.
+        """
         ...
 
     def query(
@@ -39,7 +182,21 @@ class VectorDB(Protocol):
         k: int,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        """Query a collection."""
+        """Query a collection.
+
+        This is a convenience view over `search` that materializes one
+        dictionary per hit.
+        """
+        ...
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        """Query a collection with one or more vectors."""
         ...
 
     def delete(self, name: str, ids: List[str]) -> None:
@@ -53,3 +210,168 @@ class VectorDB(Protocol):
     def count(self, name: str) -> int:
         """Get the number of items in a collection."""
         ...
+
+
+@runtime_checkable
+class PersistentVectorDB(Protocol):
+    """A protocol for adapters that can save collections to disk and reopen them.
+
+    Check for support with `isinstance(db, PersistentVectorDB)`.
+    """
+
+    def save(self, name: str, path: Union[str, Path]) -> None:
+        """Write a collection to the directory `path`."""
+        ...
+
+    def load(self, name: str, path: Union[str, Path], mmap: bool = True) -> None:
+        """Open a collection saved by `save` under `name`.
+
+        Args:
+            name: The collection name to load it as.
+            path: The directory it was saved to.
+            mmap: Memory-map the files instead of reading them up front, so
+                pages are faulted in on first access.
+        """
+        ...
+
+
+@runtime_checkable
+class RemoteVectorDB(Protocol):
+    """A protocol for adapters whose backend other processes can reach too.
+
+    Check for support with `isinstance(db, RemoteVectorDB)`. Load generator
+    processes rebuild the adapter as `type(unwrap(db))(**db.connection_kwargs())`.
+    """
+
+    def connection_kwargs(self) -> Dict[str, Any]:
+        """Return the constructor arguments that connect to the same backend."""
+        ...
+
+
+class _PersistentWrapper:
+    """Forwards the `PersistentVectorDB` calls of a wrapper."""
+
+    db: Any
+
+    def save(self, name: str, path: Union[str, Path]) -> None:
+        self.db.save(name, path)
+
+    def load(self, name: str, path: Union[str, Path], mmap: bool = True) -> None:
+        self.db.load(name, path, mmap=mmap)
+
+
+class _RemoteWrapper:
+    """Forwards the `RemoteVectorDB` calls of a wrapper."""
+
+    db: Any
+
+    def connection_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = self.db.connection_kwargs()
+        return kwargs
+
+
+_wrapper_classes: Dict[tuple[type, bool, bool], type] = {}
+
+
+def _wrapper_class(cls: type, persistent: bool, remote: bool) -> type:
+    """Returns `cls` extended with the protocols of the adapter it wraps."""
+    key = (cls, persistent, remote)
+    if key not in _wrapper_classes:
+        mixins = ((_PersistentWrapper,) if persistent else ()) + (
+            (_RemoteWrapper,) if remote else ()
+        )
+        _wrapper_classes[key] = (
+            type(cls.__name__, (cls, *mixins), {}) if mixins else cls
+        )
+    return _wrapper_classes[key]
+
+
+def unwrap(db: Any) -> Any:
+    """Returns the adapter at the bottom of a chain of wrappers."""
+    while isinstance(db, VectorDBWrapper):
+        db = db.db
+    return db
+
+
+def supports_payload_indexes(db: Any) -> bool:
+    """Returns whether `db` builds the `payload_indexes` of `create_collection`.
+
+    Adapters that do set a `supports_payload_indexes` class attribute; others
+    accept and ignore the argument.
+    """
+    return bool(getattr(unwrap(db), "supports_payload_indexes", False))
+
+
+class VectorDBWrapper:
+    """Forwards every `VectorDB` call to a wrapped adapter.
+
+    Subclasses override the calls they intercept. `query` is answered
+    through `search`, so overriding `search` intercepts both. The wrapper
+    takes the wrapped adapter's name, so results are reported under the
+    backend.
+
+    A wrapper also implements `PersistentVectorDB` and `RemoteVectorDB`
+    when the wrapped adapter does, forwarding those calls unchanged.
+
+    Args:
+        db: The adapter to wrap.
+    """
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "VectorDBWrapper":
+        db = args[0] if args else kwargs["db"]
+        subclass = _wrapper_class(
+            cls,
+            isinstance(db, PersistentVectorDB),
+            isinstance(db, RemoteVectorDB),
+        )
+        return cast(VectorDBWrapper, super().__new__(subclass))
+
+    def __init__(self, db: VectorDB) -> None:
+        self.db = db
+        self.name = db.name
+
+    def connect(self) -> bool:
+        return self.db.connect()
+
+    def drop_collection(self, name: str) -> None:
+        self.db.drop_collection(name)
+
+    def create_collection(self, name: str, dim: int, **kwargs: Any) -> None:
+        self.db.create_collection(name, dim, **kwargs)
+
+    def upsert(
+        self,
+        name: str,
+        ids: List[str],
+        vectors: np.ndarray[Any, Any],
+        meta: List[Dict[str, Any]],
+        wait: bool = True,
+    ) -> None:
+        self.db.upsert(name, ids, vectors, meta, wait=wait)
+
+    def query(
+        self,
+        name: str,
+        vector: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.search(name, vector, k, filter).to_dicts()
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        return self.db.search(name, vectors, k, filter)
+
+    def delete(self, name: str, ids: List[str]) -> None:
+        self.db.delete(name, ids)
+
+    def memory_bytes(self, name: str) -> Optional[int]:
+        return self.db.memory_bytes(name)
+
+    def count(self, name: str) -> int:
+        return self.db.count(name)
@@ -0,0 +1,383 @@
+"""An adapter wrapper that caches query results on the client.
+
+RAG systems often answer repeated or paraphrased questions from a semantic
+cache in front of the vector database. `CachingAdapter` models that setup so
+it can be benchmarked like any other adapter.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
+
+import numpy as np
+
+from vdbt.adapters.base import QueryResult, VectorDB, VectorDBWrapper
+from vdbt.utils.histogram import LatencyHistogram
+
+CACHE_MODES = ("exact", "approximate")
+EVICTIONS = ("lru", "lfu")
+
+# A cached answer: the result it came from, the row of the query in it, and
+# the write version of the collection when it was cached. Metadata is
+# resolved through the result only when asked for.
+_Entry = Tuple[QueryResult, int, int]
+# Answers are keyed by (collection, k, filter) and the query's hash in exact
+# mode or a running number in approximate mode.
+_Bucket = Tuple[str, int, str]
+_Key = Tuple[_Bucket, Union[bytes, int]]
+
+
+class _EvictionStore:
+    """A bounded mapping that evicts the least recently or frequently used key.
+
+    LFU keeps keys in per-frequency LRU lists, so both policies run in
+    constant time per operation.
+    """
+
+    def __init__(self, capacity: int, eviction: str) -> None:
+        if eviction not in EVICTIONS:
+            raise ValueError(
+                f"Unknown eviction {eviction!r}; expected one of {EVICTIONS}"
+            )
+        self.capacity = capacity
+        self.lfu = eviction == "lfu"
+        self.values: Dict[_Key, _Entry] = {}
+        self._recency: "OrderedDict[_Key, None]" = OrderedDict()
+        self._frequency: Dict[_Key, int] = {}
+        self._by_frequency: Dict[int, "OrderedDict[_Key, None]"] = defaultdict(
+            OrderedDict
+        )
+        self._min_frequency = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, key: _Key) -> Optional[_Entry]:
+        entry = self.values.get(key)
+        if entry is not None:
+            self._touch(key)
+        return entry
+
+    def put(self, key: _Key, entry: _Entry) -> Optional[_Key]:
+        """Stores `entry`, returning the key evicted to make room, if any."""
+        if key in self.values:
+            self.values[key] = entry
+            self._touch(key)
+            return None
+        evicted = None
+        if len(self.values) >= self.capacity:
+            evicted = self._victim()
+            self.remove(evicted)
+        self.values[key] = entry
+        if self.lfu:
+            self._frequency[key] = 1
+            self._by_frequency[1][key] = None
+            self._min_frequency = 1
+        else:
+            self._recency[key] = None
+        return evicted
+
+    def remove(self, key: _Key) -> None:
+        del self.values[key]
+        if self.lfu:
+            frequency = self._frequency.pop(key)
+            del self._by_frequency[frequency][key]
+            if not self._by_frequency[frequency]:
+                del self._by_frequency[frequency]
+        else:
+            del self._recency[key]
+
+    def _touch(self, key: _Key) -> None:
+        if not self.lfu:
+            self._recency.move_to_end(key)
+            return
+        frequency = self._frequency[key]
+        del self._by_frequency[frequency][key]
+        if not self._by_frequency[frequency]:
+            del self._by_frequency[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        self._frequency[key] = frequency + 1
+        self._by_frequency[frequency + 1][key] = None
+
+    def _victim(self) -> _Key:
+        if not self.lfu:
+            return next(iter(self._recency))
+        if self._min_frequency not in self._by_frequency:
+            self._min_frequency = min(self._by_frequency)
+        return next(iter(self._by_frequency[self._min_frequency]))
+
+
+class _NeighborIndex:
+    """A brute-force cosine index over the cached queries of one bucket.
+
+    Rows are kept in a preallocated matrix that doubles when full; removed
+    rows are zeroed and reused, so they never match.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.vectors = np.zeros((16, dim), dtype=np.float32)
+        self.keys: List[Optional[_Key]] = [None] * 16
+        self.slots: Dict[_Key, int] = {}
+        self._free = list(range(15, -1, -1))
+
+    def add(self, key: _Key, vector: np.ndarray[Any, Any]) -> None:
+        if not self._free:
+            size = len(self.vectors)
+            grown = np.zeros((2 * size, self.vectors.shape[1]), dtype=np.float32)
+            grown[:size] = self.vectors
+            self.vectors = grown
+            self.keys.extend([None] * size)
+            self._free = list(range(2 * size - 1, size - 1, -1))
+        slot = self._free.pop()
+        self.vectors[slot] = vector
+        self.keys[slot] = key
+        self.slots[key] = slot
+
+    def remove(self, key: _Key) -> None:
+        slot = self.slots.pop(key)
+        self.vectors[slot] = 0.0
+        self.keys[slot] = None
+        self._free.append(slot)
+
+    def nearest(self, vector: np.ndarray[Any, Any]) -> Tuple[Optional[_Key], float]:
+        """Returns the closest cached key and its cosine distance."""
+        if not self.slots:
+            return None, float("inf")
+        similarities = self.vectors @ vector
+        slot = int(np.argmax(similarities))
+        return self.keys[slot], 1.0 - float(similarities[slot])
+
+
+def _unit(vector: np.ndarray[Any, Any]) -> np.ndarray[Any, Any]:
+    norm = float(np.linalg.norm(vector))
+    unit: np.ndarray[Any, Any] = vector / norm if norm > 0 else vector
+    return unit
+
+
+class CachingAdapter(VectorDBWrapper):
+    """Answers repeated searches from an in-memory cache.
+
+    Each query vector of a search is looked up on its own; the misses are
+    sent to the wrapped adapter in one batch and their answers cached. Two
+    modes are supported:
+
+    - "exact": a hit needs the same collection, k, filter and query vector,
+      byte for byte. Keys hash the vector.
+    - "approximate": a hit needs the same collection, k and filter, and a
+      cached query within `threshold` cosine distance, found with a
+      brute-force index over the cached queries.
+
+    The cache holds at most `capacity` answers and evicts the least recently
+    ("lru") or least frequently ("lfu") used. Upserts, deletes and drops
+    clear the cached answers of their collection, unless `invalidate` is
+    off; hits on answers cached before the collection's latest write are
+    then counted as outdated.
+
+    Args:
+        db: The adapter to cache.
+        mode: "exact" or "approximate".
+        capacity: The most answers to keep.
+        eviction: "lru" or "lfu".
+        threshold: The largest cosine distance between queries that share an
+            answer in approximate mode.
+        invalidate: Clear a collection's answers when it is written to.
+    """
+
+    def __init__(
+        self,
+        db: VectorDB,
+        mode: str = "exact",
+        capacity: int = 10000,
+        eviction: str = "lru",
+        threshold: float = 0.05,
+        invalidate: bool = True,
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(
+                f"Unknown cache mode {mode!r}; expected one of {CACHE_MODES}"
+            )
+        super().__init__(db)
+        self.mode = mode
+        self.threshold = threshold
+        self.invalidate = invalidate
+        self._store = _EvictionStore(capacity, eviction)
+        self._indexes: Dict[_Bucket, _NeighborIndex] = {}
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def hits(self) -> int:
+        """The number of query vectors answered from the cache so far."""
+        return self._hits
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache's counters and latencies.
+
+        Returns:
+            "lookups", "hits", "misses" and "hit_rate" count query vectors;
+            "outdated_hits" counts hits on answers older than their
+            collection's latest write; "evictions", "invalidations" (answers
+            dropped by writes) and "entries" describe the store.
+            "hit_latency_s" and "miss_latency_s" summarize searches answered
+            entirely from the cache and searches that reached the backend.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "lookups": lookups,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "outdated_hits": self._outdated_hits,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "entries": len(self._store),
+                "hit_latency_s": self._hit_latency.summary(),
+                "miss_latency_s": self._miss_latency.summary(),
+            }
+
+    def reset_stats(self) -> None:
+        """Zeroes the counters, keeping the cached answers."""
+        with self._lock:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._hits = self._misses = self._outdated_hits = 0
+        self._evictions = self._invalidations = 0
+        self._hit_latency = LatencyHistogram()
+        self._miss_latency = LatencyHistogram()
+
+    def clear(self) -> None:
+        """Drops every cached answer."""
+        with self._lock:
+            for key in list(self._store.values):
+                self._forget(key)
+
+    def drop_collection(self, name: str) -> None:
+        self.db.drop_collection(name)
+        self._written(name)
+
+    def upsert(
+        self,
+        name: str,
+        ids: List[str],
+        vectors: np.ndarray[Any, Any],
+        meta: List[Dict[str, Any]],
+        wait: bool = True,
+    ) -> None:
+        self.db.upsert(name, ids, vectors, meta, wait=wait)
+        self._written(name)
+
+    def delete(self, name: str, ids: List[str]) -> None:
+        self.db.delete(name, ids)
+        self._written(name)
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        start = time.perf_counter_ns()
+        queries = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+        bucket = (name, k, json.dumps(filter, sort_keys=True) if filter else "")
+        with self._lock:
+            entries = [self._lookup(bucket, query) for query in queries]
+            version = self._versions[name]
+        misses = [i for i, entry in enumerate(entries) if entry is None]
+        if misses:
+            fetched = self.db.search(name, queries[misses], k, filter)
+            with self._lock:
+                # An answer fetched across a write may already be stale.
+                keep = not self.invalidate or version == self._versions[name]
+                for row, i in enumerate(misses):
+                    entries[i] = (fetched, row, version)
+                    if keep:
+                        self._insert(bucket, queries[i], (fetched, row, version))
+        result = self._assemble(cast(List[_Entry], entries), k)
+
+        elapsed_ns = time.perf_counter_ns() - start
+        with self._lock:
+            self._hits += len(entries) - len(misses)
+            self._misses += len(misses)
+            latency = self._miss_latency if misses else self._hit_latency
+            latency.record_ns(elapsed_ns)
+        return result
+
+    def _lookup(self, bucket: _Bucket, query: np.ndarray[Any, Any]) -> Optional[_Entry]:
+        key: Optional[_Key]
+        if self.mode == "exact":
+            key = (bucket, hashlib.blake2b(query.tobytes(), digest_size=16).digest())
+        else:
+            index = self._indexes.get(bucket)
+            if index is None:
+                return None
+            key, distance = index.nearest(_unit(query))
+            if key is None or distance > self.threshold:
+                return None
+        entry = self._store.get(key)
+        if entry is not None and entry[2] < self._versions[bucket[0]]:
+            self._outdated_hits += 1
+        return entry
+
+    def _insert(
+        self, bucket: _Bucket, query: np.ndarray[Any, Any], entry: _Entry
+    ) -> None:
+        key: _Key
+        if self.mode == "exact":
+            key = (bucket, hashlib.blake2b(query.tobytes(), digest_size=16).digest())
+        else:
+            key = (bucket, self._next_key)
+            self._next_key += 1
+            index = self._indexes.get(bucket)
+            if index is None:
+                index = self._indexes[bucket] = _NeighborIndex(len(query))
+            index.add(key, _unit(query))
+        evicted = self._store.put(key, entry)
+        if evicted is not None:
+            self._evictions += 1
+            self._unindex(evicted)
+
+    def _written(self, name: str) -> None:
+        """Records a write to `name` and drops its answers if invalidating."""
+        with self._lock:
+            self._versions[name] += 1
+            if not self.invalidate:
+                return
+            stale = [key for key in self._store.values if key[0][0] == name]
+            for key in stale:
+                self._forget(key)
+            self._invalidations += len(stale)
+
+    def _forget(self, key: _Key) -> None:
+        self._store.remove(key)
+        self._unindex(key)
+
+    def _unindex(self, key: _Key) -> None:
+        if self.mode == "approximate":
+            bucket = key[0]
+            self._indexes[bucket].remove(key)
+            if not self._indexes[bucket].slots:
+                del self._indexes[bucket]
+
+    @staticmethod
+    def _assemble(entries: List[_Entry], k: int) -> QueryResult:
+        """Stacks per-query answers into one result."""
+        ids = np.full((len(entries), k), None, dtype=object)
+        distances = np.full((len(entries), k), np.nan, dtype=np.float32)
+        for i, (result, row, _) in enumerate(entries):
+            ids[i] = result.ids[row]
+            distances[i] = result.distances[row]
+
+        def payload(i: int, j: int) -> Dict[str, Any]:
+            result, row, _ = entries[i]
+            return result.metadata(row, j)
+
+        return QueryResult(ids, distances, payload)
@@ -1,10 +1,83 @@
 """FAISS adapter."""
 
-from typing import Any, Dict, List, Optional
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import faiss
 import numpy as np
 
+from vdbt.adapters.base import (
+    METRICS,
+    VECTOR_DTYPES,
+    QueryResult,
+    vector_dtype,
+    vector_metric,
+)
+from vdbt.filters import filter_mask, filter_predicate
+from vdbt.utils.columnar import ColumnTable
+from vdbt.utils.timing import Span
+
+# Vectors a scalar quantizer is trained on by default.
+DEFAULT_TRAIN_SIZE = 1000
+
+_SQ_TYPES = {
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+# Cosine similarity is the inner product of normalized vectors.
+_FAISS_METRICS = {
+    "l2": faiss.METRIC_L2,
+    "ip": faiss.METRIC_INNER_PRODUCT,
+    "cosine": faiss.METRIC_INNER_PRODUCT,
+}
+
+# Sign bits compared by Hamming distance approximate angular distance, which
+# ranks like L2 and cosine on normalized vectors, but not inner product.
+_BINARY_METRICS = ("l2", "cosine")
+
+
+def _encode(
+    index: Any, vectors: np.ndarray[Any, Any], normalize: bool = False
+) -> np.ndarray[Any, Any]:
+    """Converts vectors to the input type of `index`.
+
+    Binary indexes take one sign bit per dimension, packed into bytes. With
+    `normalize`, float vectors are scaled to unit length.
+    """
+    if isinstance(index, faiss.IndexBinary):
+        packed: np.ndarray[Any, Any] = np.packbits(np.atleast_2d(vectors) > 0, axis=1)
+        return packed
+    data = np.array(np.atleast_2d(vectors), dtype=np.float32)
+    if normalize:
+        faiss.normalize_L2(data)
+    return data
+
+
+def _selector(
+    metadata: Union[List[Dict[str, Any]], ColumnTable],
+    filter: Dict[str, Any],
+    size: int,
+) -> Any:
+    """Builds an ID selector for the rows whose metadata matches `filter`.
+
+    Loaded collections evaluate the filter over their metadata columns;
+    others test each row's metadata dictionary.
+    """
+    if isinstance(metadata, ColumnTable):
+        table = metadata
+
+        def column(key: str) -> Optional[np.ndarray[Any, Any]]:
+            return table.objects(key)[:size] if key in table.columns else None
+
+        mask = filter_mask(filter, column, size)
+    else:
+        matches = filter_predicate(filter) or (lambda meta: True)
+        mask = np.fromiter((matches(meta) for meta in metadata[:size]), bool, size)
+    return faiss.IDSelectorBatch(np.flatnonzero(mask).astype(np.int64))
+
 
 class FaissAdapter:
     """A FAISS adapter for the VectorDB protocol."""
@@ -13,7 +86,17 @@ class FaissAdapter:
 
     def __init__(self) -> None:
         self._indices: Dict[str, Any] = {}
-        self._metadata: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # Row-aligned document ids (a growable object array, or a memory-mapped
+        # string array after `load`) and metadata.
+        self._ids: Dict[str, np.ndarray[Any, Any]] = {}
+        self._metadata: Dict[str, Union[List[Dict[str, Any]], ColumnTable]] = {}
+        # Upserts held back until an untrained index has enough vectors to
+        # train on, and how many that is.
+        self._pending: Dict[str, List[Tuple[Any, List[str], List[Dict[str, Any]]]]] = {}
+        self._train_size: Dict[str, int] = {}
+        self._metrics: Dict[str, str] = {}
+        # FAISS indexes are not safe for concurrent writes and searches.
+        self._lock = threading.Lock()
 
     def connect(self) -> None:
         """FAISS is an in-memory index, so no connection is needed."""
@@ -23,15 +106,52 @@ class FaissAdapter:
         """Delete a FAISS index."""
         if name in self._indices:
             del self._indices[name]
+            del self._ids[name]
             del self._metadata[name]
+            self._pending.pop(name, None)
+            self._train_size.pop(name, None)
+            self._metrics.pop(name, None)
 
     def create_collection(self, name: str, dim: int, **kwargs: Any) -> None:
-        """Create a FAISS index."""
-        # For FAISS, we can use IndexFlatL2 for simplicity.
-        # Other index types can be supported as well.
-        index = faiss.IndexFlatL2(dim)
+        """Create a FAISS index.
+
+        Args:
+            name: The collection name.
+            dim: The vector dimension.
+            **kwargs: `metric` selects "l2" (default), "ip" or "cosine";
+                cosine collections normalize vectors and rank by inner
+                product, so hits are scored by similarity. `dtype` selects
+                the stored type. "float32" (default) is an exact flat index;
+                "float16" and "int8" use a scalar quantizer; "binary" keeps
+                the sign of each dimension and ranks by Hamming distance,
+                needs a dimension divisible by 8 and does not support "ip".
+                `train_size` (default `DEFAULT_TRAIN_SIZE`) is how many
+                vectors the scalar quantizer is trained on: upserts are held
+                back until that many have arrived, or until the collection is
+                first read, so a small first batch does not fix the
+                quantization ranges for every later one.
+        """
+        dtype = vector_dtype(kwargs, VECTOR_DTYPES)
+        metric = vector_metric(
+            kwargs, _BINARY_METRICS if dtype == "binary" else METRICS
+        )
+        index: Any
+        if dtype == "float32":
+            index = faiss.IndexFlat(dim, _FAISS_METRICS[metric])
+        elif dtype == "binary":
+            if dim % 8:
+                raise ValueError(f"Binary vectors need a multiple of 8 dims, not {dim}")
+            index = faiss.IndexBinaryFlat(dim)
+        else:
+            index = faiss.IndexScalarQuantizer(
+                dim, _SQ_TYPES[dtype], _FAISS_METRICS[metric]
+            )
         self._indices[name] = index
-        self._metadata[name] = {}
+        self._ids[name] = np.empty(0, dtype=object)
+        self._metadata[name] = []
+        self._pending[name] = []
+        self._train_size[name] = kwargs.get("train_size", DEFAULT_TRAIN_SIZE)
+        self._metrics[name] = metric
 
     def upsert(
         self,
@@ -39,13 +159,69 @@ class FaissAdapter:
         ids: List[str],
         vectors: np.ndarray[Any, Any],
         meta: List[Dict[str, Any]],
+        wait: bool = True,
+    ) -> None:
+        """Add vectors to a FAISS index.
+
+        Writes are applied synchronously, so `wait` has no effect.
+        """
+        with Span("upsert"):
+            index = self._indices[name]
+            with Span("prepare"):
+                data = _encode(index, vectors, self._metrics[name] == "cosine")
+            with self._lock:
+                if index.is_trained:
+                    self._add(name, data, ids, meta)
+                    return
+                pending = self._pending[name]
+                pending.append((data, ids, meta))
+                if sum(len(batch) for batch, _, _ in pending) >= self._train_size[name]:
+                    self._train(name)
+
+    def _train(self, name: str) -> None:
+        """Trains an index on its held-back upserts, then adds them.
+
+        Must be called with `self._lock` held.
+        """
+        pending = self._pending.get(name)
+        if not pending:
+            return
+        data = np.concatenate([batch for batch, _, _ in pending])
+        with Span("engine"):
+            self._indices[name].train(data)
+        self._pending[name] = []
+        self._add(
+            name,
+            data,
+            [doc_id for _, ids, _ in pending for doc_id in ids],
+            [row for _, _, meta in pending for row in meta],
+        )
+
+    def _add(
+        self,
+        name: str,
+        data: np.ndarray[Any, Any],
+        ids: List[str],
+        meta: List[Dict[str, Any]],
     ) -> None:
-        """Add vectors to a FAISS index."""
+        """Adds encoded vectors to a trained index. Needs `self._lock` held."""
         index = self._indices[name]
         start_index = index.ntotal
-        index.add(vectors.astype(np.float32))
-        for i, doc_id in enumerate(ids):
-            self._metadata[name][start_index + i] = {"id": doc_id, **meta[i]}
+        with Span("engine"):
+            index.add(data)
+        with Span("decode"):
+            table = self._ids[name]
+            end_index = start_index + len(ids)
+            if end_index > len(table):
+                grown = np.empty(max(end_index, 2 * len(table)), dtype=object)
+                grown[:start_index] = table[:start_index]
+                self._ids[name] = table = grown
+            table[start_index:end_index] = ids
+            metadata = self._metadata[name]
+            if isinstance(metadata, ColumnTable):
+                # Appending to a loaded collection materializes it.
+                metadata = self._metadata[name] = metadata.rows()
+            metadata.extend(meta)
 
     def query(
         self,
@@ -54,31 +230,109 @@ class FaissAdapter:
         k: int,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        """Query a FAISS index."""
+        """Query a FAISS index.
+
+        The metadata of each hit includes its "id".
+        """
+        with Span("query"):
+            result = self.search(name, vector, k, filter)
+            with Span("materialize"):
+                return result.to_dicts()
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        """Query a FAISS index with one or more vectors.
+
+        A filter is applied during the search, as an ID selector over the
+        rows whose metadata matches it.
+        """
         index = self._indices[name]
-        # FAISS does not support filtering directly. This is a limitation.
-        if filter:
-            # This is a placeholder for a more complex filtering implementation
-            # which would require iterating and checking metadata.
-            pass
-
-        distances, indices = index.search(vector.astype(np.float32), k)
-        results = []
-        for i in range(indices.shape[0]):
-            query_results = []
-            for j in range(indices.shape[1]):
-                idx = indices[i][j]
-                if idx != -1:
-                    metadata = self._metadata[name].get(idx, {})
-                    query_results.append(
-                        {
-                            "id": metadata.get("id"),
-                            "distance": distances[i][j],
-                            "metadata": metadata,
-                        }
-                    )
-            results.extend(query_results)
-        return results
+
+        with Span("search"):
+            with Span("prepare"):
+                data = _encode(index, vectors, self._metrics[name] == "cosine")
+            with Span("engine"), self._lock:
+                self._train(name)
+                if index.ntotal == 0:
+                    # Quantized indexes cannot search before they are trained.
+                    rows = np.full((len(data), k), -1, dtype=np.int64)
+                    distances = np.full((len(data), k), np.nan, dtype=np.float32)
+                else:
+                    params = None
+                    if filter:
+                        selector = _selector(self._metadata[name], filter, index.ntotal)
+                        params = faiss.SearchParameters()
+                        params.sel = selector
+                    distances, rows = index.search(data, k, params=params)
+            with Span("decode"):
+                missing = rows < 0
+                hit_ids = np.full(rows.shape, None, dtype=object)
+                hit_ids[~missing] = self._ids[name][rows[~missing]]
+                distances = distances.astype(np.float32)
+                distances[missing] = np.nan
+
+        id_table = self._ids[name]
+        metadata = self._metadata[name]
+
+        def payload(i: int, j: int) -> Dict[str, Any]:
+            row = int(rows[i, j])
+            return {"id": str(id_table[row]), **metadata[row]}
+
+        return QueryResult(hit_ids, distances, payload)
+
+    def save(self, name: str, path: Union[str, Path]) -> None:
+        """Write a FAISS index, its ids and its metadata to a directory.
+
+        The index is written with `faiss.write_index` (or
+        `write_index_binary` for binary vectors), the ids as a string `.npy`
+        array, the metadata as a columnar table and the metric as JSON.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._train(name)
+            index = self._indices[name]
+            if isinstance(index, faiss.IndexBinary):
+                faiss.write_index_binary(index, str(directory / "index.bfaiss"))
+            else:
+                faiss.write_index(index, str(directory / "index.faiss"))
+            ids = self._ids[name][: index.ntotal]
+            np.save(directory / "ids.npy", ids.astype(str), allow_pickle=False)
+            metadata = self._metadata[name]
+            settings = {"metric": self._metrics[name]}
+        if isinstance(metadata, ColumnTable):
+            metadata = metadata.rows()
+        ColumnTable.from_rows(metadata).save(directory / "metadata")
+        (directory / "collection.json").write_text(json.dumps(settings))
+
+    def load(self, name: str, path: Union[str, Path], mmap: bool = True) -> None:
+        """Open a FAISS index saved by `save`.
+
+        With `mmap`, the index is opened with `IO_FLAG_MMAP` and the ids and
+        metadata columns are memory-mapped, so loading does not read the
+        vectors; they are paged in by the first queries.
+        """
+        directory = Path(path)
+        flags = faiss.IO_FLAG_MMAP if mmap else 0
+        index: Any
+        if (directory / "index.bfaiss").exists():
+            index = faiss.read_index_binary(str(directory / "index.bfaiss"), flags)
+        else:
+            index = faiss.read_index(str(directory / "index.faiss"), flags)
+        ids = np.load(directory / "ids.npy", mmap_mode="r" if mmap else None)
+        metadata = ColumnTable.load(directory / "metadata", mmap=mmap)
+        settings = json.loads((directory / "collection.json").read_text())
+        with self._lock:
+            self._indices[name] = index
+            self._ids[name] = ids
+            self._metadata[name] = metadata
+            self._pending[name] = []
+            self._metrics[name] = settings["metric"]
 
     def delete(self, name: str, ids: List[str]) -> None:
         """Delete vectors from a FAISS index.
@@ -93,15 +347,21 @@ class FaissAdapter:
     def memory_bytes(self, name: str) -> Optional[int]:
         """Estimate the memory usage of a FAISS index.
 
-        This is a rough estimation.
+        This is a rough estimation: the encoded vectors only, e.g. d * n * 4
+        bytes for float32 and d * n / 8 bytes for binary vectors.
         """
         index = self._indices.get(name)
         if not index:
             return 0
-        # d * n * 4 bytes for the vectors (float32)
-        return int(index.ntotal * index.d * 4)
+        with self._lock:
+            self._train(name)
+        return int(index.ntotal * index.code_size)
 
     def count(self, name: str) -> int:
         """Get the number of vectors in a FAISS index."""
         index = self._indices.get(name)
-        return index.ntotal if index else 0
+        if not index:
+            return 0
+        with self._lock:
+            self._train(name)
+        return int(index.ntotal)
@@ -0,0 +1,318 @@
+"""hnswlib adapter."""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import hnswlib
+import numpy as np
+
+from vdbt.adapters.base import METRICS, QueryResult, vector_dtype, vector_metric
+from vdbt.filters import filter_predicate
+from vdbt.utils.columnar import ColumnTable
+from vdbt.utils.locks import ReadWriteLock
+from vdbt.utils.timing import Span
+
+
+class _Collection:
+    """An hnswlib index plus the mapping between string ids and int labels."""
+
+    def __init__(self, index: Any, ef: int) -> None:
+        self.index = index
+        # The search breadth queries without an `ef` override run with.
+        self.ef = ef
+        index.set_ef(ef)
+        # Queries share the lock. Writes, resizes and `ef` overrides, which
+        # change the index for every query, hold it alone.
+        self.lock = ReadWriteLock()
+        self.labels: Dict[str, int] = {}
+        # Document id per label, as an object array so hits resolve in bulk.
+        self.ids = np.empty(index.get_max_elements(), dtype=object)
+        self.metadata: Dict[int, Dict[str, Any]] = {}
+        self.next_label = 0
+
+
+def _label_filter(
+    collection: _Collection, filter: Optional[Dict[str, Any]]
+) -> Optional[Callable[[int], bool]]:
+    """Builds an hnswlib label predicate from a `vdbt.filters` filter."""
+    matches = filter_predicate(filter)
+    if matches is None:
+        return None
+    metadata = collection.metadata
+    return lambda label: matches(metadata[label])
+
+
+def _knn_query(
+    collection: _Collection,
+    vector: np.ndarray[Any, Any],
+    k: int,
+    num_threads: int,
+    label_filter: Optional[Callable[[int], bool]],
+) -> Any:
+    """Runs `knn_query`, retrying with fewer neighbours if the filter is tight.
+
+    hnswlib raises instead of returning a short result when it finds fewer
+    than k points that pass the filter. The retry asks for at most the number
+    of matching points, halving that while the graph cannot reach them all,
+    so a tight filter returns fewer hits rather than an error.
+    """
+    data = np.asarray(vector, dtype=np.float32)
+    try:
+        return collection.index.knn_query(
+            data, k=k, num_threads=num_threads, filter=label_filter
+        )
+    except RuntimeError:
+        if label_filter is None:
+            raise
+    k = min(k, sum(1 for label in collection.metadata if label_filter(label)))
+    while k > 0:
+        try:
+            return collection.index.knn_query(
+                data, k=k, num_threads=num_threads, filter=label_filter
+            )
+        except RuntimeError:
+            k //= 2
+    return np.empty((len(data), 0)), np.empty((len(data), 0))
+
+
+class HnswlibAdapter:
+    """An hnswlib adapter for the VectorDB protocol.
+
+    Graph parameters `M` and `ef_construction` are fixed when a collection is
+    created, while `ef` can be changed per query. Deleted ids are only marked in
+    the graph, so their slots count towards the index capacity until the
+    collection is rebuilt. Queries on a collection run concurrently; writes
+    and queries with an `ef` override wait for them.
+    """
+
+    name = "hnswlib"
+
+    def __init__(
+        self,
+        M: int = 16,
+        ef_construction: int = 200,
+        ef: int = 50,
+        num_threads: int = -1,
+        initial_capacity: int = 1024,
+    ) -> None:
+        self._collections: Dict[str, _Collection] = {}
+        self._M = M
+        self._ef_construction = ef_construction
+        self._ef = ef
+        self._num_threads = num_threads
+        self._initial_capacity = initial_capacity
+
+    def connect(self) -> bool:
+        """hnswlib is an in-process index, so no connection is needed."""
+        return True
+
+    def drop_collection(self, name: str) -> None:
+        """Drop an hnswlib index."""
+        self._collections.pop(name, None)
+
+    def create_collection(self, name: str, dim: int, **kwargs: Any) -> None:
+        """Create an hnswlib index.
+
+        Args:
+            name: The collection name.
+            dim: The vector dimension.
+            **kwargs: Optional `metric` ("l2", "ip" or "cosine"), `M`,
+                `ef_construction`, `ef` and `max_elements` overrides.
+                Vectors are always stored as float32.
+        """
+        vector_dtype(kwargs, ("float32",))
+        index = hnswlib.Index(space=vector_metric(kwargs, METRICS), dim=dim)
+        index.init_index(
+            max_elements=kwargs.get("max_elements", self._initial_capacity),
+            M=kwargs.get("M", self._M),
+            ef_construction=kwargs.get("ef_construction", self._ef_construction),
+        )
+        self._collections[name] = _Collection(index, kwargs.get("ef", self._ef))
+
+    def upsert(
+        self,
+        name: str,
+        ids: List[str],
+        vectors: np.ndarray[Any, Any],
+        meta: List[Dict[str, Any]],
+        wait: bool = True,
+    ) -> None:
+        """Add vectors to an hnswlib index, updating existing ids in place.
+
+        Writes are applied synchronously, so `wait` has no effect.
+        """
+        collection = self._collections[name]
+        with Span("upsert"), collection.lock.write():
+            with Span("prepare"):
+                labels = np.empty(len(ids), dtype=np.int64)
+                for i, doc_id in enumerate(ids):
+                    label = collection.labels.get(doc_id)
+                    if label is None:
+                        label = collection.next_label
+                        collection.next_label += 1
+                        collection.labels[doc_id] = label
+                    labels[i] = label
+                    collection.metadata[label] = meta[i]
+                data = np.asarray(vectors, dtype=np.float32)
+
+            with Span("engine"):
+                index = collection.index
+                if collection.next_label > index.get_max_elements():
+                    capacity = max(collection.next_label, 2 * index.get_max_elements())
+                    index.resize_index(capacity)
+                    grown = np.empty(capacity, dtype=object)
+                    grown[: len(collection.ids)] = collection.ids
+                    collection.ids = grown
+                index.add_items(data, labels, num_threads=self._num_threads)
+            collection.ids[labels] = ids
+
+    def query(
+        self,
+        name: str,
+        vector: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+        ef: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query an hnswlib index, returning one dictionary per hit.
+
+        The metadata of each hit includes its "id".
+        """
+        with Span("query"):
+            result = self.search(name, vector, k, filter, ef=ef)
+            with Span("materialize"):
+                return result.to_dicts()
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+        ef: Optional[int] = None,
+    ) -> QueryResult:
+        """Query an hnswlib index with one or more vectors.
+
+        Args:
+            name: The collection name.
+            vectors: One or more query vectors.
+            k: The number of neighbours per query.
+            filter: A `vdbt.filters` filter, evaluated per candidate.
+            ef: Overrides the search breadth for this query only.
+        """
+        collection = self._collections[name]
+        index = collection.index
+        num_queries = len(np.atleast_2d(vectors))
+        hit_ids = np.full((num_queries, k), None, dtype=object)
+        hit_distances = np.full((num_queries, k), np.nan, dtype=np.float32)
+        found = min(k, len(collection.labels))
+
+        with Span("search"):
+            with Span("prepare"):
+                label_filter = _label_filter(collection, filter)
+            # A filter is a Python callback, so extra threads only contend for
+            # the GIL.
+            num_threads = 1 if label_filter else self._num_threads
+
+            if found > 0:
+                # An `ef` override holds the lock alone, so it never applies
+                # to another thread's query.
+                lock = collection.lock.read() if ef is None else collection.lock.write()
+                with Span("engine"), lock:
+                    if ef is not None:
+                        index.set_ef(ef)
+                    try:
+                        labels, distances = _knn_query(
+                            collection, vectors, found, num_threads, label_filter
+                        )
+                    finally:
+                        if ef is not None:
+                            index.set_ef(collection.ef)
+                    ids = collection.ids
+
+                with Span("decode"):
+                    found = labels.shape[1]
+                    hit_ids[:, :found] = ids[labels.astype(np.int64)]
+                    hit_distances[:, :found] = distances
+
+        metadata = collection.metadata
+
+        def payload(i: int, j: int) -> Dict[str, Any]:
+            label = collection.labels.get(hit_ids[i, j])
+            meta = metadata.get(label, {}) if label is not None else {}
+            return {"id": hit_ids[i, j], **meta}
+
+        return QueryResult(hit_ids, hit_distances, payload)
+
+    def delete(self, name: str, ids: List[str]) -> None:
+        """Mark vectors as deleted in an hnswlib index."""
+        collection = self._collections[name]
+        with Span("delete"), Span("engine"), collection.lock.write():
+            for doc_id in ids:
+                label = collection.labels.pop(doc_id, None)
+                if label is None:
+                    continue
+                collection.index.mark_deleted(label)
+                del collection.metadata[label]
+
+    def save(self, name: str, path: Union[str, Path]) -> None:
+        """Write an hnswlib index, its id mapping and its metadata to a directory."""
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        collection = self._collections[name]
+        with collection.lock.read():
+            index = collection.index
+            index.save_index(str(directory / "index.bin"))
+            labels = np.fromiter(collection.labels.values(), dtype=np.int64)
+            np.save(directory / "labels.npy", labels)
+            ids = np.asarray(list(collection.labels), dtype=str)
+            np.save(directory / "ids.npy", ids, allow_pickle=False)
+            rows = [collection.metadata[label] for label in labels.tolist()]
+            settings = {
+                "space": index.space,
+                "dim": index.dim,
+                "ef": collection.ef,
+                "next_label": collection.next_label,
+            }
+        ColumnTable.from_rows(rows).save(directory / "metadata")
+        (directory / "collection.json").write_text(json.dumps(settings))
+
+    def load(self, name: str, path: Union[str, Path], mmap: bool = True) -> None:
+        """Open an hnswlib index saved by `save`.
+
+        hnswlib always reads the whole index into memory, so `mmap` only
+        applies to the metadata columns.
+        """
+        directory = Path(path)
+        settings = json.loads((directory / "collection.json").read_text())
+        index = hnswlib.Index(space=settings["space"], dim=settings["dim"])
+        index.load_index(str(directory / "index.bin"))
+
+        collection = _Collection(index, settings["ef"])
+        labels = np.load(directory / "labels.npy").tolist()
+        ids = np.load(directory / "ids.npy").tolist()
+        rows = ColumnTable.load(directory / "metadata", mmap=mmap).rows()
+        collection.labels = dict(zip(ids, labels, strict=True))
+        collection.ids[labels] = ids
+        collection.metadata = dict(zip(labels, rows, strict=True))
+        collection.next_label = settings["next_label"]
+        self._collections[name] = collection
+
+    def memory_bytes(self, name: str) -> Optional[int]:
+        """Estimate the memory usage of an hnswlib index.
+
+        This counts the float32 vectors plus the level-0 graph links for every
+        allocated slot, which dominate the index size.
+        """
+        collection = self._collections.get(name)
+        if not collection:
+            return 0
+        index = collection.index
+        links_bytes = (2 * index.M + 1) * 4 + 8
+        return int(index.get_max_elements() * (index.dim * 4 + links_bytes))
+
+    def count(self, name: str) -> int:
+        """Get the number of live vectors in an hnswlib index."""
+        collection = self._collections.get(name)
+        return len(collection.labels) if collection else 0
@@ -0,0 +1,390 @@
+"""NumPy brute-force adapter.
+
+An exact, dependency-free reference implementation of the VectorDB protocol.
+It is used as the correctness oracle for other adapters and as the latency
+floor on every chart.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Union
+
+import numpy as np
+
+from vdbt.adapters.base import METRICS, QueryResult, vector_dtype, vector_metric
+from vdbt.filters import filter_mask
+from vdbt.utils.columnar import ColumnTable
+from vdbt.utils.timing import Span
+
+
+def _grow(array: np.ndarray[Any, Any], capacity: int) -> np.ndarray[Any, Any]:
+    """Returns a copy of `array` with its first axis grown to `capacity`."""
+    grown = np.empty((capacity, *array.shape[1:]), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class _Collection:
+    """Storage for a single collection.
+
+    Vectors live in a preallocated float32 matrix that doubles in size when
+    full. Metadata is stored column-wise so that filters become vectorized
+    masks. Deleted rows are marked in a tombstone bitmap and physically removed
+    once they make up more than `compact_ratio` of the stored rows.
+    """
+
+    def __init__(
+        self, dim: int, metric: str, capacity: int, compact_ratio: float
+    ) -> None:
+        self.dim = dim
+        self.metric = metric
+        self.compact_ratio = compact_ratio
+        self.size = 0
+        self.num_deleted = 0
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.sq_norms = np.empty(capacity, dtype=np.float32)
+        self.deleted = np.zeros(capacity, dtype=bool)
+        self.ids = np.empty(capacity, dtype=object)
+        self.columns: Dict[str, np.ndarray[Any, Any]] = {}
+        self.rows: Dict[str, int] = {}
+
+    @property
+    def capacity(self) -> int:
+        return len(self.vectors)
+
+    def reserve(self, extra: int) -> None:
+        """Ensures there is room for `extra` more rows."""
+        needed = self.size + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, 2 * self.capacity, 1)
+        self.vectors = _grow(self.vectors, capacity)
+        self.sq_norms = _grow(self.sq_norms, capacity)
+        self.deleted = _grow(self.deleted, capacity)
+        self.ids = _grow(self.ids, capacity)
+        for key, column in self.columns.items():
+            self.columns[key] = _grow(column, capacity)
+
+    def column(self, key: str) -> np.ndarray[Any, Any]:
+        """Returns the metadata column for `key`, creating it if needed."""
+        column = self.columns.get(key)
+        if column is None:
+            column = np.full(self.capacity, None, dtype=object)
+            self.columns[key] = column
+        return column
+
+    def put(
+        self, ids: List[str], vectors: np.ndarray[Any, Any], meta: List[Dict[str, Any]]
+    ) -> None:
+        """Inserts new rows or overwrites existing rows in place."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+        new_ids = [doc_id for doc_id in ids if doc_id not in self.rows]
+        self.reserve(len(new_ids))
+        positions = np.empty(len(ids), dtype=np.int64)
+        for i, doc_id in enumerate(ids):
+            row = self.rows.get(doc_id)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.rows[doc_id] = row
+                self.ids[row] = doc_id
+            positions[i] = row
+
+        self.vectors[positions] = vectors
+        self.deleted[positions] = False
+        self.sq_norms[positions] = np.einsum("ij,ij->i", vectors, vectors)
+        for column in self.columns.values():
+            column[positions] = None
+        for i, position in enumerate(positions.tolist()):
+            for key, value in meta[i].items():
+                self.column(key)[position] = value
+
+    def remove(self, ids: List[str]) -> None:
+        """Tombstones the rows for `ids` and compacts if enough are dead."""
+        rows = [self.rows.pop(doc_id) for doc_id in ids if doc_id in self.rows]
+        if not rows:
+            return
+        self.deleted[rows] = True
+        self.num_deleted += len(rows)
+        if self.num_deleted > self.compact_ratio * self.size:
+            self.compact()
+
+    def compact(self) -> None:
+        """Physically drops tombstoned rows, keeping the live rows in order."""
+        live = np.flatnonzero(~self.deleted[: self.size])
+        count = len(live)
+        self.vectors[:count] = self.vectors[live]
+        self.sq_norms[:count] = self.sq_norms[live]
+        self.ids[:count] = self.ids[live]
+        self.ids[count:] = None
+        for column in self.columns.values():
+            column[:count] = column[live]
+            column[count:] = None
+        self.deleted[:] = False
+        self.size = count
+        self.num_deleted = 0
+        self.rows = {doc_id: row for row, doc_id in enumerate(self.ids[:count])}
+
+    def mask(self, filter: Optional[Dict[str, Any]]) -> np.ndarray[Any, Any]:
+        """Returns a boolean mask of the live rows that match `filter`.
+
+        See `vdbt.filters` for the filter language; every condition is a
+        vectorized comparison over a metadata column.
+        """
+
+        def column(key: str) -> Optional[np.ndarray[Any, Any]]:
+            values = self.columns.get(key)
+            return None if values is None else values[: self.size]
+
+        mask: np.ndarray[Any, Any] = ~self.deleted[: self.size] & filter_mask(
+            filter, column, self.size
+        )
+        return mask
+
+    def search(
+        self,
+        queries: np.ndarray[Any, Any],
+        k: int,
+        mask: np.ndarray[Any, Any],
+        block_size: int,
+    ) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]:
+        """Exact blocked top-k search.
+
+        Scores are computed block by block with a matrix multiply so the
+        temporary score matrix stays bounded, and each block contributes its
+        own `argpartition` top-k candidates to a running merge.
+
+        Returns:
+            A tuple of (rows, scores), both of shape (num_queries, k). Higher
+            scores are better; missing hits have row -1 and score -inf.
+        """
+        queries = np.ascontiguousarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if self.metric == "cosine":
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.maximum(norms, np.finfo(np.float32).tiny)
+
+        nq = len(queries)
+        best_rows = np.full((nq, k), -1, dtype=np.int64)
+        best_scores = np.full((nq, k), -np.inf, dtype=np.float32)
+        for start in range(0, self.size, block_size):
+            stop = min(start + block_size, self.size)
+            block_mask = mask[start:stop]
+            if not block_mask.any():
+                continue
+            scores = queries @ self.vectors[start:stop].T
+            if self.metric == "l2":
+                # -||q - x||^2 up to the per-query constant ||q||^2.
+                scores *= 2.0
+                scores -= self.sq_norms[start:stop]
+            scores[:, ~block_mask] = -np.inf
+
+            kk = min(k, stop - start)
+            if kk < stop - start:
+                part = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+            else:
+                part = np.broadcast_to(np.arange(kk), (nq, kk))
+            cand_scores = np.take_along_axis(scores, part, axis=1)
+
+            merged_scores = np.concatenate([best_scores, cand_scores], axis=1)
+            merged_rows = np.concatenate([best_rows, part + start], axis=1)
+            top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(merged_scores, top, axis=1)
+            best_rows = np.take_along_axis(merged_rows, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_rows[np.isneginf(best_scores)] = -1
+        if self.metric == "l2":
+            q_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+            best_scores = best_scores - q_norms
+        return best_rows, best_scores
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        """Returns the metadata dict for a stored row."""
+        return {
+            key: column[row]
+            for key, column in self.columns.items()
+            if column[row] is not None
+        }
+
+    def nbytes(self) -> int:
+        arrays = [self.vectors, self.sq_norms, self.deleted, self.ids]
+        arrays.extend(self.columns.values())
+        return int(sum(array.nbytes for array in arrays))
+
+
+class NumpyAdapter:
+    """A brute-force NumPy adapter for the VectorDB protocol."""
+
+    name = "numpy"
+
+    def __init__(
+        self,
+        initial_capacity: int = 1024,
+        block_size: int = 65536,
+        compact_ratio: float = 0.25,
+    ) -> None:
+        self._collections: Dict[str, _Collection] = {}
+        self._initial_capacity = initial_capacity
+        self._block_size = block_size
+        self._compact_ratio = compact_ratio
+        # Serializes writes against searches, for concurrent load generators.
+        self._lock = threading.Lock()
+
+    def connect(self) -> bool:
+        """The NumPy adapter is in-process, so no connection is needed."""
+        return True
+
+    def drop_collection(self, name: str) -> None:
+        """Drop a collection."""
+        self._collections.pop(name, None)
+
+    def create_collection(self, name: str, dim: int, **kwargs: Any) -> None:
+        """Create a collection.
+
+        Args:
+            name: The collection name.
+            dim: The vector dimension.
+            **kwargs: `metric` selects "l2" (default), "ip" or "cosine".
+                Vectors are always stored as float32.
+        """
+        vector_dtype(kwargs, ("float32",))
+        metric = vector_metric(kwargs, METRICS)
+        self._collections[name] = _Collection(
+            dim=dim,
+            metric=metric,
+            capacity=self._initial_capacity,
+            compact_ratio=self._compact_ratio,
+        )
+
+    def upsert(
+        self,
+        name: str,
+        ids: List[str],
+        vectors: np.ndarray[Any, Any],
+        meta: List[Dict[str, Any]],
+        wait: bool = True,
+    ) -> None:
+        """Insert or overwrite vectors and their metadata.
+
+        Writes are applied synchronously, so `wait` has no effect.
+        """
+        with Span("upsert"), Span("engine"), self._lock:
+            self._collections[name].put(ids, vectors, meta)
+
+    def query(
+        self,
+        name: str,
+        vector: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Exact top-k search, returning one dictionary per hit."""
+        with Span("query"):
+            result = self.search(name, vector, k, filter)
+            with Span("materialize"):
+                return result.to_dicts()
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        """Exact top-k search.
+
+        The reported distance is the squared L2 distance for "l2", and the
+        inner product or cosine similarity for "ip" and "cosine". Metadata is
+        looked up by id when requested, so it reflects later upserts and is
+        empty for ids deleted since the search.
+        """
+        collection = self._collections[name]
+        with Span("search"):
+            with self._lock:
+                with Span("prepare"):
+                    mask = collection.mask(filter)
+                with Span("engine"):
+                    rows, scores = collection.search(vectors, k, mask, self._block_size)
+                    # Rows move on compaction, so resolve ids under the lock.
+                    hit_ids = collection.ids[np.where(rows < 0, 0, rows)]
+            with Span("decode"):
+                missing = rows < 0
+                hit_ids[missing] = None
+                if collection.metric == "l2":
+                    scores = -scores
+                scores[missing] = np.nan
+
+        def payload(i: int, j: int) -> Dict[str, Any]:
+            row = collection.rows.get(hit_ids[i, j])
+            return {} if row is None else collection.metadata(row)
+
+        return QueryResult(hit_ids, scores, payload)
+
+    def delete(self, name: str, ids: List[str]) -> None:
+        """Delete vectors by id."""
+        with Span("delete"), Span("engine"), self._lock:
+            self._collections[name].remove(ids)
+
+    def save(self, name: str, path: Union[str, Path]) -> None:
+        """Write the live rows of a collection to a directory.
+
+        Vectors, norms and ids are written as `.npy` arrays and metadata as a
+        columnar table.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        collection = self._collections[name]
+        with self._lock:
+            live = np.flatnonzero(~collection.deleted[: collection.size])
+            np.save(directory / "vectors.npy", collection.vectors[live])
+            np.save(directory / "sq_norms.npy", collection.sq_norms[live])
+            ids = collection.ids[live].astype(str)
+            np.save(directory / "ids.npy", ids, allow_pickle=False)
+            rows = [collection.metadata(row) for row in live.tolist()]
+        ColumnTable.from_rows(rows).save(directory / "metadata")
+        settings = {"dim": collection.dim, "metric": collection.metric}
+        (directory / "collection.json").write_text(json.dumps(settings))
+
+    def load(self, name: str, path: Union[str, Path], mmap: bool = True) -> None:
+        """Open a collection saved by `save`.
+
+        With `mmap`, the vectors are mapped copy-on-write, so loading does not
+        read them; they are paged in by the first queries. Ids and metadata
+        are always read, since they are indexed in memory.
+        """
+        directory = Path(path)
+        settings = json.loads((directory / "collection.json").read_text())
+        mmap_mode: Optional[Literal["c"]] = "c" if mmap else None
+        collection = _Collection(
+            dim=settings["dim"],
+            metric=settings["metric"],
+            capacity=0,
+            compact_ratio=self._compact_ratio,
+        )
+        collection.vectors = np.load(directory / "vectors.npy", mmap_mode=mmap_mode)
+        collection.sq_norms = np.load(directory / "sq_norms.npy", mmap_mode=mmap_mode)
+        collection.size = len(collection.vectors)
+        collection.deleted = np.zeros(collection.size, dtype=bool)
+        collection.ids = np.load(directory / "ids.npy").astype(object)
+        collection.rows = {doc_id: row for row, doc_id in enumerate(collection.ids)}
+        table = ColumnTable.load(directory / "metadata", mmap=mmap)
+        collection.columns = {key: table.objects(key) for key in table.columns}
+        with self._lock:
+            self._collections[name] = collection
+
+    def memory_bytes(self, name: str) -> Optional[int]:
+        """Get the bytes allocated for a collection, including spare capacity."""
+        collection = self._collections.get(name)
+        return collection.nbytes() if collection else 0
+
+    def count(self, name: str) -> int:
+        """Get the number of live vectors in a collection."""
+        collection = self._collections.get(name)
+        return len(collection.rows) if collection else 0
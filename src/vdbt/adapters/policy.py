@@ -0,0 +1,291 @@
+"""An adapter wrapper that applies timeouts, retries and backpressure.
+
+Overloaded backends time out or refuse calls. Without a policy a single such
+failure propagates out of the scenario and the run records nothing but the
+error. `PolicyAdapter` bounds every call instead, and counts what happened
+to it, so behaviour under overload becomes a measurement.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+import numpy as np
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from vdbt.adapters.base import QueryResult, VectorDB, VectorDBWrapper
+
+T = TypeVar("T")
+
+# The calls the policy applies to. Collection setup and teardown are passed
+# through unchanged.
+OPERATIONS = ("search", "upsert", "delete")
+COUNTERS = ("calls", "failures", "retries", "timeouts", "rejections", "errors")
+
+# Errors caused by the call itself rather than the backend's state; retrying
+# them cannot succeed.
+_PERMANENT = (ValueError, TypeError, KeyError, NotImplementedError)
+
+
+class OperationTimeout(TimeoutError):
+    """Raised when an attempt does not finish within its timeout."""
+
+
+class Rejected(RuntimeError):
+    """Raised when no concurrency slot frees up within the queue timeout."""
+
+
+@dataclass
+class RetryPolicy:
+    """Settings for `PolicyAdapter`.
+
+    Attributes:
+        timeout_s: The longest an attempt may take, in seconds, or None to
+            wait indefinitely.
+        timeouts: Per-operation overrides of `timeout_s`, e.g.
+            `{"upsert": 10.0}`.
+        max_attempts: The most attempts per call, including the first.
+        backoff_initial_s: The wait before the first retry. Later waits
+            double, up to `backoff_max_s`.
+        backoff_max_s: The longest wait between attempts.
+        backoff_jitter_s: The most random time added to each wait, so
+            clients that failed together do not retry together.
+        max_concurrency: The most calls in flight at once, or None for no
+            limit. An attempt that timed out holds its slot until the backend
+            actually returns.
+        queue_timeout_s: How long a call waits for a free slot before it is
+            rejected. Rejected calls are not retried.
+        fail_open: Once a call has failed for good, return an empty result
+            instead of raising, so the scenario keeps running.
+    """
+
+    timeout_s: Optional[float] = None
+    timeouts: Dict[str, float] = field(default_factory=dict)
+    max_attempts: int = 3
+    backoff_initial_s: float = 0.05
+    backoff_max_s: float = 1.0
+    backoff_jitter_s: float = 0.05
+    max_concurrency: Optional[int] = None
+    queue_timeout_s: float = 1.0
+    fail_open: bool = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        """Builds a policy from a config section.
+
+        Raises:
+            ValueError: If the section has unknown settings or operations.
+        """
+        names = {f.name for f in fields(cls)}
+        unknown = set(config) - names
+        if unknown:
+            raise ValueError(f"Unknown policy settings: {sorted(unknown)}")
+        unknown = set(config.get("timeouts", {})) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(
+                f"Unknown operations in policy timeouts: {sorted(unknown)}"
+            )
+        return cls(**config)
+
+    def timeout_for(self, operation: str) -> Optional[float]:
+        """Returns the timeout of one attempt of `operation`."""
+        return self.timeouts.get(operation, self.timeout_s)
+
+
+def empty_stats() -> Dict[str, Dict[str, int]]:
+    """Returns zeroed counters for every operation."""
+    return {op: dict.fromkeys(COUNTERS, 0) for op in OPERATIONS}
+
+
+def merge_stats(stats: List[Dict[str, Dict[str, int]]]) -> Dict[str, Dict[str, int]]:
+    """Sums counters from several `PolicyAdapter.stats` snapshots."""
+    merged = empty_stats()
+    for snapshot in stats:
+        for op, counters in snapshot.items():
+            for name, value in counters.items():
+                merged[op][name] += value
+    return merged
+
+
+class PolicyAdapter(VectorDBWrapper):
+    """Applies a `RetryPolicy` to the searches, upserts and deletes of an adapter.
+
+    Each attempt first takes a concurrency slot, waiting at most
+    `queue_timeout_s` for one, then runs with the operation's timeout.
+    Attempts that time out or raise a backend error are retried with jittered
+    exponential backoff; errors in the call's arguments are not. A
+    `TimeoutError` raised by the backend itself counts as a timeout.
+
+    Counters are kept per operation:
+
+    - "calls": calls made to the wrapper.
+    - "failures": calls that failed after their last attempt.
+    - "retries": attempts after the first.
+    - "timeouts": attempts that timed out.
+    - "rejections": calls turned away for lack of a slot.
+    - "errors": attempts that ran and raised, timeouts included.
+
+    Args:
+        db: The adapter to wrap.
+        policy: The policy to apply. Defaults to `RetryPolicy()`.
+    """
+
+    def __init__(self, db: VectorDB, policy: Optional[RetryPolicy] = None) -> None:
+        super().__init__(db)
+        self.policy = policy or RetryPolicy()
+        self._slots = (
+            threading.BoundedSemaphore(self.policy.max_concurrency)
+            if self.policy.max_concurrency is not None
+            else None
+        )
+        # Attempts with a timeout run here; a timed-out attempt keeps its
+        # worker until the backend returns.
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.policy.max_concurrency or 64,
+            thread_name_prefix="vdbt-policy",
+        )
+        self._lock = threading.Lock()
+        self._stats = empty_stats()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns a snapshot of the counters."""
+        with self._lock:
+            return {op: dict(counters) for op, counters in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        """Zeroes the counters."""
+        with self._lock:
+            self._stats = empty_stats()
+
+    def close(self) -> None:
+        """Shuts down the attempt workers.
+
+        Queued attempts are cancelled. Attempts still waiting on the backend
+        are not waited for.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def upsert(
+        self,
+        name: str,
+        ids: List[str],
+        vectors: np.ndarray[Any, Any],
+        meta: List[Dict[str, Any]],
+        wait: bool = True,
+    ) -> None:
+        self._call(
+            "upsert", lambda: self.db.upsert(name, ids, vectors, meta, wait=wait)
+        )
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        result = self._call("search", lambda: self.db.search(name, vectors, k, filter))
+        if result is None:
+            num_queries = len(np.atleast_2d(vectors))
+            return QueryResult(
+                np.full((num_queries, k), None, dtype=object),
+                np.full((num_queries, k), np.nan, dtype=np.float32),
+                lambda i, j: {},
+            )
+        return result
+
+    def delete(self, name: str, ids: List[str]) -> None:
+        self._call("delete", lambda: self.db.delete(name, ids))
+
+    def _count(self, operation: str, counter: str) -> None:
+        with self._lock:
+            self._stats[operation][counter] += 1
+
+    def _call(self, operation: str, call: Callable[[], T]) -> Optional[T]:
+        """Runs `call` under the policy.
+
+        Returns:
+            The call's result, or None if it failed and the policy fails open.
+        """
+        policy = self.policy
+
+        def before_retry(state: RetryCallState) -> None:
+            self._count(operation, "retries")
+
+        retrying = Retrying(
+            stop=stop_after_attempt(policy.max_attempts),
+            wait=wait_exponential_jitter(
+                multiplier=policy.backoff_initial_s,
+                max=policy.backoff_max_s,
+                jitter=policy.backoff_jitter_s,
+            ),
+            retry=retry_if_not_exception_type(_PERMANENT + (Rejected,)),
+            before_sleep=before_retry,
+            reraise=True,
+        )
+        self._count(operation, "calls")
+        try:
+            result: T = retrying(self._attempt, operation, call)
+            return result
+        except Exception:
+            self._count(operation, "failures")
+            if policy.fail_open:
+                return None
+            raise
+
+    def _attempt(self, operation: str, call: Callable[[], T]) -> T:
+        """Runs one attempt in a concurrency slot, within its timeout."""
+        if self._slots is not None and not self._slots.acquire(
+            timeout=self.policy.queue_timeout_s
+        ):
+            self._count(operation, "rejections")
+            raise Rejected(
+                f"{operation} rejected: {self.policy.max_concurrency} calls "
+                f"in flight for {self.policy.queue_timeout_s}s"
+            )
+        timeout = self.policy.timeout_for(operation)
+        try:
+            if timeout is None:
+                try:
+                    return call()
+                finally:
+                    self._release()
+            future: Future[T] = self._pool.submit(call)
+            future.add_done_callback(lambda _: self._release())
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError as e:
+                if future.done():
+                    raise
+                # An attempt still queued for a worker never starts; one that
+                # is running keeps its worker until the backend returns.
+                future.cancel()
+                raise OperationTimeout(f"{operation} timed out after {timeout}s") from e
+        except TimeoutError:
+            self._count(operation, "timeouts")
+            self._count(operation, "errors")
+            raise
+        except Exception:
+            self._count(operation, "errors")
+            raise
+
+    def _release(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+
+
+def find_policy(db: VectorDB) -> Optional[PolicyAdapter]:
+    """Returns the `PolicyAdapter` in a chain of wrappers, if there is one."""
+    while isinstance(db, VectorDBWrapper):
+        if isinstance(db, PolicyAdapter):
+            return db
+        db = db.db
+    return None
@@ -1,23 +1,107 @@
 """Qdrant adapter."""
 
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 from httpx import ConnectError
 from qdrant_client import QdrantClient, models
-from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.http.exceptions import (
+    ResponseHandlingException,
+    UnexpectedResponse,
+)
 
-from vdbt.adapters.base import VectorDB
+from vdbt.adapters.base import (
+    METRICS,
+    VECTOR_DTYPES,
+    QueryResult,
+    VectorDB,
+    vector_dtype,
+    vector_metric,
+)
+from vdbt.filters import AND, NOT, OR, validate_filter
+from vdbt.utils.timing import Span, record_span
+
+_DISTANCES = {
+    "l2": models.Distance.EUCLID,
+    "ip": models.Distance.DOT,
+    "cosine": models.Distance.COSINE,
+}
+
+
+def _point_id(doc_id: str) -> Union[int, str]:
+    """Converts a string id into a Qdrant point id.
+
+    Qdrant only accepts unsigned integers and UUIDs, so numeric string ids are
+    sent as integers.
+    """
+    return int(doc_id) if doc_id.isdigit() else doc_id
+
+
+def _record_server_time(response: Any) -> None:
+    """Records the server-reported processing time of a REST response.
+
+    The time is recorded as a "server" span nested inside the enclosing
+    "transport" span, so the remainder is client encoding, network and client
+    decoding.
+    """
+    if getattr(response, "time", None) is not None:
+        record_span("server", response.time)
+
+
+def _field_condition(key: str, condition: Any) -> models.FieldCondition:
+    """Translates one field condition of a `vdbt.filters` filter."""
+    if isinstance(condition, dict):
+        return models.FieldCondition(key=key, range=models.Range(**condition))
+    if isinstance(condition, (list, tuple, set)):
+        return models.FieldCondition(
+            key=key, match=models.MatchAny(any=list(condition))
+        )
+    if isinstance(condition, float):
+        # Qdrant only matches keywords, integers and booleans exactly.
+        return models.FieldCondition(
+            key=key, range=models.Range(gte=condition, lte=condition)
+        )
+    return models.FieldCondition(key=key, match=models.MatchValue(value=condition))
+
+
+def _qdrant_filter(filter: Dict[str, Any]) -> models.Filter:
+    """Translates a `vdbt.filters` filter into a Qdrant filter.
+
+    Field conditions and `$and` become `must` clauses, `$not` becomes
+    `must_not` clauses, and `$or` becomes a nested filter of `should`
+    clauses.
+    """
+    must: List[Any] = []
+    must_not: List[Any] = []
+    for key, condition in filter.items():
+        if key == AND:
+            must.extend(_qdrant_filter(nested) for nested in condition)
+        elif key == OR:
+            must.append(
+                models.Filter(should=[_qdrant_filter(nested) for nested in condition])
+            )
+        elif key == NOT:
+            must_not.extend(_qdrant_filter(nested) for nested in condition)
+        else:
+            must.append(_field_condition(key, condition))
+    return models.Filter(must=must or None, must_not=must_not or None)
 
 
 class QdrantAdapter(VectorDB):
     """A Qdrant adapter for the VectorDB protocol."""
 
     name = "qdrant"
+    # `create_collection` builds the `payload_indexes` it is given.
+    supports_payload_indexes = True
 
     def __init__(self, url: str = "http://localhost:6333"):
+        self._url = url
         self._client = QdrantClient(url=url)
 
+    def connection_kwargs(self) -> Dict[str, Any]:
+        """Return the constructor arguments that connect to the same service."""
+        return {"url": self._url}
+
     def connect(self) -> bool:
         """Connect to the Qdrant service.
 
@@ -27,7 +111,7 @@ class QdrantAdapter(VectorDB):
         try:
             self._client.get_collections()
             return True
-        except (UnexpectedResponse, ConnectError):
+        except (UnexpectedResponse, ResponseHandlingException, ConnectError):
             return False
 
     def drop_collection(self, name: str) -> None:
@@ -35,13 +119,54 @@ class QdrantAdapter(VectorDB):
         self._client.delete_collection(collection_name=name)
 
     def create_collection(self, name: str, dim: int, **kwargs: Any) -> None:
-        """Create a collection in Qdrant."""
+        """Create a collection in Qdrant.
+
+        Args:
+            name: The collection name.
+            dim: The vector dimension.
+            **kwargs: `metric` selects "cosine" (default), "l2" or "ip",
+                Qdrant's Cosine, Euclid and Dot distances. `dtype` selects
+                the stored type: "float32" (default), "float16" vectors, or
+                "int8" scalar and "binary" quantization kept in RAM next to
+                the original vectors, which Qdrant uses to rescore.
+                `payload_indexes` maps payload fields to the type of index to
+                build on them ("keyword", "integer", "float", "bool", ...),
+                so filters on them need not scan.
+
+        Raises:
+            ValueError: If the dtype, metric or a payload index type is
+                unknown.
+        """
+        dtype = vector_dtype(kwargs, VECTOR_DTYPES)
+        metric = vector_metric(kwargs, METRICS, default="cosine")
+        payload_indexes = {
+            field: models.PayloadSchemaType(schema)
+            for field, schema in (kwargs.get("payload_indexes") or {}).items()
+        }
+        quantization: Optional[models.QuantizationConfig] = None
+        if dtype == "int8":
+            quantization = models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, always_ram=True
+                )
+            )
+        elif dtype == "binary":
+            quantization = models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
         self._client.create_collection(
             collection_name=name,
             vectors_config=models.VectorParams(
-                size=dim, distance=models.Distance.COSINE
+                size=dim,
+                distance=_DISTANCES[metric],
+                datatype=models.Datatype.FLOAT16 if dtype == "float16" else None,
             ),
+            quantization_config=quantization,
         )
+        for field, schema in payload_indexes.items():
+            self._client.create_payload_index(
+                collection_name=name, field_name=field, field_schema=schema, wait=True
+            )
 
     def upsert(
         self,
@@ -49,18 +174,32 @@ class QdrantAdapter(VectorDB):
         ids: List[str],
         vectors: np.ndarray[Any, Any],
         meta: List[Dict[str, Any]],
+        wait: bool = True,
     ) -> None:
-        """Upsert data into a Qdrant collection."""
-        points = []
-        for i, doc_id in enumerate(ids):
-            points.append(
-                models.PointStruct(
-                    id=doc_id,
-                    vector=vectors[i].tolist(),
-                    payload=meta[i],
+        """Upsert data into a Qdrant collection.
+
+        With `wait=False` Qdrant acknowledges the write once it is queued,
+        before it is applied and indexed.
+        """
+        with Span("upsert"):
+            with Span("prepare"):
+                points = []
+                for i, doc_id in enumerate(ids):
+                    points.append(
+                        models.PointStruct(
+                            id=_point_id(doc_id),
+                            vector=vectors[i].tolist(),
+                            payload=meta[i],
+                        )
+                    )
+                operation = models.PointsList(points=points)
+            with Span("transport"):
+                response = self._client.http.points_api.upsert_points(
+                    collection_name=name,
+                    wait=wait,
+                    point_insert_operations=operation,
                 )
-            )
-        self._client.upsert(collection_name=name, points=points, wait=True)
+                _record_server_time(response)
 
     def query(
         self,
@@ -69,43 +208,76 @@ class QdrantAdapter(VectorDB):
         k: int,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        """Query a Qdrant collection."""
-        query_filter = None
-        if filter:
-            # Assuming filter is a simple key-value pair for now
-            # e.g., {"label": 1}
-            query_filter = models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key=list(filter.keys())[0],
-                        range=models.Range(gte=list(filter.values())[0]),
+        """Query a Qdrant collection, returning one dictionary per hit."""
+        with Span("query"):
+            result = self.search(name, vector, k, filter)
+            with Span("materialize"):
+                return result.to_dicts()
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        """Query a Qdrant collection with one or more vectors.
+
+        Several vectors are sent as a single batch request.
+        """
+        with Span("search"):
+            with Span("prepare"):
+                query_filter = None
+                if filter:
+                    validate_filter(filter)
+                    query_filter = _qdrant_filter(filter)
+                requests = [
+                    models.QueryRequest(
+                        query=query_vector,
+                        filter=query_filter,
+                        limit=k,
+                        with_payload=True,
                     )
+                    for query_vector in np.atleast_2d(vectors).tolist()
                 ]
-            )
+            with Span("transport"):
+                if len(requests) == 1:
+                    response = self._client.http.search_api.query_points(
+                        collection_name=name, query_request=requests[0]
+                    )
+                    responses = [response.result] if response.result else []
+                    _record_server_time(response)
+                else:
+                    batch_response = self._client.http.search_api.query_batch_points(
+                        collection_name=name,
+                        query_request_batch=models.QueryRequestBatch(searches=requests),
+                    )
+                    responses = batch_response.result or []
+                    _record_server_time(batch_response)
+            with Span("decode"):
+                hit_ids = np.full((len(requests), k), None, dtype=object)
+                distances = np.full((len(requests), k), np.nan, dtype=np.float32)
+                payloads: List[List[Any]] = []
+                for i, query_response in enumerate(responses):
+                    points = query_response.points
+                    hit_ids[i, : len(points)] = [str(hit.id) for hit in points]
+                    distances[i, : len(points)] = [hit.score for hit in points]
+                    payloads.append([hit.payload for hit in points])
 
-        search_result = self._client.search(
-            collection_name=name,
-            query_vector=vector.tolist()[0],
-            query_filter=query_filter,
-            limit=k,
-        )
-        results = []
-        for hit in search_result:
-            results.append(
-                {
-                    "id": hit.id,
-                    "distance": hit.score,
-                    "metadata": hit.payload,
-                }
-            )
-        return results
+        return QueryResult(hit_ids, distances, lambda i, j: payloads[i][j] or {})
 
     def delete(self, name: str, ids: List[str]) -> None:
         """Delete data from a Qdrant collection."""
-        self._client.delete(
-            collection_name=name,
-            points_selector=models.PointIdsList(points=ids),
-        )
+        with Span("delete"):
+            with Span("prepare"):
+                selector = models.PointIdsList(
+                    points=[_point_id(doc_id) for doc_id in ids]
+                )
+            with Span("transport"):
+                response = self._client.http.points_api.delete_points(
+                    collection_name=name, wait=True, points_selector=selector
+                )
+                _record_server_time(response)
 
     def memory_bytes(self, name: str) -> Optional[int]:
         """Get the memory usage of a Qdrant collection in bytes.
@@ -117,5 +289,10 @@ class QdrantAdapter(VectorDB):
 
     def count(self, name: str) -> int:
         """Get the number of items in a Qdrant collection."""
-        count_result = self._client.count(collection_name=name, exact=True)
+        try:
+            count_result = self._client.count(collection_name=name, exact=True)
+        except UnexpectedResponse as e:
+            if e.status_code == 404:
+                return 0
+            raise
         return int(count_result.count)
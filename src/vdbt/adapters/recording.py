@@ -0,0 +1,39 @@
+"""An adapter wrapper that records query traffic to a trace."""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from vdbt.adapters.base import QueryResult, VectorDB, VectorDBWrapper
+from vdbt.trace import TraceWriter
+
+
+class RecordingAdapter(VectorDBWrapper):
+    """Records every search sent to the wrapped adapter.
+
+    Each `search` or `query` call is forwarded unchanged and, once it
+    returns, appended to the trace with its start time and latency. Failed
+    calls are not recorded. Close the writer to complete the trace.
+
+    Args:
+        db: The adapter to record.
+        writer: The trace to append to.
+    """
+
+    def __init__(self, db: VectorDB, writer: TraceWriter) -> None:
+        super().__init__(db)
+        self.writer = writer
+
+    def search(
+        self,
+        name: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> QueryResult:
+        """Query the wrapped adapter and record the call."""
+        started = self.writer.clock()
+        result = self.db.search(name, vectors, k, filter)
+        latency_s = self.writer.clock() - started
+        self.writer.record(name, vectors, k, filter, started, latency_s)
+        return result
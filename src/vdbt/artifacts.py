@@ -0,0 +1,201 @@
+"""Checkpointed storage of benchmark runs.
+
+Every completed job, i.e. one adapter running one scenario with one set of
+parameters, is written to its own file as soon as it finishes, and the run
+manifest is rewritten after it. Both are written atomically, so a crash
+never leaves a truncated artifact behind and a resumed run can trust every
+job the manifest lists as completed.
+
+A run lives in `<artifacts_dir>/runs/<run_id>/`:
+
+    manifest.json           # run id, config and the status of every job
+    jobs/<job_id>.json      # the results of one job
+
+Once all jobs of a scenario are done, their merged results are also written
+to `<artifacts_dir>/metrics/<adapter>_<scenario>.json` for the report, and
+its timing span and policy summaries, if any, to the same name under
+`<artifacts_dir>/spans/` and `<artifacts_dir>/policy/`.
+"""
+
+import hashlib
+import os
+import secrets
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Serializes values orjson does not handle natively.
+
+    Raises:
+        TypeError: If the value has no JSON form, so results are never
+            stored as an unreadable string of it.
+    """
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__} to JSON: {value!r}")
+
+
+def dumps(value: Any) -> bytes:
+    """Serializes results, including NumPy scalars and arrays, to JSON."""
+    return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Writes `data` to `path` so that readers see either all of it or none.
+
+    The data is written to a temporary file in the same directory, flushed
+    to disk and renamed over `path`.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def job_id(adapter: str, scenario: str, params: Dict[str, Any]) -> str:
+    """Identifies a job by its adapter, scenario and exact parameters.
+
+    Changing any parameter changes the id, so a resumed run with a different
+    config reruns the affected jobs instead of reusing stale results.
+    """
+    key = dumps({"adapter": adapter, "scenario": scenario, "params": params})
+    digest = hashlib.sha1(key).hexdigest()[:12]
+    return f"{adapter}__{scenario}__{digest}"
+
+
+class RunStore:
+    """The manifest and job artifacts of one benchmark run.
+
+    Use `create` to start a new run and `open` to resume an existing one.
+
+    Args:
+        directory: The directory of the run.
+        manifest: The run manifest.
+    """
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]) -> None:
+        self.directory = directory
+        self.manifest = manifest
+
+    @property
+    def run_id(self) -> str:
+        run_id: str = self.manifest["run_id"]
+        return run_id
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        config: Dict[str, Any] = self.manifest["config"]
+        return config
+
+    @classmethod
+    def create(
+        cls,
+        artifacts_dir: Path,
+        config: Dict[str, Any],
+        run_id: Optional[str] = None,
+    ) -> "RunStore":
+        """Starts a new run.
+
+        Args:
+            artifacts_dir: The artifacts directory.
+            config: The run configuration, stored so the run can be resumed.
+            run_id: The id of the run. Defaults to the current local time
+                plus a random suffix, so runs started in the same second get
+                their own directories.
+
+        Raises:
+            FileExistsError: If a run with this id already exists.
+        """
+        run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        directory = artifacts_dir / "runs" / run_id
+        if (directory / "manifest.json").exists():
+            raise FileExistsError(f"Run {run_id} already exists in {artifacts_dir}")
+        store = cls(
+            directory,
+            {"run_id": run_id, "created": time.time(), "config": config, "jobs": {}},
+        )
+        store._write_manifest()
+        return store
+
+    @classmethod
+    def open(cls, artifacts_dir: Path, run_id: str) -> "RunStore":
+        """Opens an existing run to resume it.
+
+        Raises:
+            FileNotFoundError: If the run does not exist.
+        """
+        directory = artifacts_dir / "runs" / run_id
+        path = directory / "manifest.json"
+        if not path.exists():
+            raise FileNotFoundError(f"No run {run_id} in {artifacts_dir}")
+        return cls(directory, orjson.loads(path.read_bytes()))
+
+    def completed(self, job: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored results of a completed job, or None."""
+        entry = self.manifest["jobs"].get(job)
+        if entry is None or entry["status"] != "completed":
+            return None
+        path = self.directory / entry["file"]
+        if not path.exists():
+            return None
+        results: Dict[str, Any] = orjson.loads(path.read_bytes())
+        return results
+
+    def save(
+        self,
+        job: str,
+        info: Dict[str, Any],
+        results: Dict[str, Any],
+        error: Optional[str] = None,
+    ) -> None:
+        """Records a finished job.
+
+        Args:
+            job: The job id, from `job_id`.
+            info: Descriptive fields stored in the manifest entry, such as the
+                adapter, scenario and duration.
+            results: The results of the job.
+            error: The error message if the job failed. Failed jobs are rerun
+                when the run is resumed.
+        """
+        file = f"jobs/{job}.json"
+        write_atomic(self.directory / file, dumps(results))
+        self.manifest["jobs"][job] = {
+            **info,
+            "status": "failed" if error is not None else "completed",
+            "error": error,
+            "file": file,
+            "finished": time.time(),
+        }
+        self._write_manifest()
+
+    def write_metrics(
+        self,
+        adapter: str,
+        scenario: str,
+        results: Dict[str, Any],
+        section: str = "metrics",
+    ) -> None:
+        """Writes the merged results of a scenario where the report reads them.
+
+        The file goes to `<artifacts_dir>/<section>/<adapter>_<scenario>.json`.
+        """
+        path = self.directory.parents[1] / section / f"{adapter}_{scenario}.json"
+        write_atomic(path, dumps(results))
+
+    def _write_manifest(self) -> None:
+        write_atomic(self.directory / "manifest.json", dumps(self.manifest))
@@ -1,31 +1,77 @@
 """Command-line interface for the VectorDB Stress Tester."""
 
+import os
+from importlib import import_module
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 import json
 
 import typer
 
 from vdbt.adapters.base import VectorDB
-from vdbt.adapters.faiss_adapter import FaissAdapter
-from vdbt.adapters.qdrant_adapter import QdrantAdapter
+from vdbt.adapters.policy import PolicyAdapter, RetryPolicy, find_policy
+from vdbt.adapters.recording import RecordingAdapter
+from vdbt.artifacts import RunStore
+from vdbt.loadgen import AUTHKEY_ENV, run_worker
 from vdbt.report import generate_report
 from vdbt.runner import Runner
 from vdbt.scenarios.base import Scenario
+from vdbt.scenarios.cold_start import ColdStartScenario
+from vdbt.scenarios.dtype_sweep import DtypeSweepScenario
+from vdbt.scenarios.duplicates import DuplicateScenario
 from vdbt.scenarios.hybrid_query import HybridQueryScenario
+from vdbt.scenarios.ingest_throughput import IngestThroughputScenario
 from vdbt.scenarios.noise_injection import NoiseInjectionScenario
+from vdbt.scenarios.query_cache import QueryCacheScenario
+from vdbt.scenarios.query_load import QueryLoadScenario
 from vdbt.scenarios.scale_curve import ScaleCurveScenario
+from vdbt.scenarios.soak import SoakScenario
+from vdbt.scenarios.trace_replay import TraceReplayScenario
+from vdbt.scenarios.traffic_shape import TrafficShapeScenario
 from vdbt.scenarios.update_delete_storm import UpdateDeleteStormScenario
 from vdbt.scenarios.multivector_longctx import MultiVectorLongContextScenario
+from vdbt.scenarios.multi_tenant import MultiTenantScenario
+from vdbt.servers.qdrant_standin import QdrantStandIn
+from vdbt.trace import TraceWriter
 
 app = typer.Typer()
 
+# Adapters by name, as their module, class and the optional dependency
+# extra their backend comes from. Modules are imported only when selected,
+# so a missing extra only affects the adapters that need it.
+ADAPTERS: Dict[str, Tuple[str, str, Optional[str]]] = {
+    "faiss": ("vdbt.adapters.faiss_adapter", "FaissAdapter", None),
+    "hnswlib": ("vdbt.adapters.hnswlib_adapter", "HnswlibAdapter", "hnswlib"),
+    "numpy": ("vdbt.adapters.numpy_adapter", "NumpyAdapter", None),
+    "qdrant": ("vdbt.adapters.qdrant_adapter", "QdrantAdapter", "qdrant"),
+}
+
+
+def _adapter_class(name: str) -> Any:
+    """Imports the class of adapter `name`.
+
+    Raises:
+        typer.Exit: If its optional dependency is not installed.
+    """
+    module_name, class_name, extra = ADAPTERS[name]
+    try:
+        module = import_module(module_name)
+    except ImportError as e:
+        if extra is None:
+            raise
+        typer.echo(
+            f"The {name} adapter needs {e.name}; install it with "
+            f"pip install 'vectordb-stress-tester[{extra}]'"
+        )
+        raise typer.Exit(code=1) from e
+    return getattr(module, class_name)
+
 
 @app.command()
 def adapters() -> None:
     """List available adapters."""
     # This will be expanded to dynamically discover adapters
-    typer.echo("Available adapters: faiss, qdrant")
+    typer.echo(f"Available adapters: {', '.join(ADAPTERS)}")
 
 
 @app.command()
@@ -33,26 +79,114 @@ def scenarios() -> None:
     """List available scenarios."""
     typer.echo(
         "Available scenarios: scale_curve, noise_injection, hybrid_query, "
-        "update_delete_storm, multivector_longctx"
+        "update_delete_storm, multivector_longctx, soak, ingest_throughput, "
+        "multi_tenant, cold_start, query_load, duplicates, dtype_sweep, "
+        "traffic_shape, trace_replay, query_cache"
     )
 
 
+def _open_run(
+    artifacts_dir: Path, resume: Optional[str], config: Optional[Dict[str, Any]]
+) -> RunStore:
+    """Starts a new run, or reopens run `resume` to continue it.
+
+    A resumed run keeps the config it started with unless a new one is given.
+    """
+    if not resume:
+        return RunStore.create(artifacts_dir, config or {})
+    try:
+        store = RunStore.open(artifacts_dir, resume)
+    except FileNotFoundError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from e
+    if config is not None:
+        store.manifest["config"] = config
+    return store
+
+
+def _apply_policy(
+    adapters: List[VectorDB], config: Optional[Dict[str, Any]]
+) -> List[VectorDB]:
+    """Wraps each adapter in the retry, timeout and backpressure `config`."""
+    if config is None:
+        return adapters
+    try:
+        policy = RetryPolicy.from_config(config)
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1) from e
+    return [PolicyAdapter(db, policy) for db in adapters]
+
+
+def _record_traces(
+    adapters: List[VectorDB], directory: Optional[Path]
+) -> Tuple[List[VectorDB], List[TraceWriter]]:
+    """Wraps each adapter to record its queries to `<directory>/<adapter>`."""
+    if directory is None:
+        return adapters, []
+    typer.echo(f"Recording query traces to {directory}")
+    writers = [TraceWriter(directory / db.name) for db in adapters]
+    recorders: List[VectorDB] = [
+        RecordingAdapter(db, writer)
+        for db, writer in zip(adapters, writers, strict=True)
+    ]
+    return recorders, writers
+
+
+def _close(adapters: List[VectorDB], writers: List[TraceWriter]) -> None:
+    """Finishes trace files and shuts down the workers of retry policies."""
+    for writer in writers:
+        writer.close()
+    for adapter in adapters:
+        policy = find_policy(adapter)
+        if policy is not None:
+            policy.close()
+
+
 @app.command()
 def run(
     adapters_list: List[str] = typer.Option(..., "--adapters", "-a"),
     scenarios_list: List[str] = typer.Option(..., "--scenarios", "-s"),
     config_path: Optional[Path] = typer.Option(None, "--config", "-c"),
+    artifacts_dir: Path = typer.Option(Path("./artifacts"), "--artifacts-dir", "-o"),
+    profile: bool = typer.Option(
+        False, "--profile", help="Profile each scenario phase."
+    ),
+    profile_mode: str = typer.Option(
+        "sampling", "--profile-mode", help="Profiler: sampling or cprofile."
+    ),
+    resume: Optional[str] = typer.Option(
+        None, "--resume", help="Resume a run, skipping its completed jobs."
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", help="Load generator processes for query_load."
+    ),
+    record_trace: Optional[Path] = typer.Option(
+        None, "--record-trace", help="Record each adapter's queries to a trace."
+    ),
+    spans: bool = typer.Option(
+        False, "--spans", help="Break adapter calls into timing spans."
+    ),
 ) -> None:
     """Run benchmark scenarios."""
     # This is a simplified version for now.
     # It will be expanded to handle dynamic loading and configuration.
-    available_adapters = {"faiss": FaissAdapter, "qdrant": QdrantAdapter}
     available_scenarios = {
         "scale_curve": ScaleCurveScenario,
         "noise_injection": NoiseInjectionScenario,
         "hybrid_query": HybridQueryScenario,
         "update_delete_storm": UpdateDeleteStormScenario,
         "multivector_longctx": MultiVectorLongContextScenario,
+        "soak": SoakScenario,
+        "ingest_throughput": IngestThroughputScenario,
+        "multi_tenant": MultiTenantScenario,
+        "cold_start": ColdStartScenario,
+        "query_load": QueryLoadScenario,
+        "duplicates": DuplicateScenario,
+        "dtype_sweep": DtypeSweepScenario,
+        "traffic_shape": TrafficShapeScenario,
+        "trace_replay": TraceReplayScenario,
+        "query_cache": QueryCacheScenario,
     }
 
     config: Dict[str, Any] = {}
@@ -60,10 +194,17 @@ def run(
         with open(config_path, "r") as f:
             config = json.load(f)
 
+    store = _open_run(artifacts_dir, resume, config if config_path else None)
+    config = store.config
+    if workers is not None:
+        query_load = {**config.get("query_load", {}), "workers": workers}
+        config = {**config, "query_load": query_load}
+    typer.echo(f"Run {store.run_id}: resume with --resume {store.run_id}")
+
     selected_adapters: List[VectorDB] = []
     for adapter_name in adapters_list:
-        if adapter_name in available_adapters:
-            selected_adapters.append(available_adapters[adapter_name]())
+        if adapter_name in ADAPTERS:
+            selected_adapters.append(_adapter_class(adapter_name)())
         else:
             typer.echo(f"Adapter {adapter_name} not found.")
 
@@ -80,13 +221,26 @@ def run(
         typer.echo("No valid adapters or scenarios selected. Exiting.")
         raise typer.Exit(code=1)
 
-    runner = Runner(selected_adapters, selected_scenarios)
-    # Simplified kwargs for now
-    results = runner.run(**config)
+    selected_adapters = _apply_policy(selected_adapters, config.get("policy"))
+    selected_adapters, writers = _record_traces(selected_adapters, record_trace)
+    runner = Runner(
+        selected_adapters,
+        selected_scenarios,
+        profile_dir=artifacts_dir / "profiles" if profile else None,
+        profile_mode=profile_mode,
+        store=store,
+        trace_spans=spans,
+    )
+    try:
+        results = runner.run(**config)
+    finally:
+        _close(selected_adapters, writers)
 
     typer.echo("Benchmark run completed.")
-    # In the future, results will be written to artifacts.
+    typer.echo(f"Artifacts written to {store.directory}")
     print(results)
+    if profile:
+        typer.echo(f"Profiles written to {artifacts_dir / 'profiles'}")
 
 
 @app.command()
@@ -94,8 +248,48 @@ def report(
     artifacts_dir: Path = typer.Option(Path("./artifacts"), "--artifacts-dir", "-o")
 ) -> None:
     """Compile artifacts into an HTML report."""
-    generate_report(artifacts_dir)
-    typer.echo(f"Report generated at {artifacts_dir / 'report.html'}")
+    counts = generate_report(artifacts_dir)
+    typer.echo(
+        f"Report generated at {artifacts_dir / 'report.html'}"
+        f" ({counts['rendered']} metrics files rendered,"
+        f" {counts['reused']} unchanged)"
+    )
+
+
+@app.command()
+def worker(
+    connect: str = typer.Option(..., "--connect", help="Coordinator host:port."),
+) -> None:
+    """Run a load generator for a coordinator on another host.
+
+    The coordinator's key is read from the VDBT_WORKER_AUTHKEY environment
+    variable.
+    """
+    host, port = connect.rsplit(":", 1)
+    run_worker((host, int(port)), os.environ[AUTHKEY_ENV].encode())
+
+
+@app.command("serve-qdrant")
+def serve_qdrant(
+    host: str = typer.Option("127.0.0.1", "--host"),
+    port: int = typer.Option(6333, "--port", "-p"),
+    latency_ms: float = typer.Option(0.0, "--latency-ms"),
+    jitter_ms: float = typer.Option(0.0, "--jitter-ms"),
+) -> None:
+    """Serve a local stand-in for the Qdrant REST API."""
+    server = QdrantStandIn(
+        host=host,
+        port=port,
+        latency_s=latency_ms / 1000.0,
+        jitter_s=jitter_ms / 1000.0,
+    )
+    typer.echo(f"Qdrant stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
 
 
 if __name__ == "__main__":
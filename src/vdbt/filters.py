@@ -0,0 +1,174 @@
+"""A backend-neutral language for metadata filters.
+
+A filter is a JSON-compatible dictionary. Each entry is a condition and all
+of them must hold:
+
+    {"label": 3}                          # equality
+    {"label": [1, 2, 5]}                  # any of a list of values
+    {"price": {"gte": 10.0, "lt": 20.0}}  # range, with gt/gte/lt/lte bounds
+    {"$and": [filter, ...]}               # every nested filter holds
+    {"$or": [filter, ...]}                # at least one nested filter holds
+    {"$not": [filter, ...]}               # no nested filter holds
+
+so `{"label": 3, "$or": [{"a": 1}, {"b": 2}]}` reads "label is 3 and either
+a is 1 or b is 2". A condition on a field a record lacks never holds.
+
+Adapters translate filters to their native form: a vectorized mask over
+metadata columns (`filter_mask`), a per-record predicate
+(`filter_predicate`), or their server's filter syntax.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+AND = "$and"
+OR = "$or"
+NOT = "$not"
+OPERATORS = (AND, OR, NOT)
+RANGE_OPS = ("gt", "gte", "lt", "lte")
+
+
+def _check_range(condition: Dict[str, Any]) -> None:
+    unknown = set(condition) - set(RANGE_OPS)
+    if unknown:
+        raise ValueError(f"Unknown range bounds {sorted(unknown)}; use {RANGE_OPS}")
+
+
+def _check_operator(key: str) -> None:
+    if key.startswith("$") and key not in OPERATORS:
+        raise ValueError(f"Unknown filter operator {key!r}; expected {OPERATORS}")
+
+
+def condition_mask(
+    values: np.ndarray[Any, Any], condition: Any
+) -> np.ndarray[Any, Any]:
+    """Returns where one field condition holds.
+
+    Args:
+        values: The field's value in every record. In object arrays, None
+            marks records without the field.
+        condition: A value, a list of values or a range dictionary.
+    """
+    present = values != None  # noqa: E711
+    if isinstance(condition, dict):
+        _check_range(condition)
+        mask = np.asarray(present, dtype=bool).copy()
+        bounded = values[mask]
+        sub = np.ones(len(bounded), dtype=bool)
+        if "gt" in condition:
+            sub &= bounded > condition["gt"]
+        if "gte" in condition:
+            sub &= bounded >= condition["gte"]
+        if "lt" in condition:
+            sub &= bounded < condition["lt"]
+        if "lte" in condition:
+            sub &= bounded <= condition["lte"]
+        mask[mask] = sub
+        return mask
+    if isinstance(condition, (list, tuple, set)):
+        return np.asarray(np.isin(values, list(condition)), dtype=bool)
+    return np.asarray(values == condition, dtype=bool)
+
+
+def filter_mask(
+    filter: Optional[Dict[str, Any]],
+    column: Callable[[str], Optional[np.ndarray[Any, Any]]],
+    size: int,
+) -> np.ndarray[Any, Any]:
+    """Evaluates a filter over columnar metadata.
+
+    Args:
+        filter: The filter, or None to match everything.
+        column: Returns the values of a field for every record, or None if
+            no record has it.
+        size: The number of records.
+
+    Returns:
+        A boolean mask of the matching records.
+
+    Raises:
+        ValueError: If the filter uses an unknown operator or range bound.
+    """
+    mask = np.ones(size, dtype=bool)
+    for key, condition in (filter or {}).items():
+        _check_operator(key)
+        if key == AND:
+            for nested in condition:
+                mask &= filter_mask(nested, column, size)
+        elif key == OR:
+            matched = np.zeros(size, dtype=bool)
+            for nested in condition:
+                matched |= filter_mask(nested, column, size)
+            mask &= matched
+        elif key == NOT:
+            for nested in condition:
+                mask &= ~filter_mask(nested, column, size)
+        else:
+            values = column(key)
+            if values is None:
+                return np.zeros(size, dtype=bool)
+            mask &= condition_mask(values, condition)
+    return mask
+
+
+def _holds(value: Any, condition: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(condition, dict):
+        return (
+            ("gt" not in condition or value > condition["gt"])
+            and ("gte" not in condition or value >= condition["gte"])
+            and ("lt" not in condition or value < condition["lt"])
+            and ("lte" not in condition or value <= condition["lte"])
+        )
+    if isinstance(condition, (list, tuple, set)):
+        return value in condition
+    return bool(value == condition)
+
+
+def validate_filter(filter: Dict[str, Any]) -> None:
+    """Raises ValueError if a filter uses an unknown operator or range bound."""
+    for key, condition in filter.items():
+        _check_operator(key)
+        if key in OPERATORS:
+            for nested in condition:
+                validate_filter(nested)
+        elif isinstance(condition, dict):
+            _check_range(condition)
+
+
+def _matches(meta: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    for key, condition in filter.items():
+        if key == AND:
+            held = all(_matches(meta, nested) for nested in condition)
+        elif key == OR:
+            held = any(_matches(meta, nested) for nested in condition)
+        elif key == NOT:
+            held = not any(_matches(meta, nested) for nested in condition)
+        else:
+            held = _holds(meta.get(key), condition)
+        if not held:
+            return False
+    return True
+
+
+def filter_predicate(
+    filter: Optional[Dict[str, Any]],
+) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """Compiles a filter into a test of one metadata dictionary.
+
+    Returns:
+        The predicate, or None if the filter is empty.
+
+    Raises:
+        ValueError: If the filter uses an unknown operator or range bound.
+    """
+    if not filter:
+        return None
+    validate_filter(filter)
+
+    def matches(meta: Dict[str, Any]) -> bool:
+        return _matches(meta, filter)
+
+    return matches
@@ -0,0 +1,288 @@
+"""Multi-process load generation with a coordinator.
+
+A single Python process cannot saturate a remote backend: the GIL and the
+client's own overhead cap its query rate. The coordinator instead hands a
+slice of the query stream to each of several worker processes, which
+connect back to it over a TCP control channel. Workers can be spawned
+locally or started on other hosts with `vdbt worker`.
+
+The protocol, per worker connection:
+
+1. coordinator -> worker: the job (adapter, collection, queries, limits).
+2. worker -> coordinator: "ready" once connected to the backend.
+3. coordinator -> worker: a wall-clock start time, sent only when every
+   worker is ready, so all of them start together.
+4. worker -> coordinator: its latency histogram and counters.
+
+Histograms share one bucket configuration, so merging them is exact.
+"""
+
+import contextlib
+import logging
+import multiprocessing
+import os
+import secrets
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from vdbt.adapters.base import RemoteVectorDB, VectorDB, unwrap
+from vdbt.utils.histogram import LatencyHistogram
+
+AUTHKEY_ENV = "VDBT_WORKER_AUTHKEY"
+# Time between the start signal and the shared start time, so every worker
+# receives the signal before the start.
+_START_LEAD_S = 0.2
+
+
+def generate_load(
+    db: VectorDB,
+    collection_name: str,
+    queries: np.ndarray[Any, Any],
+    k: int,
+    duration_s: float,
+    max_queries: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Issues queries one at a time, cycling through `queries`.
+
+    Args:
+        db: The adapter to query.
+        collection_name: The collection to query.
+        queries: The query vectors, one per row.
+        k: The number of neighbors per query.
+        duration_s: How long to issue queries, in seconds.
+        max_queries: Stop after this many queries, if reached first.
+
+    Returns:
+        The latency histogram (as `LatencyHistogram.to_dict`), the numbers of
+        successful and failed queries, and the wall-clock start and end.
+    """
+    histogram = LatencyHistogram()
+    clock = time.perf_counter_ns
+    batches = [queries[i : i + 1] for i in range(len(queries))]
+    count = 0
+    errors = 0
+    started = time.time()
+    deadline = clock() + int(duration_s * 1e9)
+    while max_queries is None or count + errors < max_queries:
+        start = clock()
+        if start >= deadline:
+            break
+        try:
+            db.search(collection_name, batches[(count + errors) % len(batches)], k=k)
+        except Exception as e:
+            errors += 1
+            logging.warning(f"Load query failed: {e}")
+            continue
+        histogram.record_ns(clock() - start)
+        count += 1
+    return {
+        "histogram": histogram.to_dict(),
+        "queries": count,
+        "errors": errors,
+        "started": started,
+        "finished": time.time(),
+    }
+
+
+def run_worker(address: Tuple[str, int], authkey: bytes) -> None:
+    """Connects to a coordinator, runs the job it sends and reports back."""
+    with Client(address, authkey=authkey) as conn:
+        job = conn.recv()
+        try:
+            db = job["adapter"](**job["adapter_kwargs"])
+            db.connect()
+        except Exception as e:
+            conn.send({"type": "error", "error": str(e)})
+            return
+        conn.send({"type": "ready"})
+        start_at = conn.recv()["start_at"]
+        time.sleep(max(0.0, start_at - time.time()))
+        result = generate_load(
+            db,
+            job["collection_name"],
+            job["queries"],
+            job["k"],
+            job["duration_s"],
+            job["max_queries"],
+        )
+        conn.send({"type": "result", **result})
+
+
+def _accept(listener: Listener, count: int, timeout_s: float) -> List[Connection]:
+    """Accepts `count` worker connections.
+
+    Raises:
+        TimeoutError: If fewer workers connect within `timeout_s`. The
+            listener and the connections accepted so far are closed.
+    """
+    conns: List[Connection] = []
+    lock = threading.Lock()
+    expired = threading.Event()
+
+    def accept() -> None:
+        while len(conns) < count:
+            try:
+                conn = listener.accept()
+            except Exception:
+                if expired.is_set():
+                    return
+                raise
+            with lock:
+                if expired.is_set():
+                    conn.close()
+                    return
+                conns.append(conn)
+
+    # Listener.accept has no timeout of its own.
+    thread = threading.Thread(target=accept, daemon=True)
+    thread.start()
+    thread.join(timeout_s)
+    with lock:
+        if len(conns) == count:
+            return conns
+        expired.set()
+    address = listener.address
+    listener.close()
+    # Closing the listener does not wake a blocked accept, which keeps the
+    # port open; a throwaway connection does.
+    with contextlib.suppress(OSError):
+        socket.create_connection(address, timeout=1).close()
+    thread.join(1)
+    for conn in conns:
+        conn.close()
+    raise TimeoutError(f"Only {len(conns)} of {count} workers connected")
+
+
+def _stop(processes: List[Any], timeout_s: float) -> None:
+    """Waits for worker processes to exit and terminates those that do not."""
+    for process in processes:
+        process.join(timeout_s)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+
+def run_distributed(
+    db: RemoteVectorDB,
+    collection_name: str,
+    queries: np.ndarray[Any, Any],
+    k: int,
+    workers: int,
+    duration_s: float,
+    max_queries: Optional[int] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    spawn: bool = True,
+    connect_timeout_s: float = 60.0,
+) -> Dict[str, Any]:
+    """Generates query load from several worker processes.
+
+    Args:
+        db: The adapter whose backend the workers query. Workers rebuild
+            the adapter at the bottom of any wrappers, so wrappers such as a
+            `PolicyAdapter` only apply in this process.
+        collection_name: The collection to query.
+        queries: The query stream. Worker `i` of `n` gets rows `i::n`.
+        k: The number of neighbors per query.
+        workers: The number of worker processes.
+        duration_s: How long each worker issues queries, in seconds.
+        max_queries: The most queries each worker issues.
+        host: The address the coordinator listens on.
+        port: The port the coordinator listens on; 0 picks a free port.
+        spawn: Spawn the workers locally. Otherwise wait for workers started
+            with `vdbt worker`, which read the key from `VDBT_WORKER_AUTHKEY`.
+        connect_timeout_s: How long to wait for workers to connect.
+
+    Returns:
+        The merged latency histogram summary and throughput, plus the
+        counters of each worker.
+    """
+    authkey = os.environ.get(AUTHKEY_ENV, "").encode() or secrets.token_bytes(16)
+    processes: List[Any] = []
+    with Listener((host, port), authkey=authkey) as listener:
+        if spawn:
+            context = multiprocessing.get_context("spawn")
+            processes = [
+                context.Process(
+                    target=run_worker, args=(listener.address, authkey), daemon=True
+                )
+                for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+        else:
+            logging.info(f"Waiting for {workers} workers on {listener.address}")
+
+        conns: List[Connection] = []
+        # Workers get time to exit only if the run finished; otherwise they
+        # may never hear from the coordinator again.
+        exit_timeout_s = 0.0
+        try:
+            conns = _accept(listener, workers, connect_timeout_s)
+            for i, conn in enumerate(conns):
+                conn.send(
+                    {
+                        "adapter": type(unwrap(db)),
+                        "adapter_kwargs": db.connection_kwargs(),
+                        "collection_name": collection_name,
+                        "queries": queries[i::workers],
+                        "k": k,
+                        "duration_s": duration_s,
+                        "max_queries": max_queries,
+                    }
+                )
+            for conn in conns:
+                message = conn.recv()
+                if message["type"] == "error":
+                    raise RuntimeError(f"Worker failed to start: {message['error']}")
+
+            # The start barrier: nobody starts until everyone is ready.
+            start_at = time.time() + _START_LEAD_S
+            for conn in conns:
+                conn.send({"start_at": start_at})
+            reports = [conn.recv() for conn in conns]
+            exit_timeout_s = 10.0
+        finally:
+            for conn in conns:
+                conn.close()
+            _stop(processes, exit_timeout_s)
+
+    return merge_reports(reports)
+
+
+def merge_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merges the reports of several workers exactly.
+
+    Throughput is the total number of queries over the wall-clock span from
+    the first worker's start to the last worker's end.
+    """
+    histogram = LatencyHistogram()
+    for report in reports:
+        histogram.merge(LatencyHistogram.from_dict(report["histogram"]))
+    queries = sum(report["queries"] for report in reports)
+    elapsed = max(r["finished"] for r in reports) - min(r["started"] for r in reports)
+    return {
+        "workers": len(reports),
+        "queries": queries,
+        "errors": sum(report["errors"] for report in reports),
+        "elapsed_s": elapsed,
+        "qps": queries / elapsed if elapsed > 0 else 0.0,
+        "latency_s": histogram.summary(),
+        "per_worker": [
+            {
+                "queries": report["queries"],
+                "errors": report["errors"],
+                "qps": (
+                    report["queries"] / (report["finished"] - report["started"])
+                    if report["finished"] > report["started"]
+                    else 0.0
+                ),
+            }
+            for report in reports
+        ],
+    }
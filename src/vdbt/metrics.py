@@ -99,3 +99,95 @@ def ndcg_at_k(y_true: List[Any], y_pred: List[List[Any]], k: int) -> float:
         total_ndcg += dcg / idcg
 
     return total_ndcg / len(y_true)
+
+
+def neighbor_recall_at_k(
+    true_neighbors: np.ndarray[Any, Any], pred_neighbors: np.ndarray[Any, Any], k: int
+) -> float:
+    """Computes recall@k against exact nearest-neighbour ground truth.
+
+    Args:
+        true_neighbors: The (num_queries, >=k) ids of the exact neighbours.
+        pred_neighbors: The (num_queries, >=k) ids returned by the index.
+        k: The number of neighbours to consider.
+
+    Returns:
+        The mean fraction of each query's true top-k found in its predicted
+        top-k.
+    """
+    if len(true_neighbors) == 0:
+        return 0.0
+
+    hits = sum(
+        len(set(true_row[:k].tolist()) & set(pred_row[:k].tolist()))
+        for true_row, pred_row in zip(true_neighbors, pred_neighbors, strict=True)
+    )
+    return hits / (len(true_neighbors) * k)
+
+
+def exact_neighbors(
+    base: np.ndarray[Any, Any],
+    queries: np.ndarray[Any, Any],
+    k: int,
+    metric: str = "l2",
+    max_block: int = 10_000_000,
+) -> np.ndarray[Any, Any]:
+    """Finds the exact nearest neighbours of each query by brute force.
+
+    Args:
+        base: The (num_base, dim) vectors to search.
+        queries: The (num_queries, dim) query vectors.
+        k: The number of neighbours per query.
+        metric: "l2", "ip" or "cosine".
+        max_block: The most query-base scores computed at once.
+
+    Returns:
+        A (num_queries, k) int64 array of row indices into `base`, nearest
+        first.
+    """
+    base = np.asarray(base, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    if metric == "cosine":
+        base = base / np.maximum(np.linalg.norm(base, axis=1, keepdims=True), 1e-12)
+        queries = queries / np.maximum(
+            np.linalg.norm(queries, axis=1, keepdims=True), 1e-12
+        )
+    elif metric not in ("l2", "ip"):
+        raise ValueError(f"Unsupported metric {metric!r}")
+    k = min(k, len(base))
+    sq_norms = np.einsum("ij,ij->i", base, base) if metric == "l2" else None
+
+    neighbors = np.empty((len(queries), k), dtype=np.int64)
+    step = max(1, max_block // max(1, len(base)))
+    for start in range(0, len(queries), step):
+        scores = queries[start : start + step] @ base.T
+        if sq_norms is not None:
+            # Ranking by -||q - b||^2 only needs 2 q.b - ||b||^2.
+            scores = 2 * scores - sq_norms
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        neighbors[start : start + step] = np.take_along_axis(top, order, axis=1)
+    return neighbors
+
+
+def linear_trend(x: List[float], y: List[float]) -> Dict[str, float]:
+    """Fits a least-squares line to a series.
+
+    Args:
+        x: The sample positions, e.g. elapsed seconds.
+        y: The sampled values.
+
+    Returns:
+        A dictionary with the "slope" and "intercept" of the fitted line and
+        its coefficient of determination "r2". Fewer than two samples give a
+        flat line.
+    """
+    if len(x) < 2:
+        return {"slope": 0.0, "intercept": float(y[0]) if y else 0.0, "r2": 0.0}
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    slope, intercept = np.polyfit(xs, ys, 1)
+    residual = float(((ys - (slope * xs + intercept)) ** 2).sum())
+    total = float(((ys - ys.mean()) ** 2).sum())
+    r2 = 1.0 - residual / total if total > 0 else 0.0
+    return {"slope": float(slope), "intercept": float(intercept), "r2": r2}
@@ -1,102 +1,307 @@
-"""Report generation for benchmark results."""
+"""Report generation for benchmark results.
 
+The report is built incrementally. Each metrics file is rendered on its own
+into HTML fragments under `<artifacts_dir>/plots/fragments/`, and a fragment
+is only re-rendered when its metrics file changes, so rebuilding the report
+after a run costs little more than rendering that run's results. Raw latency
+data is downsampled before plotting: histograms and long latency series in
+the results become a CDF of at most `CDF_POINTS` points and a histogram of
+at most `HISTOGRAM_BINS` bins. Every chart shares one copy of plotly.js,
+written next to the fragments, and the page is streamed to disk fragment by
+fragment.
+"""
+
+import hashlib
 import json
+import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
 
+import numpy as np
+import orjson
+import plotly
 import plotly.graph_objects as go
 from markdown import markdown
-from plotly.offline import plot
+from plotly.offline import get_plotlyjs
 
+from vdbt.artifacts import write_atomic
+from vdbt.utils.histogram import LatencyHistogram
 
-def generate_report(
-    artifacts_dir: Path, output_file: Path = Path("report.html")
-) -> None:
-    """Generates an HTML report from benchmark artifacts.
+# Bump to re-render every fragment when the charts change.
+_RENDER_VERSION = 1
+SECTIONS = ("latency", "recall", "distributions")
+CDF_POINTS = 200
+HISTOGRAM_BINS = 50
+# Latency series shorter than this are plotted as they are.
+_MIN_SERIES = 32
+_MAX_TRACES = 12
+_CACHE = "cache.json"
+_HISTOGRAM_KEYS = {"min_s", "max_s", "precision", "buckets", "counts"}
 
-    Args:
-        artifacts_dir: The directory containing the benchmark artifacts.
-        output_file: The path to the output HTML report file.
+
+def _profile_links(profiles_dir: Path, report_dir: Path) -> str:
+    """Lists the profiles written by `vdbt run --profile` as Markdown links.
+
+    Profiles are stored as `<adapter>/<scenario>/<phase>.<ext>`; links are
+    relative to the directory of the report.
     """
-    metrics_dir = artifacts_dir / "metrics"
-    plots_dir = artifacts_dir / "plots"
-    plots_dir.mkdir(parents=True, exist_ok=True)
-
-    all_metrics: Dict[str, Any] = {}
-    for metric_file in metrics_dir.glob("*.json"):
-        with open(metric_file, "r") as f:
-            backend, scenario = metric_file.stem.split("_", 1)
-            if backend not in all_metrics:
-                all_metrics[backend] = {}
-            all_metrics[backend][scenario] = json.load(f)
-
-    # Plotting Latency vs Scale
-    latency_plot_html = ""
-    for backend, scenarios in all_metrics.items():
-        if "scale_curve" in scenarios:
-            scale_data = scenarios["scale_curve"]
-            scales = sorted([int(s) for s in scale_data.keys()])
-            p50_latencies = [
-                scale_data[str(s)]["query_latency_s"]["p50"] for s in scales
-            ]
-            p95_latencies = [
-                scale_data[str(s)]["query_latency_s"]["p95"] for s in scales
-            ]
-
-            fig = go.Figure()
-            fig.add_trace(
-                go.Scatter(
-                    x=scales, y=p50_latencies, mode="lines+markers", name="p50 Latency"
-                )
-            )
-            fig.add_trace(
-                go.Scatter(
-                    x=scales, y=p95_latencies, mode="lines+markers", name="p95 Latency"
-                )
-            )
-            fig.update_layout(
-                title=f"{backend} - Query Latency vs Scale",
-                xaxis_title="Number of Embeddings",
-                yaxis_title="Latency (s)",
-            )
-            plot_path = plots_dir / f"{backend}_latency_vs_scale.html"
-            plot(fig, filename=str(plot_path), auto_open=False)
-            latency_plot_html += (
-                f'<iframe src="{plot_path.name}" width="100%" height="500px">'
-                "</iframe>\n"
-            )
+    lines: List[str] = []
+    for scenario_dir in sorted(profiles_dir.glob("*/*")):
+        links = [
+            f"[{path.stem}]({os.path.relpath(path, report_dir)})"
+            for path in sorted(scenario_dir.iterdir())
+            if path.is_file()
+        ]
+        if links:
+            backend, scenario = scenario_dir.parent.name, scenario_dir.name
+            lines.append(f"- **{backend} / {scenario}:** " + ", ".join(links))
+    if not lines:
+        return "No profiles were recorded. Run with `vdbt run --profile`."
+    return (
+        "Collapsed stacks (`.collapsed`) open in speedscope or flamegraph.pl;"
+        " cProfile dumps (`.prof`) open in snakeviz.\n\n" + "\n".join(lines)
+    )
 
-    # Plotting Recall vs Noise
-    recall_plot_html = ""
-    for backend, scenarios in all_metrics.items():
-        if "noise_injection" in scenarios:
-            noise_data = scenarios["noise_injection"]
-            noise_ratios = sorted([float(r) for r in noise_data.keys()])
-            recall_at_10 = [noise_data[str(r)]["recall@10"] for r in noise_ratios]
-
-            fig = go.Figure()
-            fig.add_trace(
-                go.Scatter(
-                    x=noise_ratios,
-                    y=recall_at_10,
-                    mode="lines+markers",
-                    name="Recall@10",
-                )
-            )
-            fig.update_layout(
-                title=f"{backend} - Recall@10 vs Noise Ratio",
-                xaxis_title="Noise Ratio",
-                yaxis_title="Recall@10",
-            )
-            plot_path = plots_dir / f"{backend}_recall_vs_noise.html"
-            plot(fig, filename=str(plot_path), auto_open=False)
-            recall_plot_html += (
-                f'<iframe src="{plot_path.name}" width="100%" height="500px">'
-                "</iframe>\n"
+
+def _latency_series(
+    results: Any, path: Tuple[str, ...] = ()
+) -> Iterator[Tuple[str, LatencyHistogram]]:
+    """Finds the latency distributions in a scenario's results.
+
+    Yields serialized `LatencyHistogram`s, and lists of at least
+    `_MIN_SERIES` latencies under a key mentioning latency, which are counted
+    into a histogram, each labelled by its path in the results.
+    """
+    if isinstance(results, dict):
+        if _HISTOGRAM_KEYS <= results.keys():
+            yield "/".join(path), LatencyHistogram.from_dict(results)
+            return
+        for key, value in results.items():
+            yield from _latency_series(value, path + (str(key),))
+    elif isinstance(results, list):
+        numeric = all(
+            isinstance(value, (int, float)) and not isinstance(value, bool)
+            for value in results
+        )
+        if numeric and len(results) >= _MIN_SERIES and "latenc" in path[-1]:
+            histogram = LatencyHistogram()
+            histogram.record_many(np.asarray(results, dtype=np.float64))
+            yield "/".join(path), histogram
+
+
+def _figure_html(fig: go.Figure) -> str:
+    """Renders a figure as a div that relies on the shared plotly.js."""
+    html: str = fig.to_html(
+        full_html=False, include_plotlyjs=False, default_height="500px"
+    )
+    return html
+
+
+def _sweep_points(
+    data: Dict[str, Any], metric: str
+) -> List[Tuple[float, Dict[str, Any]]]:
+    """Returns the entries of a sweep that report `metric`, by swept value.
+
+    Keys that are not numbers, such as a "supported" flag, and entries
+    without the metric, such as failed jobs, are skipped.
+    """
+    points = []
+    for key, value in data.items():
+        try:
+            x = float(key)
+        except ValueError:
+            continue
+        if isinstance(value, dict) and metric in value:
+            points.append((x, value))
+    return sorted(points, key=lambda point: point[0])
+
+
+def _scale_chart(backend: str, scale_data: Dict[str, Any]) -> Optional[str]:
+    points = _sweep_points(scale_data, "query_latency_s")
+    if not points:
+        return None
+    scales = [int(x) for x, _ in points]
+    p50_latencies = [entry["query_latency_s"]["p50"] for _, entry in points]
+    p95_latencies = [entry["query_latency_s"]["p95"] for _, entry in points]
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(x=scales, y=p50_latencies, mode="lines+markers", name="p50 Latency")
+    )
+    fig.add_trace(
+        go.Scatter(x=scales, y=p95_latencies, mode="lines+markers", name="p95 Latency")
+    )
+    fig.update_layout(
+        title=f"{backend} - Query Latency vs Scale",
+        xaxis_title="Number of Embeddings",
+        yaxis_title="Latency (s)",
+    )
+    return _figure_html(fig)
+
+
+def _noise_chart(backend: str, noise_data: Dict[str, Any]) -> Optional[str]:
+    points = _sweep_points(noise_data, "recall@10")
+    if not points:
+        return None
+    noise_ratios = [x for x, _ in points]
+    recall_at_10 = [entry["recall@10"] for _, entry in points]
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=noise_ratios, y=recall_at_10, mode="lines+markers", name="Recall@10"
+        )
+    )
+    fig.update_layout(
+        title=f"{backend} - Recall@10 vs Noise Ratio",
+        xaxis_title="Noise Ratio",
+        yaxis_title="Recall@10",
+    )
+    return _figure_html(fig)
+
+
+def _distribution_charts(
+    backend: str, scenario: str, series: List[Tuple[str, LatencyHistogram]]
+) -> str:
+    """Plots the CDF and histogram of up to `_MAX_TRACES` latency series."""
+    cdf = go.Figure()
+    bars = go.Figure()
+    for label, histogram in series[:_MAX_TRACES]:
+        latency, fraction = histogram.cdf(CDF_POINTS)
+        cdf.add_trace(
+            go.Scatter(x=latency, y=fraction, mode="lines", name=label or scenario)
+        )
+        edges, counts = histogram.bins(HISTOGRAM_BINS)
+        bars.add_trace(
+            go.Bar(
+                x=(edges[:-1] * edges[1:]) ** 0.5,
+                y=counts,
+                width=edges[1:] - edges[:-1],
+                name=label or scenario,
+                opacity=0.6,
             )
+        )
+    title = f"{backend} - {scenario}"
+    if len(series) > _MAX_TRACES:
+        title += f" (first {_MAX_TRACES} of {len(series)} series)"
+    cdf.update_layout(
+        title=f"{title} - Latency CDF",
+        xaxis_title="Latency (s)",
+        xaxis_type="log",
+        yaxis_title="Fraction of Requests",
+    )
+    bars.update_layout(
+        title=f"{title} - Latency Histogram",
+        xaxis_title="Latency (s)",
+        xaxis_type="log",
+        yaxis_title="Requests",
+        barmode="overlay",
+    )
+    return _figure_html(cdf) + _figure_html(bars)
+
+
+def render_metrics(
+    backend: str, scenario: str, results: Dict[str, Any]
+) -> Dict[str, str]:
+    """Renders the charts of one metrics file.
+
+    Returns:
+        The HTML of each report section the results contribute to, keyed by
+        an entry of `SECTIONS`.
+    """
+    fragments = {}
+    if scenario == "scale_curve":
+        chart = _scale_chart(backend, results)
+        if chart is not None:
+            fragments["latency"] = chart
+    if scenario == "noise_injection":
+        chart = _noise_chart(backend, results)
+        if chart is not None:
+            fragments["recall"] = chart
+    series = list(_latency_series(results))
+    if series:
+        fragments["distributions"] = _distribution_charts(backend, scenario, series)
+    return fragments
+
+
+def _plotly_include(plots_dir: Path) -> Path:
+    """Writes plotly.js once per version and returns its path."""
+    path = plots_dir / f"plotly-{plotly.__version__}.min.js"
+    if not path.exists():
+        write_atomic(path, get_plotlyjs().encode())
+    return path
+
+
+class _FragmentCache:
+    """Rendered fragments of metrics files, keyed by each file's stat.
+
+    Args:
+        directory: Where fragments and the cache index are stored.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.rendered = 0
+        self.reused = 0
+        index_path = directory / _CACHE
+        index: Dict[str, Any] = {}
+        if index_path.exists():
+            index = json.loads(index_path.read_text())
+        if index.get("version") != _RENDER_VERSION:
+            index = {"version": _RENDER_VERSION, "files": {}}
+        self._entries: Dict[str, Any] = index["files"]
+        self._seen: Dict[str, Any] = {}
 
-    # Executive Summary (Markdown to HTML)
-    executive_summary_md = """
+    def _fragment(self, name: str, section: str) -> Path:
+        digest = hashlib.sha1(name.encode()).hexdigest()[:12]
+        return self.directory / f"{digest}.{section}.html"
+
+    def update(self, metric_file: Path) -> None:
+        """Renders a metrics file unless it is unchanged since the last build."""
+        stat = metric_file.stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry = self._entries.get(metric_file.name)
+        if entry is not None and entry["key"] == key:
+            self.reused += 1
+            self._seen[metric_file.name] = entry
+            return
+        backend, scenario = metric_file.stem.split("_", 1)
+        fragments = render_metrics(
+            backend, scenario, orjson.loads(metric_file.read_bytes())
+        )
+        for section in SECTIONS:
+            path = self._fragment(metric_file.name, section)
+            if section in fragments:
+                write_atomic(path, fragments[section].encode())
+            elif path.exists():
+                path.unlink()
+        self.rendered += 1
+        self._seen[metric_file.name] = {"key": key, "sections": sorted(fragments)}
+
+    def write_section(self, section: str, out: TextIO) -> bool:
+        """Copies the fragments of a section to `out`, in file name order.
+
+        Returns:
+            Whether any fragment was written.
+        """
+        written = False
+        for name in sorted(self._seen):
+            if section in self._seen[name]["sections"]:
+                out.write(self._fragment(name, section).read_text())
+                out.write("\n")
+                written = True
+        return written
+
+    def save(self) -> None:
+        """Stores the index and removes fragments of deleted metrics files."""
+        for name in set(self._entries) - set(self._seen):
+            for section in SECTIONS:
+                self._fragment(name, section).unlink(missing_ok=True)
+        index = {"version": _RENDER_VERSION, "files": self._seen}
+        write_atomic(self.directory / _CACHE, json.dumps(index).encode())
+
+
+_SUMMARY = """
 # Benchmark Report
 
 ## Executive Summary
@@ -114,45 +319,72 @@ different stress workloads.
 ### Shortcomings Observed:
 
 - FAISS, being an in-memory index, does not persist data across runs.
-- The current FAISS implementation does not support direct filtering or
-  efficient deletions.
+- The current FAISS implementation does not support efficient deletions.
 
 ## Detailed Results
+"""
 
-### Query Latency vs Scale
+_TITLES = {
+    "latency": "Query Latency vs Scale",
+    "recall": "Recall vs Noise Ratio",
+    "distributions": "Latency Distributions",
+}
 
-{latency_plots}
 
-### Recall vs Noise Ratio
+def generate_report(
+    artifacts_dir: Path, output_file: Optional[Path] = None
+) -> Dict[str, int]:
+    """Generates an HTML report from benchmark artifacts.
 
-{recall_plots}
+    Only metrics files that changed since the last report are rendered
+    again; the others reuse their cached fragments.
 
- """.format(
-        latency_plots=latency_plot_html, recall_plots=recall_plot_html
-    )
+    Args:
+        artifacts_dir: The directory containing the benchmark artifacts.
+        output_file: The path to the output HTML report file. Defaults to
+            `report.html` in the artifacts directory.
 
-    executive_summary_html = markdown(executive_summary_md)
+    Returns:
+        The number of metrics files rendered and reused.
+    """
+    output_file = output_file or artifacts_dir / "report.html"
+    report_dir = output_file.resolve().parent
+    plots_dir = artifacts_dir / "plots"
+    fragments_dir = plots_dir / "fragments"
+    fragments_dir.mkdir(parents=True, exist_ok=True)
 
-    # Combine into final HTML
-    html_content = f"""
-<!DOCTYPE html>
+    cache = _FragmentCache(fragments_dir)
+    for metric_file in sorted((artifacts_dir / "metrics").glob("*.json")):
+        cache.update(metric_file)
+    cache.save()
+
+    plotly_js = os.path.relpath(_plotly_include(plots_dir), report_dir)
+    profile_links = _profile_links(artifacts_dir / "profiles", report_dir)
+
+    tmp = output_file.with_name(f".{output_file.name}.tmp")
+    with open(tmp, "w") as out:
+        out.write(f"""<!DOCTYPE html>
 <html>
 <head>
     <title>VectorDB Stress Tester Report</title>
+    <script src="{plotly_js}"></script>
     <style>
         body {{ font-family: sans-serif; margin: 20px; }}
         h1, h2, h3 {{ color: #333; }}
-        iframe {{ border: none; }}
     </style>
 </head>
 <body>
-    {executive_summary_html}
-</body>
-</html>
-"""
-
-    with open(output_file, "w") as f:
-        f.write(html_content)
+""")
+        out.write(markdown(_SUMMARY))
+        for section in SECTIONS:
+            out.write(f"\n<h3>{_TITLES[section]}</h3>\n")
+            if not cache.write_section(section, out):
+                out.write("<p>No results.</p>\n")
+        out.write("\n<h3>Profiles</h3>\n")
+        out.write(markdown(profile_links))
+        out.write("\n</body>\n</html>\n")
+    os.replace(tmp, output_file)
+    return {"rendered": cache.rendered, "reused": cache.reused}
 
 
 if __name__ == "__main__":
@@ -1,38 +1,195 @@
 """The main runner for orchestrating benchmark scenarios."""
 
 import logging
-from typing import Any, Dict, Sequence
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Dict, List, Optional, Sequence, Tuple
 
 from vdbt.adapters.base import VectorDB
+from vdbt.adapters.policy import find_policy, merge_stats
+from vdbt.artifacts import RunStore, job_id
 from vdbt.scenarios.base import Scenario
+from vdbt.utils.profiling import profile
+from vdbt.utils.timing import SpanRecorder, record_spans
 
 
 class Runner:
-    """Orchestrates benchmark runs across adapters and scenarios."""
+    """Orchestrates benchmark runs across adapters and scenarios.
 
-    def __init__(self, adapters: Sequence[VectorDB], scenarios: Sequence[Scenario]):
+    Args:
+        adapters: The adapters to run every scenario on.
+        scenarios: The scenarios to run.
+        profile_dir: If set, every scenario run is profiled and one file per
+            phase is written to `<profile_dir>/<adapter>/<scenario>/`.
+        profile_mode: The profiler to use; see `vdbt.utils.profiling`.
+        store: If set, every job is checkpointed to this run as soon as it
+            finishes, and jobs it already completed are skipped. Span and
+            policy summaries are written next to its metrics.
+        trace_spans: Break adapter calls into timing spans. Off by default,
+            since timing every span adds several microseconds to each call,
+            and with it to the latencies the scenarios measure.
+    """
+
+    def __init__(
+        self,
+        adapters: Sequence[VectorDB],
+        scenarios: Sequence[Scenario],
+        profile_dir: Optional[Path] = None,
+        profile_mode: str = "sampling",
+        store: Optional[RunStore] = None,
+        trace_spans: bool = False,
+    ):
         self.adapters = adapters
         self.scenarios = scenarios
+        self.profile_dir = profile_dir
+        self.profile_mode = profile_mode
+        self.store = store
+        self.trace_spans = trace_spans
+        # Timing span summaries of adapter calls, per adapter and scenario,
+        # when tracing spans.
+        self.spans: Dict[str, Dict[str, Any]] = {}
+        # Retry, timeout and rejection counts per adapter and scenario, for
+        # adapters wrapped in a `PolicyAdapter`.
+        self.policy: Dict[str, Dict[str, Any]] = {}
+        # Profile files per adapter, scenario and phase, when profiling.
+        self.profiles: Dict[str, Dict[str, Dict[str, Path]]] = {}
 
     def run(self, **kwargs: Any) -> Dict[str, Any]:
         """Run all scenarios on all adapters.
 
+        Each scenario receives the top-level parameters, overridden by the
+        entries of the section named after it, e.g. `{"dim": 384,
+        "scale_curve": {"scales": [10000]}}`. Scenarios that declare a
+        `sweep` parameter are split into one job per value of it, so each
+        value is checkpointed on its own.
+
         Returns:
             A dictionary of results.
         """
+        names = {scenario.name for scenario in self.scenarios}
+        shared = {key: value for key, value in kwargs.items() if key not in names}
         results: Dict[str, Any] = {}
         for adapter in self.adapters:
             logging.info(f"Running scenarios on {adapter.name}...")
             adapter.connect()
             results[adapter.name] = {}
+            self.spans[adapter.name] = {}
+            self.profiles[adapter.name] = {}
+            self.policy[adapter.name] = {}
             for scenario in self.scenarios:
                 logging.info(f"Running scenario: {scenario.name}...")
-                try:
-                    scenario_results = scenario.run(db=adapter, **kwargs)
-                    results[adapter.name][scenario.name] = scenario_results
-                except Exception as e:
-                    logging.error(
-                        f"Scenario {scenario.name} failed on {adapter.name}: {e}"
-                    )
-                    results[adapter.name][scenario.name] = {"error": str(e)}
+                spans, profiler = self._instruments(adapter.name, scenario.name)
+                params = {**shared, **kwargs.get(scenario.name, {})}
+                scenario_results: Dict[str, Any] = {}
+                policy_stats = []
+                with spans as recorder, profiler as profiles:
+                    for label, job_params, error_key in self._jobs(scenario, params):
+                        job_results, job_policy = self._run_job(
+                            adapter, scenario, label, job_params, error_key
+                        )
+                        scenario_results.update(job_results)
+                        if job_policy is not None:
+                            policy_stats.append(job_policy)
+                results[adapter.name][scenario.name] = scenario_results
+                if policy_stats:
+                    self.policy[adapter.name][scenario.name] = merge_stats(policy_stats)
+                if recorder is not None:
+                    self.spans[adapter.name][scenario.name] = recorder.summary()
+                if profiles is not None:
+                    self.profiles[adapter.name][scenario.name] = profiles
+                if self.store is not None:
+                    self._write(adapter.name, scenario.name, scenario_results)
         return results
+
+    def _instruments(self, adapter: str, scenario: str) -> Tuple[
+        ContextManager[Optional[SpanRecorder]],
+        ContextManager[Optional[Dict[str, Path]]],
+    ]:
+        """Returns the span recorder and profiler to run a scenario under."""
+        spans: ContextManager[Optional[SpanRecorder]] = nullcontext()
+        if self.trace_spans:
+            spans = record_spans()
+        profiler: ContextManager[Optional[Dict[str, Path]]] = nullcontext()
+        if self.profile_dir is not None:
+            profiler = profile(self.profile_dir / adapter / scenario, self.profile_mode)
+        return spans, profiler
+
+    def _write(self, adapter: str, scenario: str, results: Dict[str, Any]) -> None:
+        """Writes a scenario's metrics, spans and policy counters to the store."""
+        assert self.store is not None
+        self.store.write_metrics(adapter, scenario, results)
+        for section, summaries in (("spans", self.spans), ("policy", self.policy)):
+            summary = summaries[adapter].get(scenario)
+            if summary is not None:
+                self.store.write_metrics(adapter, scenario, summary, section=section)
+
+    @staticmethod
+    def _jobs(
+        scenario: Scenario, params: Dict[str, Any]
+    ) -> List[Tuple[str, Dict[str, Any], Optional[str]]]:
+        """Splits a scenario run into jobs along its sweep parameter.
+
+        Returns:
+            The label, parameters and error key of each job. Errors of a sweep
+            job are reported under the result key of its value.
+        """
+        sweep: Optional[str] = getattr(scenario, "sweep", None)
+        if callable(sweep):
+            sweep = sweep(params)
+        if sweep is None or not isinstance(params.get(sweep), list):
+            return [("all", params, None)]
+        return [
+            (f"{sweep}={value}", {**params, sweep: [value]}, str(value))
+            for value in params[sweep]
+        ]
+
+    def _run_job(
+        self,
+        adapter: VectorDB,
+        scenario: Scenario,
+        label: str,
+        params: Dict[str, Any],
+        error_key: Optional[str],
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Runs one job, or returns its checkpointed results.
+
+        Returns:
+            The results, and the adapter's policy counters for the job if it
+            has a policy and the job ran.
+        """
+        job = job_id(adapter.name, scenario.name, params)
+        if self.store is not None:
+            stored = self.store.completed(job)
+            if stored is not None:
+                logging.info(f"Skipping completed job {scenario.name} ({label})")
+                return stored, self.store.manifest["jobs"][job].get("policy")
+
+        policy = find_policy(adapter)
+        if policy is not None:
+            policy.reset_stats()
+        start = time.perf_counter()
+        error = None
+        try:
+            results = scenario.run(db=adapter, **params)
+        except Exception as e:
+            logging.error(
+                f"Scenario {scenario.name} failed on {adapter.name} ({label}): {e}"
+            )
+            error = str(e)
+            results = {"error": error}
+            if error_key is not None:
+                results = {error_key: results}
+        stats = policy.stats() if policy is not None else None
+
+        if self.store is not None:
+            info = {
+                "adapter": adapter.name,
+                "scenario": scenario.name,
+                "label": label,
+                "duration_s": time.perf_counter() - start,
+            }
+            if stats is not None:
+                info["policy"] = stats
+            self.store.save(job, info, results, error)
+        return results, stats
@@ -6,7 +6,14 @@ from vdbt.adapters.base import VectorDB
 
 
 class Scenario(Protocol):
-    """A protocol for a benchmark scenario."""
+    """A protocol for a benchmark scenario.
+
+    Scenarios that run once per value of a list parameter, such as the scales
+    of a scale curve, can name it in a `sweep` class attribute. The runner
+    then runs and checkpoints one job per value, and merges their results,
+    which must therefore be keyed by the value. `sweep` may instead be a
+    method that picks the parameter, or None, from the run's parameters.
+    """
 
     name: str
 
@@ -0,0 +1,148 @@
+"""Cold start scenario."""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, cast
+
+import numpy as np
+
+from vdbt.adapters.base import PersistentVectorDB, VectorDB
+from vdbt.metrics import compute_percentiles
+from vdbt.utils.data import create_synthetic_embeddings
+from vdbt.utils.profiling import phase
+
+
+def _evict_page_cache(directory: Path) -> bool:
+    """Asks the kernel to drop cached pages of every file under `directory`.
+
+    Files are flushed first, since only clean pages can be dropped. This needs
+    no privileges, unlike writing to /proc/sys/vm/drop_caches.
+
+    Returns:
+        True if the platform supports `posix_fadvise`, False otherwise.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for path in directory.rglob("*"):
+        if not path.is_file():
+            continue
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+class ColdStartScenario:
+    """Scenario to measure how quickly a persisted collection becomes usable.
+
+    A collection is saved to disk, dropped and reopened twice: first with the
+    files evicted from the page cache (a cold restart), then again with them
+    cached (a warm restart). Each restart reports the load time, the time to
+    the first query result and the latency of the first N queries.
+
+    Adapters that cannot save and load collections are reported as
+    unsupported.
+    """
+
+    name = "cold_start"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the cold start scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics.
+        """
+        if not isinstance(db, PersistentVectorDB):
+            return {"supported": False}
+
+        dim = kwargs["dim"]
+        seed = kwargs["seed"]
+        num_embeddings = kwargs.get("num_embeddings", 100000)
+        num_queries = kwargs.get("num_queries", 100)
+        k = kwargs.get("k", 10)
+        mmap = kwargs.get("mmap", True)
+        path = kwargs.get("path")
+
+        collection_name = f"{self.name}"
+        db.drop_collection(collection_name)
+        db.create_collection(collection_name, dim)
+        embeddings, _ = create_synthetic_embeddings(
+            num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
+        )
+        with phase("ingest"):
+            for offset in range(0, num_embeddings, 10000):
+                stop = min(offset + 10000, num_embeddings)
+                ids = [str(i) for i in range(offset, stop)]
+                meta = [{"i": i} for i in range(offset, stop)]
+                db.upsert(collection_name, ids, embeddings[offset:stop], meta)
+        queries = np.random.default_rng(seed).standard_normal((num_queries, dim))
+        queries = queries.astype(np.float32)
+
+        directory = Path(path or tempfile.mkdtemp(prefix="vdbt_cold_start_"))
+        try:
+            with phase("save"):
+                start = time.perf_counter()
+                db.save(collection_name, directory)
+                save_s = time.perf_counter() - start
+            disk_bytes = sum(
+                p.stat().st_size for p in directory.rglob("*") if p.is_file()
+            )
+            db.drop_collection(collection_name)
+
+            evicted = _evict_page_cache(directory)
+            with phase("cold_restart"):
+                cold = self._restart(db, collection_name, directory, queries, k, mmap)
+            db.drop_collection(collection_name)
+            with phase("warm_restart"):
+                warm = self._restart(db, collection_name, directory, queries, k, mmap)
+            db.drop_collection(collection_name)
+        finally:
+            if path is None:
+                shutil.rmtree(directory, ignore_errors=True)
+
+        return {
+            "supported": True,
+            "mmap": mmap,
+            "save_s": save_s,
+            "disk_bytes": disk_bytes,
+            "page_cache_evicted": evicted,
+            "cold": cold,
+            "warm": warm,
+        }
+
+    @staticmethod
+    def _restart(
+        db: VectorDB,
+        collection_name: str,
+        directory: Path,
+        queries: np.ndarray[Any, Any],
+        k: int,
+        mmap: bool,
+    ) -> Dict[str, Any]:
+        """Loads the saved collection and runs the first queries against it."""
+        start = time.perf_counter()
+        cast(PersistentVectorDB, db).load(collection_name, directory, mmap=mmap)
+        loaded = time.perf_counter()
+
+        latencies: List[float] = []
+        for i in range(len(queries)):
+            query_start = time.perf_counter()
+            db.search(collection_name, queries[i : i + 1], k=k)
+            latencies.append(time.perf_counter() - query_start)
+
+        return {
+            "load_s": loaded - start,
+            "time_to_first_query_s": loaded - start + latencies[0],
+            "first_query_s": latencies[0],
+            "query_latency_s": compute_percentiles(latencies),
+        }
@@ -0,0 +1,119 @@
+"""Dimension and vector type sweep scenario."""
+
+import logging
+import time
+from functools import partial
+from typing import Any, Dict
+
+import numpy as np
+
+from vdbt.adapters.base import VECTOR_DTYPES, VectorDB
+from vdbt.metrics import exact_neighbors, neighbor_recall_at_k
+from vdbt.utils.data import create_synthetic_embeddings
+from vdbt.utils.harness import MeasurementConfig, measure
+from vdbt.utils.profiling import phase
+
+
+class DtypeSweepScenario:
+    """Scenario to measure the cost and accuracy of reduced-precision vectors.
+
+    For every dimension, the same data is loaded once per storage type
+    (float32, float16, int8 scalar quantization or binary, see
+    `VECTOR_DTYPES`). Each combination reports memory per vector, ingest
+    rate, query latency and recall against the exact float32 neighbours.
+    Vectors are normalized to unit length, so the ground truth holds for
+    adapters that rank by L2 and by cosine distance alike. Types an adapter
+    cannot store are reported as unsupported.
+    """
+
+    name = "dtype_sweep"
+    sweep = "dims"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the dtype sweep scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics per dimension and dtype.
+        """
+        seed = kwargs["seed"]
+        dims = kwargs.get("dims", [384, 768, 1536])
+        dtypes = kwargs.get("dtypes", list(VECTOR_DTYPES))
+        num_embeddings = kwargs.get("num_embeddings", 10000)
+        num_queries = kwargs.get("num_queries", 100)
+        batch_size = kwargs.get("batch_size", 10000)
+        k = kwargs.get("k", 10)
+        measurement = MeasurementConfig.from_kwargs(kwargs)
+
+        results: Dict[str, Any] = {}
+        for dim in dims:
+            with phase("generate"):
+                embeddings, _ = create_synthetic_embeddings(
+                    num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
+                )
+                queries, _ = create_synthetic_embeddings(
+                    num_embeddings=num_queries, dim=dim, num_classes=10, seed=seed + 1
+                )
+                embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+                queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+                ids = [str(i) for i in range(num_embeddings)]
+                metadata = [{"i": i} for i in range(num_embeddings)]
+            with phase("ground_truth"):
+                truth = exact_neighbors(embeddings, queries, k)
+
+            results[str(dim)] = {}
+            for dtype in dtypes:
+                collection_name = f"{self.name}_{dim}_{dtype}"
+                db.drop_collection(collection_name)
+                try:
+                    db.create_collection(collection_name, dim, dtype=dtype)
+                except ValueError as e:
+                    logging.info(f"Skipping {dtype} at {dim} dims: {e}")
+                    results[str(dim)][dtype] = {"supported": False, "error": str(e)}
+                    continue
+
+                with phase("ingest"):
+                    start = time.perf_counter()
+                    for offset in range(0, num_embeddings, batch_size):
+                        stop = min(offset + batch_size, num_embeddings)
+                        db.upsert(
+                            collection_name,
+                            ids[offset:stop],
+                            embeddings[offset:stop],
+                            metadata[offset:stop],
+                        )
+                    ingest_s = time.perf_counter() - start
+                memory_bytes = db.memory_bytes(collection_name)
+
+                with phase("query"):
+                    sampler, _ = measure(
+                        partial(db.search, collection_name, k=k),
+                        [vector.reshape(1, -1) for vector in queries],
+                        measurement,
+                    )
+                with phase("recall"):
+                    result = db.search(collection_name, queries, k=k)
+                predicted = np.where(result.valid, result.ids, -1).astype(np.int64)
+
+                results[str(dim)][dtype] = {
+                    "supported": True,
+                    "memory_bytes": memory_bytes,
+                    "bytes_per_vector": (
+                        memory_bytes / num_embeddings
+                        if memory_bytes is not None
+                        else None
+                    ),
+                    "ingest_s": ingest_s,
+                    "ingest_vectors_per_s": (
+                        num_embeddings / ingest_s if ingest_s > 0 else None
+                    ),
+                    "query_latency_s": sampler.percentiles(),
+                    "query_sampling": sampler.stats(),
+                    f"recall@{k}": neighbor_recall_at_k(truth, predicted, k=k),
+                }
+                db.drop_collection(collection_name)
+
+        return results
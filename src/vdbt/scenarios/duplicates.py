@@ -0,0 +1,246 @@
+"""Duplicate and near-duplicate scenario."""
+
+import time
+from functools import partial
+from typing import Any, Dict, List
+
+import numpy as np
+import psutil
+
+from vdbt.adapters.base import QueryResult, VectorDB
+from vdbt.metrics import exact_neighbors, neighbor_recall_at_k
+from vdbt.utils.data import (
+    create_synthetic_embeddings,
+    duplicate_sources,
+    inject_duplicates,
+)
+from vdbt.utils.dedup import hash_dedup, lsh_dedup
+from vdbt.utils.harness import MeasurementConfig, measure
+from vdbt.utils.profiling import phase
+
+DEDUP_METHODS = ("hash", "lsh")
+
+
+class DuplicateScenario:
+    """Scenario to measure the cost of duplicate and near-duplicate vectors.
+
+    For every duplicate ratio and perturbation, copies of randomly chosen
+    rows are appended to a clean dataset; a perturbation of 0 gives exact
+    duplicates, and a positive one near-duplicates whose noise has that
+    relative norm. Each collection reports ingest time, memory, query
+    latency, and how far duplicates crowd the top-k: the distinct ids and
+    distinct source vectors per query, and recall against the exact
+    neighbours among the clean rows, counting a copy as its source. The
+    collections rank by `metric` ("l2" by default), and so do the exact
+    neighbours.
+
+    With `dedup`, the same rows are first deduplicated client-side with each
+    listed method ("hash" for exact duplicates, "lsh" for near-duplicates).
+    Its throughput, the rows it removes, misses and wrongly removes, and the
+    recall and diversity of the deduplicated collection are reported
+    separately.
+    """
+
+    name = "duplicates"
+    sweep = "duplicate_ratios"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the duplicates scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics per duplicate ratio and perturbation.
+        """
+        dim = kwargs["dim"]
+        seed = kwargs["seed"]
+        num_embeddings = kwargs.get("num_embeddings", 10000)
+        num_queries = kwargs.get("num_queries", 100)
+        ratios = kwargs.get("duplicate_ratios", [0.0, 0.5, 1.0, 2.0])
+        perturbations = kwargs.get("perturbations", [0.0, 0.01])
+        k = kwargs.get("k", 10)
+        methods = kwargs.get("dedup", [])
+        metric = kwargs.get("metric", "l2")
+        unknown = set(methods) - set(DEDUP_METHODS)
+        if unknown:
+            raise ValueError(
+                f"Unknown dedup methods {sorted(unknown)}; expected {DEDUP_METHODS}"
+            )
+        measurement = MeasurementConfig.from_kwargs(kwargs)
+
+        with phase("generate"):
+            embeddings, labels = create_synthetic_embeddings(
+                num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
+            )
+            queries, _ = create_synthetic_embeddings(
+                num_embeddings=num_queries, dim=dim, num_classes=10, seed=seed + 1
+            )
+        with phase("ground_truth"):
+            truth = exact_neighbors(embeddings, queries, k, metric=metric)
+
+        results: Dict[str, Any] = {}
+        for ratio in ratios:
+            results[str(ratio)] = {}
+            for perturbation in perturbations:
+                with phase("generate"):
+                    rows, _ = inject_duplicates(
+                        embeddings, labels, ratio, seed, perturbation=perturbation
+                    )
+                    sources = np.concatenate(
+                        [
+                            np.arange(num_embeddings),
+                            duplicate_sources(num_embeddings, ratio, seed),
+                        ]
+                    )
+
+                collection_name = f"{self.name}_{ratio}_{perturbation}"
+                result = self._ingest(
+                    db, collection_name, rows, np.arange(len(rows)), metric
+                )
+                with phase("query"):
+                    sampler, _ = measure(
+                        partial(db.search, collection_name, k=k),
+                        [vector.reshape(1, -1) for vector in queries],
+                        measurement,
+                    )
+                result["query_latency_s"] = sampler.percentiles()
+                result["query_sampling"] = sampler.stats()
+                result.update(
+                    self._evaluate(db, collection_name, queries, sources, truth, k)
+                )
+                db.drop_collection(collection_name)
+
+                result["dedup"] = {
+                    method: self._dedup(
+                        db,
+                        f"{collection_name}_{method}",
+                        method,
+                        rows,
+                        sources,
+                        num_embeddings,
+                        queries,
+                        truth,
+                        k,
+                        kwargs,
+                    )
+                    for method in methods
+                }
+                results[str(ratio)][str(perturbation)] = result
+
+        return results
+
+    @staticmethod
+    def _ingest(
+        db: VectorDB,
+        collection_name: str,
+        vectors: np.ndarray[Any, Any],
+        rows: np.ndarray[Any, Any],
+        metric: str,
+    ) -> Dict[str, Any]:
+        """Loads `vectors`, storing each under the id of its row."""
+        db.drop_collection(collection_name)
+        db.create_collection(collection_name, vectors.shape[1], metric=metric)
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        with phase("ingest"):
+            start = time.perf_counter()
+            db.upsert(
+                collection_name,
+                [str(row) for row in rows.tolist()],
+                vectors,
+                [{"row": row} for row in rows.tolist()],
+            )
+            ingest_s = time.perf_counter() - start
+        return {
+            "rows": len(vectors),
+            "ingest_s": ingest_s,
+            "memory_bytes": db.memory_bytes(collection_name),
+            "rss_delta_bytes": process.memory_info().rss - rss_before,
+        }
+
+    @staticmethod
+    def _evaluate(
+        db: VectorDB,
+        collection_name: str,
+        queries: np.ndarray[Any, Any],
+        sources: np.ndarray[Any, Any],
+        truth: np.ndarray[Any, Any],
+        k: int,
+    ) -> Dict[str, float]:
+        """Measures top-k diversity and recall over distinct source vectors.
+
+        Args:
+            sources: The clean row each stored row was copied from, indexed
+                by stored row id.
+            truth: The exact top-k clean rows of each query.
+        """
+        with phase("recall"):
+            query_results = db.search(collection_name, queries, k=k)
+        retrieved = DuplicateScenario._retrieved_rows(query_results)
+        distinct_ids = [len(set(row)) for row in retrieved]
+        distinct_sources = [len(set(sources[row].tolist())) for row in retrieved]
+        predicted = np.full((len(queries), k), -1, dtype=np.int64)
+        for i, row in enumerate(retrieved):
+            predicted[i, : len(row)] = sources[row]
+        return {
+            "distinct_ids": float(np.mean(distinct_ids)),
+            "distinct_sources": float(np.mean(distinct_sources)),
+            "diversity": float(np.sum(distinct_sources) / max(1, np.sum(distinct_ids))),
+            f"recall@{k}": neighbor_recall_at_k(truth, predicted, k=k),
+        }
+
+    @staticmethod
+    def _retrieved_rows(query_results: QueryResult) -> List[List[int]]:
+        """Returns the stored row ids each query retrieved."""
+        return [
+            [int(doc_id) for doc_id in row if doc_id is not None]
+            for row in query_results.ids
+        ]
+
+    def _dedup(
+        self,
+        db: VectorDB,
+        collection_name: str,
+        method: str,
+        rows: np.ndarray[Any, Any],
+        sources: np.ndarray[Any, Any],
+        num_clean: int,
+        queries: np.ndarray[Any, Any],
+        truth: np.ndarray[Any, Any],
+        k: int,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Deduplicates `rows` client-side, then loads and evaluates the rest.
+
+        The first `num_clean` rows are the clean data; the rest are copies.
+        """
+        with phase("dedup"):
+            start = time.perf_counter_ns()
+            if method == "hash":
+                keep = hash_dedup(rows, decimals=params.get("dedup_decimals"))
+            else:
+                keep = lsh_dedup(
+                    rows,
+                    threshold=params.get("lsh_threshold", 0.99),
+                    num_bits=params.get("lsh_bits", 16),
+                    num_tables=params.get("lsh_tables", 4),
+                    seed=params["seed"],
+                )
+            dedup_s = (time.perf_counter_ns() - start) / 1e9
+
+        kept = np.flatnonzero(keep)
+        result = {
+            "dedup_s": dedup_s,
+            "dedup_rows_per_s": len(rows) / dedup_s if dedup_s > 0 else None,
+            "removed_rows": int(len(rows) - len(kept)),
+            "missed_duplicates": int(keep[num_clean:].sum()),
+            "false_removals": int(num_clean - keep[:num_clean].sum()),
+            **self._ingest(
+                db, collection_name, rows[kept], kept, params.get("metric", "l2")
+            ),
+            **self._evaluate(db, collection_name, queries, sources, truth, k),
+        }
+        db.drop_collection(collection_name)
+        return result
@@ -1,18 +1,45 @@
 """Hybrid query scenario."""
 
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List
 
 import numpy as np
 from tqdm import tqdm
 
-from vdbt.adapters.base import VectorDB
-from vdbt.metrics import recall_at_k
+from vdbt.adapters.base import VectorDB, supports_payload_indexes
+from vdbt.filters import filter_mask
+from vdbt.metrics import compute_percentiles, exact_neighbors, recall_at_k
 from vdbt.utils.data import create_synthetic_embeddings
-from vdbt.utils.hybrid import create_hybrid_query_dataset
+from vdbt.utils.hybrid import (
+    FILTER_KINDS,
+    FilteredQueries,
+    create_hybrid_query_dataset,
+    create_metadata_columns,
+    generate_filtered_queries,
+    metadata_rows,
+    payload_schema,
+)
+from vdbt.utils.profiling import phase
 
 
 class HybridQueryScenario:
-    """Scenario to measure performance with hybrid queries (vector + keyword)."""
+    """Scenario to measure performance with hybrid queries (vector + keyword).
+
+    Besides label-filtered queries scored by label recall, it runs
+    `num_filtered_queries` queries with equality, IN, range, AND and OR
+    filters over the "category", "year" and "price" metadata, aimed at
+    `selectivity`, and reports per filter kind the selectivity reached,
+    latency and recall against exact filtered search in the collection's
+    `metric` ("l2" by default).
+
+    With `compare_payload_index`, the filtered queries run a second time
+    against a collection created with payload indexes on the filtered
+    fields, reported as "indexed_filters" along with the p50 latency
+    speedup per kind. It defaults to on for adapters that build payload
+    indexes (Qdrant) and off for the rest, which would just time the same
+    search twice. Each pass starts with `warmup_queries` untimed filtered
+    queries, so neither pass pays for a cold collection alone.
+    """
 
     name = "hybrid_query"
 
@@ -30,18 +57,21 @@ class HybridQueryScenario:
         num_embeddings = kwargs["num_embeddings"]
         keyword_ratio = kwargs.get("keyword_ratio", 0.5)
         seed = kwargs["seed"]
+        metric = kwargs.get("metric", "l2")
 
         collection_name = f"{self.name}"
         db.drop_collection(collection_name)
-        db.create_collection(collection_name, dim)
+        db.create_collection(collection_name, dim, metric=metric)
 
         embeddings, labels = create_synthetic_embeddings(
             num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
         )
         ids = [str(i) for i in range(num_embeddings)]
-        metadata = [{"label": int(label)} for label in labels]
+        columns = create_metadata_columns(num_embeddings, seed + 2, labels=labels)
+        metadata = metadata_rows(columns)
 
-        db.upsert(collection_name, ids, embeddings, metadata)
+        with phase("ingest"):
+            db.upsert(collection_name, ids, embeddings, metadata)
 
         queries = create_hybrid_query_dataset(
             embeddings=embeddings,
@@ -53,17 +83,119 @@ class HybridQueryScenario:
 
         predictions = []
         ground_truth = []
-        for query in tqdm(queries, desc="Executing hybrid queries"):
-            query_vector = np.expand_dims(query["vector"], axis=0)
-            query_filter = query.get("filter")
-            query_results = db.query(
-                collection_name, query_vector, k=10, filter=query_filter
-            )
-            predictions.append([res["metadata"]["label"] for res in query_results])
-            ground_truth.append(query["ground_truth_label"])
+        with phase("query"):
+            for query in tqdm(queries, desc="Executing hybrid queries"):
+                query_vector = np.expand_dims(query["vector"], axis=0)
+                query_filter = query.get("filter")
+                query_results = db.search(
+                    collection_name, query_vector, k=10, filter=query_filter
+                )
+                predictions.append(query_results.field("label")[0].tolist())
+                ground_truth.append(query["ground_truth_label"])
 
         recall = recall_at_k(ground_truth, predictions, k=10)
 
+        filter_columns = {key: columns[key] for key in ("category", "year", "price")}
+        filtered = generate_filtered_queries(
+            embeddings,
+            filter_columns,
+            num_queries=kwargs.get("num_filtered_queries", 100),
+            selectivity=kwargs.get("selectivity", 0.1),
+            kinds=kwargs.get("filter_kinds", FILTER_KINDS),
+            seed=seed + 3,
+        )
+        warmup = kwargs.get("warmup_queries", 10)
+        with phase("filtered_query"):
+            by_kind = self._filtered(
+                db, collection_name, embeddings, columns, filtered, warmup, metric
+            )
+        results: Dict[str, Any] = {"recall@10": recall, "filters": by_kind}
+
+        compare = kwargs.get("compare_payload_index")
+        if compare is None:
+            compare = supports_payload_indexes(db)
+        if compare:
+            db.drop_collection(collection_name)
+            db.create_collection(
+                collection_name,
+                dim,
+                metric=metric,
+                payload_indexes=payload_schema(filter_columns),
+            )
+            with phase("indexed_ingest"):
+                db.upsert(collection_name, ids, embeddings, metadata)
+            with phase("indexed_filtered_query"):
+                indexed = self._filtered(
+                    db, collection_name, embeddings, columns, filtered, warmup, metric
+                )
+            results["indexed_filters"] = indexed
+            results["index_speedup"] = {
+                kind: by_kind[kind]["latency_s"]["p50"]
+                / max(indexed[kind]["latency_s"]["p50"], 1e-12)
+                for kind in indexed
+            }
+
         db.drop_collection(collection_name)
 
-        return {"recall@10": recall}
+        return results
+
+    @staticmethod
+    def _filtered(
+        db: VectorDB,
+        collection_name: str,
+        embeddings: np.ndarray[Any, Any],
+        columns: Dict[str, np.ndarray[Any, Any]],
+        queries: FilteredQueries,
+        warmup: int,
+        metric: str,
+        k: int = 10,
+    ) -> Dict[str, Any]:
+        """Runs the filtered queries and scores them per filter kind.
+
+        The first `warmup` queries are sent once untimed beforehand. Recall
+        is the fraction of the exact top-k in `metric` among the matching
+        documents that the database returned; filters matching fewer than k
+        documents expect all of them.
+        """
+        for i in range(min(warmup, len(queries))):
+            db.search(
+                collection_name,
+                queries.vectors[i : i + 1],
+                k=k,
+                filter=queries.filter(i),
+            )
+        kinds = queries.kinds()
+        latencies: Dict[str, List[float]] = {}
+        recalls: Dict[str, List[float]] = {}
+        selectivities: Dict[str, List[float]] = {}
+        for i in tqdm(range(len(queries)), desc="Executing filtered queries"):
+            query_filter = queries.filter(i)
+            vector = queries.vectors[i : i + 1]
+            start = time.perf_counter()
+            result = db.search(collection_name, vector, k=k, filter=query_filter)
+            latency = time.perf_counter() - start
+
+            matching = np.flatnonzero(
+                filter_mask(query_filter, columns.get, len(embeddings))
+            )
+            expected = set()
+            if len(matching):
+                top = exact_neighbors(embeddings[matching], vector, k, metric)[0]
+                expected = set(matching[top].tolist())
+            returned = {int(doc_id) for doc_id in result.ids[0][result.valid[0]]}
+            kind = str(kinds[i])
+            latencies.setdefault(kind, []).append(latency)
+            recalls.setdefault(kind, []).append(
+                len(expected & returned) / len(expected) if expected else 1.0
+            )
+            selectivities.setdefault(kind, []).append(len(matching) / len(embeddings))
+
+        return {
+            kind: {
+                "queries": len(latencies[kind]),
+                "selectivity": float(np.mean(selectivities[kind])),
+                "latency_s": compute_percentiles(latencies[kind]),
+                f"recall@{k}": float(np.mean(recalls[kind])),
+            }
+            for kind in latencies
+        }
@@ -0,0 +1,215 @@
+"""Ingest throughput scenario."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from vdbt.adapters.base import VectorDB
+from vdbt.metrics import compute_percentiles
+from vdbt.utils.data import create_synthetic_embeddings
+from vdbt.utils.profiling import phase
+
+
+class _VisibilityProbe:
+    """Polls for freshly written points until they appear in search results.
+
+    Writers register one probe point per batch; a background thread searches
+    for each registered vector and records the time from the start of its
+    upsert until its id is returned.
+    """
+
+    def __init__(
+        self,
+        db: VectorDB,
+        collection_name: str,
+        k: int,
+        timeout_s: float,
+        poll_interval_s: float,
+    ) -> None:
+        self._db = db
+        self._collection_name = collection_name
+        self._k = k
+        self._timeout_s = timeout_s
+        self._poll_interval_s = poll_interval_s
+        self._pending: List[Tuple[str, np.ndarray[Any, Any], float]] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self.delays: List[float] = []
+        self.timeouts = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def watch(self, doc_id: str, vector: np.ndarray[Any, Any], issued: float) -> None:
+        """Registers a point whose upsert started at `issued`."""
+        with self._lock:
+            self._pending.append((doc_id, vector.reshape(1, -1), issued))
+
+    def stop(self) -> None:
+        """Waits until every registered point is visible or has timed out."""
+        self._stopping.set()
+        self._thread.join()
+
+    def _poll(self) -> None:
+        while True:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending and self._stopping.is_set():
+                return
+
+            waiting = []
+            for doc_id, vector, issued in pending:
+                try:
+                    result = self._db.search(self._collection_name, vector, k=self._k)
+                    visible = doc_id in result.ids[0]
+                except Exception as e:
+                    logging.warning(f"Visibility probe failed: {e}")
+                    visible = False
+                now = time.perf_counter()
+                if visible:
+                    self.delays.append(now - issued)
+                elif now - issued > self._timeout_s:
+                    self.timeouts += 1
+                else:
+                    waiting.append((doc_id, vector, issued))
+
+            with self._lock:
+                self._pending = waiting + self._pending
+            if waiting or not pending:
+                time.sleep(self._poll_interval_s)
+
+
+class IngestThroughputScenario:
+    """Scenario to sweep batch size, writer concurrency and write semantics.
+
+    For every combination of batch size, number of concurrent writers and
+    `wait` flag, a fresh collection is filled with the same vectors. Each
+    configuration reports points/s, per-batch upsert latency, the time until
+    a freshly written point first shows up in search results, and how long
+    after the last acknowledged write the collection count catches up.
+    """
+
+    name = "ingest_throughput"
+    sweep = "batch_sizes"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the ingest throughput scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics.
+        """
+        dim = kwargs["dim"]
+        seed = kwargs["seed"]
+        num_embeddings = kwargs.get("num_embeddings", 100000)
+        batch_sizes = kwargs.get("batch_sizes", [100, 1000, 10000, 50000])
+        writer_counts = kwargs.get("writers", [1, 4])
+        waits = kwargs.get("waits", [True, False])
+
+        embeddings, _ = create_synthetic_embeddings(
+            num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
+        )
+
+        results: Dict[str, Any] = {}
+        for batch_size in batch_sizes:
+            for writers in writer_counts:
+                for wait in waits:
+                    key = f"batch={batch_size},writers={writers},wait={wait}"
+                    logging.info(f"Ingest configuration {key}...")
+                    results[key] = self._run_configuration(
+                        db, embeddings, batch_size, writers, wait, kwargs
+                    )
+        return results
+
+    def _run_configuration(
+        self,
+        db: VectorDB,
+        embeddings: np.ndarray[Any, Any],
+        batch_size: int,
+        writers: int,
+        wait: bool,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        collection_name = f"{self.name}"
+        db.drop_collection(collection_name)
+        db.create_collection(collection_name, embeddings.shape[1])
+
+        timeout_s = params.get("visibility_timeout_s", 30.0)
+        probe_every = params.get("probe_every", 1)
+        probe = _VisibilityProbe(
+            db,
+            collection_name,
+            k=params.get("probe_k", 10),
+            timeout_s=timeout_s,
+            poll_interval_s=params.get("poll_interval_s", 0.001),
+        )
+
+        num_points = len(embeddings)
+        starts = iter(range(0, num_points, batch_size))
+        starts_lock = threading.Lock()
+        batch_latencies: List[float] = []
+        failed: List[int] = []
+
+        def write() -> None:
+            while True:
+                with starts_lock:
+                    start: Optional[int] = next(starts, None)
+                if start is None:
+                    return
+                stop = min(start + batch_size, num_points)
+                ids = [str(i) for i in range(start, stop)]
+                meta = [{"i": i} for i in range(start, stop)]
+                issued = time.perf_counter()
+                try:
+                    db.upsert(
+                        collection_name, ids, embeddings[start:stop], meta, wait=wait
+                    )
+                except Exception as e:
+                    logging.warning(f"Ingest batch failed: {e}")
+                    failed.append(stop - start)
+                    continue
+                batch_latencies.append(time.perf_counter() - issued)
+                if (start // batch_size) % probe_every == 0:
+                    probe.watch(ids[-1], embeddings[stop - 1], issued)
+
+        threads = [threading.Thread(target=write) for _ in range(writers)]
+        probe.start()
+        with phase("ingest"):
+            ingest_start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            ingest_s = time.perf_counter() - ingest_start
+
+        # Without `wait`, acknowledged points may still be queued.
+        with phase("drain"):
+            drain_start = time.perf_counter()
+            expected = num_points - sum(failed)
+            while db.count(collection_name) < expected:
+                if time.perf_counter() - drain_start > timeout_s:
+                    break
+                time.sleep(params.get("poll_interval_s", 0.001))
+            drain_s = time.perf_counter() - drain_start
+            probe.stop()
+
+        db.drop_collection(collection_name)
+
+        return {
+            "points": num_points,
+            "ingest_s": ingest_s,
+            "points_per_s": expected / ingest_s if ingest_s > 0 else 0.0,
+            "drain_s": drain_s,
+            "batch_latency_s": compute_percentiles(batch_latencies),
+            "time_to_searchable_s": compute_percentiles(probe.delays),
+            "probes": len(probe.delays) + probe.timeouts,
+            "probe_timeouts": probe.timeouts,
+            "failed_batches": len(failed),
+        }
@@ -0,0 +1,205 @@
+"""Multi-tenant scenario."""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import psutil
+
+from vdbt.adapters.base import VectorDB
+from vdbt.metrics import compute_percentiles
+from vdbt.utils.data import zipf_weights
+from vdbt.utils.profiling import phase
+
+MODES = ("collections", "filter")
+
+
+class MultiTenantScenario:
+    """Scenario to measure many small tenants with skewed sizes and traffic.
+
+    Tenants are ranked; both their sizes and their share of query traffic
+    follow Zipfian distributions, so a few head tenants are large and busy
+    while a long tail is small and rarely queried. Each tenant count is run in
+    up to two modes:
+
+    - "collections": one collection per tenant.
+    - "filter": a single shared collection, with every query restricted to
+      its tenant by a metadata filter.
+    """
+
+    name = "multi_tenant"
+    sweep = "num_tenants"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the multi-tenant scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics per tenant count and mode.
+        """
+        tenant_counts = kwargs.get("num_tenants", [10, 100, 1000])
+        modes = kwargs.get("modes", list(MODES))
+
+        results: Dict[str, Any] = {}
+        for num_tenants in tenant_counts:
+            results[str(num_tenants)] = {}
+            for mode in modes:
+                if mode not in MODES:
+                    raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+                logging.info(f"Multi-tenant run with {num_tenants} tenants ({mode})")
+                results[str(num_tenants)][mode] = self._run_mode(
+                    db, num_tenants, mode, kwargs
+                )
+        return results
+
+    def _run_mode(
+        self, db: VectorDB, num_tenants: int, mode: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        dim = params["dim"]
+        seed = params["seed"]
+        total_vectors = params.get("total_vectors", 100000)
+        num_queries = params.get("num_queries", 1000)
+        k = params.get("k", 10)
+        report_tenants = params.get("report_tenants", 10)
+
+        rng = np.random.default_rng(seed)
+        sizes = np.maximum(
+            1,
+            np.round(
+                zipf_weights(num_tenants, params.get("size_skew", 1.1)) * total_vectors
+            ),
+        ).astype(np.int64)
+        traffic = zipf_weights(num_tenants, params.get("traffic_skew", 1.1))
+        names = [f"{self.name}_{t}" for t in range(num_tenants)]
+
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        with phase("ingest"):
+            if mode == "collections":
+                creation_s, ingest_s = self._load_collections(
+                    db, names, sizes, dim, rng
+                )
+            else:
+                creation_s, ingest_s = self._load_shared(db, sizes, dim, rng)
+        rss_after = process.memory_info().rss
+        memory = self._memory_bytes(db, names if mode == "collections" else [])
+
+        # Mixed tenant traffic, drawn up front so tenants interleave.
+        tenants = rng.choice(num_tenants, size=num_queries, p=traffic)
+        queries = rng.standard_normal((num_queries, dim)).astype(np.float32)
+        latencies = np.empty(num_queries, dtype=np.float64)
+        with phase("query"):
+            for i, tenant in enumerate(tenants.tolist()):
+                start = time.perf_counter()
+                if mode == "collections":
+                    db.search(names[tenant], queries[i : i + 1], k=k)
+                else:
+                    db.search(
+                        self.name, queries[i : i + 1], k=k, filter={"tenant": tenant}
+                    )
+                latencies[i] = time.perf_counter() - start
+
+        for name in names if mode == "collections" else [self.name]:
+            db.drop_collection(name)
+
+        # Tenants beyond the top tenth by traffic are the tail.
+        head = tenants < max(1, num_tenants // 10)
+        per_tenant = {}
+        for tenant in range(min(report_tenants, num_tenants)):
+            tenant_latencies = latencies[tenants == tenant].tolist()
+            per_tenant[str(tenant)] = {
+                "size": int(sizes[tenant]),
+                "queries": len(tenant_latencies),
+                "latency_s": compute_percentiles(tenant_latencies),
+            }
+
+        return {
+            "num_collections": num_tenants if mode == "collections" else 1,
+            "total_vectors": int(sizes.sum()),
+            "creation_s": creation_s,
+            "collections_per_s": (
+                num_tenants / creation_s
+                if mode == "collections" and creation_s > 0
+                else None
+            ),
+            "ingest_s": ingest_s,
+            "memory_bytes": memory,
+            "rss_delta_bytes": rss_after - rss_before,
+            "query_latency_s": compute_percentiles(latencies.tolist()),
+            "head_latency_s": compute_percentiles(latencies[head].tolist()),
+            "tail_latency_s": compute_percentiles(latencies[~head].tolist()),
+            "tenants": per_tenant,
+        }
+
+    @staticmethod
+    def _load_collections(
+        db: VectorDB,
+        names: List[str],
+        sizes: np.ndarray[Any, Any],
+        dim: int,
+        rng: np.random.Generator,
+    ) -> tuple[float, float]:
+        """Creates and fills one collection per tenant.
+
+        Returns:
+            The total creation and ingest times in seconds.
+        """
+        creation_s = 0.0
+        ingest_s = 0.0
+        for name, size in zip(names, sizes.tolist(), strict=True):
+            db.drop_collection(name)
+            vectors = rng.standard_normal((size, dim)).astype(np.float32)
+            start = time.perf_counter()
+            db.create_collection(name, dim)
+            created = time.perf_counter()
+            db.upsert(name, [str(i) for i in range(size)], vectors, [{}] * size)
+            creation_s += created - start
+            ingest_s += time.perf_counter() - created
+        return creation_s, ingest_s
+
+    def _load_shared(
+        self,
+        db: VectorDB,
+        sizes: np.ndarray[Any, Any],
+        dim: int,
+        rng: np.random.Generator,
+        batch_size: int = 10000,
+    ) -> tuple[float, float]:
+        """Fills a single collection, tagging each vector with its tenant.
+
+        Returns:
+            The creation and ingest times in seconds.
+        """
+        db.drop_collection(self.name)
+        start = time.perf_counter()
+        db.create_collection(self.name, dim)
+        creation_s = time.perf_counter() - start
+
+        owners = np.repeat(np.arange(len(sizes)), sizes)
+        ingest_s = 0.0
+        for offset in range(0, len(owners), batch_size):
+            batch = owners[offset : offset + batch_size].tolist()
+            vectors = rng.standard_normal((len(batch), dim)).astype(np.float32)
+            ids = [str(i) for i in range(offset, offset + len(batch))]
+            start = time.perf_counter()
+            db.upsert(self.name, ids, vectors, [{"tenant": t} for t in batch])
+            ingest_s += time.perf_counter() - start
+        return creation_s, ingest_s
+
+    def _memory_bytes(self, db: VectorDB, names: List[str]) -> Optional[int]:
+        """Sums the adapter-reported memory of the given collections.
+
+        Returns:
+            The total, or None if the adapter does not report memory.
+        """
+        total = 0
+        for name in names or [self.name]:
+            memory = db.memory_bytes(name)
+            if memory is None:
+                return None
+            total += memory
+        return total
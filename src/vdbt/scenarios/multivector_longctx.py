@@ -3,18 +3,18 @@
 from typing import Any, Dict
 
 import numpy as np
-from tqdm import tqdm
 
 from vdbt.adapters.base import VectorDB
-from vdbt.metrics import compute_percentiles
 from vdbt.utils.data import create_synthetic_embeddings
-from vdbt.utils.timing import Timer
+from vdbt.utils.harness import MeasurementConfig, measure
+from vdbt.utils.profiling import phase
 
 
 class MultiVectorLongContextScenario:
     """Scenario to simulate RAG over long documents with multiple sub-queries."""
 
     name = "multivector_longctx"
+    sweep = "num_sub_queries"
 
     def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
         """Run the multi-vector long context scenario.
@@ -30,6 +30,7 @@ class MultiVectorLongContextScenario:
         num_embeddings = kwargs["num_embeddings"]
         num_sub_queries = kwargs.get("num_sub_queries", [4, 8, 16])
         seed = kwargs["seed"]
+        measurement = MeasurementConfig.from_kwargs(kwargs)
 
         results = {}
 
@@ -43,38 +44,40 @@ class MultiVectorLongContextScenario:
         )
         ids = [str(i) for i in range(num_embeddings)]
         metadata = [{"label": int(label)} for label in labels]
-        db.upsert(collection_name, ids, embeddings, metadata)
+        with phase("ingest"):
+            db.upsert(collection_name, ids, embeddings, metadata)
 
         for n_sub_queries in num_sub_queries:
-            query_latencies = []
-            recalls = []
-
-            # Generate long context queries
-            for _ in tqdm(
-                range(100),
-                desc=f"Querying with {n_sub_queries} sub-queries",
-            ):
-                ground_truth_label = np.random.default_rng(seed).integers(0, 10)
-                sub_query_vectors, _ = create_synthetic_embeddings(
-                    num_embeddings=n_sub_queries,
-                    dim=dim,
-                    num_classes=1,
-                    seed=seed + ground_truth_label,
-                )
-
-                # Execute sub-queries and combine results (simulated RAG)
+            # Generate a long context query
+            ground_truth_label = np.random.default_rng(seed).integers(0, 10)
+            sub_query_vectors, _ = create_synthetic_embeddings(
+                num_embeddings=n_sub_queries,
+                dim=dim,
+                num_classes=1,
+                seed=seed + ground_truth_label,
+            )
+
+            # Execute sub-queries and combine results (simulated RAG)
+            def long_context_query(vectors: np.ndarray[Any, Any]) -> set[str]:
                 combined_results_ids = set()
-                with Timer() as query_timer:
-                    for sub_q_vec in sub_query_vectors:
-                        results_from_db = db.query(
-                            collection_name,
-                            np.expand_dims(sub_q_vec, axis=0),
-                            k=5,
-                        )
-                        for res in results_from_db:
-                            combined_results_ids.add(res["id"])
-                query_latencies.append(query_timer["duration_s"])
+                for sub_q_vec in vectors:
+                    results_from_db = db.search(
+                        collection_name,
+                        np.expand_dims(sub_q_vec, axis=0),
+                        k=5,
+                    )
+                    combined_results_ids.update(
+                        results_from_db.ids[0][results_from_db.valid[0]]
+                    )
+                return combined_results_ids
+
+            with phase("query"):
+                sampler, retrieved = measure(
+                    long_context_query, [sub_query_vectors], measurement
+                )
 
+            recalls = []
+            for combined_results_ids in retrieved:
                 # Evaluate recall (simplified: check if any result matches ground truth label)
                 # This is a very simplified recall for multi-vector queries.
                 # A more robust metric would involve checking if the original document
@@ -92,7 +95,8 @@ class MultiVectorLongContextScenario:
                     recalls.append(0.0)
 
             results[str(n_sub_queries)] = {
-                "query_latency_s": compute_percentiles(query_latencies),
+                "query_latency_s": sampler.percentiles(),
+                "query_sampling": sampler.stats(),
                 "recall": np.mean(recalls),
             }
 
@@ -1,20 +1,44 @@
 """Noise injection scenario."""
 
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Optional
 
 import numpy as np
-from tqdm import tqdm
 
 from vdbt.adapters.base import VectorDB
-from vdbt.metrics import recall_at_k
+from vdbt.metrics import exact_neighbors, neighbor_recall_at_k, recall_at_k
 from vdbt.utils.data import create_synthetic_embeddings, inject_noise
+from vdbt.utils.profiling import phase
+
+MODES = ("incremental", "rebuild")
 
 
 class NoiseInjectionScenario:
-    """Scenario to measure performance with noisy data."""
+    """Scenario to measure performance with noisy data.
+
+    A growing fraction of the vectors is replaced with random noise, and the
+    original vectors of a fixed sample are used as queries. Each noise ratio
+    reports label recall@10 and recall@10 against the exact neighbours of the
+    noisy data, in the collection's `metric` ("l2" by default). Two modes
+    are supported:
+
+    - "rebuild" (default): a fresh collection is built for every ratio, each
+      with an independent set of noisy rows.
+    - "incremental": the clean collection is built once, and for each ratio,
+      in increasing order, only the rows that newly become noise are
+      upserted. Noisy rows stay noisy at higher ratios. The ingest time and
+      row count of the lowest ratio include the clean build. Adapters that
+      append on upsert instead of replacing would keep the clean rows too,
+      so for them the mode is reported as unsupported, with the number of
+      `stale_rows` they kept.
+    """
 
     name = "noise_injection"
 
+    def sweep(self, params: Dict[str, Any]) -> Optional[str]:
+        """Rebuilds are split per ratio; incremental runs share a collection."""
+        return "noise_ratios" if params.get("mode", "rebuild") == "rebuild" else None
+
     def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
         """Run the noise injection scenario.
 
@@ -29,43 +53,174 @@ class NoiseInjectionScenario:
         num_embeddings = kwargs["num_embeddings"]
         noise_ratios = kwargs.get("noise_ratios", [0.0, 0.1, 0.2, 0.5])
         seed = kwargs["seed"]
+        mode = kwargs.get("mode", "rebuild")
+        metric = kwargs.get("metric", "l2")
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
 
-        results = {}
         embeddings, labels = create_synthetic_embeddings(
             num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
         )
+        # Query with a subset of the original embeddings, copied so that
+        # noise injected into `embeddings` in place cannot reach them.
+        query_indices = np.random.default_rng(seed + 1).choice(
+            num_embeddings, size=min(100, num_embeddings), replace=False
+        )
+        query_vectors = embeddings[query_indices].copy()
+        query_labels = labels[query_indices].tolist()
+
+        if mode == "incremental":
+            return self._run_incremental(
+                db,
+                embeddings,
+                labels,
+                query_vectors,
+                query_labels,
+                noise_ratios,
+                seed,
+                metric,
+            )
 
+        results = {}
         for ratio in noise_ratios:
             collection_name = f"{self.name}_{ratio}"
             db.drop_collection(collection_name)
-            db.create_collection(collection_name, dim)
-
-            noisy_embeddings = inject_noise(
-                embeddings.copy(), noise_ratio=ratio, seed=seed
-            )
-            ids = [str(i) for i in range(num_embeddings)]
-            metadata = [{"label": int(label)} for label in labels]
-
-            db.upsert(collection_name, ids, noisy_embeddings, metadata)
-
-            # Query with original embeddings to check recall
-            # Use a subset of original embeddings as query vectors
-            query_indices = np.random.default_rng(seed + 1).choice(
-                num_embeddings, size=100, replace=False
-            )
-            query_vectors = embeddings[query_indices]
-            query_labels = labels[query_indices]
+            db.create_collection(collection_name, dim, metric=metric)
 
-            predictions = []
-            for vector in tqdm(query_vectors, desc=f"Querying with noise {ratio}"):
-                query_results = db.query(
-                    collection_name, np.expand_dims(vector, axis=0), k=10
+            with phase("generate"):
+                noisy_embeddings = inject_noise(
+                    embeddings.copy(), noise_ratio=ratio, seed=seed
                 )
-                predictions.append([res["metadata"]["label"] for res in query_results])
-
-            recall = recall_at_k(query_labels.tolist(), predictions, k=10)
-            results[str(ratio)] = {"recall@10": recall}
+                ids = [str(i) for i in range(num_embeddings)]
+                metadata = [{"label": int(label)} for label in labels]
+
+            with phase("ingest"):
+                start = time.perf_counter()
+                db.upsert(collection_name, ids, noisy_embeddings, metadata)
+                ingest_s = time.perf_counter() - start
+
+            results[str(ratio)] = {
+                **self._evaluate(
+                    db,
+                    collection_name,
+                    noisy_embeddings,
+                    query_vectors,
+                    query_labels,
+                    metric,
+                ),
+                "noisy_rows": int(num_embeddings * ratio),
+                "upserted_rows": num_embeddings,
+                "ingest_s": ingest_s,
+            }
 
             db.drop_collection(collection_name)
 
         return results
+
+    def _run_incremental(
+        self,
+        db: VectorDB,
+        embeddings: np.ndarray[Any, Any],
+        labels: np.ndarray[Any, Any],
+        query_vectors: np.ndarray[Any, Any],
+        query_labels: List[Any],
+        noise_ratios: List[float],
+        seed: int,
+        metric: str,
+    ) -> Dict[str, Any]:
+        """Builds the clean collection once and adds noise row by row.
+
+        `embeddings` is updated in place to mirror the collection, so the
+        exact ground truth always matches what the adapter holds, unless the
+        adapter appends on upsert; the run then stops as unsupported.
+        """
+        num_embeddings, dim = embeddings.shape
+        rng = np.random.default_rng(seed)
+        # Rows become noise in this order, so every ratio extends the last.
+        order = rng.permutation(num_embeddings)
+
+        collection_name = f"{self.name}"
+        db.drop_collection(collection_name)
+        db.create_collection(collection_name, dim, metric=metric)
+        with phase("ingest"):
+            start = time.perf_counter()
+            db.upsert(
+                collection_name,
+                [str(i) for i in range(num_embeddings)],
+                embeddings,
+                [{"label": int(label)} for label in labels],
+            )
+            ingest_s = time.perf_counter() - start
+        upserted = num_embeddings
+
+        results: Dict[str, Any] = {}
+        noisy = 0
+        for ratio in sorted(noise_ratios):
+            rows = order[noisy : max(noisy, int(num_embeddings * ratio))]
+            if len(rows):
+                with phase("generate"):
+                    embeddings[rows] = rng.standard_normal((len(rows), dim))
+                with phase("ingest"):
+                    start = time.perf_counter()
+                    db.upsert(
+                        collection_name,
+                        [str(i) for i in rows],
+                        embeddings[rows],
+                        [{"label": int(labels[i])} for i in rows],
+                    )
+                    ingest_s += time.perf_counter() - start
+            noisy += len(rows)
+            upserted += len(rows)
+
+            stale_rows = db.count(collection_name) - num_embeddings
+            if stale_rows > 0:
+                db.drop_collection(collection_name)
+                return {
+                    "supported": False,
+                    "error": f"{db.name} appends on upsert instead of replacing",
+                    "stale_rows": stale_rows,
+                }
+            results[str(ratio)] = {
+                **self._evaluate(
+                    db, collection_name, embeddings, query_vectors, query_labels, metric
+                ),
+                "noisy_rows": noisy,
+                "upserted_rows": upserted,
+                "stale_rows": stale_rows,
+                "ingest_s": ingest_s,
+            }
+            ingest_s = 0.0
+            upserted = 0
+
+        db.drop_collection(collection_name)
+        return results
+
+    @staticmethod
+    def _evaluate(
+        db: VectorDB,
+        collection_name: str,
+        contents: np.ndarray[Any, Any],
+        query_vectors: np.ndarray[Any, Any],
+        query_labels: List[Any],
+        metric: str,
+    ) -> Dict[str, float]:
+        """Computes label recall and recall against the exact neighbours.
+
+        Args:
+            contents: The vectors the collection holds, with row i stored
+                under id str(i).
+            metric: The metric the collection ranks by.
+        """
+        with phase("query"):
+            query_results = db.search(collection_name, query_vectors, k=10)
+        predicted = np.where(query_results.valid, query_results.ids, -1)
+        with phase("ground_truth"):
+            truth = exact_neighbors(contents, query_vectors, 10, metric=metric)
+        return {
+            "recall@10": recall_at_k(
+                query_labels, query_results.field("label").tolist(), k=10
+            ),
+            "neighbor_recall@10": neighbor_recall_at_k(
+                truth, predicted.astype(np.int64), k=10
+            ),
+        }
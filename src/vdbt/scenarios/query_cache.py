@@ -0,0 +1,239 @@
+"""Client-side query cache scenario."""
+
+import logging
+import random
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from vdbt.adapters.base import QueryResult, VectorDB
+from vdbt.adapters.caching import CachingAdapter
+from vdbt.metrics import compute_percentiles, neighbor_recall_at_k
+from vdbt.utils.data import create_synthetic_embeddings, zipf_weights
+from vdbt.utils.profiling import phase
+
+
+def _neighbor_ids(result: QueryResult) -> np.ndarray[Any, Any]:
+    ids: np.ndarray[Any, Any] = np.where(result.valid, result.ids, -1).astype(np.int64)
+    return ids
+
+
+class QueryCacheScenario:
+    """Scenario to benchmark a semantic cache in front of the database.
+
+    The workload repeats `num_distinct` questions with Zipfian popularity,
+    each repeat perturbed by relative gaussian noise of `perturbation`, as
+    paraphrases would be. Every cache configuration in `caches`, named
+    "<mode>-<eviction>" (e.g. "exact-lru", "approximate-lfu", see
+    `CachingAdapter`), replays the same requests:
+
+    - Read-only, reporting hit rate, latency with and without the cache, and
+      the recall of cached answers against fresh ones.
+    - Under an update/delete storm, once with invalidation on writes and once
+      without, reporting hit rate and how many hits returned different
+      neighbours than the database would have.
+    """
+
+    name = "query_cache"
+    sweep = "caches"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the query cache scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics per cache configuration.
+        """
+        dim = kwargs["dim"]
+        seed = kwargs["seed"]
+        num_embeddings = kwargs.get("num_embeddings", 10000)
+        num_distinct = kwargs.get("num_distinct", 500)
+        num_queries = kwargs.get("num_queries", 5000)
+        caches = kwargs.get("caches", ["exact-lru", "exact-lfu", "approximate-lru"])
+        k = kwargs.get("k", 10)
+
+        embeddings, _ = create_synthetic_embeddings(
+            num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
+        )
+        requests = self._requests(
+            dim,
+            num_distinct,
+            num_queries,
+            kwargs.get("zipf_exponent", 1.1),
+            kwargs.get("perturbation", 0.0),
+            seed,
+        )
+
+        results: Dict[str, Any] = {}
+        for cache in caches:
+            mode, _, eviction = cache.partition("-")
+            options = {
+                "mode": mode,
+                "eviction": eviction or "lru",
+                "capacity": kwargs.get("capacity", 1000),
+                "threshold": kwargs.get("threshold", 0.05),
+            }
+            logging.info(f"Benchmarking the {cache} cache")
+            self._load(db, embeddings)
+            with phase("read"):
+                read = self._read(db, requests, k, options)
+            storm = {}
+            for invalidate in (True, False):
+                self._load(db, embeddings)
+                with phase("storm"):
+                    storm["invalidate" if invalidate else "no_invalidate"] = (
+                        self._storm(
+                            CachingAdapter(db, invalidate=invalidate, **options),
+                            requests,
+                            k,
+                            num_embeddings,
+                            kwargs,
+                        )
+                    )
+            results[cache] = {**options, **read, "storm": storm}
+
+        db.drop_collection(self.name)
+        return results
+
+    @staticmethod
+    def _requests(
+        dim: int,
+        num_distinct: int,
+        num_queries: int,
+        exponent: float,
+        perturbation: float,
+        seed: int,
+    ) -> np.ndarray[Any, Any]:
+        """Draws the query stream, one float32 row per request."""
+        rng = np.random.default_rng(seed + 1)
+        questions, _ = create_synthetic_embeddings(
+            num_embeddings=num_distinct, dim=dim, num_classes=10, seed=seed + 1
+        )
+        picks = rng.choice(
+            num_distinct, size=num_queries, p=zipf_weights(num_distinct, exponent)
+        )
+        requests = questions[picks]
+        if perturbation > 0:
+            scale = perturbation * np.linalg.norm(requests, axis=1, keepdims=True)
+            noise = rng.standard_normal(requests.shape) / np.sqrt(dim)
+            requests = requests + scale * noise
+        return np.ascontiguousarray(requests, dtype=np.float32)
+
+    def _load(self, db: VectorDB, embeddings: np.ndarray[Any, Any]) -> None:
+        db.drop_collection(self.name)
+        db.create_collection(self.name, embeddings.shape[1])
+        with phase("ingest"):
+            for start in range(0, len(embeddings), 10000):
+                stop = min(start + 10000, len(embeddings))
+                ids = [str(i) for i in range(start, stop)]
+                meta = [{"i": i} for i in range(start, stop)]
+                db.upsert(self.name, ids, embeddings[start:stop], meta)
+
+    def _read(
+        self,
+        db: VectorDB,
+        requests: np.ndarray[Any, Any],
+        k: int,
+        options: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Replays the requests without and with the cache."""
+        cache = CachingAdapter(db, **options)
+        latencies = {}
+        answers = {}
+        for label, target in (("uncached", db), ("cached", cache)):
+            timings = np.empty(len(requests), dtype=np.int64)
+            ids = np.empty((len(requests), k), dtype=np.int64)
+            for i, request in enumerate(requests):
+                start = time.perf_counter_ns()
+                result = target.search(self.name, request.reshape(1, -1), k=k)
+                timings[i] = time.perf_counter_ns() - start
+                ids[i] = _neighbor_ids(result)[0]
+            latencies[label] = compute_percentiles((timings / 1e9).tolist())
+            answers[label] = ids
+
+        stats = cache.stats()
+        return {
+            "hit_rate": stats["hit_rate"],
+            "evictions": stats["evictions"],
+            "uncached_latency_s": latencies["uncached"],
+            "cached_latency_s": latencies["cached"],
+            "hit_latency_s": stats["hit_latency_s"],
+            "miss_latency_s": stats["miss_latency_s"],
+            f"cached_recall@{k}": neighbor_recall_at_k(
+                answers["uncached"], answers["cached"], k
+            ),
+        }
+
+    def _storm(
+        self,
+        cache: CachingAdapter,
+        requests: np.ndarray[Any, Any],
+        k: int,
+        num_embeddings: int,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Replays the requests with writes every `write_every` requests.
+
+        A hit is stale if it returns a deleted document. Hits are also
+        compared with a fresh, untimed search of the database, which catches
+        answers made outdated by updates as well.
+        """
+        db = cache.db
+        write_every = params.get("write_every", 100)
+        num_updates = int(num_embeddings * params.get("update_ratio", 0.01))
+        num_deletes = int(num_embeddings * params.get("delete_ratio", 0.01))
+        rng = np.random.default_rng(params["seed"] + 2)
+        sampler = random.Random(params["seed"] + 2)
+        live: List[str] = [str(i) for i in range(num_embeddings)]
+        # Indexed by document id, with a trailing slot for padding (-1).
+        deleted = np.zeros(num_embeddings + 1, dtype=bool)
+        dim = requests.shape[1]
+
+        stale = writes = 0
+        hit_ids, fresh_ids = [], []
+        for i, request in enumerate(requests):
+            if i and i % write_every == 0:
+                writes += 1
+                if num_updates:
+                    update_ids = sampler.sample(live, min(num_updates, len(live)))
+                    vectors = rng.standard_normal((len(update_ids), dim))
+                    cache.upsert(
+                        self.name,
+                        update_ids,
+                        vectors.astype(np.float32),
+                        [{"i": int(doc_id)} for doc_id in update_ids],
+                    )
+                if num_deletes and len(live) > k:
+                    count = min(num_deletes, len(live) - k)
+                    positions = sorted(sampler.sample(range(len(live)), count))
+                    delete_ids = [live.pop(p) for p in reversed(positions)]
+                    cache.delete(self.name, delete_ids)
+                    deleted[[int(doc_id) for doc_id in delete_ids]] = True
+
+            hits = cache.hits
+            query = request.reshape(1, -1)
+            result = cache.search(self.name, query, k=k)
+            if cache.hits > hits:
+                ids = _neighbor_ids(result)
+                stale += int(deleted[ids].any())
+                hit_ids.append(ids[0])
+                fresh_ids.append(_neighbor_ids(db.search(self.name, query, k=k))[0])
+
+        stats = cache.stats()
+        return {
+            "writes": writes,
+            "hit_rate": stats["hit_rate"],
+            "stale_hits": stale,
+            "stale_hit_rate": stale / len(hit_ids) if hit_ids else 0.0,
+            f"hit_recall@{k}": (
+                neighbor_recall_at_k(np.array(fresh_ids), np.array(hit_ids), k)
+                if hit_ids
+                else None
+            ),
+            "outdated_hits": stats["outdated_hits"],
+            "invalidations": stats["invalidations"],
+        }
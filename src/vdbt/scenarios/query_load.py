@@ -0,0 +1,93 @@
+"""Query load scenario."""
+
+import logging
+from typing import Any, Dict
+
+import numpy as np
+
+from vdbt.adapters.base import RemoteVectorDB, VectorDB
+from vdbt.loadgen import generate_load, merge_reports, run_distributed
+from vdbt.utils.data import create_synthetic_embeddings
+from vdbt.utils.profiling import phase
+
+
+class QueryLoadScenario:
+    """Scenario to measure query throughput as load generators are added.
+
+    For every worker count, the query stream is split across that many load
+    generator processes, which start together and issue queries for a fixed
+    duration. Their latency histograms and counters are merged exactly, so
+    aggregate QPS can be compared across worker counts to find where the
+    backend, rather than the client, becomes the limit.
+
+    Only adapters whose backend is reachable from other processes can use
+    more than one worker; in-process adapters are measured with a single
+    in-process generator.
+    """
+
+    name = "query_load"
+    sweep = "workers"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the query load scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics per worker count.
+        """
+        dim = kwargs["dim"]
+        seed = kwargs["seed"]
+        num_embeddings = kwargs.get("num_embeddings", 100000)
+        num_queries = kwargs.get("num_queries", 10000)
+        worker_counts = kwargs.get("workers", [1, 2, 4])
+        if isinstance(worker_counts, int):
+            worker_counts = [worker_counts]
+        k = kwargs.get("k", 10)
+        duration_s = kwargs.get("duration_s", 10.0)
+        max_queries = kwargs.get("max_queries")
+
+        collection_name = f"{self.name}"
+        db.drop_collection(collection_name)
+        db.create_collection(collection_name, dim)
+        with phase("ingest"):
+            embeddings, _ = create_synthetic_embeddings(
+                num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
+            )
+            for start in range(0, num_embeddings, 10000):
+                stop = min(start + 10000, num_embeddings)
+                ids = [str(i) for i in range(start, stop)]
+                meta = [{"i": i} for i in range(start, stop)]
+                db.upsert(collection_name, ids, embeddings[start:stop], meta)
+        queries = np.random.default_rng(seed + 1).standard_normal((num_queries, dim))
+        queries = queries.astype(np.float32)
+
+        results: Dict[str, Any] = {}
+        for workers in worker_counts:
+            logging.info(f"Query load with {workers} workers...")
+            with phase("load"):
+                if isinstance(db, RemoteVectorDB):
+                    results[str(workers)] = run_distributed(
+                        db,
+                        collection_name,
+                        queries,
+                        k,
+                        workers,
+                        duration_s,
+                        max_queries,
+                        host=kwargs.get("coordinator_host", "127.0.0.1"),
+                        port=kwargs.get("coordinator_port", 0),
+                        spawn=kwargs.get("spawn_workers", True),
+                    )
+                elif workers == 1:
+                    report = generate_load(
+                        db, collection_name, queries, k, duration_s, max_queries
+                    )
+                    results[str(workers)] = merge_reports([report])
+                else:
+                    results[str(workers)] = {"supported": False}
+
+        db.drop_collection(collection_name)
+        return results
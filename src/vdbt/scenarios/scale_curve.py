@@ -1,13 +1,16 @@
 """Scale curve scenario."""
 
+from functools import partial
 from typing import Any, Dict
 
 import numpy as np
-from tqdm import tqdm
 
 from vdbt.adapters.base import VectorDB
-from vdbt.metrics import compute_percentiles
+from vdbt.metrics import neighbor_recall_at_k
 from vdbt.utils.data import create_synthetic_embeddings
+from vdbt.utils.datasets import ingest_dataset, load_dataset
+from vdbt.utils.harness import MeasurementConfig, measure
+from vdbt.utils.profiling import phase
 from vdbt.utils.timing import Timer
 
 
@@ -15,6 +18,7 @@ class ScaleCurveScenario:
     """Scenario to measure performance as the dataset size increases."""
 
     name = "scale_curve"
+    sweep = "scales"
 
     def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
         """Run the scale curve scenario.
@@ -26,45 +30,81 @@ class ScaleCurveScenario:
         Returns:
             A dictionary of metrics.
         """
-        dim = kwargs["dim"]
-        scales = kwargs["scales"]
-        seed = kwargs["seed"]
+        dataset = load_dataset(kwargs["dataset"]) if "dataset" in kwargs else None
+        if dataset is not None:
+            dim = dataset.dim
+            scales = kwargs.get("scales", [dataset.num_base])
+            create_kwargs = {"metric": dataset.metric}
+        else:
+            dim = kwargs["dim"]
+            scales = kwargs["scales"]
+            seed = kwargs["seed"]
+            create_kwargs = {}
+        num_queries = kwargs.get("num_queries", 100)
+        batch_size = kwargs.get("batch_size", 10000)
+        measurement = MeasurementConfig.from_kwargs(kwargs)
 
         results = {}
         for scale in scales:
             collection_name = f"{self.name}_{scale}"
             db.drop_collection(collection_name)
-            db.create_collection(collection_name, dim)
-
-            # Generate data
-            embeddings, _ = create_synthetic_embeddings(
-                num_embeddings=scale, dim=dim, num_classes=10, seed=seed
-            )
-            ids = [str(i) for i in range(scale)]
-            metadata = [{"i": i} for i in range(scale)]
-
-            # Indexing
-            with Timer() as index_timer:
-                db.upsert(collection_name, ids, embeddings, metadata)
+            db.create_collection(collection_name, dim, **create_kwargs)
+
+            if dataset is not None:
+                # Stream the first `scale` base vectors.
+                with phase("ingest"), Timer() as index_timer:
+                    ingest_dataset(
+                        db, collection_name, dataset, batch_size, limit=scale
+                    )
+                query_vectors = dataset.query_vectors(num_queries)
+            else:
+                # Generate data
+                with phase("generate"):
+                    embeddings, _ = create_synthetic_embeddings(
+                        num_embeddings=scale, dim=dim, num_classes=10, seed=seed
+                    )
+                    ids = [str(i) for i in range(scale)]
+                    metadata = [{"i": i} for i in range(scale)]
+                    query_vectors, _ = create_synthetic_embeddings(
+                        num_embeddings=num_queries,
+                        dim=dim,
+                        num_classes=10,
+                        seed=seed + 1,
+                    )
+
+                # Indexing
+                with phase("ingest"), Timer() as index_timer:
+                    db.upsert(collection_name, ids, embeddings, metadata)
 
             # Memory usage
             memory_bytes = db.memory_bytes(collection_name)
 
-            # Querying
-            query_vectors, _ = create_synthetic_embeddings(
-                num_embeddings=100, dim=dim, num_classes=10, seed=seed + 1
-            )
-            latencies = []
-            for vector in tqdm(query_vectors, desc=f"Querying {scale}"):
-                with Timer() as query_timer:
-                    db.query(collection_name, np.expand_dims(vector, axis=0), k=10)
-                latencies.append(query_timer["duration_s"])
+            # Querying, one vector at a time until latency is steady.
+            with phase("query"):
+                sampler, _ = measure(
+                    partial(db.search, collection_name, k=10),
+                    [vector.reshape(1, -1) for vector in query_vectors],
+                    measurement,
+                )
 
             results[str(scale)] = {
                 "index_time_s": index_timer["duration_s"],
                 "memory_bytes": memory_bytes,
-                "query_latency_s": compute_percentiles(latencies),
+                "query_latency_s": sampler.percentiles(),
+                "query_sampling": sampler.stats(),
             }
+            # Ground truth is only valid against the full base set.
+            if (
+                dataset is not None
+                and dataset.neighbors is not None
+                and scale >= dataset.num_base
+            ):
+                with phase("recall"):
+                    result = db.search(collection_name, query_vectors, k=10)
+                predicted = np.where(result.valid, result.ids, -1).astype(np.int64)
+                results[str(scale)]["recall@10"] = neighbor_recall_at_k(
+                    dataset.ground_truth(10, limit=len(query_vectors)), predicted, k=10
+                )
 
             db.drop_collection(collection_name)
 
@@ -0,0 +1,268 @@
+"""Soak scenario."""
+
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+import orjson
+import psutil
+
+from vdbt.adapters.base import VectorDB
+from vdbt.metrics import linear_trend
+from vdbt.utils.histogram import LatencyHistogram
+from vdbt.utils.profiling import phase
+from vdbt.utils.timing import timer_calibration
+
+OPERATIONS = ("query", "upsert", "delete")
+
+
+class SoakScenario:
+    """Scenario to run a mixed workload for a long time and detect drift.
+
+    A single load generator issues queries, upserts and deletes in a fixed
+    ratio for `duration_s` seconds. Every `window_s` seconds it records a
+    window with per-operation latency histograms, throughput, errors and
+    resource usage, then fits linear trends over the windows to flag memory
+    leaks, latency drift and throughput degradation.
+
+    The generator's own memory is bounded: ids are drawn from a fixed id
+    space tracked with a bitmap, latencies go into fixed-size histograms, and
+    at most `max_windows` windows are kept (all windows can additionally be
+    streamed to a JSON lines file).
+    """
+
+    name = "soak"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the soak scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics.
+        """
+        dim = kwargs["dim"]
+        seed = kwargs["seed"]
+        duration_s = kwargs.get("duration_s", 600.0)
+        window_s = kwargs.get("window_s", 60.0)
+        num_embeddings = kwargs.get("num_embeddings", 10000)
+        id_space = kwargs.get("id_space", 2 * num_embeddings)
+        mix = kwargs.get("mix", {"query": 0.8, "upsert": 0.15, "delete": 0.05})
+        max_windows = kwargs.get("max_windows", 10080)
+        warmup_windows = kwargs.get("warmup_windows", 1)
+        leak_threshold = kwargs.get("leak_threshold", 0.1)
+        drift_threshold = kwargs.get("drift_threshold", 0.25)
+        log_path = kwargs.get("log_path")
+
+        rng = np.random.default_rng(seed)
+        weights = np.array([mix.get(op, 0.0) for op in OPERATIONS], dtype=np.float64)
+        thresholds = np.cumsum(weights / weights.sum())
+
+        collection_name = f"{self.name}"
+        db.drop_collection(collection_name)
+        db.create_collection(collection_name, dim)
+
+        # Initial data load, in batches so large loads stay bounded too.
+        live = np.zeros(id_space, dtype=bool)
+        with phase("ingest"):
+            for start in range(0, num_embeddings, 10000):
+                rows = np.arange(start, min(start + 10000, num_embeddings))
+                self._upsert(db, collection_name, rows, rng, dim)
+                live[rows] = True
+
+        process = psutil.Process()
+        process.cpu_percent(interval=None)
+        histograms = {op: LatencyHistogram() for op in OPERATIONS}
+        totals = {op: LatencyHistogram() for op in OPERATIONS}
+        errors = dict.fromkeys(OPERATIONS, 0)
+        total_errors = dict.fromkeys(OPERATIONS, 0)
+        windows: Deque[Dict[str, Any]] = deque(maxlen=max_windows)
+        log_file = open(Path(log_path), "ab") if log_path else None
+
+        run_start = time.perf_counter()
+        window_start = run_start
+        try:
+            with phase("workload"):
+                while True:
+                    now = time.perf_counter()
+                    if now - window_start >= window_s or now - run_start >= duration_s:
+                        window = self._window(
+                            db,
+                            collection_name,
+                            process,
+                            histograms,
+                            errors,
+                            window_start - run_start,
+                            now - run_start,
+                        )
+                        windows.append(window)
+                        if log_file is not None:
+                            log_file.write(orjson.dumps(window) + b"\n")
+                            log_file.flush()
+                        for op in OPERATIONS:
+                            totals[op].merge(histograms[op])
+                            histograms[op].reset()
+                            total_errors[op] += errors[op]
+                            errors[op] = 0
+                        window_start = now
+                        if now - run_start >= duration_s:
+                            break
+
+                    op = OPERATIONS[int(np.searchsorted(thresholds, rng.random()))]
+                    try:
+                        latency = self._execute(
+                            db, collection_name, op, rng, live, kwargs
+                        )
+                    except Exception as e:
+                        errors[op] += 1
+                        logging.warning(f"Soak {op} failed: {e}")
+                        continue
+                    if latency is not None:
+                        histograms[op].record_ns(latency)
+        finally:
+            if log_file is not None:
+                log_file.close()
+
+        db.drop_collection(collection_name)
+
+        elapsed = time.perf_counter() - run_start
+        total_ops = sum(totals[op].count for op in OPERATIONS)
+        trends = self._trends(list(windows)[warmup_windows:])
+        return {
+            "duration_s": elapsed,
+            "throughput_ops_s": total_ops / elapsed if elapsed > 0 else 0.0,
+            "latency_s": {op: totals[op].summary() for op in OPERATIONS},
+            "errors": total_errors,
+            "timer_overhead_ns": timer_calibration().overhead_ns,
+            "windows": list(windows),
+            "trends": trends,
+            "flags": self._flags(trends, leak_threshold, drift_threshold),
+        }
+
+    def _execute(
+        self,
+        db: VectorDB,
+        collection_name: str,
+        op: str,
+        rng: np.random.Generator,
+        live: np.ndarray[Any, Any],
+        params: Dict[str, Any],
+    ) -> Optional[int]:
+        """Runs one operation and returns its latency.
+
+        Returns:
+            The latency in nanoseconds, or None if there was nothing to
+            delete.
+        """
+        dim = params["dim"]
+        if op == "query":
+            batch = rng.standard_normal((1, dim)).astype(np.float32)
+            start = time.perf_counter_ns()
+            db.search(collection_name, batch, k=params.get("k", 10))
+            return time.perf_counter_ns() - start
+
+        if op == "upsert":
+            size = params.get("write_batch_size", 100)
+            rows = rng.choice(len(live), size=min(size, len(live)), replace=False)
+            start = time.perf_counter_ns()
+            self._upsert(db, collection_name, rows, rng, dim)
+            latency = time.perf_counter_ns() - start
+            live[rows] = True
+            return latency
+
+        candidates = rng.integers(
+            0, len(live), size=params.get("delete_batch_size", 100)
+        )
+        rows = np.unique(candidates[live[candidates]])
+        if not len(rows):
+            return None
+        start = time.perf_counter_ns()
+        db.delete(collection_name, [str(i) for i in rows])
+        latency = time.perf_counter_ns() - start
+        live[rows] = False
+        return latency
+
+    @staticmethod
+    def _upsert(
+        db: VectorDB,
+        collection_name: str,
+        rows: np.ndarray[Any, Any],
+        rng: np.random.Generator,
+        dim: int,
+    ) -> None:
+        vectors = rng.standard_normal((len(rows), dim)).astype(np.float32)
+        ids = [str(i) for i in rows]
+        db.upsert(collection_name, ids, vectors, [{"i": int(i)} for i in rows])
+
+    @staticmethod
+    def _window(
+        db: VectorDB,
+        collection_name: str,
+        process: psutil.Process,
+        histograms: Dict[str, LatencyHistogram],
+        errors: Dict[str, int],
+        start_s: float,
+        end_s: float,
+    ) -> Dict[str, Any]:
+        ops = sum(histograms[op].count for op in OPERATIONS)
+        length = end_s - start_s
+        return {
+            "start_s": start_s,
+            "end_s": end_s,
+            "ops": {op: histograms[op].count for op in OPERATIONS},
+            "errors": dict(errors),
+            "throughput_ops_s": ops / length if length > 0 else 0.0,
+            "latency_s": {op: histograms[op].summary() for op in OPERATIONS},
+            "rss_bytes": process.memory_info().rss,
+            "cpu_percent": process.cpu_percent(interval=None),
+            "memory_bytes": db.memory_bytes(collection_name),
+            "count": db.count(collection_name),
+        }
+
+    @staticmethod
+    def _trends(windows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+        """Fits per-hour trends of memory, p99 query latency and throughput."""
+        hours = [w["end_s"] / 3600.0 for w in windows]
+        series = {
+            "rss_bytes": [float(w["rss_bytes"]) for w in windows],
+            "query_p99_s": [w["latency_s"]["query"]["p99"] for w in windows],
+            "throughput_ops_s": [w["throughput_ops_s"] for w in windows],
+        }
+        trends: Dict[str, Dict[str, float]] = {}
+        for key, values in series.items():
+            trend = linear_trend(hours, values)
+            start = 0.0
+            # The fitted change over the run, relative to the fitted start.
+            span = hours[-1] - hours[0] if len(hours) > 1 else 0.0
+            if hours:
+                start = trend["slope"] * hours[0] + trend["intercept"]
+            trend["relative_change"] = (
+                trend["slope"] * span / start if start > 0 else 0.0
+            )
+            trends[key] = trend
+        return trends
+
+    @staticmethod
+    def _flags(
+        trends: Dict[str, Dict[str, float]],
+        leak_threshold: float,
+        drift_threshold: float,
+    ) -> Dict[str, bool]:
+        """Flags trends that grew (or shrank) steadily past a threshold."""
+
+        def steady(key: str) -> bool:
+            return trends[key]["r2"] >= 0.5
+
+        return {
+            "memory_leak": steady("rss_bytes")
+            and trends["rss_bytes"]["relative_change"] > leak_threshold,
+            "latency_drift": steady("query_p99_s")
+            and trends["query_p99_s"]["relative_change"] > drift_threshold,
+            "throughput_degradation": steady("throughput_ops_s")
+            and trends["throughput_ops_s"]["relative_change"] < -drift_threshold,
+        }
@@ -0,0 +1,190 @@
+"""Trace replay scenario."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from vdbt.adapters.base import VectorDB
+from vdbt.loadgen import merge_reports
+from vdbt.metrics import compute_percentiles
+from vdbt.trace import QueryTrace
+from vdbt.utils.data import create_synthetic_embeddings
+from vdbt.utils.datasets import ingest_dataset, load_dataset
+from vdbt.utils.histogram import LatencyHistogram
+from vdbt.utils.profiling import phase
+
+TIMINGS = ("original", "max")
+
+
+class TraceReplayScenario:
+    """Scenario to re-issue a recorded query trace.
+
+    The trace, written by `RecordingAdapter`, is replayed call by call with
+    its recorded k and filters. With "original" timing each call is sent at
+    its recorded offset, divided by `speed`; with "max" timing calls are
+    sent back to back. Calls are dealt round-robin to `replayers` threads,
+    so several replayers keep the original order and rate while letting
+    calls overlap. Latencies of paced calls are measured from the time each
+    call was due, so a replayer that falls behind the schedule reports the
+    delay as latency instead of hiding it.
+
+    By default the calls go to a collection of synthetic (or `dataset`)
+    vectors loaded by the scenario. With `use_recorded_collections`, nothing
+    is loaded and every call goes to the collection it was recorded
+    against, for replaying against a backend that already holds the data.
+    """
+
+    name = "trace_replay"
+    sweep = "replayers"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the trace replay scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics per replayer count.
+        """
+        trace = QueryTrace.load(kwargs["trace"])
+        timing = kwargs.get("timing", "original")
+        if timing not in TIMINGS:
+            raise ValueError(f"Unknown timing {timing!r}; expected one of {TIMINGS}")
+        speed = kwargs.get("speed", 1.0)
+        replayer_counts = kwargs.get("replayers", [1])
+        if isinstance(replayer_counts, int):
+            replayer_counts = [replayer_counts]
+        recorded = kwargs.get("use_recorded_collections", False)
+
+        calls = trace.calls()
+        recorded_latencies = trace.columns.columns["latency_s"]
+        recorded_latency_s = compute_percentiles(
+            [float(recorded_latencies[call["rows"].start]) for call in calls]
+        )
+        if not recorded:
+            self._load(db, trace.dim, kwargs)
+            for call in calls:
+                call["collection"] = self.name
+
+        results: Dict[str, Any] = {}
+        for replayers in replayer_counts:
+            logging.info(f"Replaying {len(calls)} calls with {replayers} replayers")
+            with phase("replay"):
+                reports = self._replay(
+                    db, trace, calls, replayers, timing == "original", speed
+                )
+            results[str(replayers)] = {
+                **merge_reports(reports),
+                "vectors": sum(report["vectors"] for report in reports),
+                "max_lag_s": max(report["max_lag_s"] for report in reports),
+                "timing": timing,
+                "speed": speed if timing == "original" else None,
+                "trace_duration_s": trace.duration_s,
+                "recorded_latency_s": recorded_latency_s,
+            }
+
+        if not recorded:
+            db.drop_collection(self.name)
+        return results
+
+    def _load(self, db: VectorDB, dim: int, params: Dict[str, Any]) -> None:
+        """Loads the vectors the trace is replayed against."""
+        db.drop_collection(self.name)
+        with phase("ingest"):
+            if "dataset" in params:
+                dataset = load_dataset(params["dataset"])
+                if dataset.dim != dim:
+                    raise ValueError(
+                        f"The trace has {dim}-dim queries but the dataset has "
+                        f"{dataset.dim}-dim vectors"
+                    )
+                db.create_collection(self.name, dim, metric=dataset.metric)
+                ingest_dataset(db, self.name, dataset, params.get("batch_size", 10000))
+                return
+            num_embeddings = params.get("num_embeddings", 10000)
+            embeddings, _ = create_synthetic_embeddings(
+                num_embeddings=num_embeddings,
+                dim=dim,
+                num_classes=10,
+                seed=params["seed"],
+            )
+            db.create_collection(self.name, dim)
+            for start in range(0, num_embeddings, 10000):
+                stop = min(start + 10000, num_embeddings)
+                ids = [str(i) for i in range(start, stop)]
+                meta = [{"i": i} for i in range(start, stop)]
+                db.upsert(self.name, ids, embeddings[start:stop], meta)
+
+    @staticmethod
+    def _replay(
+        db: VectorDB,
+        trace: QueryTrace,
+        calls: List[Dict[str, Any]],
+        replayers: int,
+        paced: bool,
+        speed: float,
+    ) -> List[Dict[str, Any]]:
+        """Replays the calls from `replayers` threads.
+
+        Returns:
+            One report per replayer, like `loadgen.generate_load`, where
+            "queries" counts calls, plus the number of query vectors sent
+            and the furthest the replayer fell behind the schedule.
+        """
+        clock = time.perf_counter_ns
+        reports: List[Dict[str, Any]] = [{} for _ in range(replayers)]
+        start_barrier = threading.Barrier(replayers + 1)
+        origin = 0
+
+        def replay(index: int) -> None:
+            histogram = LatencyHistogram()
+            count = errors = vectors_sent = 0
+            max_lag_ns = 0
+            start_barrier.wait()
+            started = time.time()
+            for call in calls[index::replayers]:
+                vectors = np.asarray(trace.vectors[call["rows"]])
+                if paced:
+                    due = origin + int(call["timestamp_s"] / speed * 1e9)
+                    wait_ns = due - clock()
+                    if wait_ns > 0:
+                        time.sleep(wait_ns / 1e9)
+                    else:
+                        max_lag_ns = max(max_lag_ns, -wait_ns)
+                    sent = due
+                else:
+                    sent = clock()
+                try:
+                    db.search(call["collection"], vectors, call["k"], call["filter"])
+                except Exception as e:
+                    errors += 1
+                    logging.warning(f"Replayed query failed: {e}")
+                    continue
+                histogram.record_ns(clock() - sent)
+                count += 1
+                vectors_sent += len(vectors)
+            reports[index] = {
+                "histogram": histogram.to_dict(),
+                "queries": count,
+                "vectors": vectors_sent,
+                "errors": errors,
+                "max_lag_s": max_lag_ns / 1e9,
+                "started": started,
+                "finished": time.time(),
+            }
+
+        threads = [
+            threading.Thread(target=replay, args=(i,), daemon=True)
+            for i in range(replayers)
+        ]
+        for thread in threads:
+            thread.start()
+        origin = clock()
+        start_barrier.wait()
+        for thread in threads:
+            thread.join()
+        return reports
@@ -0,0 +1,233 @@
+"""Traffic shape scenario."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from vdbt.adapters.base import VectorDB
+from vdbt.utils.data import create_synthetic_embeddings
+from vdbt.utils.histogram import LatencyHistogram
+from vdbt.utils.profiling import phase
+from vdbt.utils.traffic import arrival_times, rate_profile
+
+# Per-query outcomes.
+_PENDING, _OK, _ERROR, _TIMEOUT = 0, 1, 2, 3
+
+
+class TrafficShapeScenario:
+    """Scenario to replay a time-varying query rate and measure recovery.
+
+    Queries are sent open-loop at the times given by a rate profile (step
+    bursts, a sine-shaped diurnal cycle or a recorded per-second trace, see
+    `vdbt.utils.traffic`) from a pool of `concurrency` threads. Latency is
+    measured from each query's scheduled send time, so time spent queued
+    behind a burst counts against it rather than being hidden by a slower
+    send rate.
+
+    Every `window_s` seconds of schedule gets its own latency percentiles,
+    offered and achieved rate, errors and timeouts. A burst is a run of
+    windows whose offered rate exceeds `burst_threshold` times the median
+    offered rate; its recovery time is how long after it ends the window p99
+    takes to fall back within `recovery_factor` of the p99 of the windows
+    outside bursts.
+    """
+
+    name = "traffic_shape"
+
+    def run(self, db: VectorDB, **kwargs: Any) -> Dict[str, Any]:
+        """Run the traffic shape scenario.
+
+        Args:
+            db: The vector database adapter to use.
+            **kwargs: Scenario-specific parameters.
+
+        Returns:
+            A dictionary of metrics.
+        """
+        dim = kwargs["dim"]
+        seed = kwargs["seed"]
+        num_embeddings = kwargs.get("num_embeddings", 10000)
+        num_queries = kwargs.get("num_queries", 1000)
+        k = kwargs.get("k", 10)
+        duration_s = kwargs.get("duration_s", 60)
+        window_s = kwargs.get("window_s", 1.0)
+        concurrency = kwargs.get("concurrency", 16)
+        timeout_s = kwargs.get("timeout_s", 1.0)
+        profile = kwargs.get(
+            "profile",
+            {
+                "shape": "step",
+                "base_qps": 50,
+                "burst_qps": 500,
+                "burst_duration_s": 5,
+            },
+        )
+
+        rates = rate_profile(profile, duration_s)
+        schedule = arrival_times(rates, kwargs.get("arrivals", "uniform"), seed)
+
+        collection_name = f"{self.name}"
+        db.drop_collection(collection_name)
+        db.create_collection(collection_name, dim)
+        with phase("ingest"):
+            embeddings, _ = create_synthetic_embeddings(
+                num_embeddings=num_embeddings, dim=dim, num_classes=10, seed=seed
+            )
+            for start in range(0, num_embeddings, 10000):
+                stop = min(start + 10000, num_embeddings)
+                ids = [str(i) for i in range(start, stop)]
+                meta = [{"i": i} for i in range(start, stop)]
+                db.upsert(collection_name, ids, embeddings[start:stop], meta)
+        queries = np.random.default_rng(seed + 1).standard_normal((num_queries, dim))
+        queries = queries.astype(np.float32)
+
+        with phase("replay"):
+            latencies, outcomes, lag = self._replay(
+                db, collection_name, queries, k, schedule, concurrency, timeout_s
+            )
+        db.drop_collection(collection_name)
+
+        windows = self._windows(schedule, latencies, outcomes, window_s, len(rates))
+        ok = outcomes == _OK
+        total = LatencyHistogram()
+        total.record_many_ns(latencies[ok | (outcomes == _TIMEOUT)])
+        return {
+            "duration_s": len(rates),
+            "scheduled": len(schedule),
+            "completed": int(ok.sum()),
+            "errors": int((outcomes == _ERROR).sum()),
+            "timeouts": int((outcomes == _TIMEOUT).sum()),
+            "offered_qps": float(rates.mean()) if len(rates) else 0.0,
+            "max_send_lag_s": lag,
+            "latency_s": total.summary(),
+            "windows": windows,
+            "bursts": self._bursts(
+                windows,
+                kwargs.get("burst_threshold", 1.5),
+                kwargs.get("recovery_factor", 1.5),
+            ),
+        }
+
+    @staticmethod
+    def _replay(
+        db: VectorDB,
+        collection_name: str,
+        queries: np.ndarray[Any, Any],
+        k: int,
+        schedule: np.ndarray[Any, Any],
+        concurrency: int,
+        timeout_s: float,
+    ) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any], float]:
+        """Sends one query at each scheduled time.
+
+        Returns:
+            The latency of every query from its scheduled time in
+            nanoseconds, its outcome, and the furthest the sender fell behind
+            the schedule, in seconds.
+        """
+        clock = time.perf_counter_ns
+        due_ns = (schedule * 1e9).astype(np.int64)
+        timeout_ns = int(timeout_s * 1e9)
+        latencies = np.zeros(len(schedule), dtype=np.int64)
+        outcomes = np.full(len(schedule), _PENDING, dtype=np.int8)
+        batches = [queries[i : i + 1] for i in range(len(queries))]
+        origin = clock()
+        max_lag_ns = 0
+        logged = threading.Event()
+
+        def send(i: int) -> None:
+            # Each call writes only its own slot, so no lock is needed.
+            try:
+                db.search(collection_name, batches[i % len(batches)], k=k)
+            except Exception as e:
+                outcomes[i] = _ERROR
+                if not logged.is_set():
+                    logged.set()
+                    logging.warning(f"Traffic query failed: {e}")
+                return
+            latencies[i] = clock() - origin - due_ns[i]
+            outcomes[i] = _TIMEOUT if latencies[i] > timeout_ns else _OK
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i, due in enumerate(due_ns.tolist()):
+                wait_ns = due - (clock() - origin)
+                if wait_ns > 0:
+                    time.sleep(wait_ns / 1e9)
+                else:
+                    max_lag_ns = max(max_lag_ns, -wait_ns)
+                pool.submit(send, i)
+        return latencies, outcomes, max_lag_ns / 1e9
+
+    @staticmethod
+    def _windows(
+        schedule: np.ndarray[Any, Any],
+        latencies: np.ndarray[Any, Any],
+        outcomes: np.ndarray[Any, Any],
+        window_s: float,
+        duration_s: float,
+    ) -> List[Dict[str, Any]]:
+        """Summarizes the queries scheduled in each window."""
+        num_windows = max(1, int(np.ceil(duration_s / window_s)))
+        assignment = np.minimum((schedule / window_s).astype(np.int64), num_windows - 1)
+
+        windows = []
+        for w in range(num_windows):
+            members = assignment == w
+            window_outcomes = outcomes[members]
+            measured = (window_outcomes == _OK) | (window_outcomes == _TIMEOUT)
+            histogram = LatencyHistogram()
+            histogram.record_many_ns(latencies[members][measured])
+            completed = int((window_outcomes == _OK).sum())
+            windows.append(
+                {
+                    "start_s": w * window_s,
+                    "end_s": min((w + 1) * window_s, duration_s),
+                    "offered_qps": int(members.sum()) / window_s,
+                    "scheduled": int(members.sum()),
+                    "achieved_qps": completed / window_s,
+                    "errors": int((window_outcomes == _ERROR).sum()),
+                    "timeouts": int((window_outcomes == _TIMEOUT).sum()),
+                    "latency_s": histogram.summary(),
+                }
+            )
+        return windows
+
+    @staticmethod
+    def _bursts(
+        windows: List[Dict[str, Any]], threshold: float, recovery_factor: float
+    ) -> Dict[str, Any]:
+        """Finds bursts and how long p99 takes to recover after each one."""
+        offered = np.array([w["offered_qps"] for w in windows])
+        p99 = np.array([w["latency_s"]["p99"] for w in windows])
+        in_burst = offered > threshold * np.median(offered)
+        quiet = ~in_burst & (p99 > 0)
+        baseline = float(np.median(p99[quiet])) if quiet.any() else None
+
+        bursts = []
+        edges = np.diff(np.concatenate([[0], in_burst.astype(np.int8), [0]]))
+        for start, stop in zip(
+            np.flatnonzero(edges == 1), np.flatnonzero(edges == -1), strict=True
+        ):
+            recovery_s: Optional[float] = None
+            if baseline is not None:
+                tail = p99[stop:]
+                after = np.flatnonzero(
+                    (tail > 0) & (tail <= recovery_factor * baseline)
+                )
+                if len(after):
+                    recovered = windows[stop + int(after[0])]["start_s"]
+                    recovery_s = recovered - windows[stop - 1]["end_s"]
+            bursts.append(
+                {
+                    "start_s": windows[start]["start_s"],
+                    "end_s": windows[stop - 1]["end_s"],
+                    "peak_offered_qps": float(offered[start:stop].max()),
+                    "peak_p99_s": float(p99[start:stop].max()),
+                    "recovery_s": recovery_s,
+                }
+            )
+        return {"baseline_p99_s": baseline, "bursts": bursts}
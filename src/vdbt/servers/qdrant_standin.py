@@ -0,0 +1,436 @@
+"""A local stand-in for the Qdrant REST API.
+
+Implements the subset of the Qdrant HTTP API that `QdrantAdapter` uses
+(collections, payload indexes, upsert, search/query, batch query, delete and
+count) on top of the in-process `NumpyAdapter`. This lets the Qdrant client
+path, including request serialization, be tested and benchmarked on machines
+that cannot reach a real Qdrant service.
+
+Every response can be delayed by a fixed latency plus uniform jitter to
+emulate a network hop. The `time` field of each response reports only the
+engine time, the way a real server reports its own processing time.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import orjson
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.filters import AND, NOT, OR
+
+_DISTANCES = {"Cosine": "cosine", "Dot": "ip", "Euclid": "l2"}
+_UUID = re.compile(r"^[0-9a-fA-F]{8}-?([0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}$")
+
+
+class StandInError(Exception):
+    """An error reported to the client with an HTTP status code."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _server_version() -> str:
+    """Returns the version to advertise, matching the installed client."""
+    try:
+        return metadata.version("qdrant-client")
+    except metadata.PackageNotFoundError:
+        return "1.12.0"
+
+
+def _point_key(point_id: Any) -> str:
+    """Validates a point id the way Qdrant does and returns its storage key."""
+    if isinstance(point_id, int) and not isinstance(point_id, bool) and point_id >= 0:
+        return str(point_id)
+    if isinstance(point_id, str) and _UUID.match(point_id):
+        return point_id
+    raise StandInError(
+        400, f"Unable to parse point id {point_id!r}: expected uint or UUID"
+    )
+
+
+def _point_id(key: str) -> Any:
+    """Converts a storage key back into the id type the client sent."""
+    return int(key) if key.isdigit() else key
+
+
+def _translate_condition(condition: Dict[str, Any]) -> Dict[str, Any]:
+    """Translates one Qdrant condition, a field condition or a nested filter."""
+    key = condition.get("key")
+    if key is None:
+        if any(condition.get(clause) for clause in ("must", "should", "must_not")):
+            return _translate_filter(condition)
+        raise StandInError(400, f"Unsupported filter condition: {condition}")
+    if condition.get("match") is not None:
+        match = condition["match"]
+        if "value" in match:
+            return {key: match["value"]}
+        if "any" in match:
+            return {key: list(match["any"])}
+        raise StandInError(400, f"Unsupported match condition: {match}")
+    if condition.get("range") is not None:
+        return {
+            key: {
+                op: bound
+                for op, bound in condition["range"].items()
+                if bound is not None
+            }
+        }
+    raise StandInError(400, f"Unsupported filter condition: {condition}")
+
+
+def _translate_filter(query_filter: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Translates a Qdrant filter into a `NumpyAdapter` filter.
+
+    `must`, `should` and `must_not` clauses of `match.value`, `match.any`
+    and `range` conditions and nested filters become `vdbt.filters` filters,
+    which are evaluated as column masks; anything else is rejected.
+    """
+    if not query_filter:
+        return {}
+    if query_filter.get("min_should"):
+        raise StandInError(400, "Unsupported filter clauses: ['min_should']")
+
+    clauses = [_translate_condition(c) for c in query_filter.get("must") or []]
+    should = query_filter.get("should") or []
+    if should:
+        clauses.append({OR: [_translate_condition(c) for c in should]})
+    must_not = query_filter.get("must_not") or []
+    if must_not:
+        clauses.append({NOT: [_translate_condition(c) for c in must_not]})
+    return {AND: clauses} if clauses else {}
+
+
+class QdrantStandInEngine:
+    """The request handlers, independent of the HTTP transport."""
+
+    def __init__(self) -> None:
+        self._engine = NumpyAdapter()
+        self._collections: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._operation_id = 0
+
+    def _collection(self, name: str) -> Dict[str, Any]:
+        collection = self._collections.get(name)
+        if collection is None:
+            raise StandInError(404, f"Not found: Collection `{name}` doesn't exist!")
+        return collection
+
+    def _update_result(self, wait: bool) -> Dict[str, Any]:
+        self._operation_id += 1
+        return {
+            "operation_id": self._operation_id,
+            "status": "completed" if wait else "acknowledged",
+        }
+
+    def list_collections(self) -> Any:
+        return {"collections": [{"name": name} for name in self._collections]}
+
+    def collection_exists(self, name: str) -> Any:
+        return {"exists": name in self._collections}
+
+    def create_collection(self, name: str, body: Dict[str, Any]) -> Any:
+        if name in self._collections:
+            raise StandInError(409, f"Wrong input: Collection `{name}` already exists!")
+        vectors = body.get("vectors") or {}
+        if "size" not in vectors:
+            raise StandInError(400, "Only a single unnamed vector is supported")
+        distance = vectors.get("distance", "Cosine")
+        if distance not in _DISTANCES:
+            raise StandInError(400, f"Unsupported distance {distance!r}")
+        self._engine.create_collection(
+            name, int(vectors["size"]), metric=_DISTANCES[distance]
+        )
+        self._collections[name] = {
+            "dim": int(vectors["size"]),
+            "distance": distance,
+            "payload_schema": {},
+        }
+        return True
+
+    def create_index(self, name: str, body: Dict[str, Any], wait: bool) -> Any:
+        """Records a payload index.
+
+        Filters are always evaluated as column masks, so the index only
+        changes what the collection reports.
+        """
+        collection = self._collection(name)
+        schema = body.get("field_schema")
+        if isinstance(schema, dict):
+            schema = schema.get("type")
+        if not isinstance(schema, str):
+            raise StandInError(400, f"Unsupported field schema: {schema}")
+        collection["payload_schema"][body["field_name"]] = schema
+        return self._update_result(wait)
+
+    def delete_collection(self, name: str) -> Any:
+        existed = self._collections.pop(name, None) is not None
+        self._engine.drop_collection(name)
+        return existed
+
+    def upsert(self, name: str, body: Dict[str, Any], wait: bool) -> Any:
+        collection = self._collection(name)
+        if "batch" in body:
+            batch = body["batch"]
+            ids = batch["ids"]
+            vectors = batch["vectors"]
+            payloads = batch.get("payloads") or [None] * len(ids)
+        else:
+            points = body.get("points", [])
+            ids = [point["id"] for point in points]
+            vectors = [point["vector"] for point in points]
+            payloads = [point.get("payload") for point in points]
+
+        keys = [_point_key(point_id) for point_id in ids]
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+        if matrix.shape[1] != collection["dim"]:
+            raise StandInError(
+                400,
+                f"Wrong input: Vector dimension error: expected dim: "
+                f"{collection['dim']}, got {matrix.shape[1]}",
+            )
+        self._engine.upsert(name, keys, matrix, [p or {} for p in payloads])
+        return self._update_result(wait)
+
+    def search(self, name: str, body: Dict[str, Any]) -> Any:
+        collection = self._collection(name)
+        vector = body.get("vector", body.get("query"))
+        if isinstance(vector, dict):
+            vector = vector.get("nearest", vector.get("vector"))
+        if not isinstance(vector, list):
+            raise StandInError(400, "Only nearest-vector queries are supported")
+
+        hits = self._engine.query(
+            name,
+            np.asarray(vector, dtype=np.float32)[None, :],
+            k=int(body.get("limit", 10)) + int(body.get("offset") or 0),
+            filter=_translate_filter(body.get("filter")),
+        )
+        hits = hits[int(body.get("offset") or 0) :]
+        with_payload = body.get("with_payload") not in (None, False)
+        euclid = collection["distance"] == "Euclid"
+        return [
+            {
+                "id": _point_id(hit["id"]),
+                "version": 0,
+                "score": (
+                    float(np.sqrt(max(hit["distance"], 0.0)))
+                    if euclid
+                    else hit["distance"]
+                ),
+                "payload": hit["metadata"] if with_payload else None,
+                "vector": None,
+            }
+            for hit in hits
+        ]
+
+    def query(self, name: str, body: Dict[str, Any]) -> Any:
+        return {"points": self.search(name, body)}
+
+    def query_batch(self, name: str, body: Dict[str, Any]) -> Any:
+        return [self.query(name, request) for request in body.get("searches", [])]
+
+    def delete_points(self, name: str, body: Dict[str, Any], wait: bool) -> Any:
+        self._collection(name)
+        if "points" not in body:
+            raise StandInError(400, "Only deletion by point ids is supported")
+        keys = [_point_key(point_id) for point_id in body["points"]]
+        self._engine.delete(name, keys)
+        return self._update_result(wait)
+
+    def count(self, name: str, body: Dict[str, Any]) -> Any:
+        self._collection(name)
+        if body.get("filter"):
+            raise StandInError(400, "Filtered counts are not supported")
+        return {"count": self._engine.count(name)}
+
+    def dispatch(
+        self, method: str, path: str, query: Dict[str, List[str]], body: Any
+    ) -> Any:
+        """Routes a request and returns its `result` payload."""
+        wait = query.get("wait", ["false"])[0].lower() == "true"
+        routes: List[Tuple[str, str, Callable[..., Any]]] = [
+            ("GET", r"/collections", lambda: self.list_collections()),
+            ("GET", r"/collections/([^/]+)/exists", self.collection_exists),
+            ("PUT", r"/collections/([^/]+)", lambda n: self.create_collection(n, body)),
+            ("DELETE", r"/collections/([^/]+)", self.delete_collection),
+            (
+                "PUT",
+                r"/collections/([^/]+)/index",
+                lambda n: self.create_index(n, body, wait),
+            ),
+            (
+                "PUT",
+                r"/collections/([^/]+)/points",
+                lambda n: self.upsert(n, body, wait),
+            ),
+            (
+                "POST",
+                r"/collections/([^/]+)/points/search",
+                lambda n: self.search(n, body),
+            ),
+            (
+                "POST",
+                r"/collections/([^/]+)/points/query",
+                lambda n: self.query(n, body),
+            ),
+            (
+                "POST",
+                r"/collections/([^/]+)/points/query/batch",
+                lambda n: self.query_batch(n, body),
+            ),
+            (
+                "POST",
+                r"/collections/([^/]+)/points/delete",
+                lambda n: self.delete_points(n, body, wait),
+            ),
+            (
+                "POST",
+                r"/collections/([^/]+)/points/count",
+                lambda n: self.count(n, body),
+            ),
+        ]
+        for route_method, pattern, handler in routes:
+            if route_method != method:
+                continue
+            match = re.fullmatch(pattern, path)
+            if match:
+                with self._lock:
+                    return handler(*match.groups())
+        raise StandInError(404, f"Not found: {method} {path}")
+
+
+class QdrantStandIn:
+    """A threaded HTTP server that speaks a subset of the Qdrant REST API.
+
+    Example:
+        with QdrantStandIn(latency_s=0.001) as server:
+            adapter = QdrantAdapter(url=server.url)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        seed: int = 42,
+    ) -> None:
+        self.engine = QdrantStandInEngine()
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self._rng = random.Random(seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def _delay(self) -> None:
+        delay = self.latency_s
+        if self.jitter_s > 0:
+            delay += self._rng.uniform(0.0, self.jitter_s)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handler_class(self) -> type:
+        server = self
+        version = _server_version()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, status: int, payload: Dict[str, Any]) -> None:
+                data = orjson.dumps(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self) -> None:
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                server._delay()
+                if url.path in ("", "/"):
+                    self._respond(
+                        200,
+                        {"title": "qdrant - vector search engine", "version": version},
+                    )
+                    return
+                start = time.perf_counter()
+                try:
+                    body = orjson.loads(raw) if raw else {}
+                    result = server.engine.dispatch(
+                        self.command, url.path.rstrip("/"), parse_qs(url.query), body
+                    )
+                except StandInError as e:
+                    self._respond(
+                        e.status,
+                        {
+                            "status": {"error": str(e)},
+                            "time": time.perf_counter() - start,
+                        },
+                    )
+                    return
+                except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                    self._respond(
+                        400,
+                        {
+                            "status": {"error": f"Bad request: {e}"},
+                            "time": time.perf_counter() - start,
+                        },
+                    )
+                    return
+                self._respond(
+                    200,
+                    {
+                        "result": result,
+                        "status": "ok",
+                        "time": time.perf_counter() - start,
+                    },
+                )
+
+            do_GET = do_PUT = do_POST = do_DELETE = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logging.debug("qdrant stand-in: " + format, *args)
+
+        return Handler
+
+    def start(self) -> "QdrantStandIn":
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serves requests on the calling thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stops serving and closes the listening socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "QdrantStandIn":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
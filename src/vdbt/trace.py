@@ -0,0 +1,250 @@
+"""A compact on-disk format for recorded query workloads.
+
+A trace is a directory:
+
+    trace.json      # format version, vector dimension and query count
+    vectors.f32     # raw little-endian float32 query vectors, row-major
+    columns/        # a ColumnTable with one row per query vector
+
+The vector block has no header, so it is appended to as queries arrive and
+memory-mapped on load. The columns hold, for every query vector:
+
+- "timestamp_s": when its call started, in seconds from the first call.
+- "batch": the index of its call; vectors sent together share one.
+- "collection": the collection it was sent to.
+- "k": the number of neighbours requested.
+- "filter": the metadata filter, if any, stored as JSON.
+- "latency_s": how long the recorded call took.
+"""
+
+import json
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from vdbt.utils.columnar import ColumnTable
+
+TRACE_VERSION = 1
+_MANIFEST = "trace.json"
+_VECTORS = "vectors.f32"
+_COLUMNS = "columns"
+
+
+class QueryTrace:
+    """A recorded sequence of query calls.
+
+    Args:
+        vectors: The (num_queries, dim) float32 query vectors.
+        columns: The per-vector fields, see the module docstring.
+    """
+
+    def __init__(self, vectors: np.ndarray[Any, Any], columns: ColumnTable) -> None:
+        if len(vectors) != len(columns):
+            raise ValueError(
+                f"{len(vectors)} vectors but {len(columns)} rows of columns"
+            )
+        self.vectors = vectors
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    @property
+    def timestamps(self) -> np.ndarray[Any, Any]:
+        return self.columns.columns["timestamp_s"]
+
+    @property
+    def duration_s(self) -> float:
+        return float(self.timestamps.max()) if len(self) else 0.0
+
+    def calls(self) -> List[Dict[str, Any]]:
+        """Groups the vectors back into the calls they were recorded from.
+
+        Returns:
+            One dictionary per call, ordered by start time, with its
+            "timestamp_s", "collection", "k", "filter" (or None) and the
+            "rows" of its vectors.
+        """
+        if not len(self):
+            return []
+        batches = np.asarray(self.columns.columns["batch"])
+        starts = np.flatnonzero(np.r_[True, batches[1:] != batches[:-1]])
+        stops = np.r_[starts[1:], len(batches)]
+        filters = (
+            self.columns.objects("filter")
+            if "filter" in self.columns.columns
+            else np.full(len(self), None, dtype=object)
+        )
+        collections = self.columns.columns["collection"]
+        ks = self.columns.columns["k"]
+        calls = [
+            {
+                "timestamp_s": float(self.timestamps[start]),
+                "collection": str(collections[start]),
+                "k": int(ks[start]),
+                "filter": filters[start],
+                "rows": slice(int(start), int(stop)),
+            }
+            for start, stop in zip(starts.tolist(), stops.tolist(), strict=True)
+        ]
+        # Calls from several threads are written in completion order.
+        return sorted(calls, key=lambda call: call["timestamp_s"])
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> "QueryTrace":
+        """Opens a trace written by `TraceWriter`.
+
+        Args:
+            directory: The trace directory.
+            mmap: Memory-map the vectors and columns instead of reading them.
+
+        Raises:
+            ValueError: If the trace was written by an unknown format version.
+        """
+        directory = Path(directory)
+        manifest = json.loads((directory / _MANIFEST).read_text())
+        if manifest["version"] != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {manifest['version']}")
+        shape = (manifest["num_queries"], manifest["dim"])
+        path = directory / _VECTORS
+        vectors: np.ndarray[Any, Any]
+        if mmap and shape[0]:
+            vectors = np.memmap(path, dtype="<f4", mode="r", shape=shape)
+        else:
+            vectors = np.fromfile(path, dtype="<f4").reshape(shape)
+        return cls(vectors, ColumnTable.load(directory / _COLUMNS, mmap=mmap))
+
+
+class TraceWriter:
+    """Appends query calls to a trace directory.
+
+    Vectors are written to disk as they arrive. The other fields are kept
+    in memory once per call, in typed arrays, and expanded to one row per
+    vector by `close`. Recording is thread-safe; calls are stored in the
+    order they finish and sorted by start time on replay.
+
+    Args:
+        directory: The trace directory. It is created if needed, and an
+            existing trace in it is overwritten.
+    """
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors = open(self.directory / _VECTORS, "wb")
+        self._dim: Optional[int] = None
+        self._num_queries = 0
+        # Per-call fields, indexed by batch.
+        self._sizes = array("q")
+        self._timestamps = array("d")
+        self._ks = array("q")
+        self._latencies = array("d")
+        self._collections: List[str] = []
+        self._filters: List[Optional[str]] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._num_queries
+
+    def clock(self) -> float:
+        """Returns the current time on the clock timestamps are taken from."""
+        return time.perf_counter()
+
+    def record(
+        self,
+        collection: str,
+        vectors: np.ndarray[Any, Any],
+        k: int,
+        filter: Optional[Dict[str, Any]],
+        started: float,
+        latency_s: float,
+    ) -> None:
+        """Appends one call.
+
+        Args:
+            collection: The collection queried.
+            vectors: The query vectors of the call, one per row.
+            k: The number of neighbours requested.
+            filter: The metadata filter, if any.
+            started: When the call started, from `clock`.
+            latency_s: How long the call took.
+
+        Raises:
+            ValueError: If the vectors do not match the trace's dimension.
+        """
+        data = np.ascontiguousarray(np.atleast_2d(vectors), dtype="<f4")
+        with self._lock:
+            if self._dim is None:
+                self._dim = data.shape[1]
+            elif data.shape[1] != self._dim:
+                raise ValueError(
+                    f"Cannot record {data.shape[1]}-dim queries in a "
+                    f"{self._dim}-dim trace"
+                )
+            self._vectors.write(data.tobytes())
+            self._num_queries += len(data)
+            self._sizes.append(len(data))
+            self._timestamps.append(started)
+            self._ks.append(k)
+            self._latencies.append(latency_s)
+            self._collections.append(collection)
+            self._filters.append(json.dumps(filter) if filter else None)
+
+    def close(self) -> None:
+        """Writes the columns and manifest, completing the trace."""
+        with self._lock:
+            if self._vectors.closed:
+                return
+            self._vectors.close()
+            self._columns().save(self.directory / _COLUMNS)
+            manifest = {
+                "version": TRACE_VERSION,
+                "dim": self._dim or 0,
+                "num_queries": self._num_queries,
+            }
+            (self.directory / _MANIFEST).write_text(json.dumps(manifest))
+
+    def _columns(self) -> ColumnTable:
+        """Expands the per-call fields to one row per vector."""
+        if not self._sizes:
+            return ColumnTable(0, {}, {}, {})
+        sizes = np.frombuffer(self._sizes, dtype=np.int64)
+        timestamps = np.frombuffer(self._timestamps, dtype=np.float64)
+        per_call = {
+            "timestamp_s": timestamps - timestamps.min(),
+            "batch": np.arange(len(sizes), dtype=np.int64),
+            "collection": np.asarray(self._collections, dtype=np.str_),
+            "k": np.frombuffer(self._ks, dtype=np.int64),
+            "latency_s": np.frombuffer(self._latencies, dtype=np.float64),
+        }
+        columns = {key: np.repeat(values, sizes) for key, values in per_call.items()}
+        kinds = {
+            "timestamp_s": "float64",
+            "batch": "int64",
+            "collection": "str",
+            "k": "int64",
+            "latency_s": "float64",
+        }
+        masks = {}
+        filtered = np.fromiter((f is not None for f in self._filters), bool, len(sizes))
+        if filtered.any():
+            filters = np.asarray([f or "" for f in self._filters], dtype=np.str_)
+            columns["filter"] = np.repeat(filters, sizes)
+            kinds["filter"] = "json"
+            if not filtered.all():
+                masks["filter"] = np.repeat(filtered, sizes)
+        return ColumnTable(self._num_queries, columns, kinds, masks)
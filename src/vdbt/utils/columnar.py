@@ -0,0 +1,151 @@
+"""Compact columnar storage for per-row metadata.
+
+Metadata dictionaries are stored column by column as `.npy` files, so they
+can be memory-mapped on load instead of parsed. Columns whose values are all
+booleans, integers, floats or strings get a native dtype; anything else is
+stored as JSON strings. Rows missing a key are recorded in a presence mask.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Sequence, Union
+
+import numpy as np
+
+_MANIFEST = "columns.json"
+
+
+def _kind(values: List[Any]) -> str:
+    """Returns the narrowest storage kind that holds every value."""
+    types = {type(value) for value in values}
+    if types <= {bool}:
+        return "bool"
+    if types <= {int}:
+        return "int64"
+    if types <= {int, float}:
+        return "float64"
+    if types <= {str}:
+        return "str"
+    return "json"
+
+
+class ColumnTable:
+    """Rows of metadata stored as typed columns.
+
+    Args:
+        num_rows: The number of rows.
+        columns: The values of each key, one entry per row. Entries for rows
+            without the key are arbitrary.
+        kinds: The storage kind of each column.
+        masks: For columns missing from some rows, a boolean mask of the rows
+            that have the key.
+    """
+
+    def __init__(
+        self,
+        num_rows: int,
+        columns: Dict[str, np.ndarray[Any, Any]],
+        kinds: Dict[str, str],
+        masks: Dict[str, np.ndarray[Any, Any]],
+    ) -> None:
+        self.num_rows = num_rows
+        self.columns = columns
+        self.kinds = kinds
+        self.masks = masks
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "ColumnTable":
+        """Builds a table from a sequence of metadata dictionaries."""
+        keys: Dict[str, None] = {}
+        for row in rows:
+            keys.update(dict.fromkeys(row))
+
+        columns: Dict[str, np.ndarray[Any, Any]] = {}
+        kinds: Dict[str, str] = {}
+        masks: Dict[str, np.ndarray[Any, Any]] = {}
+        for key in keys:
+            present = np.fromiter((key in row for row in rows), bool, len(rows))
+            values = [row[key] for row in rows if key in row]
+            kind = _kind(values)
+            if kind == "json":
+                values = [json.dumps(value) for value in values]
+            if kind in ("str", "json"):
+                dtype = np.asarray(values, dtype=np.str_).dtype
+                column = np.full(len(rows), "", dtype=dtype)
+            else:
+                column = np.zeros(len(rows), dtype=kind)
+            column[present] = values
+            columns[key] = column
+            kinds[key] = kind
+            if not present.all():
+                masks[key] = present
+        return cls(len(rows), columns, kinds, masks)
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        """Returns the metadata dictionary of row `i`."""
+        row = {}
+        for key, column in self.columns.items():
+            mask = self.masks.get(key)
+            if mask is not None and not mask[i]:
+                continue
+            value = column[i].item()
+            row[key] = json.loads(value) if self.kinds[key] == "json" else value
+        return row
+
+    def objects(self, key: str) -> np.ndarray[Any, Any]:
+        """Returns a column as an object array with None for missing values."""
+        values = np.full(self.num_rows, None, dtype=object)
+        mask = self.masks.get(key)
+        rows = np.arange(self.num_rows) if mask is None else np.flatnonzero(mask)
+        column = self.columns[key][rows].tolist()
+        if self.kinds[key] == "json":
+            # Decoded values may be lists, which slice assignment would unpack.
+            for row, value in zip(rows.tolist(), column, strict=True):
+                values[row] = json.loads(value)
+        else:
+            values[rows] = column
+        return values
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Returns every row as a metadata dictionary."""
+        return [self[i] for i in range(self.num_rows)]
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Writes one `.npy` file per column plus a JSON manifest."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest: Dict[str, Any] = {"num_rows": self.num_rows, "columns": []}
+        for i, (key, column) in enumerate(self.columns.items()):
+            entry: Dict[str, Any] = {"key": key, "kind": self.kinds[key]}
+            entry["file"] = f"column_{i}.npy"
+            np.save(directory / entry["file"], column, allow_pickle=False)
+            if key in self.masks:
+                entry["mask"] = f"column_{i}.mask.npy"
+                np.save(directory / entry["mask"], self.masks[key], allow_pickle=False)
+            manifest["columns"].append(entry)
+        (directory / _MANIFEST).write_text(json.dumps(manifest))
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> "ColumnTable":
+        """Reads a table written by `save`.
+
+        Args:
+            directory: The directory the table was saved to.
+            mmap: Memory-map the column files instead of reading them.
+        """
+        directory = Path(directory)
+        manifest = json.loads((directory / _MANIFEST).read_text())
+        mmap_mode: Optional[Literal["r"]] = "r" if mmap else None
+        columns: Dict[str, np.ndarray[Any, Any]] = {}
+        kinds: Dict[str, str] = {}
+        masks: Dict[str, np.ndarray[Any, Any]] = {}
+        for entry in manifest["columns"]:
+            key = entry["key"]
+            columns[key] = np.load(directory / entry["file"], mmap_mode=mmap_mode)
+            kinds[key] = entry["kind"]
+            if "mask" in entry:
+                masks[key] = np.load(directory / entry["mask"], mmap_mode=mmap_mode)
+        return cls(manifest["num_rows"], columns, kinds, masks)
@@ -36,11 +36,33 @@ def create_synthetic_embeddings(
     return embeddings, labels
 
 
+def duplicate_sources(
+    num_embeddings: int, duplicate_ratio: float, seed: int
+) -> np.ndarray[Any, Any]:
+    """Picks the rows that `inject_duplicates` copies.
+
+    Args:
+        num_embeddings: The number of original embeddings.
+        duplicate_ratio: The fraction of embeddings to duplicate.
+        seed: The random seed.
+
+    Returns:
+        The index of the original row of every appended duplicate, in order.
+    """
+    rng = np.random.default_rng(seed)
+    num_duplicates = int(num_embeddings * duplicate_ratio)
+    sources: np.ndarray[Any, Any] = rng.choice(
+        num_embeddings, size=num_duplicates, replace=True
+    )
+    return sources
+
+
 def inject_duplicates(
     embeddings: np.ndarray[Any, Any],
     labels: np.ndarray[Any, Any],
     duplicate_ratio: float,
     seed: int,
+    perturbation: float = 0.0,
 ) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]:
     """Injects duplicate embeddings into the dataset.
 
@@ -49,17 +71,25 @@ def inject_duplicates(
         labels: The original labels.
         duplicate_ratio: The fraction of embeddings to duplicate.
         seed: The random seed.
+        perturbation: If positive, duplicates are near-duplicates: gaussian
+            noise is added whose expected norm is this fraction of the norm
+            of the copied row.
 
     Returns:
         A tuple containing the embeddings and labels with duplicates.
     """
-    rng = np.random.default_rng(seed)
-    num_duplicates = int(len(embeddings) * duplicate_ratio)
-    if num_duplicates == 0:
+    duplicate_indices = duplicate_sources(len(embeddings), duplicate_ratio, seed)
+    if len(duplicate_indices) == 0:
         return embeddings, labels
 
-    duplicate_indices = rng.choice(len(embeddings), size=num_duplicates, replace=True)
-    new_embeddings = np.vstack([embeddings, embeddings[duplicate_indices]])
+    duplicates = embeddings[duplicate_indices]
+    if perturbation > 0:
+        rng = np.random.default_rng(seed + 1)
+        scale = np.linalg.norm(duplicates, axis=1, keepdims=True)
+        scale *= perturbation / np.sqrt(embeddings.shape[1])
+        noise = rng.standard_normal(duplicates.shape) * scale
+        duplicates = (duplicates + noise).astype(embeddings.dtype)
+    new_embeddings = np.vstack([embeddings, duplicates])
     new_labels = np.hstack([labels, labels[duplicate_indices]])
 
     return new_embeddings, new_labels
@@ -88,3 +118,19 @@ def inject_noise(
     embeddings[noise_indices] = noise
 
     return embeddings
+
+
+def zipf_weights(n: int, exponent: float) -> np.ndarray[Any, Any]:
+    """Returns Zipfian weights for `n` ranked items.
+
+    Args:
+        n: The number of items.
+        exponent: The skew; 0 gives a uniform distribution and larger values
+            concentrate more weight on the first items.
+
+    Returns:
+        A float64 array of `n` weights that sum to 1, largest first.
+    """
+    weights = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** exponent
+    normalized: np.ndarray[Any, Any] = weights / weights.sum()
+    return normalized
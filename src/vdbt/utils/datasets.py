@@ -0,0 +1,209 @@
+"""Loaders for standard ANN benchmark datasets.
+
+Supports the TEXMEX `.fvecs`/`.bvecs`/`.ivecs` formats used by SIFT and GIST
+and the HDF5 files published by ann-benchmarks. Vectors are memory-mapped (or
+read lazily from HDF5) and streamed in batches, so base sets larger than RAM
+can be ingested into an adapter.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from vdbt.adapters.base import VectorDB
+
+DatasetRef = Union[str, Path, Dict[str, Any]]
+
+# ann-benchmarks distance names mapped to adapter metric names.
+_HDF5_METRICS = {"euclidean": "l2", "angular": "cosine", "dot": "ip"}
+
+
+def read_vecs(path: Union[str, Path]) -> np.ndarray[Any, Any]:
+    """Memory-maps a `.fvecs`, `.bvecs` or `.ivecs` file.
+
+    Each record is a little-endian int32 dimension followed by that many
+    float32, uint8 or int32 components.
+
+    Args:
+        path: The file to map.
+
+    Returns:
+        A read-only (num_vectors, dim) view into the file; no data is read
+        until it is accessed.
+    """
+    path = Path(path)
+    dtypes = {".fvecs": np.float32, ".ivecs": np.int32, ".bvecs": np.uint8}
+    if path.suffix not in dtypes:
+        raise ValueError(f"Unsupported vector file extension: {path.suffix}")
+    dtype = np.dtype(dtypes[path.suffix])
+
+    dim = int(np.fromfile(path, dtype="<i4", count=1)[0])
+    record_bytes = 4 + dim * dtype.itemsize
+    size = path.stat().st_size
+    if size % record_bytes:
+        raise ValueError(f"{path} is not a valid {path.suffix} file")
+
+    record = np.dtype([("dim", "<i4"), ("vector", dtype.newbyteorder("<"), (dim,))])
+    records = np.memmap(path, dtype=record, mode="r", shape=(size // record_bytes,))
+    return records["vector"]
+
+
+@dataclass
+class Dataset:
+    """A base set, query set and optional ground truth.
+
+    Attributes:
+        name: A short name for reports.
+        base: The (num_base, dim) vectors to index. May be a memory map or a
+            lazily read HDF5 dataset.
+        queries: The (num_queries, dim) query vectors.
+        neighbors: The (num_queries, n) row indices of each query's exact
+            nearest neighbours in `base`, if known.
+        metric: The metric the ground truth was computed with.
+    """
+
+    name: str
+    base: Any
+    queries: Any
+    neighbors: Optional[Any] = None
+    metric: str = "l2"
+
+    @property
+    def num_base(self) -> int:
+        return int(self.base.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.base.shape[1])
+
+    def iter_batches(
+        self, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[Tuple[int, np.ndarray[Any, Any]]]:
+        """Streams the base set in float32 batches.
+
+        Args:
+            batch_size: The number of vectors per batch.
+            limit: Stop after this many vectors.
+
+        Yields:
+            Tuples of (start row, float32 batch). Only one batch is held in
+            memory at a time.
+        """
+        stop = self.num_base if limit is None else min(limit, self.num_base)
+        for start in range(0, stop, batch_size):
+            end = min(start + batch_size, stop)
+            yield start, np.asarray(self.base[start:end], dtype=np.float32)
+
+    def query_vectors(self, limit: Optional[int] = None) -> np.ndarray[Any, Any]:
+        """Returns up to `limit` query vectors as float32."""
+        count = self.queries.shape[0] if limit is None else limit
+        return np.asarray(self.queries[:count], dtype=np.float32)
+
+    def ground_truth(self, k: int, limit: Optional[int] = None) -> np.ndarray[Any, Any]:
+        """Returns the first `k` true neighbours of up to `limit` queries."""
+        if self.neighbors is None:
+            raise ValueError(f"Dataset {self.name} has no ground truth")
+        count = self.neighbors.shape[0] if limit is None else limit
+        return np.asarray(self.neighbors[:count, :k], dtype=np.int64)
+
+
+def load_hdf5(path: Union[str, Path]) -> Dataset:
+    """Opens an ann-benchmarks HDF5 file.
+
+    The file stays open for the lifetime of the returned dataset so that
+    vectors are read lazily.
+    """
+    import h5py
+
+    path = Path(path)
+    handle = h5py.File(path, "r")
+    distance = handle.attrs.get("distance", "euclidean")
+    if isinstance(distance, bytes):
+        distance = distance.decode()
+    return Dataset(
+        name=path.stem,
+        base=handle["train"],
+        queries=handle["test"],
+        neighbors=handle["neighbors"] if "neighbors" in handle else None,
+        metric=_HDF5_METRICS.get(distance, distance),
+    )
+
+
+def load_texmex(directory: Union[str, Path]) -> Dataset:
+    """Opens a TEXMEX-style directory such as an unpacked SIFT1M archive.
+
+    The directory must contain one `*_base.[fb]vecs` and one
+    `*_query.[fb]vecs` file, and may contain a `*_groundtruth.ivecs` file.
+    """
+    directory = Path(directory)
+
+    def find(pattern: str) -> Optional[Path]:
+        matches = sorted(directory.glob(pattern))
+        return matches[0] if matches else None
+
+    base = find("*_base.fvecs") or find("*_base.bvecs")
+    queries = find("*_query.fvecs") or find("*_query.bvecs")
+    if base is None or queries is None:
+        raise FileNotFoundError(f"No *_base/*_query vector files in {directory}")
+    ground_truth = find("*_groundtruth.ivecs")
+    return Dataset(
+        name=directory.name,
+        base=read_vecs(base),
+        queries=read_vecs(queries),
+        neighbors=read_vecs(ground_truth) if ground_truth else None,
+    )
+
+
+def load_dataset(ref: DatasetRef) -> Dataset:
+    """Loads a dataset from a reference.
+
+    Args:
+        ref: An HDF5 file, a TEXMEX directory, or a dictionary with "base" and
+            "queries" vector file paths and optional "neighbors", "name" and
+            "metric" entries.
+
+    Returns:
+        The dataset, with vectors mapped rather than loaded.
+    """
+    if isinstance(ref, dict):
+        neighbors = ref.get("neighbors")
+        return Dataset(
+            name=ref.get("name", Path(ref["base"]).stem),
+            base=read_vecs(ref["base"]),
+            queries=read_vecs(ref["queries"]),
+            neighbors=read_vecs(neighbors) if neighbors else None,
+            metric=ref.get("metric", "l2"),
+        )
+    path = Path(ref)
+    if path.is_dir():
+        return load_texmex(path)
+    if path.suffix in (".hdf5", ".h5"):
+        return load_hdf5(path)
+    raise ValueError(f"Unrecognized dataset reference: {ref}")
+
+
+def ingest_dataset(
+    db: VectorDB,
+    collection_name: str,
+    dataset: Dataset,
+    batch_size: int = 10000,
+    limit: Optional[int] = None,
+) -> int:
+    """Streams a dataset's base vectors into a collection.
+
+    Rows get their base index as id (as a string) and as the "i" metadata
+    field, so results can be compared against the ground truth.
+
+    Returns:
+        The number of vectors ingested.
+    """
+    count = 0
+    for start, batch in dataset.iter_batches(batch_size, limit=limit):
+        rows = range(start, start + len(batch))
+        db.upsert(
+            collection_name, [str(i) for i in rows], batch, [{"i": i} for i in rows]
+        )
+        count += len(batch)
+    return count
@@ -0,0 +1,93 @@
+"""Client-side deduplication of vectors before ingest.
+
+Both methods are vectorized and return a mask of the rows to keep, keeping
+the first occurrence of every duplicate group:
+
+- `hash_dedup` drops exact duplicates by hashing the raw bytes of each row,
+  optionally after rounding so that tiny perturbations collide too.
+- `lsh_dedup` drops near-duplicates with random-hyperplane LSH (SimHash):
+  rows sharing a signature in any table are compared to the first row of
+  their bucket by cosine similarity.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+
+def hash_dedup(
+    vectors: np.ndarray[Any, Any], decimals: Optional[int] = None
+) -> np.ndarray[Any, Any]:
+    """Finds the first occurrence of every distinct row.
+
+    Args:
+        vectors: The (n, dim) vectors.
+        decimals: If set, rows are rounded to this many decimals before
+            hashing, so near-duplicates that round alike are dropped too.
+
+    Returns:
+        A boolean mask of the rows to keep.
+    """
+    rows = np.asarray(vectors)
+    if decimals is not None:
+        rows = np.round(rows, decimals)
+    # -0.0 and 0.0 compare equal but differ in their bytes.
+    rows = np.ascontiguousarray(rows + 0.0)
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1])))
+    _, first = np.unique(keys.ravel(), return_index=True)
+    keep = np.zeros(len(rows), dtype=bool)
+    keep[first] = True
+    return keep
+
+
+def lsh_dedup(
+    vectors: np.ndarray[Any, Any],
+    threshold: float = 0.99,
+    num_bits: int = 16,
+    num_tables: int = 4,
+    seed: int = 0,
+) -> np.ndarray[Any, Any]:
+    """Finds near-duplicate rows with random-hyperplane LSH.
+
+    A row is dropped if, in some table, it shares its bucket with an earlier
+    row whose cosine similarity to it is at least `threshold`. More bits give
+    smaller buckets and fewer comparisons; more tables catch more
+    near-duplicates that a single table would split across buckets.
+
+    Args:
+        vectors: The (n, dim) vectors.
+        threshold: The cosine similarity at or above which rows are
+            duplicates.
+        num_bits: The number of hyperplanes per table, at most 63.
+        num_tables: The number of independent tables.
+        seed: The seed for the hyperplanes.
+
+    Returns:
+        A boolean mask of the rows to keep.
+    """
+    rows = np.asarray(vectors, dtype=np.float32)
+    unit = rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-12)
+    planes = np.random.default_rng(seed).standard_normal(
+        (rows.shape[1], num_tables * num_bits)
+    )
+    bits = (unit @ planes.astype(np.float32) > 0).reshape(-1, num_tables, num_bits)
+    weights = np.left_shift(np.int64(1), np.arange(num_bits, dtype=np.int64))
+    signatures = bits.astype(np.int64) @ weights
+
+    duplicate = np.zeros(len(rows), dtype=bool)
+    for table in range(num_tables):
+        # Group rows by signature; a stable sort keeps each group in row
+        # order, so its first member is the earliest row in the bucket.
+        order = np.argsort(signatures[:, table], kind="stable")
+        sorted_signatures = signatures[order, table]
+        starts = np.flatnonzero(
+            np.r_[True, sorted_signatures[1:] != sorted_signatures[:-1]]
+        )
+        sizes = np.diff(np.r_[starts, len(order)])
+        first = np.empty(len(rows), dtype=np.int64)
+        first[order] = np.repeat(order[starts], sizes)
+
+        similarity = np.einsum("ij,ij->i", unit, unit[first])
+        duplicate |= (first != np.arange(len(rows))) & (similarity >= threshold)
+    keep: np.ndarray[Any, Any] = ~duplicate
+    return keep
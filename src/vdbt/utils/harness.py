@@ -0,0 +1,216 @@
+"""A shared harness for latency measurements.
+
+Early samples include lazy allocation, connection setup and cold caches, so
+they are discarded as warmup. Measurement then continues until the running
+percentile estimates stop moving, so tail percentiles are trustworthy without
+a fixed, arbitrary number of repetitions.
+
+Latencies are timed with `time.perf_counter_ns` into preallocated int64
+buffers. The timer's own overhead is calibrated once per process and
+reported alongside the samples, and can optionally be subtracted from them.
+"""
+
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from vdbt.metrics import compute_percentiles
+from vdbt.utils.timing import LatencyBuffer, timer_calibration
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class MeasurementConfig:
+    """Settings for warmup and steady-state detection.
+
+    Attributes:
+        warmup_count: The minimum number of samples to discard as warmup.
+        warmup_s: The minimum time to spend in warmup, in seconds.
+        min_samples: The number of samples to measure before checking for a
+            steady state.
+        max_samples: The most samples to measure.
+        max_duration_s: The most time to spend measuring, in seconds.
+        check_every: The number of samples between steady-state checks.
+        tolerance: The largest relative change in any tracked percentile
+            between checks that still counts as stable.
+        stable_checks: The number of consecutive stable checks required.
+        percentiles: The percentiles tracked for stability.
+        subtract_timer_overhead: Subtract the calibrated timer overhead from
+            every sample. It is reported either way.
+    """
+
+    warmup_count: int = 10
+    warmup_s: float = 0.0
+    min_samples: int = 200
+    max_samples: int = 10000
+    max_duration_s: float = 60.0
+    check_every: int = 50
+    tolerance: float = 0.05
+    stable_checks: int = 3
+    percentiles: Tuple[int, ...] = (50, 95, 99)
+    subtract_timer_overhead: bool = False
+
+    @classmethod
+    def from_kwargs(
+        cls, kwargs: Dict[str, Any], **defaults: Any
+    ) -> "MeasurementConfig":
+        """Builds a config from scenario parameters.
+
+        Args:
+            kwargs: Scenario parameters. Overrides are read from their
+                "measurement" dictionary.
+            **defaults: Scenario-specific defaults, applied before the
+                overrides.
+        """
+        overrides = kwargs.get("measurement", {})
+        names = {field.name for field in fields(cls)}
+        unknown = set(overrides) - names
+        if unknown:
+            raise ValueError(f"Unknown measurement settings: {sorted(unknown)}")
+        return cls(**{**defaults, **overrides})
+
+
+class LatencySampler:
+    """Collects latency samples, skipping warmup and stopping at steady state.
+
+    Callers that interleave measured operations with other work feed samples
+    with `add` until `done` is true:
+
+        sampler = LatencySampler(config)
+        while not sampler.done:
+            ...
+            sampler.add(latency_s)
+
+    Hot loops should time with `time.perf_counter_ns` and call `add_ns`.
+    """
+
+    def __init__(self, config: MeasurementConfig) -> None:
+        self.config = config
+        self.warmup_discarded = 0
+        self.converged = False
+        self._samples = LatencyBuffer(config.max_samples)
+        self._warmup_start: Optional[float] = None
+        self._measure_start: Optional[float] = None
+        self._previous: Optional[np.ndarray[Any, Any]] = None
+        self._stable = 0
+
+    @property
+    def latencies(self) -> np.ndarray[Any, Any]:
+        """The measured (non-warmup) samples, in seconds."""
+        return self._samples.seconds(self._overhead_ns())
+
+    @property
+    def warming_up(self) -> bool:
+        """Whether the next sample will be discarded as warmup."""
+        if len(self._samples):
+            return False
+        if self.warmup_discarded < self.config.warmup_count:
+            return True
+        if self._warmup_start is None:
+            return self.config.warmup_s > 0
+        return time.perf_counter() - self._warmup_start < self.config.warmup_s
+
+    @property
+    def done(self) -> bool:
+        """Whether measurement has converged or hit a cap."""
+        if self.converged or self._samples.full:
+            return True
+        if self._measure_start is None:
+            return False
+        return time.perf_counter() - self._measure_start >= self.config.max_duration_s
+
+    def add(self, latency_s: float) -> bool:
+        """Records one sample in seconds, or discards it during warmup.
+
+        Returns:
+            True if the sample was measured, False if it was discarded.
+        """
+        return self.add_ns(round(latency_s * 1e9))
+
+    def add_ns(self, latency_ns: int) -> bool:
+        """Records one sample in nanoseconds, or discards it during warmup.
+
+        Returns:
+            True if the sample was measured, False if it was discarded.
+        """
+        if self.warming_up:
+            if self._warmup_start is None:
+                self._warmup_start = time.perf_counter()
+            self.warmup_discarded += 1
+            return False
+        if self._measure_start is None:
+            self._measure_start = time.perf_counter()
+        self._samples.record_ns(latency_ns)
+        since_min = len(self._samples) - self.config.min_samples
+        if since_min >= 0 and since_min % self.config.check_every == 0:
+            self._check()
+        return True
+
+    def _overhead_ns(self) -> int:
+        if not self.config.subtract_timer_overhead:
+            return 0
+        return timer_calibration().overhead_ns
+
+    def _check(self) -> None:
+        estimates = np.percentile(self._samples.values_ns, self.config.percentiles)
+        if self._previous is not None:
+            change = np.abs(estimates - self._previous) / np.maximum(
+                self._previous, np.finfo(np.float64).tiny
+            )
+            self._stable = (
+                self._stable + 1 if change.max() <= self.config.tolerance else 0
+            )
+            self.converged = self._stable >= self.config.stable_checks
+        self._previous = estimates
+
+    def percentiles(self) -> Dict[str, float]:
+        """Returns the percentiles of the measured samples."""
+        return compute_percentiles(
+            self.latencies.tolist(), list(self.config.percentiles)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns how many samples were measured and discarded.
+
+        The calibrated timer overhead is included, along with whether it was
+        subtracted from the samples.
+        """
+        return {
+            "samples": len(self._samples),
+            "warmup_discarded": self.warmup_discarded,
+            "converged": self.converged,
+            "timer_overhead_ns": timer_calibration().overhead_ns,
+            "timer_overhead_subtracted": self.config.subtract_timer_overhead,
+        }
+
+
+def measure(
+    operation: Callable[[T], R], inputs: Sequence[T], config: MeasurementConfig
+) -> Tuple[LatencySampler, List[R]]:
+    """Times `operation` until its latency reaches a steady state.
+
+    Args:
+        operation: The operation to time, called with one input at a time.
+        inputs: The inputs, cycled through in order.
+        config: The warmup and steady-state settings.
+
+    Returns:
+        The sampler holding the measured latencies, and the return values of
+        the measured (non-warmup) calls in call order.
+    """
+    sampler = LatencySampler(config)
+    results: List[R] = []
+    clock = time.perf_counter_ns
+    i = 0
+    while not sampler.done:
+        item = inputs[i % len(inputs)]
+        i += 1
+        start = clock()
+        result = operation(item)
+        if sampler.add_ns(clock() - start):
+            results.append(result)
+    return sampler, results
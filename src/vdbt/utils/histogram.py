@@ -0,0 +1,190 @@
+"""A fixed-size, mergeable latency histogram."""
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """Counts latencies in logarithmic buckets of fixed relative width.
+
+    Memory use depends only on the configured range and precision, never on
+    the number of recorded values, so histograms can be kept per time window
+    for arbitrarily long runs. Histograms with the same configuration can be
+    merged exactly by adding their counts.
+
+    Args:
+        min_s: Values at or below this are counted in the first bucket.
+        max_s: Values at or above this are counted in the last bucket.
+        precision: The relative width of each bucket; percentiles are
+            accurate to within this fraction of the true value.
+    """
+
+    def __init__(
+        self, min_s: float = 1e-6, max_s: float = 1e3, precision: float = 0.01
+    ) -> None:
+        self.min_s = min_s
+        self.max_s = max_s
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        num_buckets = int(math.ceil(math.log(max_s / min_s) / self._log_base)) + 1
+        self.counts = np.zeros(num_buckets, dtype=np.int64)
+        self.total_s = 0.0
+        self.max_value_s = 0.0
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def _buckets(self, values: np.ndarray[Any, Any]) -> np.ndarray[Any, Any]:
+        ratios = np.maximum(values, self.min_s) / self.min_s
+        buckets = np.floor(np.log(ratios) / self._log_base).astype(np.int64)
+        clipped: np.ndarray[Any, Any] = np.clip(buckets, 0, len(self.counts) - 1)
+        return clipped
+
+    def record(self, value_s: float) -> None:
+        """Counts one latency."""
+        bucket = 0
+        if value_s > self.min_s:
+            bucket = min(
+                int(math.log(value_s / self.min_s) / self._log_base),
+                len(self.counts) - 1,
+            )
+        self.counts[bucket] += 1
+        self.total_s += value_s
+        self.max_value_s = max(self.max_value_s, value_s)
+
+    def record_many(self, values_s: np.ndarray[Any, Any]) -> None:
+        """Counts an array of latencies."""
+        values = np.asarray(values_s, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        np.add.at(self.counts, self._buckets(values), 1)
+        self.total_s += float(values.sum())
+        self.max_value_s = max(self.max_value_s, float(values.max()))
+
+    def record_ns(self, value_ns: int) -> None:
+        """Counts one latency given in integer nanoseconds."""
+        self.record(value_ns * 1e-9)
+
+    def record_many_ns(self, values_ns: np.ndarray[Any, Any]) -> None:
+        """Counts an array of latencies given in integer nanoseconds."""
+        self.record_many(np.asarray(values_ns, dtype=np.float64) * 1e-9)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Adds the counts of a histogram with the same configuration."""
+        if (other.min_s, other.max_s, other.precision) != (
+            self.min_s,
+            self.max_s,
+            self.precision,
+        ):
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts += other.counts
+        self.total_s += other.total_s
+        self.max_value_s = max(self.max_value_s, other.max_value_s)
+
+    def reset(self) -> None:
+        """Clears all counts."""
+        self.counts[:] = 0
+        self.total_s = 0.0
+        self.max_value_s = 0.0
+
+    def percentile(self, p: float) -> float:
+        """Returns an estimate of the p-th percentile, in seconds.
+
+        The estimate is the geometric midpoint of the bucket holding the
+        percentile, capped at the largest recorded value.
+        """
+        total = self.count
+        if total == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(p / 100.0 * total)))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        midpoint = self.min_s * math.exp((bucket + 0.5) * self._log_base)
+        return min(midpoint, self.max_value_s)
+
+    def summary(self, percentiles: Optional[List[int]] = None) -> Dict[str, float]:
+        """Summarizes the histogram like `compute_percentiles`.
+
+        Returns:
+            A dictionary with the count, mean and max, and one "p<N>" entry per
+            requested percentile (default 50, 95 and 99), in seconds.
+        """
+        if percentiles is None:
+            percentiles = [50, 95, 99]
+        total = self.count
+        return {
+            "count": total,
+            "mean": self.total_s / total if total else 0.0,
+            "max": self.max_value_s,
+            **{f"p{p}": self.percentile(p) for p in percentiles},
+        }
+
+    def cdf(
+        self, max_points: int = 200
+    ) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]:
+        """Returns the cumulative distribution at no more than `max_points`.
+
+        Returns:
+            The upper bound in seconds of each kept bucket, capped at the
+            largest recorded value, and the fraction of latencies at or below
+            it. Points are kept at evenly spaced fractions, so the tail keeps
+            its shape however many buckets are filled.
+        """
+        buckets = np.flatnonzero(self.counts)
+        if not len(buckets):
+            return np.empty(0), np.empty(0)
+        fractions = np.cumsum(self.counts[buckets]) / self.count
+        upper = np.minimum(
+            self.min_s * np.exp((buckets + 1) * self._log_base), self.max_value_s
+        )
+        if len(buckets) > max_points:
+            steps = np.linspace(0.0, 1.0, max_points)
+            keep = np.unique(np.searchsorted(fractions, steps[:-1]))
+            keep = np.append(keep[keep < len(buckets) - 1], len(buckets) - 1)
+            upper, fractions = upper[keep], fractions[keep]
+        return upper, fractions
+
+    def bins(
+        self, max_bins: int = 50
+    ) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]:
+        """Merges adjacent buckets into no more than `max_bins` bins.
+
+        Returns:
+            The bin edges in seconds, one more than there are bins, and the
+            count of each bin, spanning the first to the last filled bucket.
+        """
+        buckets = np.flatnonzero(self.counts)
+        if not len(buckets):
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        first, stop = int(buckets[0]), int(buckets[-1]) + 1
+        width = -(-(stop - first) // max_bins)
+        groups = np.arange(stop - first) // width
+        counts = np.bincount(groups, weights=self.counts[first:stop]).astype(np.int64)
+        edges = self.min_s * np.exp(
+            (first + np.arange(len(counts) + 1) * width) * self._log_base
+        )
+        return edges, counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable form with only the non-empty buckets."""
+        buckets = np.flatnonzero(self.counts)
+        return {
+            "min_s": self.min_s,
+            "max_s": self.max_s,
+            "precision": self.precision,
+            "total_s": self.total_s,
+            "max_value_s": self.max_value_s,
+            "buckets": buckets.tolist(),
+            "counts": self.counts[buckets].tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuilds a histogram from `to_dict` output."""
+        histogram = cls(data["min_s"], data["max_s"], data["precision"])
+        histogram.counts[data["buckets"]] = data["counts"]
+        histogram.total_s = data["total_s"]
+        histogram.max_value_s = data["max_value_s"]
+        return histogram
@@ -1,9 +1,31 @@
-"""Utilities for creating hybrid query datasets."""
+"""Utilities for creating hybrid query datasets.
 
-from typing import Any, Dict, List
+`generate_filtered_queries` draws a whole query set at once: query vectors
+from the corpus, each with an equality, IN-list or range filter, or two of
+them combined with AND or OR, aimed at a target selectivity. Filters are
+held column-wise in a `FilteredQueries`, which can be saved and
+memory-mapped, and expanded into `vdbt.filters` dictionaries on demand.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 import numpy as np
 
+from vdbt.filters import AND, OR, filter_mask
+from vdbt.utils.columnar import ColumnTable
+
+FILTER_KINDS = ("eq", "in", "range", "and", "or")
+# Clause operators, and how the clauses of a query combine, by column code.
+_OPS = ("eq", "in", "range")
+_EQ, _IN, _RANGE = range(3)
+_NONE, _SINGLE, _AND, _OR = range(4)
+_SLOTS = ("a", "b")
+_MANIFEST = "queries.json"
+_VECTORS = "vectors.npy"
+_COLUMNS = "columns"
+
 
 def create_hybrid_query_dataset(
     embeddings: np.ndarray[Any, Any],
@@ -26,18 +48,343 @@ def create_hybrid_query_dataset(
         optional filter.
     """
     rng = np.random.default_rng(seed)
+    sources = rng.integers(0, len(embeddings), size=num_queries)
+    filtered = rng.random(num_queries) < keyword_ratio
     queries = []
-    for _i in range(num_queries):
-        query: Dict[str, Any] = {}
-        query_idx = rng.integers(0, len(embeddings))
-        query["vector"] = embeddings[query_idx]
-        query["ground_truth_label"] = labels[query_idx]
+    for source, has_filter in zip(sources.tolist(), filtered.tolist(), strict=True):
+        query: Dict[str, Any] = {
+            "vector": embeddings[source],
+            "ground_truth_label": labels[source],
+        }
+        if has_filter:
+            # Filtering by the query's own label ensures at least one match.
+            query["filter"] = {"label": int(labels[source])}
+        queries.append(query)
+    return queries
 
-        if rng.random() < keyword_ratio:
-            # For simplicity, we filter by the ground truth label.
-            # This ensures that there is at least one match.
-            query["filter"] = {"label": int(labels[query_idx])}
 
-        queries.append(query)
+def create_metadata_columns(
+    num_embeddings: int,
+    seed: int,
+    labels: Optional[np.ndarray[Any, Any]] = None,
+    num_categories: int = 100,
+) -> Dict[str, np.ndarray[Any, Any]]:
+    """Draws filterable metadata for a corpus.
 
-    return queries
+    Returns:
+        Integer "label" (the given labels, if any), Zipf-distributed integer
+        "category" and "year", and uniform float "price" columns.
+    """
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, num_categories + 1)
+    columns: Dict[str, np.ndarray[Any, Any]] = {}
+    if labels is not None:
+        columns["label"] = np.asarray(labels, dtype=np.int64)
+    columns["category"] = rng.choice(
+        num_categories, size=num_embeddings, p=weights / weights.sum()
+    ).astype(np.int64)
+    columns["year"] = rng.integers(2000, 2025, size=num_embeddings, dtype=np.int64)
+    columns["price"] = rng.uniform(0.0, 100.0, size=num_embeddings)
+    return columns
+
+
+def payload_schema(columns: Dict[str, np.ndarray[Any, Any]]) -> Dict[str, str]:
+    """Returns the payload index type of each metadata column.
+
+    The result is the `payload_indexes` argument of `create_collection`.
+    """
+    schema = {}
+    for key, values in columns.items():
+        if values.dtype == np.bool_:
+            schema[key] = "bool"
+        elif np.issubdtype(values.dtype, np.integer):
+            schema[key] = "integer"
+        elif np.issubdtype(values.dtype, np.floating):
+            schema[key] = "float"
+        else:
+            schema[key] = "keyword"
+    return schema
+
+
+def metadata_rows(columns: Dict[str, np.ndarray[Any, Any]]) -> List[Dict[str, Any]]:
+    """Converts metadata columns into one dictionary per row, for upserts."""
+    keys = list(columns)
+    values = [columns[key].tolist() for key in keys]
+    return [dict(zip(keys, row, strict=True)) for row in zip(*values, strict=True)]
+
+
+class FilteredQueries:
+    """Query vectors with compound filters, stored column-wise.
+
+    Every query has up to two clauses, "a" and "b". The table holds one row
+    per query:
+
+    - "source": the corpus row the vector was drawn from.
+    - "combine": 0 for no filter, 1 for clause a alone, 2 for a AND b and 3
+      for a OR b.
+    - "<slot>_field": the clause's field, as an index into `fields`.
+    - "<slot>_op": 0 for equality, 1 for an IN-list and 2 for a range.
+    - "<slot>_values" and "<slot>_count": the equality value or IN-list, a
+      (num_queries, width) integer array of which the first count entries
+      are used.
+    - "<slot>_low" and "<slot>_high": the range, low <= value < high.
+
+    Args:
+        vectors: The (num_queries, dim) query vectors.
+        table: The filter columns described above.
+        fields: The metadata field names the clauses refer to.
+    """
+
+    def __init__(
+        self, vectors: np.ndarray[Any, Any], table: ColumnTable, fields: List[str]
+    ) -> None:
+        if len(vectors) != len(table):
+            raise ValueError(f"{len(vectors)} vectors but {len(table)} filter rows")
+        self.vectors = vectors
+        self.table = table
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def kinds(self) -> np.ndarray[Any, Any]:
+        """Returns the kind of each query's filter: "none" or a `FILTER_KINDS`."""
+        columns = self.table.columns
+        single = np.asarray(_OPS)[columns["a_op"]]
+        return np.select(
+            [columns["combine"] == _NONE, columns["combine"] == _AND],
+            ["none", "and"],
+            np.where(columns["combine"] == _OR, "or", single),
+        )
+
+    def _clause(self, slot: str, i: int) -> Dict[str, Any]:
+        columns = self.table.columns
+        field = self.fields[int(columns[f"{slot}_field"][i])]
+        op = int(columns[f"{slot}_op"][i])
+        if op == _RANGE:
+            low = float(columns[f"{slot}_low"][i])
+            return {field: {"gte": low, "lt": float(columns[f"{slot}_high"][i])}}
+        values = columns[f"{slot}_values"][i, : int(columns[f"{slot}_count"][i])]
+        if op == _EQ:
+            return {field: int(values[0])}
+        return {field: values.tolist()}
+
+    def filter(self, i: int) -> Optional[Dict[str, Any]]:
+        """Returns the filter of query `i` as a `vdbt.filters` dictionary."""
+        combine = int(self.table.columns["combine"][i])
+        if combine == _NONE:
+            return None
+        if combine == _SINGLE:
+            return self._clause("a", i)
+        clauses = [self._clause(slot, i) for slot in _SLOTS]
+        return {AND if combine == _AND else OR: clauses}
+
+    def filters(self) -> List[Optional[Dict[str, Any]]]:
+        """Returns every query's filter."""
+        return [self.filter(i) for i in range(len(self))]
+
+    def selectivity(
+        self, columns: Dict[str, np.ndarray[Any, Any]]
+    ) -> np.ndarray[Any, Any]:
+        """Returns the fraction of the corpus each query's filter matches."""
+        size = len(next(iter(columns.values())))
+        matched = [
+            filter_mask(query_filter, columns.get, size).mean() if query_filter else 1.0
+            for query_filter in self.filters()
+        ]
+        return np.asarray(matched, dtype=np.float64)
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Writes the vectors, filter columns and field names to a directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / _VECTORS, self.vectors, allow_pickle=False)
+        self.table.save(directory / _COLUMNS)
+        (directory / _MANIFEST).write_text(json.dumps({"fields": self.fields}))
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> "FilteredQueries":
+        """Opens a query set written by `save`, memory-mapped by default."""
+        directory = Path(directory)
+        manifest = json.loads((directory / _MANIFEST).read_text())
+        vectors = np.load(directory / _VECTORS, mmap_mode="r" if mmap else None)
+        table = ColumnTable.load(directory / _COLUMNS, mmap=mmap)
+        return cls(vectors, table, manifest["fields"])
+
+
+def _fill_range(
+    clause: Dict[str, np.ndarray[Any, Any]],
+    rows: np.ndarray[Any, Any],
+    column: np.ndarray[Any, Any],
+    targets: np.ndarray[Any, Any],
+    rng: np.random.Generator,
+) -> None:
+    """Picks a window of the sorted values holding `targets` of the corpus."""
+    ordered = np.sort(column)
+    width = np.maximum(np.round(targets * len(ordered)).astype(np.int64), 1)
+    start = (rng.random(len(rows)) * (len(ordered) - width + 1)).astype(np.int64)
+    stop = start + width
+    clause["low"][rows] = ordered[start]
+    # The window is half-open, so past the largest value the bound is nudged up.
+    clause["high"][rows] = np.where(
+        stop < len(ordered),
+        ordered[np.minimum(stop, len(ordered) - 1)],
+        np.nextafter(ordered[-1], np.inf),
+    )
+
+
+def _fill_values(
+    clause: Dict[str, np.ndarray[Any, Any]],
+    rows: np.ndarray[Any, Any],
+    column: np.ndarray[Any, Any],
+    targets: np.ndarray[Any, Any],
+    equality: np.ndarray[Any, Any],
+    rng: np.random.Generator,
+) -> None:
+    """Picks an equality value or an IN-list covering `targets` of the corpus.
+
+    Equality picks among the values whose frequency is within a factor of two
+    of the closest one to the target. IN-lists add values in random order,
+    those rarer than the target first, and stop at the length whose combined
+    frequency is closest to the target.
+    """
+    values, counts = np.unique(column, return_counts=True)
+    frequency = counts / len(column)
+    width = clause["values"].shape[1]
+
+    common = frequency[None, :] > targets[:, None]
+    order = np.argsort(rng.random((len(rows), len(values))) + common, axis=1)
+    covered = np.cumsum(frequency[order], axis=1)[:, :width]
+    count = np.abs(covered - targets[:, None]).argmin(axis=1) + 1
+    used = min(width, len(values))
+    clause["values"][rows, :used] = values[order[:, :used]]
+    clause["count"][rows] = count
+
+    for target in np.unique(targets[equality]):
+        members = rows[equality & (targets == target)]
+        distance = np.abs(np.log(frequency / target))
+        candidates = values[distance <= distance.min() + np.log(2)]
+        clause["values"][members, 0] = rng.choice(candidates, size=len(members))
+        clause["count"][members] = 1
+
+
+def generate_filtered_queries(
+    embeddings: np.ndarray[Any, Any],
+    columns: Dict[str, np.ndarray[Any, Any]],
+    num_queries: int,
+    selectivity: float = 0.1,
+    kinds: Sequence[str] = FILTER_KINDS,
+    filter_ratio: float = 1.0,
+    seed: int = 0,
+    max_values: int = 64,
+) -> FilteredQueries:
+    """Draws query vectors with filters of controlled selectivity.
+
+    Integer columns are treated as categorical, filtered by equality or
+    IN-lists; float columns are filtered by ranges. Each query's filter
+    kind is drawn uniformly from `kinds`. AND and OR filters join clauses on
+    two different fields, each aimed at the selectivity that gives the
+    target for independent fields: the square root of it for AND, and the
+    complement of the square root of its complement for OR. Actual
+    selectivity depends on the data; see `FilteredQueries.selectivity`.
+
+    Args:
+        embeddings: The corpus; query vectors are copies of its rows.
+        columns: The corpus metadata, one array per field.
+        num_queries: The number of queries.
+        selectivity: The target fraction of the corpus each filter matches.
+        kinds: The filter kinds to draw from, see `FILTER_KINDS`.
+        filter_ratio: The fraction of queries with a filter at all.
+        seed: The random seed.
+        max_values: The longest IN-list.
+
+    Raises:
+        ValueError: If a kind is unknown or the columns cannot express it.
+    """
+    unknown = set(kinds) - set(FILTER_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown filter kinds {sorted(unknown)}; use {FILTER_KINDS}")
+    fields = list(columns)
+    numeric = np.array(
+        [np.issubdtype(columns[field].dtype, np.floating) for field in fields]
+    )
+    categorical = np.array(
+        [np.issubdtype(columns[field].dtype, np.integer) for field in fields]
+    )
+    usable = np.flatnonzero(numeric | categorical)
+    needs = {
+        "eq": categorical.any(),
+        "in": categorical.any(),
+        "range": numeric.any(),
+        "and": len(usable) >= 2,
+        "or": len(usable) >= 2,
+    }
+    missing = [kind for kind in kinds if not needs[kind]]
+    if missing:
+        raise ValueError(f"The metadata columns cannot express {missing} filters")
+
+    rng = np.random.default_rng(seed)
+    kind = np.asarray(kinds)[rng.integers(len(kinds), size=num_queries)]
+    combine = np.select([kind == "and", kind == "or"], [_AND, _OR], _SINGLE).astype(
+        np.int8
+    )
+    combine[rng.random(num_queries) >= filter_ratio] = _NONE
+    targets = np.select(
+        [combine == _AND, combine == _OR],
+        [np.sqrt(selectivity), 1 - np.sqrt(1 - selectivity)],
+        selectivity,
+    )
+
+    # Single clauses take a field of the type their kind needs; compound
+    # clauses take two different fields of any type.
+    compound = (combine == _AND) | (combine == _OR)
+    first = usable[rng.integers(len(usable), size=num_queries)]
+    offset = 1 + rng.integers(max(len(usable) - 1, 1), size=num_queries)
+    position = np.searchsorted(usable, first)
+    second = usable[(position + offset) % len(usable)]
+    for single, pool in (
+        (np.isin(kind, ("eq", "in")), np.flatnonzero(categorical)),
+        (kind == "range", np.flatnonzero(numeric)),
+    ):
+        chosen = single & ~compound
+        if chosen.any():
+            first[chosen] = pool[rng.integers(len(pool), size=chosen.sum())]
+
+    table: Dict[str, np.ndarray[Any, Any]] = {
+        "source": rng.integers(len(embeddings), size=num_queries),
+        "combine": combine,
+    }
+    width = 1
+    for slot, field_index in zip(_SLOTS, (first, second), strict=True):
+        clause = {
+            "values": np.zeros((num_queries, max_values), dtype=np.int64),
+            "count": np.zeros(num_queries, dtype=np.int64),
+            "low": np.zeros(num_queries, dtype=np.float64),
+            "high": np.zeros(num_queries, dtype=np.float64),
+        }
+        # Compound categorical clauses pick equality or IN at random.
+        equality = np.where(compound, rng.random(num_queries) < 0.5, kind == "eq")
+        op = np.where(numeric[field_index], _RANGE, np.where(equality, _EQ, _IN))
+        active = combine != _NONE if slot == "a" else compound
+        for index in np.unique(field_index[active]):
+            rows = np.flatnonzero(active & (field_index == index))
+            column = np.asarray(columns[fields[index]])
+            if numeric[index]:
+                _fill_range(clause, rows, column, targets[rows], rng)
+            else:
+                _fill_values(clause, rows, column, targets[rows], op[rows] == _EQ, rng)
+        width = max(width, int(clause["count"].max(initial=1)))
+        table[f"{slot}_field"] = field_index.astype(np.int16)
+        table[f"{slot}_op"] = op.astype(np.int8)
+        for name, values in clause.items():
+            table[f"{slot}_{name}"] = values
+
+    for slot in _SLOTS:
+        table[f"{slot}_values"] = np.ascontiguousarray(
+            table[f"{slot}_values"][:, :width]
+        )
+    kinds_of = {name: str(values.dtype) for name, values in table.items()}
+    vectors = np.ascontiguousarray(embeddings[table["source"]], dtype=np.float32)
+    return FilteredQueries(
+        vectors, ColumnTable(num_queries, table, kinds_of, {}), fields
+    )
@@ -0,0 +1,198 @@
+"""Opt-in profiling of scenario phases.
+
+Scenarios mark their phases, e.g. data generation, ingest and querying,
+with `phase`. While a profiler is active, everything that runs is
+attributed to the innermost open phase, on every thread; otherwise `phase`
+does nothing.
+
+Two profilers are available:
+
+- "sampling": a background thread periodically captures the stack of every
+  other thread. Its overhead is independent of how many calls are made, and
+  it writes collapsed stacks (`<phase>.collapsed`), which flamegraph.pl,
+  speedscope and most flame graph viewers read directly.
+- "cprofile": the deterministic profiler from the standard library, used as
+  a fallback where stacks of other threads cannot be captured. It only sees
+  the thread that opened the profile, and writes `pstats` dumps
+  (`<phase>.prof`).
+"""
+
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Iterator, List, Optional, Union
+
+PROFILE_MODES = ("sampling", "cprofile")
+# Samples taken outside any phase are attributed to this one.
+DEFAULT_PHASE = "scenario"
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads at a fixed interval.
+
+    Args:
+        interval_s: The time between samples, in seconds.
+    """
+
+    suffix = ".collapsed"
+
+    def __init__(self, interval_s: float = 0.005) -> None:
+        self.interval_s = interval_s
+        self.phase = DEFAULT_PHASE
+        self.stacks: Dict[str, Counter[str]] = defaultdict(Counter)
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(
+            target=self._sample, name="vdbt-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join()
+
+    def enter_phase(self, name: str) -> str:
+        """Switches to phase `name` and returns the previous phase."""
+        previous, self.phase = self.phase, name
+        return previous
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        while not self._stopping.wait(self.interval_s):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            phase = self.phase
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _collapse(frame, names.get(ident, str(ident)))
+                self.stacks[phase][stack] += 1
+
+    def write(self, directory: Path) -> Dict[str, Path]:
+        """Writes one collapsed-stack file per phase.
+
+        Returns:
+            The path written for each phase.
+        """
+        paths = {}
+        for phase, stacks in sorted(self.stacks.items()):
+            path = directory / f"{phase}{self.suffix}"
+            with open(path, "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths[phase] = path
+        return paths
+
+
+class CProfileProfiler:
+    """Profiles the calling thread with cProfile, one profile per phase."""
+
+    suffix = ".prof"
+
+    def __init__(self) -> None:
+        self.phase = DEFAULT_PHASE
+        self.profiles: Dict[str, cProfile.Profile] = {}
+
+    def start(self) -> None:
+        self._profile(self.phase).enable()
+
+    def stop(self) -> None:
+        self._profile(self.phase).disable()
+
+    def enter_phase(self, name: str) -> str:
+        """Switches to phase `name` and returns the previous phase."""
+        previous = self.phase
+        self._profile(previous).disable()
+        self.phase = name
+        self._profile(name).enable()
+        return previous
+
+    def _profile(self, name: str) -> cProfile.Profile:
+        if name not in self.profiles:
+            self.profiles[name] = cProfile.Profile()
+        return self.profiles[name]
+
+    def write(self, directory: Path) -> Dict[str, Path]:
+        """Writes one `pstats` file per phase.
+
+        Returns:
+            The path written for each phase.
+        """
+        paths = {}
+        for phase, profile in sorted(self.profiles.items()):
+            path = directory / f"{phase}{self.suffix}"
+            profile.dump_stats(path)
+            paths[phase] = path
+        return paths
+
+
+Profiler = Union[SamplingProfiler, CProfileProfiler]
+
+_active_profiler: Optional[Profiler] = None
+
+
+def _collapse(frame: Optional[FrameType], thread_name: str) -> str:
+    """Formats a stack root-first, with frames separated by semicolons."""
+    frames: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        frames.append(f"{code.co_qualname} ({filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    frames.append(thread_name)
+    return ";".join(reversed(frames))
+
+
+def create_profiler(mode: str = "sampling") -> Profiler:
+    """Creates a profiler, falling back to cProfile if sampling is unavailable.
+
+    Args:
+        mode: One of `PROFILE_MODES`.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode {mode!r}; expected {PROFILE_MODES}")
+    if mode == "sampling" and hasattr(sys, "_current_frames"):
+        return SamplingProfiler()
+    return CProfileProfiler()
+
+
+@contextmanager
+def profile(directory: Path, mode: str = "sampling") -> Iterator[Dict[str, Path]]:
+    """Profiles the block and writes one output file per phase to `directory`.
+
+    Yields:
+        A dictionary that is filled with the path written for each phase
+        once the block exits.
+    """
+    global _active_profiler
+    profiler = create_profiler(mode)
+    paths: Dict[str, Path] = {}
+    previous = _active_profiler
+    _active_profiler = profiler
+    profiler.start()
+    try:
+        yield paths
+    finally:
+        profiler.stop()
+        _active_profiler = previous
+        directory.mkdir(parents=True, exist_ok=True)
+        paths.update(profiler.write(directory))
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Attributes everything that runs inside the block to phase `name`."""
+    profiler = _active_profiler
+    if profiler is None:
+        yield
+        return
+    previous = profiler.enter_phase(name)
+    try:
+        yield
+    finally:
+        profiler.enter_phase(previous)
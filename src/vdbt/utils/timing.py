@@ -1,8 +1,17 @@
 """Timing utilities for benchmarking."""
 
+import threading
 import time
 from contextlib import contextmanager
-from typing import Any, Dict, Iterator
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+import numpy as np
+
+from vdbt.utils.histogram import LatencyHistogram
+
+R = TypeVar("R")
 
 
 @contextmanager
@@ -35,3 +44,235 @@ def Timer() -> Iterator[Dict[str, Any]]:
     finally:
         end = time.perf_counter()
         metrics["duration_s"] = end - start
+
+
+@dataclass(frozen=True)
+class TimerCalibration:
+    """The cost of timing an interval with `perf_counter_ns`.
+
+    Attributes:
+        overhead_ns: The median duration measured for an empty interval. Every
+            latency measured with two clock reads includes roughly this much.
+        min_ns: The shortest duration measured for an empty interval.
+        resolution_ns: The clock resolution reported by the platform.
+        samples: The number of empty intervals measured.
+    """
+
+    overhead_ns: int
+    min_ns: int
+    resolution_ns: float
+    samples: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def calibrate_timer(samples: int = 10000) -> TimerCalibration:
+    """Measures the overhead of timing an empty interval.
+
+    Args:
+        samples: The number of empty intervals to time.
+    """
+    clock = time.perf_counter_ns
+    durations = np.empty(samples, dtype=np.int64)
+    for i in range(samples):
+        start = clock()
+        durations[i] = clock() - start
+    return TimerCalibration(
+        overhead_ns=int(np.median(durations)),
+        min_ns=int(durations.min()),
+        resolution_ns=time.get_clock_info("perf_counter").resolution * 1e9,
+        samples=samples,
+    )
+
+
+@lru_cache(maxsize=1)
+def timer_calibration() -> TimerCalibration:
+    """Returns the timer calibration, measured once per process."""
+    return calibrate_timer()
+
+
+class LatencyBuffer:
+    """A preallocated buffer of latencies in integer nanoseconds.
+
+    Recording a latency stores one int64 without allocating, so hot loops
+    can time sub-microsecond differences without the bookkeeping showing up
+    in the measurements:
+
+        buffer = LatencyBuffer(len(queries))
+        for query in queries:
+            start = time.perf_counter_ns()
+            db.search(name, query, k=10)
+            buffer.record_ns(time.perf_counter_ns() - start)
+
+    Args:
+        capacity: The most latencies the buffer can hold.
+    """
+
+    __slots__ = ("_values", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        self._values = np.empty(capacity, dtype=np.int64)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    @property
+    def full(self) -> bool:
+        return self._count >= len(self._values)
+
+    @property
+    def values_ns(self) -> np.ndarray[Any, Any]:
+        """The recorded latencies, in nanoseconds."""
+        return self._values[: self._count]
+
+    def record_ns(self, duration_ns: int) -> None:
+        """Stores one latency.
+
+        Raises:
+            IndexError: If the buffer is full.
+        """
+        self._values[self._count] = duration_ns
+        self._count += 1
+
+    def time_call(self, operation: Callable[..., R], *args: Any) -> R:
+        """Calls `operation` with `args` and records how long it took."""
+        start = time.perf_counter_ns()
+        result = operation(*args)
+        self._values[self._count] = time.perf_counter_ns() - start
+        self._count += 1
+        return result
+
+    def seconds(self, overhead_ns: int = 0) -> np.ndarray[Any, Any]:
+        """Returns the latencies in seconds.
+
+        Args:
+            overhead_ns: A timer overhead to subtract from every latency, as
+                measured by `calibrate_timer`. Results are clipped at zero.
+        """
+        values = np.maximum(self.values_ns - overhead_ns, 0)
+        seconds: np.ndarray[Any, Any] = values * 1e-9
+        return seconds
+
+    def reset(self) -> None:
+        """Forgets every recorded latency."""
+        self._count = 0
+
+
+class SpanRecorder:
+    """Collects durations of nested timing spans.
+
+    Spans are keyed by their path, e.g. "query/engine" for an "engine" span
+    opened inside a "query" span. Spans can be recorded from several threads.
+    Durations are counted in one fixed-size `LatencyHistogram` per path, so
+    memory does not grow with the length of the run.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, duration_s: float) -> None:
+        """Adds one duration for the span at `path`."""
+        with self._lock:
+            histogram = self._histograms.get(path)
+            if histogram is None:
+                # Client-side spans such as "prepare" can take well under 1 us.
+                histogram = self._histograms[path] = LatencyHistogram(min_s=1e-8)
+            histogram.record(duration_s)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Summarizes every span path.
+
+        Returns:
+            A dictionary mapping span path to its count, total and mean
+            duration and duration percentiles, all in seconds.
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for path in sorted(self._histograms):
+                histogram = self._histograms[path]
+                summary[path] = {
+                    "count": histogram.count,
+                    "total_s": histogram.total_s,
+                    "mean_s": histogram.total_s / histogram.count,
+                    **{f"p{p}": histogram.percentile(p) for p in (50, 95, 99)},
+                }
+        return summary
+
+
+_active_recorder: Optional[SpanRecorder] = None
+_span_stack = threading.local()
+
+
+def _current_path() -> List[str]:
+    stack: Optional[List[str]] = getattr(_span_stack, "stack", None)
+    if stack is None:
+        stack = []
+        _span_stack.stack = stack
+    return stack
+
+
+@contextmanager
+def record_spans() -> Iterator[SpanRecorder]:
+    """Activates a new span recorder for the duration of the block.
+
+    Yields:
+        The recorder that collects every span closed inside the block, on any
+        thread.
+    """
+    global _active_recorder
+    previous = _active_recorder
+    recorder = SpanRecorder()
+    _active_recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _active_recorder = previous
+
+
+def record_span(name: str, duration_s: float) -> None:
+    """Records an externally measured duration as a child of the current span.
+
+    This is used for timings reported by a backend, such as the server-side
+    processing time returned with a response.
+    """
+    recorder = _active_recorder
+    if recorder is not None:
+        recorder.record("/".join([*_current_path(), name]), duration_s)
+
+
+class Span:
+    """A context manager that times a named span when a recorder is active.
+
+    When no recorder is active the span does nothing, so adapters can stay
+    instrumented at negligible cost.
+    """
+
+    __slots__ = ("_name", "_recorder", "_start")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._recorder: Optional[SpanRecorder] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "Span":
+        self._recorder = _active_recorder
+        if self._recorder is not None:
+            _current_path().append(self._name)
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._recorder is None:
+            return
+        duration = time.perf_counter() - self._start
+        stack = _current_path()
+        path = "/".join(stack)
+        stack.pop()
+        self._recorder.record(path, duration)
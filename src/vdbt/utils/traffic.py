@@ -0,0 +1,156 @@
+"""Query rate profiles and the arrival times they produce.
+
+A profile is a float64 array of target queries per second, one entry per
+second. Three shapes are supported:
+
+- "step": a base rate with periodic bursts to a higher rate.
+- "sine": a diurnal-style rate oscillating around a mean.
+- "csv": a recorded per-second rate trace, one row per second.
+"""
+
+import csv
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+SHAPES = ("step", "sine", "csv")
+ARRIVALS = ("uniform", "poisson")
+
+
+def step_profile(
+    duration_s: int,
+    base_qps: float,
+    burst_qps: float,
+    burst_duration_s: int,
+    burst_every_s: Optional[int] = None,
+    burst_start_s: Optional[int] = None,
+) -> np.ndarray[Any, Any]:
+    """Returns a base rate with bursts.
+
+    Args:
+        duration_s: The length of the profile, in seconds.
+        base_qps: The rate between bursts.
+        burst_qps: The rate during bursts.
+        burst_duration_s: The length of each burst, in seconds.
+        burst_every_s: The time from the start of one burst to the next.
+            Defaults to a single burst.
+        burst_start_s: The start of the first burst. Defaults to a third of
+            the burst interval, leaving time to settle before it.
+    """
+    every = burst_every_s or duration_s
+    start = burst_start_s if burst_start_s is not None else every // 3
+    seconds = np.arange(duration_s)
+    in_burst = (seconds >= start) & ((seconds - start) % every < burst_duration_s)
+    rates: np.ndarray[Any, Any] = np.where(in_burst, burst_qps, base_qps).astype(
+        np.float64
+    )
+    return rates
+
+
+def sine_profile(
+    duration_s: int,
+    mean_qps: float,
+    amplitude_qps: float,
+    period_s: float,
+    phase_s: float = 0.0,
+) -> np.ndarray[Any, Any]:
+    """Returns a rate oscillating around `mean_qps`, never below zero.
+
+    Args:
+        duration_s: The length of the profile, in seconds.
+        mean_qps: The mean rate.
+        amplitude_qps: The largest deviation from the mean.
+        period_s: The length of one cycle, e.g. 86400 for a day, or less to
+            compress a day into a shorter run.
+        phase_s: Shifts the cycle by this many seconds.
+    """
+    seconds = np.arange(duration_s, dtype=np.float64)
+    rates = mean_qps + amplitude_qps * np.sin(
+        2 * np.pi * (seconds + phase_s) / period_s
+    )
+    clipped: np.ndarray[Any, Any] = np.maximum(rates, 0.0)
+    return clipped
+
+
+def csv_profile(
+    path: Union[str, Path], column: str = "qps", scale: float = 1.0
+) -> np.ndarray[Any, Any]:
+    """Reads a recorded rate trace with one row per second.
+
+    Args:
+        path: A CSV file with a header row.
+        column: The column holding queries per second.
+        scale: Multiplies every rate, to replay a trace at a fraction or a
+            multiple of its recorded load.
+    """
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or column not in reader.fieldnames:
+            raise ValueError(f"{path} has no {column!r} column")
+        rates = np.array([float(row[column]) for row in reader], dtype=np.float64)
+    if np.any(rates < 0):
+        raise ValueError(f"{path} has negative rates")
+    scaled: np.ndarray[Any, Any] = rates * scale
+    return scaled
+
+
+def rate_profile(
+    spec: Dict[str, Any], duration_s: Optional[int] = None
+) -> np.ndarray[Any, Any]:
+    """Builds the profile described by a scenario config entry.
+
+    Args:
+        spec: The "shape" and the keyword arguments of its profile function.
+        duration_s: The length of step and sine profiles, and the most of a
+            CSV trace to replay.
+
+    Raises:
+        ValueError: If the shape is unknown or a step or sine profile has no
+            duration.
+    """
+    options = {key: value for key, value in spec.items() if key != "shape"}
+    shape = spec.get("shape")
+    if shape == "csv":
+        rates = csv_profile(**options)
+        return rates[:duration_s] if duration_s is not None else rates
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown profile shape {shape!r}; expected one of {SHAPES}")
+    if duration_s is None:
+        raise ValueError(f"A {shape} profile needs a duration")
+    if shape == "step":
+        return step_profile(duration_s, **options)
+    return sine_profile(duration_s, **options)
+
+
+def arrival_times(
+    rates: np.ndarray[Any, Any], arrivals: str = "uniform", seed: int = 0
+) -> np.ndarray[Any, Any]:
+    """Returns the send time of every query, in seconds from the start.
+
+    Args:
+        rates: The target rate of each second.
+        arrivals: "uniform" spaces queries evenly at the current rate;
+            "poisson" draws them as a Poisson process with that rate.
+        seed: The seed for Poisson arrivals.
+
+    Returns:
+        A sorted float64 array of offsets.
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    if arrivals == "poisson":
+        rng = np.random.default_rng(seed)
+        counts = rng.poisson(rates)
+        seconds = np.repeat(np.arange(len(rates), dtype=np.float64), counts)
+        times: np.ndarray[Any, Any] = np.sort(seconds + rng.random(len(seconds)))
+        return times
+    if arrivals != "uniform":
+        raise ValueError(f"Unknown arrivals {arrivals!r}; expected one of {ARRIVALS}")
+    # Invert the cumulative count: the n-th query goes out when the expected
+    # number of queries so far reaches n + 0.5.
+    expected = np.concatenate([[0.0], np.cumsum(rates)])
+    targets = np.arange(int(expected[-1])) + 0.5
+    second = np.searchsorted(expected, targets, side="right") - 1
+    fraction = (targets - expected[second]) / rates[second]
+    uniform: np.ndarray[Any, Any] = second + fraction
+    return uniform
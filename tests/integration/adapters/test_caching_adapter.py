@@ -0,0 +1,119 @@
+"""Integration tests for the query result cache wrapper."""
+
+import numpy as np
+import pytest
+
+from vdbt.adapters.caching import CachingAdapter
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+
+
+class _CountingAdapter(NumpyAdapter):
+    """Counts the query vectors that reach the backend."""
+
+    def __init__(self):
+        super().__init__()
+        self.searched = 0
+
+    def search(self, name, vectors, k, filter=None):
+        self.searched += len(np.atleast_2d(vectors))
+        return super().search(name, vectors, k, filter)
+
+
+def _load(adapter, n=50, dim=8):
+    vectors = np.random.default_rng(0).standard_normal((n, dim)).astype(np.float32)
+    adapter.create_collection("c", dim)
+    adapter.upsert(
+        "c", [str(i) for i in range(n)], vectors, [{"i": i} for i in range(n)]
+    )
+    return vectors
+
+
+def test_exact_cache_hits_repeated_queries():
+    """Repeats are answered from the cache; k and filter are part of the key."""
+    inner = _CountingAdapter()
+    cache = CachingAdapter(inner)
+    vectors = _load(cache)
+
+    first = cache.search("c", vectors[:3], k=5)
+    second = cache.search("c", vectors[:3], k=5)
+    assert inner.searched == 3
+    assert second.ids.tolist() == first.ids.tolist()
+    assert second.metadata(1, 0) == {"i": 1}
+
+    cache.search("c", vectors[:3], k=4)
+    cache.search("c", vectors[:1], k=5, filter={"i": 0})
+    # A batch mixing cached and new queries only sends the new ones.
+    cache.search("c", vectors[2:5], k=5)
+    assert inner.searched == 3 + 3 + 1 + 2
+
+    stats = cache.stats()
+    assert stats["hits"] == 4
+    assert stats["misses"] == 9
+    assert stats["hit_rate"] == pytest.approx(4 / 13)
+    assert stats["hit_latency_s"]["p50"] > 0
+
+
+def test_cache_invalidates_on_writes():
+    """Writes drop the collection's answers unless invalidation is off."""
+    for invalidate in (True, False):
+        inner = _CountingAdapter()
+        cache = CachingAdapter(inner, invalidate=invalidate)
+        vectors = _load(cache)
+        cache.search("c", vectors[:1], k=3)
+        cache.delete("c", ["0"])
+        result = cache.search("c", vectors[:1], k=3)
+
+        stats = cache.stats()
+        if invalidate:
+            assert "0" not in result.ids[0].tolist()
+            assert stats["invalidations"] == 1
+            assert stats["outdated_hits"] == 0
+        else:
+            assert result.ids[0, 0] == "0"
+            assert stats["outdated_hits"] == 1
+        assert inner.searched == (2 if invalidate else 1)
+
+
+@pytest.mark.parametrize("eviction", ["lru", "lfu"])
+def test_cache_eviction(eviction):
+    """LRU evicts the oldest answer, LFU the least used one."""
+    inner = _CountingAdapter()
+    cache = CachingAdapter(inner, capacity=2, eviction=eviction)
+    vectors = _load(cache)
+    for i in (0, 0, 0, 1, 1):
+        cache.search("c", vectors[i : i + 1], k=1)
+    # Query 0 is used most but query 1 most recently.
+    cache.search("c", vectors[2:3], k=1)
+    assert cache.stats()["evictions"] == 1
+
+    searched = inner.searched
+    kept = 1 if eviction == "lru" else 0
+    cache.search("c", vectors[kept : kept + 1], k=1)
+    assert inner.searched == searched
+    cache.search("c", vectors[1 - kept : 2 - kept], k=1)
+    assert inner.searched == searched + 1
+
+
+def test_approximate_cache_reuses_nearby_answers():
+    """Queries within the threshold share an answer; distant ones do not."""
+    inner = _CountingAdapter()
+    cache = CachingAdapter(inner, mode="approximate", threshold=0.01)
+    vectors = _load(cache)
+
+    cache.search("c", vectors[:1], k=3)
+    nearby = vectors[:1] * 2 + 1e-3
+    result = cache.search("c", nearby, k=3)
+    assert inner.searched == 1
+    assert result.ids[0, 0] == "0"
+
+    cache.search("c", vectors[1:2], k=3)
+    assert inner.searched == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_cache_rejects_unknown_settings():
+    """Unknown modes and evictions are refused."""
+    with pytest.raises(ValueError):
+        CachingAdapter(NumpyAdapter(), mode="semantic")
+    with pytest.raises(ValueError):
+        CachingAdapter(NumpyAdapter(), eviction="fifo")
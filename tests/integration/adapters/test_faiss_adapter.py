@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 
 from vdbt.adapters.faiss_adapter import FaissAdapter
+from vdbt.metrics import exact_neighbors
 
 
 @pytest.fixture
@@ -37,6 +38,12 @@ def test_faiss_adapter_smoke(adapter: FaissAdapter):
         assert "id" in result
         assert "distance" in result
 
+    # Batched search
+    search_result = adapter.search(collection_name, vectors[:3], k=5)
+    assert search_result.ids.shape == (3, 5)
+    assert search_result.ids[:, 0].tolist() == ["0", "1", "2"]
+    assert search_result.field("i")[:, 0].tolist() == [0, 1, 2]
+
     # Delete (not implemented for this index, but should not fail)
     adapter.delete(collection_name, ["0", "1"])
     assert adapter.count(collection_name) == num_vectors
@@ -44,3 +51,121 @@ def test_faiss_adapter_smoke(adapter: FaissAdapter):
     # Drop collection
     adapter.drop_collection(collection_name)
     assert adapter.count(collection_name) == 0
+
+
+def test_faiss_adapter_save_and_mmap_load(adapter: FaissAdapter, tmp_path):
+    """A saved index reopens memory-mapped with the same results and metadata."""
+    vectors = np.random.default_rng(4).random((20, 4)).astype(np.float32)
+    adapter.create_collection("c", 4)
+    ids = [f"doc{i}" for i in range(20)]
+    adapter.upsert("c", ids, vectors, [{"i": i} for i in range(20)])
+    expected = adapter.query("c", vectors[:2], k=3)
+    adapter.save("c", tmp_path)
+
+    reloaded = FaissAdapter()
+    reloaded.load("c", tmp_path, mmap=True)
+    assert reloaded.count("c") == 20
+    assert reloaded.query("c", vectors[:2], k=3) == expected
+    reloaded.upsert("c", ["new"], vectors[:1] + 10, [{"i": 20}])
+    assert reloaded.query("c", vectors[:1] + 10, k=1)[0]["metadata"]["i"] == 20
+
+
+@pytest.mark.parametrize(
+    "dtype,code_size", [("float16", 16), ("int8", 8), ("binary", 1)]
+)
+def test_faiss_adapter_reduced_dtypes(
+    adapter: FaissAdapter, tmp_path, dtype: str, code_size: int
+):
+    """Reduced-precision indexes find each vector and survive save and load."""
+    vectors = np.random.default_rng(5).standard_normal((50, 8)).astype(np.float32)
+    adapter.create_collection("c", 8, dtype=dtype)
+    adapter.upsert("c", [str(i) for i in range(50)], vectors, [{}] * 50)
+    assert adapter.memory_bytes("c") == 50 * code_size
+    assert adapter.search("c", vectors[:5], k=1).ids[:, 0].tolist() == list("01234")
+
+    adapter.save("c", tmp_path)
+    reloaded = FaissAdapter()
+    reloaded.load("c", tmp_path)
+    assert reloaded.search("c", vectors[:5], k=1).ids[:, 0].tolist() == list("01234")
+
+
+def test_faiss_adapter_rejects_unknown_dtypes(adapter: FaissAdapter):
+    """Unknown types, and binary vectors of odd dimension, are rejected."""
+    with pytest.raises(ValueError, match="dtype"):
+        adapter.create_collection("c", 8, dtype="int4")
+    with pytest.raises(ValueError, match="multiple of 8"):
+        adapter.create_collection("c", 12, dtype="binary")
+
+
+def test_faiss_adapter_compound_filters(adapter: FaissAdapter):
+    """Filters restrict the search to matching vectors via an ID selector."""
+    vectors = np.random.default_rng(0).random((60, 4)).astype(np.float32)
+    meta = [{"label": i % 3, "price": float(i)} for i in range(60)]
+    adapter.create_collection("c", 4)
+    adapter.upsert("c", [str(i) for i in range(60)], vectors, meta)
+
+    query_filter = {"$or": [{"label": 1}, {"price": {"gte": 50.0}}]}
+    results = adapter.query("c", vectors[:1], k=60, filter=query_filter)
+    expected = {str(i) for i in range(60) if i % 3 == 1 or i >= 50}
+    assert {r["id"] for r in results} == expected
+
+    results = adapter.query("c", vectors[:1], k=60, filter={"label": [0, 2]})
+    assert len(results) == 40
+    assert all(r["metadata"]["label"] != 1 for r in results)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8", "binary"])
+def test_faiss_adapter_search_empty_collection(adapter: FaissAdapter, dtype: str):
+    """Searching a collection with no vectors returns empty results."""
+    adapter.create_collection("c", 8, dtype=dtype)
+    query = np.random.default_rng(0).random((2, 8)).astype(np.float32)
+    result = adapter.search("c", query, k=3)
+    assert result.ids.shape == (2, 3)
+    assert not result.valid.any()
+    assert adapter.query("c", query[:1], k=3) == []
+
+
+def test_faiss_adapter_trains_quantizer_on_enough_vectors(adapter: FaissAdapter):
+    """A small first upsert is held back until `train_size` vectors arrive."""
+    rng = np.random.default_rng(3)
+    vectors = rng.standard_normal((50, 8)).astype(np.float32)
+    vectors[:2] *= 0.01
+    ids = [str(i) for i in range(50)]
+    adapter.create_collection("c", 8, dtype="int8", train_size=40)
+    adapter.upsert("c", ids[:2], vectors[:2], [{}] * 2)
+    assert not adapter._indices["c"].is_trained
+    adapter.upsert("c", ids[2:], vectors[2:], [{"i": i} for i in range(2, 50)])
+    assert adapter._indices["c"].is_trained
+    assert adapter.search("c", vectors, k=1).ids[:, 0].tolist() == ids
+
+    # Reading the collection trains on whatever has arrived so far.
+    adapter.create_collection("d", 8, dtype="int8")
+    adapter.upsert("d", ids[:5], vectors[:5], [{}] * 5)
+    assert adapter.count("d") == 5
+    assert adapter.search("d", vectors[:5], k=1).ids[:, 0].tolist() == ids[:5]
+
+
+@pytest.mark.parametrize("metric", ["l2", "ip", "cosine"])
+def test_faiss_adapter_metrics(adapter: FaissAdapter, tmp_path, metric: str):
+    """Hits are ranked in the collection's metric, also after save and load."""
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((40, 8)).astype(np.float32)
+    vectors *= rng.uniform(0.1, 10, size=(40, 1)).astype(np.float32)
+    queries = rng.standard_normal((5, 8)).astype(np.float32)
+    adapter.create_collection("c", 8, metric=metric)
+    adapter.upsert("c", [str(i) for i in range(40)], vectors, [{}] * 40)
+
+    expected = exact_neighbors(vectors, queries, 3, metric=metric).tolist()
+    assert adapter.search("c", queries, k=3).ids.astype(int).tolist() == expected
+    adapter.save("c", tmp_path)
+    reloaded = FaissAdapter()
+    reloaded.load("c", tmp_path)
+    assert reloaded.search("c", queries, k=3).ids.astype(int).tolist() == expected
+
+
+def test_faiss_adapter_rejects_unsupported_metrics(adapter: FaissAdapter):
+    """Unknown metrics, and inner product on sign bits, are rejected."""
+    with pytest.raises(ValueError, match="metric"):
+        adapter.create_collection("c", 8, metric="hamming")
+    with pytest.raises(ValueError, match="metric"):
+        adapter.create_collection("c", 8, dtype="binary", metric="ip")
@@ -0,0 +1,152 @@
+"""Integration tests for the hnswlib adapter."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("hnswlib")
+
+from vdbt.adapters.hnswlib_adapter import HnswlibAdapter  # noqa: E402
+
+
+@pytest.fixture
+def adapter():
+    """Returns an HnswlibAdapter with a small initial capacity."""
+    return HnswlibAdapter(initial_capacity=16)
+
+
+def test_hnswlib_adapter_smoke(adapter: HnswlibAdapter):
+    """Smoke test for the hnswlib adapter."""
+    collection_name = "test_collection"
+    dim = 4
+    num_vectors = 100
+
+    adapter.connect()
+    adapter.create_collection(collection_name, dim, M=8, ef_construction=50)
+
+    # Upsert grows the index past its initial capacity.
+    ids = [str(i) for i in range(num_vectors)]
+    vectors = np.random.rand(num_vectors, dim).astype(np.float32)
+    metadata = [{"i": i, "label": i % 2} for i in range(num_vectors)]
+    adapter.upsert(collection_name, ids, vectors, metadata)
+    assert adapter.count(collection_name) == num_vectors
+
+    # Query
+    query_vector = np.random.rand(1, dim).astype(np.float32)
+    results = adapter.query(collection_name, query_vector, k=5, ef=100)
+    assert len(results) == 5
+    for result in results:
+        assert "id" in result
+        assert "distance" in result
+
+    # Query with filter
+    results = adapter.query(collection_name, query_vector, k=5, filter={"label": 0})
+    assert len(results) == 5
+    assert all(r["metadata"]["label"] == 0 for r in results)
+
+    # Delete
+    adapter.delete(collection_name, ["0", "1"])
+    assert adapter.count(collection_name) == num_vectors - 2
+    results = adapter.query(collection_name, vectors[:1], k=10)
+    assert "0" not in {r["id"] for r in results}
+
+    # Drop collection
+    adapter.drop_collection(collection_name)
+    assert adapter.count(collection_name) == 0
+
+
+def test_hnswlib_adapter_filter_with_few_matches(adapter: HnswlibAdapter):
+    """A filter matching fewer than k points returns only the matches."""
+    adapter.create_collection("c", 4)
+    vectors = np.random.rand(20, 4).astype(np.float32)
+    meta = [{"label": int(i == 3)} for i in range(20)]
+    adapter.upsert("c", [str(i) for i in range(20)], vectors, meta)
+
+    results = adapter.query("c", vectors[:1], k=10, filter={"label": 1})
+    assert [r["id"] for r in results] == ["3"]
+    assert adapter.query("c", vectors[:1], k=10, filter={"label": 2}) == []
+
+
+def test_hnswlib_adapter_save_and_load(adapter: HnswlibAdapter, tmp_path):
+    """A saved index reloads with its ids, metadata and deletions."""
+    vectors = np.random.default_rng(5).random((30, 4)).astype(np.float32)
+    adapter.create_collection("c", 4)
+    adapter.upsert(
+        "c", [str(i) for i in range(30)], vectors, [{"i": i} for i in range(30)]
+    )
+    adapter.delete("c", ["1"])
+    expected = adapter.query("c", vectors[:1], k=5)
+    adapter.save("c", tmp_path)
+
+    reloaded = HnswlibAdapter()
+    reloaded.load("c", tmp_path)
+    assert reloaded.count("c") == 29
+    assert reloaded.query("c", vectors[:1], k=5) == expected
+    reloaded.upsert("c", ["30"], vectors[1:2], [{"i": 30}])
+    assert reloaded.query("c", vectors[1:2], k=1)[0]["id"] == "30"
+
+
+def test_hnswlib_adapter_compound_filters(adapter: HnswlibAdapter):
+    """AND, OR, IN and range filters are evaluated per candidate."""
+    vectors = np.random.default_rng(0).random((60, 4)).astype(np.float32)
+    meta = [{"label": i % 3, "price": float(i)} for i in range(60)]
+    adapter.create_collection("c", 4)
+    adapter.upsert("c", [str(i) for i in range(60)], vectors, meta)
+
+    query_filter = {"$and": [{"label": [1, 2]}, {"price": {"lt": 30.0}}]}
+    results = adapter.query("c", vectors[:1], k=60, filter=query_filter)
+    assert {r["id"] for r in results} == {str(i) for i in range(30) if i % 3 != 0}
+    results = adapter.query(
+        "c", vectors[:1], k=60, filter={"$or": [{"label": 0}, {"price": 1.0}]}
+    )
+    assert len(results) == 21
+
+
+def test_hnswlib_adapter_ef_override_restores_collection_ef(adapter: HnswlibAdapter):
+    """A per-query `ef` is undone back to the collection's own `ef`."""
+    vectors = np.random.default_rng(1).random((20, 4)).astype(np.float32)
+    adapter.create_collection("c", 4, ef=120)
+    adapter.upsert("c", [str(i) for i in range(20)], vectors, [{}] * 20)
+    adapter.search("c", vectors[:1], k=3, ef=300)
+    assert adapter._collections["c"].index.ef == 120
+
+
+def test_hnswlib_adapter_unreachable_filter_matches_return_fewer_hits():
+    """Matches the graph cannot reach shorten the result instead of raising."""
+    from types import SimpleNamespace
+
+    from vdbt.adapters.hnswlib_adapter import _knn_query
+
+    class ReachesTwo:
+        def knn_query(self, data, k, num_threads, filter):
+            if k > 2:
+                raise RuntimeError("Cannot return the results in a contiguous array")
+            return np.zeros((len(data), k)), np.zeros((len(data), k))
+
+    collection = SimpleNamespace(index=ReachesTwo(), metadata=dict.fromkeys(range(9)))
+    labels, _ = _knn_query(collection, np.zeros((1, 4)), 10, 1, lambda label: True)
+    assert labels.shape == (1, 2)
+
+
+def test_hnswlib_adapter_searches_share_the_collection_lock(adapter: HnswlibAdapter):
+    """A search runs while another holds the read lock; writes wait for it."""
+    import threading
+
+    vectors = np.random.default_rng(0).random((20, 4)).astype(np.float32)
+    adapter.create_collection("c", 4)
+    adapter.upsert("c", [str(i) for i in range(20)], vectors, [{}] * 20)
+    results = []
+    with adapter._collections["c"].lock.read():
+        search = threading.Thread(
+            target=lambda: results.append(adapter.search("c", vectors[:1], k=1))
+        )
+        search.start()
+        search.join(timeout=5)
+        assert len(results) == 1
+        upsert = threading.Thread(
+            target=adapter.upsert, args=("c", ["20"], vectors[:1], [{}])
+        )
+        upsert.start()
+        upsert.join(timeout=0.1)
+        assert upsert.is_alive()
+    upsert.join(timeout=5)
+    assert adapter.count("c") == 21
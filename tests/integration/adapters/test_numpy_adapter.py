@@ -0,0 +1,137 @@
+"""Integration tests for the NumPy adapter."""
+
+import numpy as np
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+
+
+@pytest.fixture
+def adapter():
+    """Returns a NumpyAdapter with small blocks to exercise the block merge."""
+    return NumpyAdapter(initial_capacity=8, block_size=16)
+
+
+def test_numpy_adapter_smoke(adapter: NumpyAdapter):
+    """Smoke test for the NumPy adapter."""
+    collection_name = "test_collection"
+    dim = 4
+    num_vectors = 100
+
+    adapter.connect()
+    adapter.create_collection(collection_name, dim)
+
+    ids = [str(i) for i in range(num_vectors)]
+    vectors = np.random.rand(num_vectors, dim).astype(np.float32)
+    metadata = [{"i": i} for i in range(num_vectors)]
+    adapter.upsert(collection_name, ids, vectors, metadata)
+    assert adapter.count(collection_name) == num_vectors
+
+    query_vector = np.random.rand(1, dim).astype(np.float32)
+    results = adapter.query(collection_name, query_vector, k=5)
+    assert len(results) == 5
+    for result in results:
+        assert "id" in result
+        assert "distance" in result
+        assert "metadata" in result
+
+    adapter.delete(collection_name, ["0", "1"])
+    assert adapter.count(collection_name) == num_vectors - 2
+
+    adapter.drop_collection(collection_name)
+    assert adapter.count(collection_name) == 0
+
+
+@pytest.mark.parametrize("metric", ["l2", "ip", "cosine"])
+def test_numpy_adapter_exact_top_k(adapter: NumpyAdapter, metric: str):
+    """Blocked top-k should match a full brute-force sort."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((100, 8)).astype(np.float32)
+    query = rng.standard_normal((1, 8)).astype(np.float32)
+    adapter.create_collection("c", 8, metric=metric)
+    adapter.upsert("c", [str(i) for i in range(100)], vectors, [{}] * 100)
+
+    if metric == "l2":
+        expected = np.argsort(((vectors - query) ** 2).sum(axis=1))[:10]
+    else:
+        if metric == "cosine":
+            vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(vectors @ query[0]))[:10]
+
+    results = adapter.query("c", query, k=10)
+    assert [r["id"] for r in results] == [str(i) for i in expected]
+
+
+def test_numpy_adapter_upsert_delete_and_compaction(adapter: NumpyAdapter):
+    """Upserts overwrite in place and deleted ids never come back."""
+    vectors = np.eye(4, dtype=np.float32).repeat(10, axis=0)
+    ids = [str(i) for i in range(40)]
+    adapter.create_collection("c", 4)
+    adapter.upsert("c", ids, vectors, [{"i": i} for i in range(40)])
+
+    adapter.upsert("c", ["0"], np.full((1, 4), 9.0), [{"i": 100}])
+    assert adapter.count("c") == 40
+    top = adapter.query("c", np.full((1, 4), 9.0), k=1)[0]
+    assert top["id"] == "0"
+    assert top["metadata"] == {"i": 100}
+
+    adapter.delete("c", ids[:20])
+    assert adapter.count("c") == 20
+    results = adapter.query("c", np.ones((1, 4)), k=40)
+    assert len(results) == 20
+    assert not {r["id"] for r in results} & set(ids[:20])
+
+
+def test_numpy_adapter_filters(adapter: NumpyAdapter):
+    """Equality, any-of and range filters select matching rows only."""
+    vectors = np.random.default_rng(1).random((30, 4)).astype(np.float32)
+    meta = [{"label": i % 3, "i": i} for i in range(30)]
+    adapter.create_collection("c", 4)
+    adapter.upsert("c", [str(i) for i in range(30)], vectors, meta)
+    query = np.zeros((1, 4), dtype=np.float32)
+
+    results = adapter.query("c", query, k=30, filter={"label": 1})
+    assert {r["metadata"]["label"] for r in results} == {1}
+    assert len(results) == 10
+
+    results = adapter.query("c", query, k=30, filter={"label": [0, 2]})
+    assert len(results) == 20
+
+    results = adapter.query("c", query, k=30, filter={"i": {"gte": 5, "lt": 10}})
+    assert sorted(r["metadata"]["i"] for r in results) == [5, 6, 7, 8, 9]
+
+    assert adapter.query("c", query, k=5, filter={"missing": 1}) == []
+
+
+def test_numpy_adapter_search_batch(adapter: NumpyAdapter):
+    """Batched search returns padded parallel arrays with lazy metadata."""
+    vectors = np.random.default_rng(2).random((3, 4)).astype(np.float32)
+    adapter.create_collection("c", 4)
+    adapter.upsert("c", ["a", "b", "c"], vectors, [{"i": i} for i in range(3)])
+
+    result = adapter.search("c", vectors[:2], k=5)
+    assert result.ids.shape == (2, 5)
+    assert result.ids[0, 0] == "a"
+    assert result.ids[1, 0] == "b"
+    assert result.valid.sum(axis=1).tolist() == [3, 3]
+    assert np.isnan(result.distances[0, 3])
+    assert result.field("i")[1, 0] == 1
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_numpy_adapter_save_and_load(adapter: NumpyAdapter, tmp_path, mmap: bool):
+    """A saved collection reloads with the same results and stays writable."""
+    vectors = np.random.default_rng(3).random((20, 4)).astype(np.float32)
+    adapter.create_collection("c", 4, metric="cosine")
+    ids = [str(i) for i in range(20)]
+    adapter.upsert("c", ids, vectors, [{"label": i % 2} for i in range(20)])
+    adapter.delete("c", ["0"])
+    expected = adapter.query("c", vectors[:1], k=5, filter={"label": 1})
+    adapter.save("c", tmp_path)
+
+    reloaded = NumpyAdapter()
+    reloaded.load("c", tmp_path, mmap=mmap)
+    assert reloaded.count("c") == 19
+    assert reloaded.query("c", vectors[:1], k=5, filter={"label": 1}) == expected
+    reloaded.upsert("c", ["new"], vectors[:1], [{"label": 5}])
+    assert reloaded.query("c", vectors[:1], k=1)[0]["id"] == "new"
@@ -0,0 +1,189 @@
+"""Integration tests for the retry, timeout and backpressure wrapper."""
+
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.adapters.policy import (
+    OperationTimeout,
+    PolicyAdapter,
+    Rejected,
+    RetryPolicy,
+    find_policy,
+)
+from vdbt.adapters.recording import RecordingAdapter
+from vdbt.artifacts import RunStore
+from vdbt.runner import Runner
+from vdbt.trace import TraceWriter
+
+
+class _FlakyAdapter(NumpyAdapter):
+    """Fails the first `failures` searches, and sleeps `delay_s` in each."""
+
+    def __init__(self, failures=0, delay_s=0.0):
+        super().__init__()
+        self.failures = failures
+        self.delay_s = delay_s
+        self.searches = 0
+
+    def search(self, name, vectors, k, filter=None):
+        self.searches += 1
+        time.sleep(self.delay_s)
+        if self.searches <= self.failures:
+            raise ConnectionError("backend unavailable")
+        return super().search(name, vectors, k, filter)
+
+
+def _load(adapter, n=10, dim=4):
+    vectors = np.random.default_rng(0).random((n, dim)).astype(np.float32)
+    adapter.create_collection("c", dim)
+    adapter.upsert(
+        "c", [str(i) for i in range(n)], vectors, [{"i": i} for i in range(n)]
+    )
+    return vectors
+
+
+_FAST = {"backoff_initial_s": 0.001, "backoff_max_s": 0.001, "backoff_jitter_s": 0}
+
+
+def test_policy_adapter_retries_transient_errors():
+    """Backend errors are retried until an attempt succeeds."""
+    inner = _FlakyAdapter(failures=2)
+    adapter = PolicyAdapter(inner, RetryPolicy(max_attempts=3, **_FAST))
+    vectors = _load(adapter)
+
+    result = adapter.search("c", vectors[:1], k=1)
+    assert result.ids[0, 0] == "0"
+    assert inner.searches == 3
+    stats = adapter.stats()
+    assert stats["search"] == {
+        "calls": 1,
+        "failures": 0,
+        "retries": 2,
+        "timeouts": 0,
+        "rejections": 0,
+        "errors": 2,
+    }
+    assert stats["upsert"]["calls"] == 1
+
+
+def test_policy_adapter_gives_up_after_max_attempts():
+    """Exhausted retries re-raise, or return an empty result if failing open."""
+    adapter = PolicyAdapter(
+        _FlakyAdapter(failures=10), RetryPolicy(max_attempts=2, **_FAST)
+    )
+    vectors = _load(adapter)
+    with pytest.raises(ConnectionError):
+        adapter.search("c", vectors[:1], k=1)
+    assert adapter.stats()["search"]["failures"] == 1
+
+    adapter = PolicyAdapter(
+        _FlakyAdapter(failures=10),
+        RetryPolicy(max_attempts=2, fail_open=True, **_FAST),
+    )
+    _load(adapter)
+    result = adapter.search("c", vectors[:2], k=3)
+    assert result.ids.shape == (2, 3)
+    assert not result.valid.any()
+    assert adapter.query("c", vectors[0], k=3) == []
+    assert adapter.stats()["search"]["failures"] == 2
+
+
+def test_policy_adapter_does_not_retry_invalid_calls():
+    """Errors in the call's arguments fail on the first attempt."""
+    adapter = PolicyAdapter(NumpyAdapter(), RetryPolicy(max_attempts=5, **_FAST))
+    with pytest.raises(KeyError):
+        adapter.search("missing", np.zeros((1, 4), dtype=np.float32), k=1)
+    assert adapter.stats()["search"]["retries"] == 0
+
+
+def test_policy_adapter_times_out_slow_attempts():
+    """Attempts over their timeout are abandoned and counted as timeouts."""
+    inner = _FlakyAdapter(delay_s=0.2)
+    adapter = PolicyAdapter(
+        inner, RetryPolicy(timeouts={"search": 0.02}, max_attempts=2, **_FAST)
+    )
+    vectors = _load(adapter)
+    with pytest.raises(OperationTimeout):
+        adapter.search("c", vectors[:1], k=1)
+    stats = adapter.stats()["search"]
+    assert stats["timeouts"] == 2
+    assert stats["retries"] == 1
+    assert stats["failures"] == 1
+    # Upserts have no timeout.
+    assert adapter.stats()["upsert"]["timeouts"] == 0
+
+
+def test_policy_adapter_close_does_not_wait_for_abandoned_attempts():
+    """Closing the wrapper returns while a timed-out attempt is still running."""
+    inner = _FlakyAdapter(delay_s=0.3)
+    adapter = PolicyAdapter(inner, RetryPolicy(timeout_s=0.02, max_attempts=1, **_FAST))
+    vectors = _load(adapter)
+    with pytest.raises(OperationTimeout):
+        adapter.search("c", vectors[:1], k=1)
+    start = time.perf_counter()
+    adapter.close()
+    assert time.perf_counter() - start < 0.2
+    with pytest.raises(RuntimeError, match="shutdown"):
+        adapter.search("c", vectors[:1], k=1)
+
+
+def test_policy_adapter_rejects_over_concurrency_limit():
+    """Calls beyond the concurrency limit wait, then are rejected."""
+    inner = _FlakyAdapter(delay_s=0.3)
+    adapter = PolicyAdapter(
+        inner, RetryPolicy(max_concurrency=1, queue_timeout_s=0.01, **_FAST)
+    )
+    vectors = _load(adapter)
+    holder = threading.Thread(target=adapter.search, args=("c", vectors[:1], 1))
+    holder.start()
+    time.sleep(0.05)
+    with pytest.raises(Rejected):
+        adapter.search("c", vectors[:1], k=1)
+    holder.join()
+
+    stats = adapter.stats()["search"]
+    assert stats["rejections"] == 1
+    assert stats["retries"] == 0
+    assert inner.searches == 1
+    # The slot is free again once the first call returns.
+    assert adapter.search("c", vectors[:1], k=1).ids[0, 0] == "0"
+
+
+def test_retry_policy_from_config():
+    """Unknown settings and operations are refused."""
+    policy = RetryPolicy.from_config({"timeout_s": 1.0, "timeouts": {"upsert": 5}})
+    assert policy.timeout_for("search") == 1.0
+    assert policy.timeout_for("upsert") == 5
+    with pytest.raises(ValueError):
+        RetryPolicy.from_config({"retries": 3})
+    with pytest.raises(ValueError):
+        RetryPolicy.from_config({"timeouts": {"count": 1.0}})
+
+
+class _SearchScenario:
+    name = "search"
+
+    def run(self, db, **kwargs):
+        vectors = _load(db)
+        return {"hits": len(db.query("c", vectors[0], k=2))}
+
+
+def test_runner_reports_policy_counters(tmp_path):
+    """The runner collects the counters of a policy anywhere in the chain."""
+    policy = PolicyAdapter(_FlakyAdapter(failures=1), RetryPolicy(**_FAST))
+    store = RunStore.create(tmp_path / "artifacts", {})
+    with TraceWriter(tmp_path / "trace") as writer:
+        adapter = RecordingAdapter(policy, writer)
+        assert find_policy(adapter) is policy
+        runner = Runner([adapter], [_SearchScenario()], store=store)
+        results = runner.run()
+    assert results["numpy"]["search"] == {"hits": 2}
+    assert runner.policy["numpy"]["search"]["search"]["retries"] == 1
+    stored = tmp_path / "artifacts" / "policy" / "numpy_search.json"
+    assert json.loads(stored.read_text()) == runner.policy["numpy"]["search"]
+    assert find_policy(NumpyAdapter()) is None
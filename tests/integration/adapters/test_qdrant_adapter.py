@@ -5,15 +5,24 @@ import pytest
 
 from vdbt.adapters.qdrant_adapter import QdrantAdapter
 from vdbt.config import settings
+from vdbt.metrics import exact_neighbors
+from vdbt.servers.qdrant_standin import QdrantStandIn
 
 
 @pytest.fixture(scope="module")
 def qdrant_adapter():
-    """Returns a QdrantAdapter instance, skipping if not reachable."""
+    """Returns a QdrantAdapter instance.
+
+    Falls back to the local stand-in server if Qdrant is not reachable.
+    """
     adapter = QdrantAdapter(url=settings.QDRANT_URL)
-    if not adapter.connect():
-        pytest.skip(f"Qdrant not reachable at {settings.QDRANT_URL}")
-    return adapter
+    if adapter.connect():
+        yield adapter
+        return
+    with QdrantStandIn() as server:
+        adapter = QdrantAdapter(url=server.url)
+        assert adapter.connect()
+        yield adapter
 
 
 def test_qdrant_adapter_smoke(qdrant_adapter: QdrantAdapter):
@@ -42,6 +51,11 @@ def test_qdrant_adapter_smoke(qdrant_adapter: QdrantAdapter):
         assert "distance" in result
         assert "metadata" in result
 
+    # Batched search
+    search_result = qdrant_adapter.search(collection_name, vectors[:2], k=3)
+    assert search_result.ids.shape == (2, 3)
+    assert search_result.field("i")[:, 0].tolist() == [0, 1]
+
     # Query with filter
     results_filtered = qdrant_adapter.query(
         collection_name, query_vector, k=5, filter={"label": 0}
@@ -57,3 +71,65 @@ def test_qdrant_adapter_smoke(qdrant_adapter: QdrantAdapter):
     # Drop collection
     qdrant_adapter.drop_collection(collection_name)
     assert qdrant_adapter.count(collection_name) == 0
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8", "binary"])
+def test_qdrant_adapter_reduced_dtypes(qdrant_adapter: QdrantAdapter, dtype: str):
+    """Quantized and half-precision collections accept writes and searches."""
+    collection_name = f"test_collection_qdrant_{dtype}"
+    vectors = np.random.default_rng(0).random((10, 8)).astype(np.float32)
+    qdrant_adapter.drop_collection(collection_name)
+    qdrant_adapter.create_collection(collection_name, 8, dtype=dtype)
+    qdrant_adapter.upsert(
+        collection_name, [str(i) for i in range(10)], vectors, [{}] * 10
+    )
+    assert qdrant_adapter.count(collection_name) == 10
+    assert qdrant_adapter.search(collection_name, vectors[:1], k=1).ids[0, 0] == "0"
+    qdrant_adapter.drop_collection(collection_name)
+
+
+def test_qdrant_adapter_compound_filters(qdrant_adapter: QdrantAdapter):
+    """Compound filters are translated to nested Qdrant filters."""
+    collection_name = "test_collection_qdrant_filters"
+    vectors = np.random.default_rng(0).random((60, 4)).astype(np.float32)
+    meta = [{"label": i % 3, "price": float(i)} for i in range(60)]
+    qdrant_adapter.drop_collection(collection_name)
+    qdrant_adapter.create_collection(collection_name, 4)
+    qdrant_adapter.upsert(collection_name, [str(i) for i in range(60)], vectors, meta)
+
+    query_filter = {
+        "label": [0, 1],
+        "$or": [{"price": {"lt": 10.0}}, {"price": {"gte": 50.0}}],
+    }
+    results = qdrant_adapter.query(
+        collection_name, vectors[:1], k=60, filter=query_filter
+    )
+    expected = {str(i) for i in range(60) if i % 3 != 2 and (i < 10 or i >= 50)}
+    assert {r["id"] for r in results} == expected
+    results = qdrant_adapter.query(
+        collection_name, vectors[:1], k=60, filter={"price": 3.0}
+    )
+    assert [r["id"] for r in results] == ["3"]
+    with pytest.raises(ValueError):
+        qdrant_adapter.query(collection_name, vectors[:1], k=5, filter={"$xor": []})
+    qdrant_adapter.drop_collection(collection_name)
+
+
+@pytest.mark.parametrize("metric", ["l2", "ip", "cosine"])
+def test_qdrant_adapter_metrics(qdrant_adapter: QdrantAdapter, metric: str):
+    """Hits are ranked in the collection's metric."""
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((40, 8)).astype(np.float32)
+    vectors *= rng.uniform(0.1, 10, size=(40, 1)).astype(np.float32)
+    queries = rng.standard_normal((5, 8)).astype(np.float32)
+    qdrant_adapter.drop_collection("metric")
+    qdrant_adapter.create_collection("metric", 8, metric=metric)
+    qdrant_adapter.upsert("metric", [str(i) for i in range(40)], vectors, [{}] * 40)
+
+    result = qdrant_adapter.search("metric", queries, k=3)
+    expected = exact_neighbors(vectors, queries, 3, metric=metric)
+    assert result.ids.astype(int).tolist() == expected.tolist()
+    qdrant_adapter.drop_collection("metric")
+
+    with pytest.raises(ValueError, match="metric"):
+        qdrant_adapter.create_collection("metric", 8, metric="hamming")
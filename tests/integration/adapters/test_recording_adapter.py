@@ -0,0 +1,35 @@
+"""Integration tests for the recording adapter wrapper."""
+
+import numpy as np
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.adapters.recording import RecordingAdapter
+from vdbt.trace import QueryTrace, TraceWriter
+
+
+def test_recording_adapter_records_searches(tmp_path):
+    """Searches and queries pass through unchanged and land in the trace."""
+    inner = NumpyAdapter()
+    vectors = np.random.default_rng(0).random((10, 4)).astype(np.float32)
+    with TraceWriter(tmp_path) as writer:
+        adapter = RecordingAdapter(inner, writer)
+        assert adapter.name == "numpy"
+        adapter.create_collection("c", 4)
+        adapter.upsert(
+            "c", [str(i) for i in range(10)], vectors, [{"i": i} for i in range(10)]
+        )
+        assert adapter.count("c") == 10
+
+        result = adapter.search("c", vectors[:2], k=3)
+        assert result.ids.tolist() == inner.search("c", vectors[:2], k=3).ids.tolist()
+        hits = adapter.query("c", vectors[2], k=1, filter={"i": 2})
+        assert hits[0]["id"] == "2"
+
+    trace = QueryTrace.load(tmp_path)
+    calls = trace.calls()
+    # The direct search of the inner adapter is not recorded.
+    assert len(calls) == 2
+    assert [call["k"] for call in calls] == [3, 1]
+    assert calls[1]["filter"] == {"i": 2}
+    assert np.array_equal(trace.vectors, vectors[:3])
+    assert np.all(trace.columns.columns["latency_s"] > 0)
@@ -0,0 +1,62 @@
+"""Integration tests for the cold start scenario."""
+
+import pytest
+
+from vdbt.adapters.faiss_adapter import FaissAdapter
+from vdbt.adapters.policy import PolicyAdapter
+from vdbt.scenarios.cold_start import ColdStartScenario
+
+
+@pytest.fixture
+def adapter():
+    """Returns a FaissAdapter instance."""
+    return FaissAdapter()
+
+
+def test_cold_start_scenario_smoke(adapter: FaissAdapter, tmp_path):
+    """Smoke test for the cold start scenario."""
+    scenario = ColdStartScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=4,
+        num_embeddings=200,
+        num_queries=5,
+        path=tmp_path / "index",
+        seed=42,
+    )
+
+    assert results["supported"] is True
+    assert results["disk_bytes"] > 200 * 4 * 4
+    for restart in ("cold", "warm"):
+        assert results[restart]["load_s"] > 0
+        assert (
+            results[restart]["time_to_first_query_s"]
+            >= results[restart]["first_query_s"]
+        )
+    assert (tmp_path / "index" / "index.faiss").exists()
+    assert adapter.count("cold_start") == 0
+
+
+def test_cold_start_scenario_through_wrapper(tmp_path):
+    """A wrapped persistent adapter still supports the scenario."""
+    results = ColdStartScenario().run(
+        db=PolicyAdapter(FaissAdapter()),
+        dim=4,
+        num_embeddings=200,
+        num_queries=5,
+        path=tmp_path / "index",
+        seed=42,
+    )
+    assert results["supported"] is True
+    assert results["cold"]["load_s"] > 0
+
+
+def test_cold_start_scenario_unsupported_adapter():
+    """Adapters without save/load are reported as unsupported."""
+
+    class InMemoryOnly:
+        name = "in_memory_only"
+
+    assert ColdStartScenario().run(db=InMemoryOnly(), dim=4, seed=42) == {
+        "supported": False
+    }
@@ -0,0 +1,48 @@
+"""Integration tests for the dtype sweep scenario."""
+
+from vdbt.adapters.faiss_adapter import FaissAdapter
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.scenarios.dtype_sweep import DtypeSweepScenario
+
+MEASUREMENT = {"warmup_count": 2, "min_samples": 10, "max_samples": 20}
+
+
+def test_dtype_sweep_scenario_smoke():
+    """Smaller types use less memory and float32 recall is exact."""
+    results = DtypeSweepScenario().run(
+        db=FaissAdapter(),
+        dims=[32, 64],
+        num_embeddings=500,
+        num_queries=10,
+        seed=42,
+        measurement=MEASUREMENT,
+    )
+
+    assert set(results) == {"32", "64"}
+    for dim, by_dtype in results.items():
+        assert set(by_dtype) == {"float32", "float16", "int8", "binary"}
+        assert by_dtype["float32"]["bytes_per_vector"] == int(dim) * 4
+        assert by_dtype["float16"]["bytes_per_vector"] == int(dim) * 2
+        assert by_dtype["int8"]["bytes_per_vector"] == int(dim)
+        assert by_dtype["binary"]["bytes_per_vector"] == int(dim) / 8
+        assert by_dtype["float32"]["recall@10"] == 1.0
+        assert by_dtype["float16"]["recall@10"] > 0.9
+        assert by_dtype["binary"]["recall@10"] < by_dtype["float32"]["recall@10"]
+        assert by_dtype["int8"]["ingest_vectors_per_s"] > 0
+
+
+def test_dtype_sweep_reports_unsupported_dtypes():
+    """Types the adapter cannot store are skipped rather than failing."""
+    results = DtypeSweepScenario().run(
+        db=NumpyAdapter(),
+        dims=[16],
+        dtypes=["float32", "int8"],
+        num_embeddings=100,
+        num_queries=5,
+        seed=0,
+        measurement=MEASUREMENT,
+    )
+
+    assert results["16"]["float32"]["supported"]
+    assert results["16"]["int8"]["supported"] is False
+    assert "int8" in results["16"]["int8"]["error"]
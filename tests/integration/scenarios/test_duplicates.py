@@ -0,0 +1,75 @@
+"""Integration tests for the duplicates scenario."""
+
+import pytest
+
+from vdbt.adapters.faiss_adapter import FaissAdapter
+from vdbt.scenarios.duplicates import DuplicateScenario
+
+
+@pytest.fixture
+def adapter():
+    """Returns a FaissAdapter instance."""
+    return FaissAdapter()
+
+
+def test_duplicates_scenario_smoke(adapter: FaissAdapter):
+    """Duplicates crowd the top-k, and deduplication restores recall."""
+    scenario = DuplicateScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=32,
+        num_embeddings=1000,
+        num_queries=20,
+        duplicate_ratios=[0.0, 1.0],
+        perturbations=[0.0, 0.01],
+        dedup=["hash", "lsh"],
+        seed=42,
+        measurement={"warmup_count": 2, "min_samples": 10, "max_samples": 20},
+    )
+
+    clean = results["0.0"]["0.0"]
+    assert clean["rows"] == 1000
+    assert clean["diversity"] == 1.0
+    assert clean["recall@10"] == 1.0
+
+    for perturbation in ("0.0", "0.01"):
+        crowded = results["1.0"][perturbation]
+        assert crowded["rows"] == 2000
+        assert crowded["distinct_ids"] == 10
+        assert crowded["distinct_sources"] < 10
+        assert crowded["recall@10"] < clean["recall@10"]
+        assert "p99" in crowded["query_latency_s"]
+
+        lsh = crowded["dedup"]["lsh"]
+        assert lsh["rows"] == 1000
+        assert lsh["false_removals"] == 0
+        assert lsh["recall@10"] == 1.0
+        assert lsh["dedup_rows_per_s"] > 0
+
+    # Hashing only catches exact duplicates.
+    assert results["1.0"]["0.0"]["dedup"]["hash"]["removed_rows"] == 1000
+    assert results["1.0"]["0.01"]["dedup"]["hash"]["missed_duplicates"] == 1000
+
+
+def test_duplicates_scenario_rejects_unknown_dedup(adapter: FaissAdapter):
+    """Unknown dedup methods fail before any data is loaded."""
+    with pytest.raises(ValueError, match="dedup"):
+        DuplicateScenario().run(
+            db=adapter, dim=8, num_embeddings=10, seed=0, dedup=["minhash"]
+        )
+
+
+def test_duplicates_scenario_truth_uses_collection_metric(adapter: FaissAdapter):
+    """Clean collections reach full recall in a non-L2 metric too."""
+    results = DuplicateScenario().run(
+        db=adapter,
+        dim=16,
+        num_embeddings=300,
+        num_queries=10,
+        duplicate_ratios=[0.0],
+        perturbations=[0.0],
+        metric="cosine",
+        seed=42,
+        measurement={"warmup_count": 1, "min_samples": 5, "max_samples": 10},
+    )
+    assert results["0.0"]["0.0"]["recall@10"] == 1.0
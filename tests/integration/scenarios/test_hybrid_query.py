@@ -21,6 +21,47 @@ def test_hybrid_query_scenario_smoke(adapter: FaissAdapter):
         num_embeddings=100,
         keyword_ratio=0.5,
         seed=42,
+        compare_payload_index=True,
     )
 
     assert "recall@10" in results
+    assert set(results["filters"]) == {"eq", "in", "range", "and", "or"}
+    for kind, metrics in results["filters"].items():
+        assert 0 < metrics["selectivity"] <= 1
+        # FAISS searches exactly, so filtered results match the ground truth.
+        assert metrics["recall@10"] == 1.0
+        assert results["indexed_filters"][kind]["queries"] == metrics["queries"]
+    assert set(results["index_speedup"]) == set(results["filters"])
+
+
+def test_hybrid_query_skips_payload_index_comparison_by_default(
+    adapter: FaissAdapter,
+):
+    """Adapters without payload indexes skip the indexed pass by default."""
+    results = HybridQueryScenario().run(
+        db=adapter, dim=4, num_embeddings=100, num_filtered_queries=10, seed=42
+    )
+    assert "indexed_filters" not in results
+    assert "index_speedup" not in results
+
+
+@pytest.mark.parametrize("metric", ["l2", "cosine"])
+def test_hybrid_query_filtered_truth_uses_collection_metric(metric: str):
+    """Exact filtered search scores full recall in the collection's metric."""
+    from vdbt.adapters.qdrant_adapter import QdrantAdapter
+    from vdbt.servers.qdrant_standin import QdrantStandIn
+
+    with QdrantStandIn() as server:
+        results = HybridQueryScenario().run(
+            db=QdrantAdapter(url=server.url),
+            dim=8,
+            num_embeddings=200,
+            num_filtered_queries=20,
+            metric=metric,
+            seed=42,
+        )
+    for metrics in results["filters"].values():
+        assert metrics["recall@10"] == 1.0
+    # Qdrant builds payload indexes, so the comparison runs by default.
+    for metrics in results["indexed_filters"].values():
+        assert metrics["recall@10"] == 1.0
@@ -0,0 +1,59 @@
+"""Integration tests for the ingest throughput scenario."""
+
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.scenarios.ingest_throughput import IngestThroughputScenario
+
+
+@pytest.fixture
+def adapter():
+    """Returns a NumpyAdapter instance."""
+    return NumpyAdapter()
+
+
+def test_ingest_throughput_scenario_smoke(adapter: NumpyAdapter):
+    """Smoke test for the ingest throughput scenario."""
+    scenario = IngestThroughputScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=4,
+        num_embeddings=500,
+        batch_sizes=[50, 500],
+        writers=[1, 3],
+        waits=[True],
+        seed=42,
+    )
+
+    assert len(results) == 4
+    result = results["batch=50,writers=3,wait=True"]
+    assert result["points"] == 500
+    assert result["points_per_s"] > 0
+    assert result["failed_batches"] == 0
+    assert result["probes"] == 10
+    assert result["probe_timeouts"] == 0
+    assert result["time_to_searchable_s"]["p50"] > 0
+    assert adapter.count("ingest_throughput") == 0
+
+
+def test_ingest_throughput_scenario_without_wait():
+    """Unacknowledged writes to a Qdrant stand-in still become searchable."""
+    from vdbt.adapters.qdrant_adapter import QdrantAdapter
+    from vdbt.servers.qdrant_standin import QdrantStandIn
+
+    with QdrantStandIn() as server:
+        scenario = IngestThroughputScenario()
+        results = scenario.run(
+            db=QdrantAdapter(url=server.url),
+            dim=4,
+            num_embeddings=200,
+            batch_sizes=[50],
+            writers=[2],
+            waits=[False],
+            seed=42,
+        )
+
+    result = results["batch=50,writers=2,wait=False"]
+    assert result["failed_batches"] == 0
+    assert result["probes"] == 4
+    assert result["probe_timeouts"] == 0
@@ -0,0 +1,42 @@
+"""Integration tests for the multi-tenant scenario."""
+
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.scenarios.multi_tenant import MultiTenantScenario
+
+
+@pytest.fixture
+def adapter():
+    """Returns a NumpyAdapter instance."""
+    return NumpyAdapter(initial_capacity=16)
+
+
+def test_multi_tenant_scenario_smoke(adapter: NumpyAdapter):
+    """Smoke test for the multi-tenant scenario."""
+    scenario = MultiTenantScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=4,
+        num_tenants=[20],
+        total_vectors=500,
+        num_queries=50,
+        report_tenants=3,
+        seed=42,
+    )
+
+    collections = results["20"]["collections"]
+    shared = results["20"]["filter"]
+    assert collections["num_collections"] == 20
+    assert shared["num_collections"] == 1
+    assert collections["total_vectors"] == shared["total_vectors"]
+    assert collections["collections_per_s"] > 0
+    assert shared["collections_per_s"] is None
+    assert collections["memory_bytes"] > 0
+    assert shared["memory_bytes"] > 0
+    assert list(collections["tenants"]) == ["0", "1", "2"]
+    # The head tenant is the largest and gets the most traffic.
+    head = collections["tenants"]["0"]
+    assert head["size"] >= collections["tenants"]["1"]["size"]
+    assert head["queries"] > 0
+    assert adapter.count("multi_tenant_0") == 0
@@ -3,6 +3,7 @@
 import pytest
 
 from vdbt.adapters.faiss_adapter import FaissAdapter
+from vdbt.adapters.numpy_adapter import NumpyAdapter
 from vdbt.scenarios.noise_injection import NoiseInjectionScenario
 
 
@@ -30,3 +31,82 @@ def test_noise_injection_scenario_smoke(adapter: FaissAdapter):
     assert "recall@10" in results["0.8"]
     # Recall should be lower with more noise
     assert results["0.8"]["recall@10"] < results["0.0"]["recall@10"]
+
+
+def test_noise_injection_incremental_upserts_only_new_noise():
+    """Incremental mode upserts only added noisy rows and matches exact search."""
+    adapter = NumpyAdapter()
+    scenario = NoiseInjectionScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=16,
+        num_embeddings=1000,
+        noise_ratios=[0.5, 0.0, 0.2],
+        mode="incremental",
+        seed=42,
+    )
+
+    assert list(results) == ["0.0", "0.2", "0.5"]
+    assert results["0.0"]["upserted_rows"] == 1000
+    assert results["0.2"]["upserted_rows"] == 200
+    assert results["0.5"]["upserted_rows"] == 300
+    assert results["0.5"]["noisy_rows"] == 500
+    # Exact search returns the exact neighbours of whatever it holds.
+    for result in results.values():
+        assert result["neighbor_recall@10"] == pytest.approx(1.0)
+        assert result["stale_rows"] == 0
+    assert results["0.5"]["recall@10"] < results["0.0"]["recall@10"]
+    assert adapter.count("noise_injection") == 0
+
+
+def test_noise_injection_incremental_unsupported_on_append(adapter: FaissAdapter):
+    """Adapters that append on upsert do not support incremental mode."""
+    scenario = NoiseInjectionScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=16,
+        num_embeddings=500,
+        noise_ratios=[0.0, 0.4],
+        mode="incremental",
+        seed=42,
+    )
+
+    assert results["supported"] is False
+    assert results["stale_rows"] == 200
+    assert "recall@10" not in results
+    assert adapter.count("noise_injection") == 0
+
+
+def test_noise_injection_rebuild_mode(adapter: FaissAdapter):
+    """Rebuild mode ingests every row for every ratio."""
+    scenario = NoiseInjectionScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=16,
+        num_embeddings=500,
+        noise_ratios=[0.0, 0.4],
+        mode="rebuild",
+        seed=42,
+    )
+
+    assert results["0.4"]["upserted_rows"] == 500
+    assert results["0.4"]["noisy_rows"] == 200
+    assert results["0.4"]["neighbor_recall@10"] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("metric", ["l2", "cosine"])
+def test_noise_injection_truth_uses_collection_metric(metric: str):
+    """Exact search in either metric matches ground truth in that metric."""
+    from vdbt.adapters.qdrant_adapter import QdrantAdapter
+    from vdbt.servers.qdrant_standin import QdrantStandIn
+
+    with QdrantStandIn() as server:
+        results = NoiseInjectionScenario().run(
+            db=QdrantAdapter(url=server.url),
+            dim=16,
+            num_embeddings=300,
+            noise_ratios=[0.5],
+            metric=metric,
+            seed=42,
+        )
+    assert results["0.5"]["neighbor_recall@10"] == pytest.approx(1.0)
@@ -0,0 +1,36 @@
+"""Integration tests for the query cache scenario."""
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.scenarios.query_cache import QueryCacheScenario
+
+
+def test_query_cache_scenario_smoke():
+    """Repeated queries hit; without invalidation, writes make hits stale."""
+    results = QueryCacheScenario().run(
+        db=NumpyAdapter(),
+        dim=16,
+        seed=42,
+        num_embeddings=500,
+        num_distinct=20,
+        num_queries=200,
+        caches=["exact-lru", "approximate-lfu"],
+        capacity=50,
+        write_every=20,
+        update_ratio=0.05,
+        delete_ratio=0.05,
+    )
+
+    assert set(results) == {"exact-lru", "approximate-lfu"}
+    for result in results.values():
+        assert result["hit_rate"] > 0.8
+        assert result["cached_recall@10"] == 1.0
+        assert result["cached_latency_s"]["p50"] > 0
+        assert result["uncached_latency_s"]["p50"] > 0
+
+        storm = result["storm"]
+        assert storm["invalidate"]["writes"] == 9
+        assert storm["invalidate"]["stale_hits"] == 0
+        assert storm["invalidate"]["invalidations"] > 0
+        assert storm["no_invalidate"]["stale_hits"] > 0
+        assert storm["no_invalidate"]["outdated_hits"] > 0
+        assert storm["no_invalidate"]["hit_rate"] > storm["invalidate"]["hit_rate"]
@@ -0,0 +1,123 @@
+"""Integration tests for the query load scenario."""
+
+import socket
+import threading
+import time
+from multiprocessing.connection import Client
+
+import numpy as np
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.loadgen import AUTHKEY_ENV, merge_reports, run_distributed
+from vdbt.scenarios.query_load import QueryLoadScenario
+from vdbt.utils.histogram import LatencyHistogram
+
+
+def test_query_load_scenario_in_process():
+    """In-process adapters run one generator and cannot use more workers."""
+    adapter = NumpyAdapter()
+    results = QueryLoadScenario().run(
+        db=adapter,
+        dim=4,
+        num_embeddings=200,
+        num_queries=50,
+        workers=[1, 2],
+        duration_s=5.0,
+        max_queries=100,
+        seed=42,
+    )
+
+    assert results["1"]["queries"] == 100
+    assert results["1"]["latency_s"]["count"] == 100
+    assert results["1"]["qps"] > 0
+    assert results["2"] == {"supported": False}
+    assert adapter.count("query_load") == 0
+
+
+def test_query_load_scenario_with_workers():
+    """Worker processes query a Qdrant stand-in and their reports merge."""
+    from vdbt.adapters.qdrant_adapter import QdrantAdapter
+    from vdbt.servers.qdrant_standin import QdrantStandIn
+
+    with QdrantStandIn() as server:
+        results = QueryLoadScenario().run(
+            db=QdrantAdapter(url=server.url),
+            dim=4,
+            num_embeddings=200,
+            num_queries=50,
+            workers=2,
+            duration_s=5.0,
+            max_queries=30,
+            seed=42,
+        )
+
+    result = results["2"]
+    assert result["workers"] == 2
+    assert result["queries"] == 60
+    assert result["errors"] == 0
+    assert result["latency_s"]["count"] == 60
+    assert [w["queries"] for w in result["per_worker"]] == [30, 30]
+
+
+def test_run_distributed_cleans_up_when_workers_do_not_connect(monkeypatch):
+    """A connect timeout closes the listener and the workers that connected."""
+    monkeypatch.setenv(AUTHKEY_ENV, "secret")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    clients = []
+
+    def connect() -> None:
+        for _ in range(50):
+            try:
+                clients.append(Client(("127.0.0.1", port), authkey=b"secret"))
+                return
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+
+    thread = threading.Thread(target=connect)
+    thread.start()
+    with pytest.raises(TimeoutError, match="Only 1 of 2"):
+        run_distributed(
+            NumpyAdapter(),
+            "c",
+            np.zeros((4, 4), dtype=np.float32),
+            k=1,
+            workers=2,
+            duration_s=1.0,
+            port=port,
+            spawn=False,
+            connect_timeout_s=1.0,
+        )
+    thread.join()
+
+    with pytest.raises(EOFError):
+        clients[0].recv()
+    with pytest.raises(ConnectionRefusedError):
+        socket.create_connection(("127.0.0.1", port), timeout=1)
+
+
+def test_merge_reports_is_exact():
+    """Merged histograms count every latency of every worker."""
+    reports = []
+    for i in range(3):
+        histogram = LatencyHistogram()
+        histogram.record_many([0.001 * (i + 1)] * 10)
+        reports.append(
+            {
+                "histogram": histogram.to_dict(),
+                "queries": 10,
+                "errors": i,
+                "started": 100.0 + i,
+                "finished": 104.0,
+            }
+        )
+
+    merged = merge_reports(reports)
+    assert merged["queries"] == 30
+    assert merged["errors"] == 3
+    assert merged["elapsed_s"] == 4.0
+    assert merged["qps"] == 7.5
+    assert merged["latency_s"]["count"] == 30
+    assert merged["latency_s"]["max"] == 0.003
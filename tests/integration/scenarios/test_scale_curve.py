@@ -1,5 +1,6 @@
 """Integration tests for the scale curve scenario."""
 
+import numpy as np
 import pytest
 
 from vdbt.adapters.faiss_adapter import FaissAdapter
@@ -28,3 +29,32 @@ def test_scale_curve_scenario_smoke(adapter: FaissAdapter):
         assert "index_time_s" in results[str(scale)]
         assert "memory_bytes" in results[str(scale)]
         assert "query_latency_s" in results[str(scale)]
+        assert results[str(scale)]["query_sampling"]["samples"] > 0
+
+
+def test_scale_curve_scenario_with_dataset(adapter: FaissAdapter, tmp_path):
+    """A dataset reference replaces synthetic data and adds recall."""
+    rng = np.random.default_rng(0)
+    base = rng.random((300, 8)).astype(np.float32)
+    queries = rng.random((5, 8)).astype(np.float32)
+    distances = ((queries[:, None, :] - base[None, :, :]) ** 2).sum(axis=2)
+    neighbors = np.argsort(distances, axis=1)[:, :10].astype(np.int32)
+    for name, array in [("base", base), ("query", queries), ("gt", neighbors)]:
+        dims = np.full((len(array), 1), array.shape[1], dtype="<i4")
+        path = tmp_path / f"{name}.{'ivecs' if name == 'gt' else 'fvecs'}"
+        np.hstack([dims.view(np.uint8), array.view(np.uint8)]).tofile(path)
+
+    scenario = ScaleCurveScenario()
+    results = scenario.run(
+        db=adapter,
+        dataset={
+            "base": tmp_path / "base.fvecs",
+            "queries": tmp_path / "query.fvecs",
+            "neighbors": tmp_path / "gt.ivecs",
+        },
+        scales=[100, 300],
+        batch_size=64,
+    )
+
+    assert "recall@10" not in results["100"]
+    assert results["300"]["recall@10"] == 1.0
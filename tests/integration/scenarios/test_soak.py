@@ -0,0 +1,45 @@
+"""Integration tests for the soak scenario."""
+
+import json
+
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.scenarios.soak import SoakScenario
+
+
+@pytest.fixture
+def adapter():
+    """Returns a NumpyAdapter instance."""
+    return NumpyAdapter()
+
+
+def test_soak_scenario_smoke(adapter: NumpyAdapter, tmp_path):
+    """Smoke test for the soak scenario."""
+    log_path = tmp_path / "soak.jsonl"
+    scenario = SoakScenario()
+    results = scenario.run(
+        db=adapter,
+        dim=4,
+        num_embeddings=200,
+        duration_s=1.0,
+        window_s=0.25,
+        write_batch_size=10,
+        delete_batch_size=10,
+        max_windows=3,
+        log_path=log_path,
+        seed=42,
+    )
+
+    assert len(results["windows"]) == 3
+    logged = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert len(logged) >= 4
+    assert logged[-1] == results["windows"][-1]
+    assert results["latency_s"]["query"]["count"] > 0
+    assert results["throughput_ops_s"] > 0
+    assert set(results["flags"]) == {
+        "memory_leak",
+        "latency_drift",
+        "throughput_degradation",
+    }
+    assert "rss_bytes" in results["trends"]
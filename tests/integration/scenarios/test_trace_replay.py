@@ -0,0 +1,84 @@
+"""Integration tests for the trace replay scenario."""
+
+import time
+
+import numpy as np
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.scenarios.trace_replay import TraceReplayScenario
+from vdbt.trace import TraceWriter
+
+
+@pytest.fixture
+def trace_dir(tmp_path):
+    """A trace of 20 single-vector calls, 50 ms apart."""
+    vectors = np.random.default_rng(1).random((20, 8)).astype(np.float32)
+    with TraceWriter(tmp_path) as writer:
+        for i, vector in enumerate(vectors):
+            filter = {"i": i} if i % 2 else None
+            writer.record("live", vector, 5, filter, started=i * 0.05, latency_s=0.001)
+    return tmp_path
+
+
+def test_trace_replay_original_timing(trace_dir):
+    """Original timing takes as long as the trace, divided by the speed."""
+    start = time.perf_counter()
+    results = TraceReplayScenario().run(
+        db=NumpyAdapter(),
+        trace=str(trace_dir),
+        replayers=[1, 2],
+        speed=2.0,
+        num_embeddings=100,
+        seed=0,
+    )
+
+    assert set(results) == {"1", "2"}
+    for result in results.values():
+        assert result["queries"] == result["vectors"] == 20
+        assert result["errors"] == 0
+        assert result["elapsed_s"] >= 0.95 / 2.0 * 0.9
+        assert result["trace_duration_s"] == pytest.approx(0.95)
+        assert result["recorded_latency_s"]["p50"] == pytest.approx(0.001)
+    assert results["2"]["workers"] == 2
+    assert time.perf_counter() - start < 5
+
+
+def test_trace_replay_max_speed_against_recorded_collections(trace_dir):
+    """Max timing sends back to back to the recorded collection."""
+    adapter = NumpyAdapter()
+    adapter.create_collection("live", 8)
+    vectors = np.random.default_rng(2).random((50, 8)).astype(np.float32)
+    adapter.upsert(
+        "live", [str(i) for i in range(50)], vectors, [{"i": i} for i in range(50)]
+    )
+
+    results = TraceReplayScenario().run(
+        db=adapter,
+        trace=str(trace_dir),
+        timing="max",
+        use_recorded_collections=True,
+        seed=0,
+    )
+
+    result = results["1"]
+    assert result["queries"] == 20
+    assert result["speed"] is None
+    assert result["elapsed_s"] < 0.95
+    assert adapter.count("live") == 50
+
+
+def test_trace_replay_counts_schedule_lag_as_latency(trace_dir):
+    """A paced replayer that falls behind reports the delay as latency."""
+
+    class SlowAdapter(NumpyAdapter):
+        def search(self, name, vectors, k, filter=None):
+            time.sleep(0.1)
+            return super().search(name, vectors, k, filter)
+
+    result = TraceReplayScenario().run(
+        db=SlowAdapter(), trace=str(trace_dir), num_embeddings=100, seed=0
+    )["1"]
+    # 20 calls of 100 ms fall about 1 s behind a 0.95 s schedule.
+    assert result["max_lag_s"] > 0.5
+    assert result["latency_s"]["max"] > 0.5
@@ -0,0 +1,67 @@
+"""Integration tests for the traffic shape scenario."""
+
+import numpy as np
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.scenarios.traffic_shape import TrafficShapeScenario
+
+PROFILE = {
+    "shape": "step",
+    "base_qps": 20,
+    "burst_qps": 200,
+    "burst_duration_s": 1,
+    "burst_start_s": 1,
+}
+
+
+class FailingAdapter(NumpyAdapter):
+    """A NumPy adapter whose searches always fail."""
+
+    def search(self, *args, **kwargs):
+        raise RuntimeError("unavailable")
+
+
+def test_traffic_shape_scenario_smoke():
+    """Every scheduled query lands in a window, and the burst is found."""
+    results = TrafficShapeScenario().run(
+        db=NumpyAdapter(),
+        dim=16,
+        num_embeddings=1000,
+        num_queries=50,
+        duration_s=3,
+        window_s=0.5,
+        concurrency=4,
+        profile=PROFILE,
+        seed=42,
+    )
+
+    assert results["scheduled"] == 20 + 200 + 20
+    windows = results["windows"]
+    assert len(windows) == 6
+    assert sum(w["scheduled"] for w in windows) == results["scheduled"]
+    assert results["completed"] + results["timeouts"] == results["scheduled"]
+    assert results["errors"] == 0
+    assert np.allclose([w["offered_qps"] for w in windows], [20, 20, 200, 200, 20, 20])
+
+    bursts = results["bursts"]["bursts"]
+    assert len(bursts) == 1
+    assert (bursts[0]["start_s"], bursts[0]["end_s"]) == (1.0, 2.0)
+    assert bursts[0]["peak_offered_qps"] == 200
+    assert results["bursts"]["baseline_p99_s"] > 0
+
+
+def test_traffic_shape_scenario_counts_errors():
+    """Failed queries are counted per window instead of aborting the run."""
+    results = TrafficShapeScenario().run(
+        db=FailingAdapter(),
+        dim=8,
+        num_embeddings=10,
+        duration_s=1,
+        profile={"shape": "sine", "mean_qps": 20, "amplitude_qps": 0, "period_s": 1},
+        seed=0,
+    )
+
+    assert results["errors"] == results["scheduled"] == 20
+    assert results["completed"] == 0
+    assert results["windows"][0]["errors"] == 20
+    assert results["bursts"] == {"baseline_p99_s": None, "bursts": []}
@@ -0,0 +1,84 @@
+"""Integration tests for the local Qdrant stand-in server."""
+
+import time
+
+import httpx
+import numpy as np
+import pytest
+
+from vdbt.adapters.qdrant_adapter import QdrantAdapter
+from vdbt.servers.qdrant_standin import QdrantStandIn
+
+
+@pytest.fixture
+def server():
+    """Returns a running stand-in server."""
+    with QdrantStandIn() as standin:
+        yield standin
+
+
+def test_standin_matches_reference_results(server: QdrantStandIn):
+    """Cosine search through the client returns the exact nearest neighbours."""
+    adapter = QdrantAdapter(url=server.url)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((50, 8)).astype(np.float32)
+    adapter.create_collection("c", 8)
+    adapter.upsert("c", [str(i) for i in range(50)], vectors, [{}] * 50)
+
+    query = rng.standard_normal((1, 8)).astype(np.float32)
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normed @ query[0]))[:5]
+
+    results = adapter.query("c", query, k=5)
+    assert [r["id"] for r in results] == [str(i) for i in expected]
+
+
+def test_standin_reports_errors_like_qdrant(server: QdrantStandIn):
+    """Missing collections and invalid point ids are rejected."""
+    response = httpx.post(f"{server.url}/collections/missing/points/count", json={})
+    assert response.status_code == 404
+    assert "doesn't exist" in response.json()["status"]["error"]
+
+    httpx.put(
+        f"{server.url}/collections/c",
+        json={"vectors": {"size": 2, "distance": "Dot"}},
+    )
+    response = httpx.put(
+        f"{server.url}/collections/c/points",
+        json={"points": [{"id": "not-a-uuid", "vector": [0.0, 1.0]}]},
+    )
+    assert response.status_code == 400
+
+
+def test_standin_injects_latency():
+    """Every request is delayed by the configured latency."""
+    with QdrantStandIn(latency_s=0.02, jitter_s=0.01) as server:
+        start = time.perf_counter()
+        response = httpx.get(f"{server.url}/collections")
+        elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    assert elapsed >= 0.02
+    assert response.json()["time"] < 0.02
+
+
+def test_standin_payload_indexes_and_must_not(server: QdrantStandIn):
+    """Payload indexes are recorded and must_not clauses exclude matches."""
+    adapter = QdrantAdapter(url=server.url)
+    vectors = np.random.default_rng(0).random((20, 4)).astype(np.float32)
+    adapter.create_collection(
+        "c", 4, payload_indexes={"label": "integer", "price": "float"}
+    )
+    meta = [{"label": i % 4, "price": float(i)} for i in range(20)]
+    adapter.upsert("c", [str(i) for i in range(20)], vectors, meta)
+    assert server.engine._collections["c"]["payload_schema"] == {
+        "label": "integer",
+        "price": "float",
+    }
+
+    query_filter = {"price": {"lt": 10.0}, "$not": [{"label": [0, 1]}]}
+    results = adapter.query("c", vectors[:1], k=20, filter=query_filter)
+    assert {r["id"] for r in results} == {"2", "3", "6", "7"}
+
+    with pytest.raises(ValueError):
+        adapter.create_collection("d", 4, payload_indexes={"label": "number"})
@@ -0,0 +1,69 @@
+"""Unit tests for the adapter base types."""
+
+import numpy as np
+
+from vdbt.adapters.base import (
+    PersistentVectorDB,
+    QueryResult,
+    RemoteVectorDB,
+    VectorDBWrapper,
+    unwrap,
+)
+
+
+def _result() -> QueryResult:
+    ids = np.array([["a", "b"], ["c", None]], dtype=object)
+    distances = np.array([[0.1, 0.2], [0.3, np.nan]], dtype=np.float32)
+    payloads = {"a": {"label": 1}, "b": {"label": 2}, "c": {}}
+    return QueryResult(ids, distances, lambda i, j: payloads[ids[i, j]])
+
+
+def test_query_result_valid_and_field():
+    """Padding slots are invalid and fields resolve per hit."""
+    result = _result()
+    assert len(result) == 2
+    assert result.valid.tolist() == [[True, True], [True, False]]
+    assert result.field("label").tolist() == [[1, 2], [None, None]]
+    assert result.metadata(0, 1) == {"label": 2}
+
+
+def test_query_result_to_dicts():
+    """The legacy view flattens hits and skips padding."""
+    dicts = _result().to_dicts()
+    assert [d["id"] for d in dicts] == ["a", "b", "c"]
+    assert dicts[0]["distance"] == np.float32(0.1)
+    assert dicts[0]["metadata"] == {"label": 1}
+
+
+class _Persistent:
+    name = "persistent"
+
+    def save(self, name, path):
+        self.saved = (name, path)
+
+    def load(self, name, path, mmap=True):
+        self.loaded = (name, path, mmap)
+
+
+class _Remote:
+    name = "remote"
+
+    def connection_kwargs(self):
+        return {"url": "http://localhost:6333"}
+
+
+def test_wrapper_forwards_only_protocols_of_wrapped_adapter():
+    """Wrappers implement persistence and remoteness exactly when the adapter does."""
+    persistent = VectorDBWrapper(VectorDBWrapper(_Persistent()))
+    assert isinstance(persistent, PersistentVectorDB)
+    assert not isinstance(persistent, RemoteVectorDB)
+    persistent.save("c", "dir")
+    persistent.load("c", "dir", mmap=False)
+    assert unwrap(persistent).saved == ("c", "dir")
+    assert unwrap(persistent).loaded == ("c", "dir", False)
+
+    remote = VectorDBWrapper(db=_Remote())
+    assert isinstance(remote, RemoteVectorDB)
+    assert not isinstance(remote, PersistentVectorDB)
+    assert remote.connection_kwargs() == {"url": "http://localhost:6333"}
+    assert type(unwrap(remote)) is _Remote
@@ -0,0 +1,132 @@
+"""Unit tests for checkpointed run storage."""
+
+import json
+
+import numpy as np
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.artifacts import RunStore, dumps, job_id, write_atomic
+from vdbt.runner import Runner
+
+
+def test_write_atomic_and_dumps(tmp_path):
+    """Results with NumPy values are written whole, with no temporary files."""
+    path = tmp_path / "nested" / "result.json"
+    write_atomic(path, dumps({"p50": np.float64(0.5), "n": np.int64(3)}))
+    assert json.loads(path.read_text()) == {"p50": 0.5, "n": 3}
+    assert [p.name for p in path.parent.iterdir()] == ["result.json"]
+
+
+def test_dumps_rejects_unserializable_values():
+    """Values with no JSON form raise instead of being stored as strings."""
+    assert json.loads(dumps({"ids": (1, 2)})) == {"ids": [1, 2]}
+    with pytest.raises(TypeError, match="object"):
+        dumps({"value": object()})
+
+
+def test_run_store_default_ids_are_unique(tmp_path):
+    """Runs created in the same second get their own directories."""
+    first = RunStore.create(tmp_path, {})
+    second = RunStore.create(tmp_path, {})
+    assert first.directory != second.directory
+
+
+def test_run_store_round_trip(tmp_path):
+    """Completed jobs survive reopening the run; failed jobs do not count."""
+    store = RunStore.create(tmp_path, {"dim": 4}, run_id="run-1")
+    store.save("a", {"label": "all"}, {"x": 1})
+    store.save("b", {"label": "all"}, {"error": "boom"}, error="boom")
+
+    reopened = RunStore.open(tmp_path, "run-1")
+    assert reopened.config == {"dim": 4}
+    assert reopened.completed("a") == {"x": 1}
+    assert reopened.completed("b") is None
+    assert reopened.completed("c") is None
+
+    with pytest.raises(FileExistsError):
+        RunStore.create(tmp_path, {}, run_id="run-1")
+    with pytest.raises(FileNotFoundError):
+        RunStore.open(tmp_path, "run-2")
+
+
+def test_job_id_depends_on_params():
+    """Jobs with different parameters get different ids."""
+    assert job_id("numpy", "s", {"dim": 4}) == job_id("numpy", "s", {"dim": 4})
+    assert job_id("numpy", "s", {"dim": 4}) != job_id("numpy", "s", {"dim": 8})
+
+
+class _SweepScenario:
+    name = "sweep"
+    sweep = "sizes"
+
+    def __init__(self) -> None:
+        self.calls: list = []
+        self.fail = {3}
+
+    def run(self, db, **kwargs):
+        (size,) = kwargs["sizes"]
+        self.calls.append(size)
+        if size in self.fail:
+            raise RuntimeError("crashed")
+        return {str(size): {"dim": kwargs["dim"]}}
+
+
+def test_runner_resume_skips_completed_jobs(tmp_path):
+    """A resumed run only reruns jobs that did not complete."""
+    config = {"dim": 4, "sweep": {"sizes": [1, 2, 3]}, "other": {"dim": 9}}
+    scenario = _SweepScenario()
+    store = RunStore.create(tmp_path, config, run_id="run")
+    results = Runner([NumpyAdapter()], [scenario], store=store).run(**config)
+    assert scenario.calls == [1, 2, 3]
+    assert results["numpy"]["sweep"]["1"] == {"dim": 4}
+    assert results["numpy"]["sweep"]["3"] == {"error": "crashed"}
+
+    scenario.calls.clear()
+    scenario.fail.clear()
+    store = RunStore.open(tmp_path, "run")
+    results = Runner([NumpyAdapter()], [scenario], store=store).run(**store.config)
+    assert scenario.calls == [3]
+    assert results["numpy"]["sweep"] == {str(s): {"dim": 4} for s in (1, 2, 3)}
+
+    metrics = json.loads((tmp_path / "metrics" / "numpy_sweep.json").read_text())
+    assert metrics == results["numpy"]["sweep"]
+
+
+def test_runner_sweep_can_depend_on_params():
+    """A `sweep` method decides per run whether to split into jobs."""
+    from vdbt.scenarios.noise_injection import NoiseInjectionScenario
+
+    scenario = NoiseInjectionScenario()
+    params = {"noise_ratios": [0.0, 0.5]}
+    assert len(Runner._jobs(scenario, params)) == 2
+    assert len(Runner._jobs(scenario, {**params, "mode": "incremental"})) == 1
+
+
+class _SearchScenario:
+    name = "search"
+
+    def run(self, db, **kwargs):
+        db.create_collection("c", 4)
+        vectors = np.random.default_rng(0).random((10, 4)).astype(np.float32)
+        db.upsert("c", [str(i) for i in range(10)], vectors, [{}] * 10)
+        db.search("c", vectors[:1], k=3)
+        return {"ok": True}
+
+
+def test_runner_writes_spans_only_when_tracing(tmp_path):
+    """Span summaries are opt-in and stored next to the metrics."""
+    store = RunStore.create(tmp_path, {}, run_id="plain")
+    runner = Runner([NumpyAdapter()], [_SearchScenario()], store=store)
+    runner.run()
+    assert runner.spans == {"numpy": {}}
+    assert not (tmp_path / "spans").exists()
+
+    store = RunStore.create(tmp_path, {}, run_id="traced")
+    runner = Runner(
+        [NumpyAdapter()], [_SearchScenario()], store=store, trace_spans=True
+    )
+    runner.run()
+    spans = json.loads((tmp_path / "spans" / "numpy_search.json").read_text())
+    assert spans == runner.spans["numpy"]["search"]
+    assert spans["search"]["count"] == 1
@@ -0,0 +1,19 @@
+"""Unit tests for the command-line interface."""
+
+import sys
+
+import pytest
+import typer
+
+from vdbt import cli
+
+
+def test_missing_optional_backend_only_fails_its_adapter(monkeypatch, capsys):
+    """Without hnswlib, other adapters load and hnswlib explains the extra."""
+    monkeypatch.setitem(sys.modules, "hnswlib", None)
+    monkeypatch.delitem(sys.modules, "vdbt.adapters.hnswlib_adapter", raising=False)
+
+    assert cli._adapter_class("numpy").name == "numpy"
+    with pytest.raises(typer.Exit):
+        cli._adapter_class("hnswlib")
+    assert "vectordb-stress-tester[hnswlib]" in capsys.readouterr().out
@@ -0,0 +1,55 @@
+"""Unit tests for the filter language."""
+
+import numpy as np
+import pytest
+
+from vdbt.filters import filter_mask, filter_predicate, validate_filter
+
+_COLUMNS = {
+    "label": np.array([0, 1, 2, 1, 0]),
+    "price": np.array([1.0, 5.0, 10.0, 20.0, 50.0]),
+    "tag": np.array(["a", None, "b", "a", None], dtype=object),
+}
+_ROWS = [
+    {key: values[i] for key, values in _COLUMNS.items() if values[i] is not None}
+    for i in range(5)
+]
+
+
+@pytest.mark.parametrize(
+    "query_filter, expected",
+    [
+        (None, [0, 1, 2, 3, 4]),
+        ({"label": 1}, [1, 3]),
+        ({"label": [0, 2]}, [0, 2, 4]),
+        ({"price": {"gt": 5.0, "lte": 20.0}}, [2, 3]),
+        ({"label": 1, "price": {"gte": 10.0}}, [3]),
+        ({"$and": [{"label": [0, 1]}, {"price": {"lt": 10.0}}]}, [0, 1]),
+        ({"$or": [{"label": 2}, {"price": {"gte": 50.0}}]}, [2, 4]),
+        ({"tag": "a", "$or": [{"label": 0}, {"label": 1}]}, [0, 3]),
+        ({"tag": ["a", "b"]}, [0, 2, 3]),
+        ({"missing": 1}, []),
+        ({"$not": [{"label": 0}, {"price": {"gte": 20.0}}]}, [1, 2]),
+        ({"$not": [{"tag": "a"}]}, [1, 2, 4]),
+        ({"$or": [{"label": 2}, {"$not": [{"price": {"lt": 50.0}}]}]}, [2, 4]),
+    ],
+)
+def test_mask_and_predicate_agree(query_filter, expected):
+    """The columnar mask and the per-record predicate select the same rows."""
+    mask = filter_mask(query_filter, _COLUMNS.get, 5)
+    assert np.flatnonzero(mask).tolist() == expected
+    predicate = filter_predicate(query_filter)
+    if predicate is None:
+        assert query_filter is None
+    else:
+        assert [i for i, row in enumerate(_ROWS) if predicate(row)] == expected
+
+
+def test_unknown_operators_are_rejected():
+    """Unknown $-operators and range bounds raise ValueError."""
+    with pytest.raises(ValueError):
+        validate_filter({"$xor": [{"label": 1}]})
+    with pytest.raises(ValueError):
+        validate_filter({"$or": [{"price": {"between": [1, 2]}}]})
+    with pytest.raises(ValueError):
+        filter_mask({"price": {"ne": 1}}, _COLUMNS.get, 5)
@@ -1,9 +1,12 @@
 """Unit tests for the metrics module."""
 
+import numpy as np
 import pytest
 
 from vdbt.metrics import (
     compute_percentiles,
+    exact_neighbors,
+    linear_trend,
     mrr_at_k,
     ndcg_at_k,
     recall_at_k,
@@ -68,3 +71,28 @@ def test_ndcg_at_k():
     dcg3 = 1 / 2.0
     expected_ndcg = (dcg1 + dcg2 + dcg3) / 3.0
     assert ndcg_at_k(y_true, y_pred, k=3) == pytest.approx(expected_ndcg, 0.01)
+
+
+def test_linear_trend():
+    """Test fitting a line to a series."""
+    trend = linear_trend([0.0, 1.0, 2.0, 3.0], [1.0, 3.0, 5.0, 7.0])
+    assert trend["slope"] == pytest.approx(2.0)
+    assert trend["intercept"] == pytest.approx(1.0)
+    assert trend["r2"] == pytest.approx(1.0)
+    assert linear_trend([0.0], [4.0]) == {"slope": 0.0, "intercept": 4.0, "r2": 0.0}
+
+
+def test_exact_neighbors():
+    """Brute-force neighbours are ordered nearest first for every metric."""
+    base = np.array([[0.0, 0.0], [1.0, 0.0], [3.0, 0.0], [0.0, 2.0]])
+    queries = np.array([[0.9, 0.0], [0.0, 3.0]])
+    assert exact_neighbors(base, queries, 2).tolist() == [[1, 0], [3, 0]]
+    assert exact_neighbors(base, queries, 2, max_block=4).tolist() == [
+        [1, 0],
+        [3, 0],
+    ]
+    assert exact_neighbors(base, queries, 1, metric="ip").tolist() == [[2], [3]]
+    assert exact_neighbors(base[1:], queries, 1, metric="cosine").tolist() == [
+        [0],
+        [2],
+    ]
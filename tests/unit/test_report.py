@@ -0,0 +1,92 @@
+"""Unit tests for report generation."""
+
+import json
+import os
+
+import numpy as np
+
+from vdbt.report import generate_report
+from vdbt.utils.histogram import LatencyHistogram
+
+
+def _write(path, results):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results))
+
+
+def _artifacts(tmp_path):
+    metrics = tmp_path / "metrics"
+    _write(
+        metrics / "faiss_scale_curve.json",
+        {
+            "1000": {"query_latency_s": {"p50": 0.001, "p95": 0.002}},
+            "2000": {"query_latency_s": {"p50": 0.003, "p95": 0.004}},
+        },
+    )
+    _write(metrics / "faiss_noise_injection.json", {"0.0": {"recall@10": 0.9}})
+    histogram = LatencyHistogram(precision=0.001)
+    histogram.record_many(np.random.default_rng(0).lognormal(-7, 1, 50000))
+    raw = np.random.default_rng(1).random(20000).tolist()
+    _write(
+        metrics / "numpy_trace_replay.json",
+        {"replay": {"histogram": histogram.to_dict(), "query_latencies": raw}},
+    )
+    return metrics
+
+
+def test_report_shares_plotly_and_downsamples(tmp_path):
+    """Charts share one plotly.js include and latency data is downsampled."""
+    _artifacts(tmp_path)
+    counts = generate_report(tmp_path)
+
+    assert counts == {"rendered": 3, "reused": 0}
+    html = (tmp_path / "report.html").read_text()
+    scripts = [p for p in (tmp_path / "plots").iterdir() if p.suffix == ".js"]
+    assert len(scripts) == 1
+    assert html.count(f'<script src="plots/{scripts[0].name}">') == 1
+    assert "Latency vs Scale" in html and "Recall@10 vs Noise Ratio" in html
+    assert "histogram" in html and "query_latencies" in html
+    # Embedded as is, the 20000 raw latencies alone would take over 200kB.
+    assert len(html) < 100_000
+
+
+def test_report_renders_only_changed_metrics(tmp_path):
+    """Unchanged metrics files reuse their fragments; removed ones are dropped."""
+    metrics = _artifacts(tmp_path)
+    generate_report(tmp_path)
+    assert generate_report(tmp_path) == {"rendered": 0, "reused": 3}
+
+    scale = metrics / "faiss_scale_curve.json"
+    results = json.loads(scale.read_text())
+    results["4000"] = {"query_latency_s": {"p50": 0.005, "p95": 0.006}}
+    _write(scale, results)
+    os.utime(scale, ns=(0, 0))
+    assert generate_report(tmp_path) == {"rendered": 1, "reused": 2}
+
+    (metrics / "numpy_trace_replay.json").unlink()
+    assert generate_report(tmp_path) == {"rendered": 0, "reused": 2}
+    html = (tmp_path / "report.html").read_text()
+    assert "query_latencies" not in html
+    assert '"x":[1000,2000,4000]' in html
+    fragments = list((tmp_path / "plots" / "fragments").glob("*.html"))
+    assert len(fragments) == 2
+
+
+def test_report_skips_unsupported_and_failed_sweep_entries(tmp_path):
+    """Sweeps with an unsupported marker or failed jobs still render."""
+    metrics = tmp_path / "metrics"
+    _write(
+        metrics / "faiss_noise_injection.json",
+        {"supported": False, "error": "appends on upsert", "stale_rows": 200},
+    )
+    _write(
+        metrics / "faiss_scale_curve.json",
+        {
+            "1000": {"query_latency_s": {"p50": 0.001, "p95": 0.002}},
+            "2000": {"error": "out of memory"},
+        },
+    )
+    assert generate_report(tmp_path) == {"rendered": 2, "reused": 0}
+    html = (tmp_path / "report.html").read_text()
+    assert "Recall@10 vs Noise Ratio" not in html
+    assert '"x":[1000]' in html
@@ -0,0 +1,105 @@
+"""Unit tests for the query trace format."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from vdbt.trace import QueryTrace, TraceWriter
+from vdbt.utils.columnar import ColumnTable
+
+
+def test_trace_round_trip(tmp_path):
+    """Calls come back grouped, in order, with their fields and vectors."""
+    vectors = np.arange(12, dtype=np.float32).reshape(4, 3)
+    with TraceWriter(tmp_path) as writer:
+        writer.record("a", vectors[:1], 5, None, started=10.0, latency_s=0.1)
+        writer.record("b", vectors[1:3], 10, {"label": 1}, started=10.5, latency_s=0.2)
+        writer.record("a", vectors[3], 1, None, started=11.25, latency_s=0.3)
+
+    trace = QueryTrace.load(tmp_path)
+    assert len(trace) == 4
+    assert trace.dim == 3
+    assert isinstance(trace.vectors, np.memmap)
+    assert np.array_equal(trace.vectors, vectors)
+    assert trace.duration_s == 1.25
+
+    calls = trace.calls()
+    assert [call["timestamp_s"] for call in calls] == [0.0, 0.5, 1.25]
+    assert [call["collection"] for call in calls] == ["a", "b", "a"]
+    assert [call["k"] for call in calls] == [5, 10, 1]
+    assert [call["filter"] for call in calls] == [None, {"label": 1}, None]
+    assert np.array_equal(trace.vectors[calls[1]["rows"]], vectors[1:3])
+
+
+def test_trace_orders_calls_by_start_time(tmp_path):
+    """A call that started first but finished last is replayed first."""
+    writer = TraceWriter(tmp_path)
+    writer.record("c", np.ones((1, 2)), 1, None, started=5.0, latency_s=0.0)
+    writer.record("c", np.zeros((1, 2)), 1, None, started=4.0, latency_s=2.0)
+    writer.close()
+
+    calls = QueryTrace.load(tmp_path, mmap=False).calls()
+    assert [call["timestamp_s"] for call in calls] == [0.0, 1.0]
+    assert calls[0]["rows"] == slice(1, 2)
+
+
+def test_trace_writer_is_thread_safe(tmp_path):
+    """Concurrent recorders never interleave the vectors of a call."""
+    with TraceWriter(tmp_path) as writer:
+
+        def record(value: float) -> None:
+            for _ in range(50):
+                writer.record("c", np.full((3, 4), value), 1, None, 0.0, 0.0)
+
+        threads = [threading.Thread(target=record, args=(v,)) for v in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    trace = QueryTrace.load(tmp_path)
+    assert len(trace.calls()) == 200
+    for call in trace.calls():
+        assert len(np.unique(trace.vectors[call["rows"]])) == 1
+
+
+def test_trace_writer_rejects_mixed_dimensions(tmp_path):
+    """All queries of a trace share one dimension."""
+    with TraceWriter(tmp_path) as writer:
+        writer.record("c", np.ones((1, 2)), 1, None, 0.0, 0.0)
+        with pytest.raises(ValueError, match="2-dim trace"):
+            writer.record("c", np.ones((1, 3)), 1, None, 0.0, 0.0)
+
+
+def test_trace_writer_columns_match_per_vector_rows(tmp_path):
+    """Per-call fields expand to the table the per-vector rows would give."""
+    with TraceWriter(tmp_path) as writer:
+        writer.record("a", np.ones((2, 2)), 5, None, started=1.0, latency_s=0.1)
+        writer.record("b", np.ones((3, 2)), 7, {"x": [1]}, started=2.0, latency_s=0.2)
+
+    rows = [
+        {"timestamp_s": 0.0, "batch": 0, "collection": "a", "k": 5, "latency_s": 0.1}
+    ] * 2 + [
+        {
+            "timestamp_s": 1.0,
+            "batch": 1,
+            "collection": "b",
+            "k": 7,
+            "latency_s": 0.2,
+            "filter": {"x": [1]},
+        }
+    ] * 3
+    columns = QueryTrace.load(tmp_path).columns
+    expected = ColumnTable.from_rows(rows)
+    assert columns.kinds == expected.kinds
+    assert columns.rows() == expected.rows()
+    assert np.array_equal(columns.masks["filter"], expected.masks["filter"])
+
+
+def test_trace_writer_empty_trace(tmp_path):
+    """A writer that recorded nothing still leaves a loadable trace."""
+    TraceWriter(tmp_path).close()
+    trace = QueryTrace.load(tmp_path)
+    assert len(trace) == 0
+    assert trace.calls() == []
@@ -0,0 +1,42 @@
+"""Unit tests for columnar metadata storage."""
+
+import numpy as np
+import pytest
+
+from vdbt.utils.columnar import ColumnTable
+
+ROWS = [
+    {"label": 1, "score": 0.5, "name": "a", "flag": True, "tags": [1, 2]},
+    {"label": 2, "score": 1, "name": "bb", "flag": False},
+    {"label": 3, "name": "ccc", "extra": {"nested": None}},
+]
+
+
+def test_column_table_types_and_rows():
+    """Columns get native dtypes and rows round-trip, including missing keys."""
+    table = ColumnTable.from_rows(ROWS)
+    assert table.kinds == {
+        "label": "int64",
+        "score": "float64",
+        "name": "str",
+        "flag": "bool",
+        "tags": "json",
+        "extra": "json",
+    }
+    assert table.columns["label"].dtype == np.int64
+    assert table.rows() == [
+        {"label": 1, "score": 0.5, "name": "a", "flag": True, "tags": [1, 2]},
+        {"label": 2, "score": 1.0, "name": "bb", "flag": False},
+        {"label": 3, "name": "ccc", "extra": {"nested": None}},
+    ]
+    assert table.objects("tags").tolist() == [[1, 2], None, None]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_column_table_save_and_load(tmp_path, mmap):
+    """A saved table loads back, memory-mapped or not."""
+    ColumnTable.from_rows(ROWS).save(tmp_path / "table")
+    table = ColumnTable.load(tmp_path / "table", mmap=mmap)
+    assert isinstance(table.columns["label"], np.memmap) == mmap
+    assert len(table) == 3
+    assert table[2] == {"label": 3, "name": "ccc", "extra": {"nested": None}}
@@ -4,8 +4,10 @@ import numpy as np
 
 from vdbt.utils.data import (
     create_synthetic_embeddings,
+    duplicate_sources,
     inject_duplicates,
     inject_noise,
+    zipf_weights,
 )
 
 
@@ -32,6 +34,23 @@ def test_inject_duplicates():
     assert new_labels.shape[0] == 3
 
 
+def test_inject_duplicates_perturbation():
+    """Near-duplicates stay close to the rows reported as their sources."""
+    embeddings = np.random.default_rng(0).standard_normal((100, 16))
+    labels = np.arange(100)
+    new_embeddings, new_labels = inject_duplicates(
+        embeddings, labels, duplicate_ratio=0.5, seed=42, perturbation=0.01
+    )
+    sources = duplicate_sources(100, 0.5, seed=42)
+    copies = new_embeddings[100:]
+    assert np.array_equal(new_labels[100:], sources)
+    assert not np.any(np.all(copies == embeddings[sources], axis=1))
+    relative = np.linalg.norm(copies - embeddings[sources], axis=1) / np.linalg.norm(
+        embeddings[sources], axis=1
+    )
+    assert np.all(relative < 0.05)
+
+
 def test_inject_noise():
     """Test that noise is injected correctly."""
     embeddings = np.ones((10, 2))
@@ -40,3 +59,11 @@ def test_inject_noise():
     # Count the number of rows that are not all ones
     num_changed_rows = np.sum(np.any(noisy_embeddings != 1.0, axis=1))
     assert num_changed_rows == 5
+
+
+def test_zipf_weights():
+    """Test that Zipfian weights are normalized and skewed."""
+    weights = zipf_weights(4, exponent=1.0)
+    assert np.isclose(weights.sum(), 1.0)
+    assert np.allclose(weights / weights[0], [1.0, 1 / 2, 1 / 3, 1 / 4])
+    assert np.allclose(zipf_weights(3, exponent=0.0), 1 / 3)
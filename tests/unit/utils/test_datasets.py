@@ -0,0 +1,71 @@
+"""Unit tests for the ANN dataset loaders."""
+
+import numpy as np
+import pytest
+
+from vdbt.utils.datasets import load_dataset, read_vecs
+
+
+def write_vecs(path, array):
+    """Writes an array in the TEXMEX *vecs format."""
+    dims = np.full((len(array), 1), array.shape[1], dtype="<i4")
+    records = np.hstack([dims.view(np.uint8), array.view(np.uint8)])
+    records.tofile(path)
+
+
+@pytest.mark.parametrize(
+    "suffix, dtype",
+    [(".fvecs", np.float32), (".ivecs", np.int32), (".bvecs", np.uint8)],
+)
+def test_read_vecs_round_trip(tmp_path, suffix, dtype):
+    """Vectors written in each format are mapped back unchanged."""
+    array = (np.arange(30) % 250).reshape(10, 3).astype(dtype)
+    path = tmp_path / f"data{suffix}"
+    write_vecs(path, array)
+
+    mapped = read_vecs(path)
+    assert mapped.shape == (10, 3)
+    assert np.array_equal(mapped, array)
+
+
+def test_read_vecs_rejects_truncated_file(tmp_path):
+    """A file that is not a whole number of records is rejected."""
+    path = tmp_path / "bad.fvecs"
+    write_vecs(path, np.ones((2, 4), dtype=np.float32))
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ValueError):
+        read_vecs(path)
+
+
+def test_texmex_directory_streams_batches(tmp_path):
+    """A SIFT-style directory yields batches and ground truth."""
+    base = np.random.default_rng(0).random((25, 4)).astype(np.float32)
+    write_vecs(tmp_path / "toy_base.fvecs", base)
+    write_vecs(tmp_path / "toy_query.fvecs", base[:3])
+    write_vecs(
+        tmp_path / "toy_groundtruth.ivecs", np.arange(30, dtype=np.int32).reshape(3, 10)
+    )
+
+    dataset = load_dataset(tmp_path)
+    assert (dataset.num_base, dataset.dim) == (25, 4)
+    batches = list(dataset.iter_batches(batch_size=10, limit=22))
+    assert [start for start, _ in batches] == [0, 10, 20]
+    assert np.array_equal(np.vstack([b for _, b in batches]), base[:22])
+    assert dataset.ground_truth(k=2, limit=2).tolist() == [[0, 1], [10, 11]]
+
+
+def test_hdf5_dataset(tmp_path):
+    """ann-benchmarks HDF5 files expose train/test/neighbors and the metric."""
+    h5py = pytest.importorskip("h5py")
+    path = tmp_path / "toy-angular.hdf5"
+    with h5py.File(path, "w") as f:
+        f.attrs["distance"] = "angular"
+        f["train"] = np.ones((5, 2), dtype=np.float32)
+        f["test"] = np.ones((2, 2), dtype=np.float32)
+        f["neighbors"] = np.zeros((2, 3), dtype=np.int32)
+
+    dataset = load_dataset(path)
+    assert dataset.metric == "cosine"
+    assert dataset.num_base == 5
+    assert dataset.ground_truth(k=3).shape == (2, 3)
@@ -0,0 +1,28 @@
+"""Unit tests for the deduplication utilities."""
+
+import numpy as np
+
+from vdbt.utils.dedup import hash_dedup, lsh_dedup
+
+
+def test_hash_dedup_keeps_first_occurrences():
+    """Exact duplicates are dropped and the first copy of each row is kept."""
+    vectors = np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 2.0], [0.0, -0.0], [-0.0, 0.0]])
+    assert hash_dedup(vectors).tolist() == [True, True, False, True, False]
+
+
+def test_hash_dedup_rounding_catches_small_perturbations():
+    """Rounding before hashing drops rows that differ only in noise."""
+    vectors = np.array([[1.0, 2.0], [1.0001, 2.0001]])
+    assert hash_dedup(vectors).tolist() == [True, True]
+    assert hash_dedup(vectors, decimals=2).tolist() == [True, False]
+
+
+def test_lsh_dedup_drops_near_duplicates():
+    """Perturbed copies are dropped while distinct random rows are kept."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 32)).astype(np.float32)
+    copies = vectors[:100] + rng.standard_normal((100, 32)).astype(np.float32) * 1e-3
+    keep = lsh_dedup(np.vstack([vectors, copies]), threshold=0.99, seed=0)
+    assert keep[:500].all()
+    assert not keep[500:].any()
@@ -0,0 +1,82 @@
+"""Unit tests for the measurement harness."""
+
+import time
+
+import pytest
+
+from vdbt.utils.harness import LatencySampler, MeasurementConfig, measure
+from vdbt.utils.timing import timer_calibration
+
+
+def test_sampler_discards_warmup_and_converges():
+    """Warmup samples are dropped and a constant latency converges early."""
+    config = MeasurementConfig(
+        warmup_count=5, min_samples=20, check_every=10, stable_checks=2
+    )
+    sampler = LatencySampler(config)
+    for latency in [1.0] * 5:
+        assert sampler.add(latency) is False
+    while not sampler.done:
+        assert sampler.add(0.001) is True
+
+    stats = sampler.stats()
+    assert (stats["samples"], stats["warmup_discarded"]) == (40, 5)
+    assert stats["converged"] is True
+    assert stats["timer_overhead_ns"] >= 0
+    assert sampler.percentiles()["p99"] == pytest.approx(0.001)
+
+
+def test_sampler_stops_at_cap_without_steady_state():
+    """Ever-growing latencies never converge and stop at the sample cap."""
+    config = MeasurementConfig(warmup_count=0, min_samples=10, max_samples=50)
+    sampler = LatencySampler(config)
+    latency = 1e-6
+    while not sampler.done:
+        sampler.add(latency)
+        latency *= 1.5
+    assert sampler.stats()["samples"] == 50
+    assert sampler.converged is False
+
+
+def test_sampler_duration_based_warmup():
+    """A warmup duration keeps discarding samples until it has elapsed."""
+    config = MeasurementConfig(warmup_count=1, warmup_s=0.02, max_samples=1)
+    sampler = LatencySampler(config)
+    sampler.add(0.0)
+    sampler.add(0.0)
+    assert sampler.warmup_discarded == 2
+    time.sleep(0.03)
+    sampler.add(0.0)
+    assert sampler.done
+
+
+def test_measure_cycles_inputs_and_returns_measured_results():
+    """`measure` cycles through inputs and keeps only measured results."""
+    config = MeasurementConfig(warmup_count=2, min_samples=3, max_samples=3)
+    sampler, results = measure(lambda x: x * 10, [1, 2], config)
+    assert results == [10, 20, 10]
+    assert sampler.warmup_discarded == 2
+
+
+def test_config_from_kwargs():
+    """Scenario defaults are overridden by the "measurement" settings."""
+    config = MeasurementConfig.from_kwargs(
+        {"measurement": {"warmup_count": 3}}, warmup_count=1, max_samples=7
+    )
+    assert (config.warmup_count, config.max_samples) == (3, 7)
+    with pytest.raises(ValueError):
+        MeasurementConfig.from_kwargs({"measurement": {"warmup": 3}})
+
+
+def test_sampler_subtracts_timer_overhead():
+    """The calibrated overhead is removed from samples only when asked."""
+    overhead_ns = timer_calibration().overhead_ns
+    for subtract in (False, True):
+        config = MeasurementConfig(
+            warmup_count=0, max_samples=1, subtract_timer_overhead=subtract
+        )
+        sampler = LatencySampler(config)
+        sampler.add_ns(overhead_ns + 1000)
+        expected = 1000 + (0 if subtract else overhead_ns)
+        assert sampler.latencies[0] == pytest.approx(expected * 1e-9)
+        assert sampler.stats()["timer_overhead_subtracted"] is subtract
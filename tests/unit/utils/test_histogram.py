@@ -0,0 +1,72 @@
+"""Unit tests for the latency histogram."""
+
+import numpy as np
+import pytest
+
+from vdbt.utils.histogram import LatencyHistogram
+
+
+def test_histogram_percentiles_within_precision():
+    """Percentiles match exact ones to within the bucket precision."""
+    values = np.random.default_rng(0).lognormal(-7, 1, 10000)
+    histogram = LatencyHistogram(precision=0.01)
+    histogram.record_many(values)
+
+    assert histogram.count == 10000
+    for p in (50, 95, 99):
+        exact = np.percentile(values, p)
+        assert histogram.percentile(p) == pytest.approx(exact, rel=0.02)
+    assert histogram.summary()["max"] == values.max()
+
+
+def test_histogram_merge_and_round_trip():
+    """Merged histograms equal one fed with all values, and survive JSON."""
+    values = np.random.default_rng(1).random(1000)
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for value in values[:400]:
+        first.record(float(value))
+    second.record_many(values[400:])
+    combined.record_many(values)
+
+    first.merge(second)
+    assert np.array_equal(first.counts, combined.counts)
+    restored = LatencyHistogram.from_dict(first.to_dict())
+    assert restored.summary() == first.summary()
+
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(precision=0.05))
+    first.reset()
+    assert first.count == 0
+
+
+def test_histogram_records_nanoseconds():
+    """Nanosecond latencies land in the same buckets as seconds."""
+    values_ns = np.array([1_000, 25_000, 3_000_000], dtype=np.int64)
+    from_ns, from_s = LatencyHistogram(), LatencyHistogram()
+    from_ns.record_ns(int(values_ns[0]))
+    from_ns.record_many_ns(values_ns[1:])
+    from_s.record_many(values_ns * 1e-9)
+    assert np.array_equal(from_ns.counts, from_s.counts)
+    assert from_ns.summary()["max"] == pytest.approx(3e-3)
+
+
+def test_histogram_downsampled_cdf_and_bins():
+    """CDF and bins are bounded in size and preserve the distribution."""
+    values = np.random.default_rng(2).lognormal(-7, 1, 100000)
+    histogram = LatencyHistogram(precision=0.001)
+    histogram.record_many(values)
+
+    latency, fraction = histogram.cdf(max_points=100)
+    assert len(latency) <= 100
+    assert np.all(np.diff(latency) > 0) and np.all(np.diff(fraction) > 0)
+    assert fraction[-1] == 1.0 and latency[-1] == values.max()
+    median = latency[np.searchsorted(fraction, 0.5)]
+    assert median == pytest.approx(np.median(values), rel=0.05)
+
+    edges, counts = histogram.bins(max_bins=40)
+    assert len(counts) <= 40 and len(edges) == len(counts) + 1
+    assert counts.sum() == len(values)
+    assert edges[0] <= values.min() and edges[-1] >= values.max()
+
+    empty = LatencyHistogram()
+    assert len(empty.cdf()[0]) == 0 and len(empty.bins()[1]) == 0
@@ -1,8 +1,15 @@
 """Unit tests for the hybrid query utilities."""
 
 import numpy as np
+import pytest
 
-from vdbt.utils.hybrid import create_hybrid_query_dataset
+from vdbt.utils.hybrid import (
+    FILTER_KINDS,
+    FilteredQueries,
+    create_hybrid_query_dataset,
+    create_metadata_columns,
+    generate_filtered_queries,
+)
 
 
 def test_create_hybrid_query_dataset():
@@ -19,3 +26,56 @@ def test_create_hybrid_query_dataset():
     # The number of keyword queries should be roughly 5, but can vary
     # due to randomness.
     assert 0 < num_keyword_queries < 10
+
+
+def test_generate_filtered_queries_selectivity():
+    """Each filter kind matches roughly the target fraction of the corpus."""
+    embeddings = np.random.default_rng(0).random((5000, 4)).astype(np.float32)
+    columns = create_metadata_columns(5000, seed=0, num_categories=200)
+    columns.pop("year")
+    queries = generate_filtered_queries(
+        embeddings, columns, num_queries=200, selectivity=0.05, seed=1
+    )
+
+    assert queries.vectors.shape == (200, 4)
+    np.testing.assert_array_equal(
+        queries.vectors, embeddings[queries.table.columns["source"]]
+    )
+    kinds = queries.kinds()
+    assert set(kinds.tolist()) == set(FILTER_KINDS)
+    selectivity = queries.selectivity(columns)
+    for kind in FILTER_KINDS:
+        assert 0.02 < selectivity[kinds == kind].mean() < 0.1
+    assert selectivity[kinds == "range"].mean() == pytest.approx(0.05, abs=0.005)
+
+    and_filter = queries.filter(int(np.flatnonzero(kinds == "and")[0]))
+    fields = [next(iter(clause)) for clause in and_filter["$and"]]
+    assert len(set(fields)) == 2
+
+
+def test_generate_filtered_queries_options():
+    """Unfiltered queries are drawn at the given ratio; bad kinds are refused."""
+    embeddings = np.zeros((100, 4), dtype=np.float32)
+    columns = {"category": np.arange(100) % 7}
+    queries = generate_filtered_queries(
+        embeddings, columns, 100, kinds=["eq", "in"], filter_ratio=0.5, seed=0
+    )
+    assert 20 < sum(f is None for f in queries.filters()) < 80
+    with pytest.raises(ValueError):
+        generate_filtered_queries(embeddings, columns, 10, kinds=["range"])
+    with pytest.raises(ValueError):
+        generate_filtered_queries(embeddings, columns, 10, kinds=["like"])
+
+
+def test_filtered_queries_save_and_mmap_load(tmp_path):
+    """A saved query set reloads memory-mapped with the same filters."""
+    embeddings = np.random.default_rng(0).random((500, 4)).astype(np.float32)
+    columns = create_metadata_columns(500, seed=0)
+    queries = generate_filtered_queries(embeddings, columns, 50, seed=0)
+    queries.save(tmp_path / "queries")
+
+    loaded = FilteredQueries.load(tmp_path / "queries")
+    assert isinstance(loaded.vectors, np.memmap)
+    assert isinstance(loaded.table.columns["a_values"], np.memmap)
+    np.testing.assert_array_equal(loaded.vectors, queries.vectors)
+    assert loaded.filters() == queries.filters()
@@ -0,0 +1,55 @@
+"""Unit tests for the readers-writer lock."""
+
+import threading
+import time
+
+from vdbt.utils.locks import ReadWriteLock
+
+
+def test_readers_share_and_writers_exclude():
+    """Readers hold the lock together; a writer waits for all of them."""
+    lock = ReadWriteLock()
+    both_reading = threading.Barrier(2, timeout=5)
+    events = []
+
+    def read() -> None:
+        with lock.read():
+            both_reading.wait()
+            time.sleep(0.05)
+            events.append("read")
+
+    def write() -> None:
+        with lock.write():
+            events.append("write")
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    time.sleep(0.01)
+    writer = threading.Thread(target=write)
+    writer.start()
+    for thread in [*readers, writer]:
+        thread.join()
+    assert events == ["read", "read", "write"]
+
+
+def test_waiting_writer_blocks_new_readers():
+    """A reader arriving after a waiting writer goes after it."""
+    lock = ReadWriteLock()
+    events = []
+
+    def hold(mode: str) -> None:
+        with getattr(lock, mode)():
+            events.append(mode)
+
+    with lock.read():
+        writer = threading.Thread(target=hold, args=("write",))
+        writer.start()
+        time.sleep(0.05)
+        reader = threading.Thread(target=hold, args=("read",))
+        reader.start()
+        time.sleep(0.05)
+        assert events == []
+    writer.join(timeout=5)
+    reader.join(timeout=5)
+    assert events == ["write", "read"]
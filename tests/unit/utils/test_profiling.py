@@ -0,0 +1,75 @@
+"""Unit tests for the phase profilers."""
+
+import pstats
+import time
+
+import pytest
+
+from vdbt.adapters.numpy_adapter import NumpyAdapter
+from vdbt.report import _profile_links
+from vdbt.runner import Runner
+from vdbt.utils.profiling import create_profiler, phase, profile
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profile_writes_collapsed_stacks_per_phase(tmp_path):
+    """Samples land in the phase that was open, as collapsed stacks."""
+    with profile(tmp_path) as paths:
+        with phase("generate"):
+            _busy(0.05)
+    assert set(paths) >= {"generate"}
+    lines = paths["generate"].read_text().splitlines()
+    assert lines
+    # Threads left behind by other tests may be sampled too.
+    busy = [line for line in lines if "_busy" in line]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert stack.startswith("MainThread;")
+
+
+def test_cprofile_profile_writes_stats_per_phase(tmp_path):
+    """The cProfile fallback writes loadable stats for each phase."""
+    with profile(tmp_path, mode="cprofile") as paths:
+        with phase("query"):
+            _busy(0.01)
+    assert set(paths) == {"scenario", "query"}
+    functions = {name for _, _, name in pstats.Stats(str(paths["query"])).stats}
+    assert "_busy" in functions
+
+
+def test_phase_without_profiler_is_noop():
+    """Phases outside a profile do nothing."""
+    with phase("ingest"):
+        pass
+    with pytest.raises(ValueError):
+        create_profiler("perf")
+
+
+class _PhasedScenario:
+    name = "phased"
+
+    def run(self, db, **kwargs):
+        with phase("query"):
+            _busy(0.03)
+        return {}
+
+
+def test_runner_profiles_each_scenario(tmp_path):
+    """The runner writes profiles per adapter and scenario, and the report
+    links them."""
+    runner = Runner(
+        [NumpyAdapter()], [_PhasedScenario()], profile_dir=tmp_path / "profiles"
+    )
+    runner.run()
+    paths = runner.profiles["numpy"]["phased"]
+    assert paths["query"].parent == tmp_path / "profiles" / "numpy" / "phased"
+
+    links = _profile_links(tmp_path / "profiles", tmp_path)
+    assert "**numpy / phased:**" in links
+    assert "(profiles/numpy/phased/query.collapsed)" in links
@@ -2,7 +2,19 @@
 
 import time
 
-from vdbt.utils.timing import Timer, measure_time
+import numpy as np
+import pytest
+
+from vdbt.utils.timing import (
+    LatencyBuffer,
+    Span,
+    SpanRecorder,
+    Timer,
+    calibrate_timer,
+    measure_time,
+    record_span,
+    record_spans,
+)
 
 
 def test_measure_time():
@@ -22,3 +34,84 @@ def test_timer():
 
     assert "duration_s" in metrics
     assert metrics["duration_s"] > 0.01
+
+
+def test_spans_record_nested_paths():
+    """Nested spans are recorded under their full path."""
+    with record_spans() as recorder:
+        for _ in range(3):
+            with Span("query"):
+                with Span("engine"):
+                    time.sleep(0.001)
+                    record_span("server", 0.0005)
+                with Span("decode"):
+                    pass
+
+    summary = recorder.summary()
+    assert set(summary) == {
+        "query",
+        "query/engine",
+        "query/engine/server",
+        "query/decode",
+    }
+    assert summary["query"]["count"] == 3
+    assert summary["query/engine/server"]["total_s"] == pytest.approx(0.0015)
+    assert summary["query"]["total_s"] >= summary["query/engine"]["total_s"]
+
+
+def test_span_recorder_memory_is_bounded():
+    """Durations go into fixed-size histograms; percentiles stay accurate."""
+    recorder = SpanRecorder()
+    values = np.random.default_rng(0).lognormal(-9, 1, 50000)
+    for value in values:
+        recorder.record("search", float(value))
+    buckets = recorder._histograms["search"].counts.size
+    for value in values[:1000]:
+        recorder.record("search", float(value))
+    assert recorder._histograms["search"].counts.size == buckets
+
+    summary = recorder.summary()["search"]
+    assert summary["count"] == 51000
+    assert summary["p50"] == pytest.approx(np.median(values), rel=0.02)
+
+
+def test_spans_without_recorder_are_noops():
+    """Spans outside record_spans() do not fail and are not recorded."""
+    with Span("query"):
+        record_span("server", 1.0)
+    with record_spans() as recorder:
+        pass
+    assert recorder.summary() == {}
+
+
+def test_calibrate_timer():
+    """Calibration reports a small, non-negative overhead."""
+    calibration = calibrate_timer(samples=1000)
+    assert calibration.samples == 1000
+    assert 0 <= calibration.min_ns <= calibration.overhead_ns < 1_000_000
+    assert calibration.resolution_ns > 0
+    assert set(calibration.to_dict()) == {
+        "overhead_ns",
+        "min_ns",
+        "resolution_ns",
+        "samples",
+    }
+
+
+def test_latency_buffer():
+    """Latencies are stored as int64 nanoseconds without growing."""
+    buffer = LatencyBuffer(3)
+    buffer.record_ns(1500)
+    assert buffer.time_call(sum, [1, 2]) == 3
+    assert len(buffer) == 2
+    assert buffer.values_ns.dtype == np.int64
+    assert buffer.values_ns[0] == 1500
+    assert buffer.seconds(overhead_ns=500)[0] == pytest.approx(1e-6)
+    assert buffer.seconds(overhead_ns=10**9).min() == 0.0
+
+    buffer.record_ns(1)
+    assert buffer.full
+    with pytest.raises(IndexError):
+        buffer.record_ns(1)
+    buffer.reset()
+    assert len(buffer) == 0 and not buffer.full
@@ -0,0 +1,61 @@
+"""Unit tests for the traffic rate profiles."""
+
+import numpy as np
+import pytest
+
+from vdbt.utils.traffic import (
+    arrival_times,
+    csv_profile,
+    rate_profile,
+    sine_profile,
+    step_profile,
+)
+
+
+def test_step_profile_bursts():
+    """Bursts start at `burst_start_s` and repeat every `burst_every_s`."""
+    rates = step_profile(10, 1, 5, burst_duration_s=2, burst_every_s=5, burst_start_s=1)
+    assert rates.tolist() == [1, 5, 5, 1, 1, 1, 5, 5, 1, 1]
+
+
+def test_sine_profile_is_clipped_at_zero():
+    """The rate follows the sine around its mean but never goes negative."""
+    rates = sine_profile(4, mean_qps=1, amplitude_qps=2, period_s=4)
+    assert np.allclose(rates, [1, 3, 1, 0])
+
+
+def test_csv_profile(tmp_path):
+    """Traces are read per second from the named column and scaled."""
+    path = tmp_path / "trace.csv"
+    path.write_text("second,qps\n0,10\n1,20\n2,0\n")
+    assert csv_profile(path, scale=0.5).tolist() == [5, 10, 0]
+    assert rate_profile({"shape": "csv", "path": str(path)}, 2).tolist() == [10, 20]
+    with pytest.raises(ValueError, match="rate"):
+        csv_profile(path, column="rate")
+
+
+def test_rate_profile_rejects_unknown_shapes():
+    """Unknown shapes, and generated shapes without a duration, are rejected."""
+    with pytest.raises(ValueError, match="shape"):
+        rate_profile({"shape": "square"}, 10)
+    with pytest.raises(ValueError, match="duration"):
+        rate_profile(
+            {"shape": "sine", "mean_qps": 1, "amplitude_qps": 1, "period_s": 2}
+        )
+
+
+def test_uniform_arrivals_follow_the_rate():
+    """Each second gets its rate's worth of evenly spaced, sorted sends."""
+    times = arrival_times(np.array([2.0, 0.0, 4.0]))
+    assert np.bincount(times.astype(int), minlength=3).tolist() == [2, 0, 4]
+    assert np.allclose(times[:2], [0.25, 0.75])
+    assert np.all(np.diff(times) > 0)
+
+
+def test_poisson_arrivals_are_seeded():
+    """Poisson arrivals are sorted, reproducible and close to the rate."""
+    rates = np.full(100, 50.0)
+    times = arrival_times(rates, "poisson", seed=1)
+    assert np.array_equal(times, arrival_times(rates, "poisson", seed=1))
+    assert np.all(np.diff(times) >= 0)
+    assert abs(len(times) - 5000) < 300